@@ -10,7 +10,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal, async_session_maker
+from app.db.session import SessionLocal, async_session_maker, async_read_session_maker
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -36,3 +36,17 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """
     async with async_session_maker() as session:
         yield session
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a read-only async database session.
+    
+    Uses the replica when DB_REPLICA_URI is set; transactions are READ
+    ONLY and the session is never committed.
+    
+    Yields:
+        An SQLAlchemy async session
+    """
+    async with async_read_session_maker() as session:
+        yield session
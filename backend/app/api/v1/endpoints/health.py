@@ -15,6 +15,8 @@ from app.api.dependencies.db import get_async_db
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.connection import connection_health_check
+from app.db.instrumentation import get_query_metrics
+from app.db.session import async_engine
 from app.db.vector import ensure_extension
 
 # Define Pydantic models for response validation
@@ -37,6 +39,12 @@ class DetailedHealthResponse(HealthResponse):
     components: Dict[str, ComponentStatus]
 
 
+class DatabaseMetricsResponse(BaseModel):
+    """Connection pool and query metrics."""
+    pool: Dict[str, int]
+    queries: Dict[str, float]
+
+
 router = APIRouter()
 logger = get_logger(__name__)
 
@@ -143,6 +151,32 @@ async def detailed_health_check(db: AsyncSession = Depends(get_async_db)) -> Det
     }
 
 
+@router.get(
+    "/database",
+    summary="Database metrics",
+    description="Returns connection pool usage and query metrics for this process",
+    status_code=status.HTTP_200_OK,
+    response_model=DatabaseMetricsResponse,
+)
+async def database_metrics() -> DatabaseMetricsResponse:
+    """
+    Connection pool usage and query metrics of the primary async engine.
+    
+    Returns:
+        A dictionary with pool and query metrics
+    """
+    pool = async_engine.pool
+    return {
+        "pool": {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checked_in": pool.checkedin(),
+        },
+        "queries": get_query_metrics(),
+    }
+
+
 @router.get(
     "/readiness",
     summary="Readiness probe",
@@ -15,7 +15,7 @@ from pydantic import BaseModel, Field
 
 from app.core.auth.manager import get_current_user
 from app.core.auth.base import AuthUser
-from app.db.session import get_async_db
+from app.db.session import get_async_db, get_async_read_db
 from app.db.models.receipt import Receipt, ReceiptType
 from app.services.receipt_service import ReceiptService
 
@@ -67,7 +67,7 @@ async def get_user_receipts(
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of receipts"),
     offset: int = Query(0, ge=0, description="Number of receipts to skip"),
     current_user: AuthUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get receipts for the current user.
     
@@ -148,7 +148,7 @@ async def get_receipt_stats(
     start_date: Optional[datetime] = Query(None, description="Start date for statistics"),
     end_date: Optional[datetime] = Query(None, description="End date for statistics"),
     current_user: AuthUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get receipt statistics for the current user.
     
@@ -177,7 +177,7 @@ async def get_receipt_stats(
 async def get_receipt(
     receipt_id: str,
     current_user: AuthUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get a specific receipt by ID.
     
@@ -241,7 +241,7 @@ async def get_entity_receipts(
     entity_type: str,
     entity_id: str,
     current_user: AuthUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all receipts for a specific entity.
     
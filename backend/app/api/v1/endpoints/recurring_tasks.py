@@ -31,6 +31,9 @@ async def create_recurring_task_instances(
     """
     Create recurring task instances based on a master task.
     
+    Only occurrences within the recurrence horizon are created now; later
+    ones are created as the horizon moves forward.
+    
     Args:
         task_id: The ID of the master task.
         recurrence_pattern: The recurrence pattern string.
@@ -55,6 +58,7 @@ async def create_recurring_task_instances(
             count=count,
             end_date=end_date
         )
+        await db.commit()
         return created_tasks
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
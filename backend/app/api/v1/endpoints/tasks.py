@@ -31,6 +31,8 @@ from app.schemas.task import (
     TaskStats
 )
 from app.services.task.task_service import TaskService
+from app.services.task.task_analytics import TaskAnalyticsService
+from app.services.task.reminder_scheduler import ReminderScheduler
 from app.services.task.task_intelligence import TaskIntelligenceService
 from app.services.task.suggestion_engine import TaskSuggestionEngine
 from app.services.receipt_service import ReceiptService
@@ -477,7 +479,16 @@ async def complete_task(
         )
     
     # Mark task as complete using the model's helper method
+    previous_status = task.status
     task.mark_complete()
+    await TaskAnalyticsService(db).record_transition(
+        user_id=task.user_id,
+        previous_status=previous_status,
+        status=task.status,
+        completed_at=task.completed_at,
+        experience_points=task.experience_points
+    )
+    await ReminderScheduler(db).cancel_for_task(task.id)
     
     # Update actual duration if provided
     if completion_data.actual_duration_minutes:
@@ -621,72 +632,8 @@ async def get_task_stats(
     Returns:
         Task statistics including XP, streaks, and performance metrics.
     """
-    task_service = TaskService(db)
-    
-    # Get all user's tasks
-    tasks, total = await task_service.get_tasks_by_user_id(
-        user_id=str(current_user.user_id),
-        limit=10000,  # Get all tasks for stats
-        include_inactive=True
-    )
-    
-    # Calculate statistics
-    stats = TaskStats()
-    stats.total_tasks = total
-    
-    completed_tasks = []
-    total_estimated = 0
-    total_actual = 0
-    on_time_count = 0
-    total_difficulty = 0
-    
-    for task in tasks:
-        if task.status == TaskStatus.COMPLETED:
-            stats.completed_tasks += 1
-            completed_tasks.append(task)
-            stats.total_experience += task.experience_points
-            
-            if task.actual_duration_minutes:
-                total_actual += task.actual_duration_minutes
-            
-            if task.due_date and task.completed_at:
-                if task.completed_at <= task.due_date:
-                    on_time_count += 1
-                    
-        elif task.status == TaskStatus.IN_PROGRESS:
-            stats.in_progress_tasks += 1
-        elif task.status == TaskStatus.PENDING and task.due_date:
-            if task.due_date < datetime.now():
-                stats.overdue_tasks += 1
-        
-        if task.estimated_duration_minutes:
-            total_estimated += task.estimated_duration_minutes
-        
-        total_difficulty += task.difficulty
-        
-        # Count by quest type
-        if task.quest_type:
-            quest_type_str = task.quest_type.value
-            if quest_type_str not in stats.tasks_by_quest_type:
-                stats.tasks_by_quest_type[quest_type_str] = 0
-            stats.tasks_by_quest_type[quest_type_str] += 1
-    
-    # Calculate averages
-    if stats.completed_tasks > 0:
-        stats.on_time_completion_rate = on_time_count / stats.completed_tasks
-        if total_actual > 0:
-            stats.average_completion_time = total_actual / stats.completed_tasks
-    
-    if total > 0:
-        stats.average_difficulty = total_difficulty / total
-    
-    stats.total_time_estimated = total_estimated
-    stats.total_time_actual = total_actual
-    
-    # TODO: Calculate current streak (consecutive days with completed tasks)
-    stats.current_streak = 0
-    
-    return stats
+    # Aggregated in the database: one round trip regardless of task count
+    return await TaskAnalyticsService(db).get_stats(current_user.user_id)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -667,7 +667,7 @@ async def record_board_vote(
         )
 
         # Check if consensus reached
-        consensus = await appeals_service.check_board_consensus(appeal_id)
+        consensus = vote_result['consensus']
         if consensus:
             # Auto-resolve if consensus reached
             resolution_text = f"Review board reached consensus: {consensus}"
@@ -825,18 +825,22 @@ async def escalate_appeal(
 
 @router.get("/appeals/sla-violations", response_model=List[AppealResponse])
 async def check_sla_violations(
+    breached_since: Optional[datetime] = Query(None, description="Only breaches recorded at or after this time"),
     current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_async_db)
 ) -> List[AppealResponse]:
     """
     Check for appeals with SLA violations (past review deadline).
 
+    Each appeal carries sla_breached_at once the SLA monitor has recorded
+    its breach; pass breached_since to poll for newly recorded breaches.
+
     Only system admins should have access to this in production.
     """
     appeals_service = AppealResolutionService(db)
 
     # Future: Add admin check here
 
-    overdue_appeals = await appeals_service.check_sla_violations()
+    overdue_appeals = await appeals_service.check_sla_violations(breached_since=breached_since)
 
     return [AppealResponse.from_orm(appeal) for appeal in overdue_appeals]
\ No newline at end of file
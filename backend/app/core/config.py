@@ -66,6 +66,19 @@ class Settings(BaseSettings):
     DB_USERNAME: str = "postgres"
     DB_PASSWORD: str = "postgres"
     DB_SCHEMA: str = "public"
+    DB_REPLICA_URI: Optional[str] = None  # read-only sessions connect here when set
+    
+    # Database Pool Settings
+    DB_POOL_SIZE: int = 10  # connections kept open per engine
+    DB_MAX_OVERFLOW: int = 20  # connections allowed above DB_POOL_SIZE
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # check connections before use
+    DB_STATEMENT_CACHE_SIZE: int = 500  # asyncpg prepared statements per connection (0 behind pgbouncer)
+    
+    # Query Instrumentation Settings
+    DB_SLOW_QUERY_MS: float = 250.0  # statements slower than this are logged with their fingerprint
+    DB_N_PLUS_ONE_THRESHOLD: int = 10  # repeats of one statement per request that warn in development
     
     @property
     def DATABASE_URI(self) -> PostgresDsn:
@@ -96,8 +109,50 @@ class Settings(BaseSettings):
     
     # Vector Database Settings
     VECTOR_DIMENSIONS: int = 1536
-    VECTOR_INDEX_TYPE: str = "hnsw"
+    VECTOR_INDEX_TYPE: str = "auto"  # hnsw, ivfflat, or auto (chosen from table size)
     VECTOR_DISTANCE_METRIC: str = "cosine"
+    VECTOR_INDEX_HNSW_MIN_ROWS: int = 100_000  # auto switches from ivfflat to hnsw at this size
+    VECTOR_INDEX_MAINTENANCE_WINDOW: str = "02:00-05:00"  # UTC, HH:MM-HH:MM
+    VECTOR_INDEX_MAINTENANCE_WORK_MEM: str = "1GB"
+    VECTOR_INDEX_RECALL_SAMPLE_SIZE: int = 50
+    VECTOR_INDEX_RECALL_TOLERANCE: float = 0.05  # rebuild when recall drops this far below its post-build baseline
+    VECTOR_INDEX_MIN_RECALL: float = 0.9
+    
+    # Task Statistics Settings
+    TASK_STATS_DAILY_ROLLUP: bool = True  # compute streaks from task_daily_stats instead of scanning completed tasks
+    RECURRENCE_HORIZON_DAYS: int = 30  # recurring task instances are created this far ahead
+    RECURRENCE_EXTEND_MINUTES: int = 60  # how often the recurrence horizon is moved forward
+    
+    # Task Reminder Settings
+    REMINDER_TICK_SECONDS: int = 60  # how often due reminders are dispatched
+    REMINDER_BATCH_SIZE: int = 100  # reminders claimed per batch
+    REMINDER_CLAIM_LEASE_SECONDS: int = 300  # a claimed reminder that was not sent is due again after this
+    REMINDER_MAX_ATTEMPTS: int = 5  # failed deliveries before a reminder is given up
+    
+    # Negotiation Timeout Settings
+    NEGOTIATION_TIMEOUT_BATCH_SIZE: int = 200  # negotiations expired per transaction
+    NEGOTIATION_TIMEOUT_MAX_SLEEP_SECONDS: int = 300  # longest wait between deadline checks
+    
+    # Appeal SLA Settings
+    APPEAL_SLA_CHECK_SECONDS: int = 60  # how often the SLA deadline queue is drained
+    APPEAL_SLA_BATCH_SIZE: int = 200  # appeals marked as breached per transaction
+    
+    # Trust Calibration Settings
+    TRUST_RECALIBRATION_BATCH_SIZE: int = 1000  # components recalibrated per transaction
+    
+    # Research Bus Settings
+    RESEARCH_BUS_QUEUE_SIZE: int = 10000  # events buffered before the overflow policy applies
+    RESEARCH_BUS_OVERFLOW_POLICY: str = "drop_newest"  # drop_newest, drop_oldest or block
+    RESEARCH_BUS_BATCH_SIZE: int = 100  # events anonymized, dispatched and stored together
+    RESEARCH_BUS_FLUSH_SECONDS: float = 5.0  # longest wait to fill a batch
+    RESEARCH_BUS_HANDLER_TIMEOUT_SECONDS: float = 2.0  # per subscriber call
+    
+    # Feature Flag Settings
+    FEATURE_FLAGS_CONFIG_PATH: Optional[str] = None  # JSON flag configuration; defaults apply if unset
+    FEATURE_FLAG_CACHE_SIZE: int = 100000  # cached (flag, principal) evaluations
+    FEATURE_FLAG_AUDIT_BUFFER_SIZE: int = 10000  # audit entries held in memory
+    FEATURE_FLAG_AUDIT_FLUSH_SECONDS: float = 5.0  # how often audit entries are written to Redis
+    FEATURE_FLAG_AUDIT_STREAM_MAXLEN: int = 1000000  # audit stream cap (approximate)
     
     # Security Settings
     TOKEN_ALGORITHM: str = "HS256"
@@ -6,16 +6,27 @@ experimental features and ensure clear separation between proven
 and unvalidated functionality.
 """
 
-from typing import Dict, Any, Optional, Set, List
+from typing import Dict, Any, Optional, Set, List, Callable, Deque, Tuple
 from enum import Enum
+from collections import deque
+import asyncio
+import copy
 import json
 import os
+import time
 from datetime import datetime
 import logging
 from pathlib import Path
 
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+# An evaluation result: (enabled, reason)
+Decision = Tuple[bool, str]
+
 
 class FeatureStatus(str, Enum):
     """Feature flag status levels"""
@@ -32,6 +43,12 @@ class FeatureFlags:
     
     Controls access to experimental features and provides
     audit trail for feature usage.
+    
+    Flag configuration is compiled into one predicate per flag, and
+    results are cached per principal (user and the context attributes
+    the predicates read), so a repeated check is a dictionary lookup.
+    Any configuration change recompiles the predicates and clears the
+    cache. FeatureFlagSync propagates changes between replicas.
     """
     
     # Experimental feature flags
@@ -54,9 +71,21 @@ class FeatureFlags:
     
     # Feature flag configuration
     _config: Dict[str, Dict[str, Any]] = {}
+    _base_config: Dict[str, Dict[str, Any]] = {}  # As loaded, before propagated changes
     _user_overrides: Dict[str, Dict[str, bool]] = {}
     _instance_config: Dict[str, Any] = {}
-    _audit_log: List[Dict[str, Any]] = []
+    
+    # Compiled predicates and cached evaluations
+    _predicates: Dict[str, Callable[[Optional[Dict[str, Any]]], Decision]] = {}
+    _evaluations: Dict[tuple, Decision] = {}
+    _version: int = 0  # Last propagated change applied
+    
+    # Audit entries as (timestamp, flag, user_id, result, reason): recent
+    # history for reports, and entries not yet written to the audit sink
+    _audit_log: Deque[tuple] = deque(maxlen=settings.FEATURE_FLAG_AUDIT_BUFFER_SIZE)
+    _audit_pending: Deque[tuple] = deque(maxlen=settings.FEATURE_FLAG_AUDIT_BUFFER_SIZE)
+    
+    _sync: Optional["FeatureFlagSync"] = None
     
     @classmethod
     def initialize(cls, config_path: Optional[str] = None) -> None:
@@ -140,6 +169,60 @@ class FeatureFlags:
                 }
             }
             logger.info("Using default feature flag configuration")
+        
+        cls._base_config = copy.deepcopy(cls._config)
+        cls._compile()
+    
+    @classmethod
+    def _compile(cls) -> None:
+        """Compile every flag into a predicate and drop cached evaluations"""
+        cls._predicates = {
+            flag: cls._compile_flag(flag, flag_config)
+            for flag, flag_config in cls._config.items()
+        }
+        cls._evaluations = {}
+    
+    @classmethod
+    def _compile_flag(
+        cls,
+        flag: str,
+        flag_config: Dict[str, Any]
+    ) -> Callable[[Optional[Dict[str, Any]]], Decision]:
+        """
+        Compile one flag's configuration into a predicate over the context.
+        
+        Args:
+            flag: Feature flag name
+            flag_config: Flag configuration
+        
+        Returns:
+            Function mapping an evaluation context to a decision
+        """
+        # Instance configuration takes precedence over flag status
+        if flag in cls._instance_config:
+            decision = (bool(cls._instance_config[flag].get('enabled', False)), "instance_config")
+            return lambda context: decision
+        
+        try:
+            status = FeatureStatus(flag_config.get('status', FeatureStatus.DISABLED))
+        except ValueError:
+            logger.warning(f"Unknown status for feature flag {flag}: {flag_config.get('status')}")
+            decision = (False, "disabled")
+            return lambda context: decision
+        
+        if status == FeatureStatus.ENABLED:
+            decision = (True, "enabled")
+        elif status == FeatureStatus.INTERNAL:
+            # Only enabled for internal users
+            return lambda context: (bool(context and context.get('is_internal', False)), "internal_only")
+        elif status == FeatureStatus.BETA:
+            # Check if user is in beta program
+            return lambda context: (bool(context and context.get('is_beta_user', False)), "beta_only")
+        elif status == FeatureStatus.DEPRECATED:
+            decision = (False, "deprecated")
+        else:
+            decision = (False, "disabled")
+        return lambda context: decision
     
     @classmethod
     def is_enabled(
@@ -155,53 +238,47 @@ class FeatureFlags:
             flag: Feature flag name
             user_id: Optional user ID for per-user flags
             context: Optional context for flag evaluation
-            
+        
         Returns:
             True if feature is enabled for this context
         """
+        # The principal: predicates only read these context attributes
+        if context:
+            key = (flag, user_id, context.get('is_internal', False), context.get('is_beta_user', False))
+        else:
+            key = (flag, user_id)
+        
+        decision = cls._evaluations.get(key)
+        if decision is None:
+            decision = cls._evaluate(flag, user_id, context)
+            if len(cls._evaluations) >= settings.FEATURE_FLAG_CACHE_SIZE:
+                cls._evaluations = {}
+            cls._evaluations[key] = decision
+        
+        entry = (time.time(), flag, user_id, decision[0], decision[1])
+        cls._audit_log.append(entry)
+        cls._audit_pending.append(entry)
+        return decision[0]
+    
+    @classmethod
+    def _evaluate(
+        cls,
+        flag: str,
+        user_id: Optional[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Decision:
+        """Evaluate a flag without the cache"""
         # Check if flag exists
-        if flag not in cls._config:
+        predicate = cls._predicates.get(flag)
+        if predicate is None:
             logger.warning(f"Unknown feature flag: {flag}")
-            return False
-        
-        flag_config = cls._config[flag]
+            return (False, "unknown")
         
         # Check user override first
-        if user_id and user_id in cls._user_overrides:
-            if flag in cls._user_overrides[user_id]:
-                cls._log_access(flag, user_id, cls._user_overrides[user_id][flag], "user_override")
-                return cls._user_overrides[user_id][flag]
+        if user_id and flag in cls._user_overrides.get(user_id, {}):
+            return (cls._user_overrides[user_id][flag], "user_override")
         
-        # Check instance configuration
-        if flag in cls._instance_config:
-            enabled = cls._instance_config[flag].get('enabled', False)
-            cls._log_access(flag, user_id, enabled, "instance_config")
-            return enabled
-        
-        # Check flag status
-        status = flag_config.get('status', FeatureStatus.DISABLED)
-        
-        if status == FeatureStatus.DISABLED:
-            cls._log_access(flag, user_id, False, "disabled")
-            return False
-        elif status == FeatureStatus.ENABLED:
-            cls._log_access(flag, user_id, True, "enabled")
-            return True
-        elif status == FeatureStatus.INTERNAL:
-            # Only enabled for internal users
-            is_internal = context and context.get('is_internal', False)
-            cls._log_access(flag, user_id, is_internal, "internal_only")
-            return is_internal
-        elif status == FeatureStatus.BETA:
-            # Check if user is in beta program
-            is_beta = context and context.get('is_beta_user', False)
-            cls._log_access(flag, user_id, is_beta, "beta_only")
-            return is_beta
-        elif status == FeatureStatus.DEPRECATED:
-            cls._log_access(flag, user_id, False, "deprecated")
-            return False
-        
-        return False
+        return predicate(context)
     
     @classmethod
     def require_consent(cls, flag: str) -> bool:
@@ -210,7 +287,7 @@ class FeatureFlags:
         
         Args:
             flag: Feature flag name
-            
+        
         Returns:
             True if feature requires consent
         """
@@ -226,7 +303,7 @@ class FeatureFlags:
         
         Args:
             flag: Feature flag name
-            
+        
         Returns:
             Path to hypothesis documentation or None
         """
@@ -242,7 +319,7 @@ class FeatureFlags:
         
         Args:
             flag: Feature flag name
-            
+        
         Returns:
             Validation status information
         """
@@ -262,16 +339,80 @@ class FeatureFlags:
         """
         Set per-user feature flag override.
         
+        The change applies locally at once and is propagated to other
+        replicas when sync is running.
+        
         Args:
             user_id: User ID
             flag: Feature flag name
             enabled: Whether to enable for this user
         """
-        if user_id not in cls._user_overrides:
-            cls._user_overrides[user_id] = {}
-        
-        cls._user_overrides[user_id][flag] = enabled
+        cls._apply_change(f"override:{user_id}:{flag}", enabled)
         logger.info(f"Set user override: {user_id} -> {flag} = {enabled}")
+        cls._propagate(f"override:{user_id}:{flag}", enabled)
+    
+    @classmethod
+    def set_status(cls, flag: str, status: FeatureStatus) -> None:
+        """
+        Set a feature flag's status.
+        
+        The change applies locally at once and is propagated to other
+        replicas when sync is running.
+        
+        Args:
+            flag: Feature flag name
+            status: New status
+        """
+        status = FeatureStatus(status)
+        cls._apply_change(f"status:{flag}", status.value)
+        logger.info(f"Set feature status: {flag} = {status.value}")
+        cls._propagate(f"status:{flag}", status.value)
+    
+    @classmethod
+    def _apply_change(cls, field: str, value: Any) -> None:
+        """
+        Apply one propagated change and recompile.
+        
+        Args:
+            field: "status:<flag>" or "override:<user_id>:<flag>"
+            value: Status value, or whether the override enables the flag
+        """
+        cls._set_field(field, value)
+        cls._compile()
+    
+    @classmethod
+    def _load_state(cls, state: Dict[str, Any], version: int) -> None:
+        """
+        Replace propagated state with a full snapshot.
+        
+        Args:
+            state: All propagated changes, by field
+            version: Version of the snapshot
+        """
+        cls._config = copy.deepcopy(cls._base_config)
+        cls._user_overrides = {}
+        for field, value in state.items():
+            cls._set_field(field, value)
+        cls._version = version
+        cls._compile()
+    
+    @classmethod
+    def _set_field(cls, field: str, value: Any) -> None:
+        """Set one propagated field without recompiling"""
+        kind, target = field.split(':', 1)
+        if kind == "status":
+            cls._config[target] = {**cls._config.get(target, {}), "status": FeatureStatus(value)}
+        elif kind == "override":
+            user_id, flag = target.rsplit(':', 1)
+            cls._user_overrides.setdefault(user_id, {})[flag] = bool(value)
+        else:
+            logger.warning(f"Ignoring unknown feature flag change: {field}")
+    
+    @classmethod
+    def _propagate(cls, field: str, value: Any) -> None:
+        """Publish a local change to other replicas, if sync is running"""
+        if cls._sync is not None:
+            cls._sync.publish_later(field, value)
     
     @classmethod
     def get_experimental_features(cls) -> List[str]:
@@ -288,7 +429,7 @@ class FeatureFlags:
         
         Args:
             user_id: Optional user ID
-            
+        
         Returns:
             List of enabled feature flags
         """
@@ -331,33 +472,211 @@ class FeatureFlags:
             },
             "audit_summary": {
                 "total_accesses": len(cls._audit_log),
-                "unique_users": len(set(log['user_id'] for log in cls._audit_log if log['user_id'])),
+                "unique_users": len(set(entry[2] for entry in cls._audit_log if entry[2])),
                 "experimental_accesses": sum(
-                    1 for log in cls._audit_log 
-                    if log['flag'].startswith('experimental.')
+                    1 for entry in cls._audit_log
+                    if entry[1].startswith('experimental.')
                 )
-            }
+            },
+            "version": cls._version
         }
     
-    @classmethod
-    def _log_access(cls, flag: str, user_id: Optional[str], result: bool, reason: str) -> None:
-        """Log feature flag access for auditing"""
-        cls._audit_log.append({
-            "timestamp": datetime.utcnow().isoformat(),
+    @staticmethod
+    def _audit_record(entry: tuple) -> Dict[str, Any]:
+        """Expand an audit entry into its record form"""
+        timestamp, flag, user_id, result, reason = entry
+        return {
+            "timestamp": datetime.utcfromtimestamp(timestamp).isoformat(),
             "flag": flag,
             "user_id": user_id,
             "result": result,
             "reason": reason
-        })
-        
-        # Rotate log if too large
-        if len(cls._audit_log) > 10000:
-            cls._audit_log = cls._audit_log[-5000:]
+        }
     
     @classmethod
     def export_audit_log(cls) -> List[Dict[str, Any]]:
-        """Export audit log for analysis"""
-        return cls._audit_log.copy()
+        """Export recent audit log entries for analysis"""
+        return [cls._audit_record(entry) for entry in cls._audit_log]
+    
+    @classmethod
+    def drain_audit_entries(cls, limit: int) -> List[Dict[str, Any]]:
+        """
+        Take up to limit audit entries not yet written to the audit sink.
+        
+        Args:
+            limit: Maximum number of entries
+        
+        Returns:
+            Audit records, oldest first
+        """
+        pending = cls._audit_pending
+        return [cls._audit_record(pending.popleft()) for _ in range(min(limit, len(pending)))]
+    
+    @classmethod
+    async def start_sync(cls, redis_url: str) -> None:
+        """Start propagating flag changes and audit entries through Redis"""
+        sync = FeatureFlagSync(redis_url)
+        await sync.start()
+        cls._sync = sync
+    
+    @classmethod
+    async def stop_sync(cls) -> None:
+        """Stop sync, flushing the remaining audit entries"""
+        if cls._sync is not None:
+            await cls._sync.stop()
+            cls._sync = None
+
+
+class FeatureFlagSync:
+    """
+    Keeps feature flags consistent across replicas through Redis.
+    
+    Every change is written to a Redis hash together with a version
+    counter, in one transaction, and then announced on a pub/sub channel.
+    Replicas apply announced changes in version order and reload the
+    whole hash when they see a gap, so a replica that missed messages
+    converges on the next change it receives.
+    
+    Audit entries are written in batches to a Redis stream capped at
+    FEATURE_FLAG_AUDIT_STREAM_MAXLEN entries.
+    """
+    
+    CHANNEL = "feature_flags:changes"
+    STATE_KEY = "feature_flags:state"
+    VERSION_FIELD = "_version"
+    AUDIT_STREAM = "feature_flags:audit"
+    
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+        self.redis = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._listener: Optional[asyncio.Task] = None
+        self._flusher: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Connect, load the current state and start listening"""
+        self.redis = await aioredis.from_url(
+            self.redis_url,
+            encoding="utf-8",
+            decode_responses=True
+        )
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self.CHANNEL)
+        # Subscribe before loading, so no change falls between the two
+        await self.reload()
+        self._listener = asyncio.create_task(self._listen(pubsub))
+        self._flusher = asyncio.create_task(self._flush_periodically())
+    
+    async def stop(self) -> None:
+        """Stop listening and flush the audit buffer"""
+        for task in (self._listener, self._flusher):
+            if task:
+                task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush_audit()
+        await self.redis.close()
+    
+    def publish_later(self, field: str, value: Any) -> None:
+        """Publish a change from synchronous code"""
+        task = asyncio.get_running_loop().create_task(self.publish(field, value))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def publish(self, field: str, value: Any) -> int:
+        """
+        Record a change and announce it to all replicas.
+        
+        Args:
+            field: Change field (see FeatureFlags._apply_change)
+            value: Change value
+        
+        Returns:
+            Version of the change
+        """
+        encoded = json.dumps(value)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.STATE_KEY, field, encoded)
+            pipe.hincrby(self.STATE_KEY, self.VERSION_FIELD, 1)
+            _, version = await pipe.execute()
+        await self.redis.publish(
+            self.CHANNEL,
+            json.dumps({"version": version, "field": field, "value": value})
+        )
+        return version
+    
+    async def reload(self) -> None:
+        """Load the full propagated state"""
+        state = await self.redis.hgetall(self.STATE_KEY)
+        version = int(state.pop(self.VERSION_FIELD, 0))
+        FeatureFlags._load_state(
+            {field: json.loads(value) for field, value in state.items()},
+            version
+        )
+        logger.info(f"Loaded feature flag state version {version}")
+    
+    async def handle_message(self, data: str) -> None:
+        """
+        Apply an announced change, or reload on a version gap.
+        
+        Args:
+            data: JSON message published by publish()
+        """
+        message = json.loads(data)
+        version = message["version"]
+        if version <= FeatureFlags._version:
+            return  # Already applied
+        if version == FeatureFlags._version + 1:
+            FeatureFlags._apply_change(message["field"], message["value"])
+            FeatureFlags._version = version
+        else:
+            logger.info(f"Feature flag version gap ({FeatureFlags._version} -> {version}), reloading")
+            await self.reload()
+    
+    async def _listen(self, pubsub) -> None:
+        """Apply changes announced by any replica, including this one"""
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                await self.handle_message(message["data"])
+            except Exception as e:
+                logger.error(f"Failed to apply feature flag change: {e}")
+    
+    async def _flush_periodically(self) -> None:
+        """Flush the audit buffer on an interval"""
+        while True:
+            await asyncio.sleep(settings.FEATURE_FLAG_AUDIT_FLUSH_SECONDS)
+            try:
+                await self.flush_audit()
+            except Exception as e:
+                logger.error(f"Failed to flush feature flag audit log: {e}")
+    
+    async def flush_audit(self, batch_size: int = 1000) -> int:
+        """
+        Write buffered audit entries to the audit stream.
+        
+        Args:
+            batch_size: Entries written per round trip
+        
+        Returns:
+            Number of entries written
+        """
+        written = 0
+        while True:
+            records = FeatureFlags.drain_audit_entries(batch_size)
+            if not records:
+                return written
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for record in records:
+                    pipe.xadd(
+                        self.AUDIT_STREAM,
+                        {key: json.dumps(value) for key, value in record.items()},
+                        maxlen=settings.FEATURE_FLAG_AUDIT_STREAM_MAXLEN,
+                        approximate=True
+                    )
+                await pipe.execute()
+            written += len(records)
 
 
 class FeatureFlagMiddleware:
@@ -373,7 +692,7 @@ class FeatureFlagMiddleware:
         # Extract user ID from request (implementation depends on auth system)
         user_id = getattr(request.state, 'user_id', None)
         
-        # Add feature flag checker to request
+        # Add feature flag checker to request; flags are evaluated on use
         request.state.features = FeatureFlagChecker(user_id)
         
         response = await call_next(request)
@@ -385,13 +704,10 @@ class FeatureFlagChecker:
     
     def __init__(self, user_id: Optional[str] = None):
         self.user_id = user_id
-        self._cache = {}
     
     def is_enabled(self, flag: str) -> bool:
-        """Check if feature is enabled (with caching)"""
-        if flag not in self._cache:
-            self._cache[flag] = FeatureFlags.is_enabled(flag, self.user_id)
-        return self._cache[flag]
+        """Check if feature is enabled (cached per user by FeatureFlags)"""
+        return FeatureFlags.is_enabled(flag, self.user_id)
     
     def require(self, flag: str) -> None:
         """Require feature to be enabled or raise exception"""
@@ -165,11 +165,11 @@ class PluginInterface(ABC):
             event_type: Type of research event
             data: Event data (will be anonymized)
         """
-        from ..research_bus import ResearchBus
+        from ..research_bus import get_research_bus
         
         if self.plugin_type == PluginType.EXPERIMENTAL:
             # Only experimental plugins emit research events
-            bus = ResearchBus()
+            bus = get_research_bus()
             asyncio.create_task(
                 bus.publish(
                     event_type=f"{self.__class__.__name__}.{event_type}",
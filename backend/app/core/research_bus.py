@@ -8,13 +8,18 @@ All data is anonymized and consent-verified before publication.
 import asyncio
 import hashlib
 import json
+import time
 from typing import Dict, Any, Optional, List, Callable
-from datetime import datetime, timedelta
+from datetime import datetime
 from collections import defaultdict
 import logging
 from enum import Enum
 import uuid
 
+import numpy as np
+
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,28 +39,116 @@ class AnonymizationLevel(str, Enum):
     FULL = "full"  # Complete anonymization
 
 
+class OverflowPolicy(str, Enum):
+    """What publish does when the event queue is full"""
+    DROP_NEWEST = "drop_newest"  # Reject the new event
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest queued event
+    BLOCK = "block"  # Wait for space (back-pressure on publishers)
+
+
+# Direct identifiers removed by BASIC and stronger anonymization
+IDENTIFIER_FIELDS = frozenset({
+    'user_id', 'email', 'username', 'full_name',
+    'ip_address', 'device_id', 'session_id'
+})
+
+
+class ResearchEventStore:
+    """
+    Append-only storage for research events.
+    
+    Batches are bulk-loaded into the research_events table with COPY,
+    which costs one round trip per batch instead of one per event.
+    """
+    
+    COLUMNS = (
+        "id", "created_at", "event_type", "plugin", "priority",
+        "anonymization_level", "schema_version", "user_hash",
+        "consent_verified", "data"
+    )
+    
+    async def append(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Append anonymized events to the store.
+        
+        Args:
+            events: Event envelopes as built by ResearchBus.publish
+        """
+        from app.db.session import async_engine
+        
+        records = [
+            (
+                uuid.UUID(event["id"]),
+                datetime.fromisoformat(event["timestamp"]),
+                event["type"],
+                event["plugin"],
+                event["priority"],
+                event["anonymization_level"],
+                event["metadata"]["schema_version"],
+                event["metadata"]["user_hash"],
+                event["metadata"]["consent_verified"],
+                json.dumps(event["data"], default=str)
+            )
+            for event in events
+        ]
+        
+        async with async_engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            # COPY runs as its own statement; the batch is committed when it returns
+            await raw_connection.driver_connection.copy_records_to_table(
+                "research_events",
+                records=records,
+                columns=self.COLUMNS
+            )
+
+
 class ResearchBus:
     """
     Event bus for publishing anonymized data to research track.
     
     Ensures all published data is properly anonymized and
     consent has been obtained.
+    
+    Events wait in a bounded queue and are processed in batches: each
+    batch is anonymized at once, then dispatched to subscribers and
+    persisted to the event store concurrently. Subscribers run in
+    parallel, each receiving its events in order, with every handler
+    call bounded by a timeout so a slow subscriber only delays itself.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        store: Optional[ResearchEventStore] = None,
+        queue_size: Optional[int] = None,
+        overflow_policy: Optional[OverflowPolicy] = None,
+        handler_timeout: Optional[float] = None
+    ):
         self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
-        self._event_queue: asyncio.Queue = asyncio.Queue()
+        self._store = store or ResearchEventStore()
+        self._event_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=queue_size or settings.RESEARCH_BUS_QUEUE_SIZE
+        )
+        self._overflow_policy = OverflowPolicy(overflow_policy or settings.RESEARCH_BUS_OVERFLOW_POLICY)
+        self._handler_timeout = handler_timeout or settings.RESEARCH_BUS_HANDLER_TIMEOUT_SECONDS
         self._processing = False
-        self._event_buffer: List[Dict[str, Any]] = []
-        self._buffer_size = 100
-        self._buffer_timeout = 5.0  # seconds
-        self._last_flush = datetime.utcnow()
+        self._processor: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()  # set while flush() drains the bus
+        self._buffer_size = settings.RESEARCH_BUS_BATCH_SIZE
+        self._buffer_timeout = settings.RESEARCH_BUS_FLUSH_SECONDS
+        self._store_lock = asyncio.Lock()
+        self._store_backlog: List[Dict[str, Any]] = []  # Events whose last store attempt failed
+        self._rng = np.random.default_rng()
         self._metrics = {
             "events_published": 0,
             "events_dropped": 0,
             "consent_denied": 0,
-            "anonymization_failures": 0
+            "anonymization_failures": 0,
+            "events_stored": 0,
+            "store_failures": 0,
+            "handler_timeouts": 0,
+            "batches_dispatched": 0
         }
+        self._dispatch_latency = {"last_ms": 0.0, "avg_ms": 0.0, "max_ms": 0.0}
     
     async def publish(
         self,
@@ -78,9 +171,9 @@ class ResearchBus:
             plugin_name: Source plugin name
             priority: Event priority
             anonymization_level: Required anonymization level
-            
+        
         Returns:
-            True if event was published, False otherwise
+            True if event was accepted, False if it was rejected or dropped
         """
         try:
             # Verify consent if user_id provided
@@ -89,14 +182,7 @@ class ResearchBus:
                 logger.warning(f"Consent denied for event {event_type} from user {user_id}")
                 return False
             
-            # Anonymize data
-            anonymized_data = await self._anonymize_data(
-                data, 
-                user_id, 
-                anonymization_level
-            )
-            
-            # Create event envelope
+            # Create event envelope; data is anonymized with its batch
             event = {
                 "id": str(uuid.uuid4()),
                 "timestamp": datetime.utcnow().isoformat(),
@@ -104,7 +190,7 @@ class ResearchBus:
                 "plugin": plugin_name,
                 "priority": priority.value,
                 "anonymization_level": anonymization_level.value,
-                "data": anonymized_data,
+                "data": dict(data),
                 "metadata": {
                     "schema_version": "1.0",
                     "consent_verified": bool(consent_id),
@@ -114,22 +200,51 @@ class ResearchBus:
             
             # Handle based on priority
             if priority == EventPriority.CRITICAL:
-                await self._process_immediate(event)
+                await self._process_batch([event])
             else:
-                await self._event_queue.put(event)
+                # Start processor if not running; while flushing, flush()
+                # itself drains what is queued
+                if not self._processing and not self._stopping.is_set():
+                    self._processing = True
+                    self._processor = asyncio.create_task(self._process_events())
                 
-                # Start processor if not running
-                if not self._processing:
-                    asyncio.create_task(self._process_events())
+                if not await self._enqueue(event):
+                    return False
             
             self._metrics["events_published"] += 1
             return True
-            
+        
         except Exception as e:
             logger.error(f"Failed to publish event {event_type}: {e}")
             self._metrics["events_dropped"] += 1
             return False
     
+    async def _enqueue(self, event: Dict[str, Any]) -> bool:
+        """
+        Queue an event, applying the overflow policy when the queue is full.
+        
+        Returns:
+            False if the event itself was dropped
+        """
+        if self._overflow_policy == OverflowPolicy.BLOCK:
+            await self._event_queue.put(event)
+            return True
+        
+        try:
+            self._event_queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self._metrics["events_dropped"] += 1
+            if self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+                logger.warning(f"Research queue full, dropped event {event['type']}")
+                return False
+        
+        # DROP_OLDEST: make room for the new event
+        evicted = self._event_queue.get_nowait()
+        logger.warning(f"Research queue full, dropped event {evicted['type']}")
+        self._event_queue.put_nowait(event)
+        return True
+    
     async def subscribe(
         self,
         event_pattern: str,
@@ -141,7 +256,7 @@ class ResearchBus:
         Args:
             event_pattern: Event type pattern (supports wildcards)
             handler: Async function to handle events
-            
+        
         Returns:
             Subscription ID
         """
@@ -160,7 +275,7 @@ class ResearchBus:
         
         Args:
             subscription_id: Subscription to remove
-            
+        
         Returns:
             True if removed, False if not found
         """
@@ -185,7 +300,7 @@ class ResearchBus:
             user_id: User ID
             event_type: Type of event
             consent_id: Consent record ID
-            
+        
         Returns:
             True if consent is valid
         """
@@ -198,138 +313,178 @@ class ResearchBus:
         # This would check against consent database
         return True
     
-    async def _anonymize_data(
-        self,
-        data: Dict[str, Any],
-        user_id: Optional[str],
-        level: AnonymizationLevel
-    ) -> Dict[str, Any]:
+    def _anonymize_batch(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Anonymize data based on specified level.
+        Anonymize event data based on each event's anonymization level.
+        
+        Laplace noise for every numeric value in the batch is drawn in a
+        single vectorized call.
         
         Args:
-            data: Data to anonymize
-            user_id: User ID to remove
-            level: Anonymization level
-            
+            events: Event envelopes with raw data
+        
         Returns:
-            Anonymized data
+            The events that were anonymized; failures are dropped
         """
-        if level == AnonymizationLevel.NONE:
-            # No anonymization (requires special consent)
-            return data
-        
-        anonymized = data.copy()
-        
-        # Basic anonymization - remove direct identifiers
-        if level >= AnonymizationLevel.BASIC:
-            fields_to_remove = [
-                'user_id', 'email', 'username', 'full_name',
-                'ip_address', 'device_id', 'session_id'
-            ]
-            for field in fields_to_remove:
-                anonymized.pop(field, None)
-            
-            # Replace user_id with hash if present
-            if user_id:
-                anonymized['user_hash'] = self._hash_user_id(user_id)
-        
-        # Differential privacy
-        if level >= AnonymizationLevel.DIFFERENTIAL:
-            # Add noise to numerical values
-            for key, value in anonymized.items():
-                if isinstance(value, (int, float)):
-                    # Add Laplacian noise
-                    noise = self._generate_laplace_noise(sensitivity=1.0, epsilon=1.0)
-                    anonymized[key] = value + noise
-        
-        # Full anonymization
-        if level == AnonymizationLevel.FULL:
-            # Additional processing for complete anonymization
-            # Remove timestamps to hour precision
-            if 'timestamp' in anonymized:
-                dt = datetime.fromisoformat(anonymized['timestamp'])
-                anonymized['timestamp'] = dt.replace(minute=0, second=0, microsecond=0).isoformat()
-            
-            # Generalize location data
-            if 'location' in anonymized:
-                # Round to city-level precision
-                pass
+        anonymized_events = []
+        noisy_fields = []  # (data, key) pairs that receive noise
         
-        return anonymized
+        for event in events:
+            try:
+                level = AnonymizationLevel(event["anonymization_level"])
+                if level == AnonymizationLevel.NONE:
+                    # No anonymization (requires special consent)
+                    anonymized_events.append(event)
+                    continue
+                
+                # Basic anonymization - remove direct identifiers
+                anonymized = {
+                    key: value for key, value in event["data"].items()
+                    if key not in IDENTIFIER_FIELDS
+                }
+                
+                # Replace user_id with hash if present
+                user_hash = event["metadata"]["user_hash"]
+                if user_hash:
+                    anonymized['user_hash'] = user_hash
+                
+                # Differential privacy: add noise to numerical values
+                if level in (AnonymizationLevel.DIFFERENTIAL, AnonymizationLevel.FULL):
+                    noisy_fields.extend(
+                        (anonymized, key) for key, value in anonymized.items()
+                        if isinstance(value, (int, float))
+                    )
+                
+                # Full anonymization: remove timestamps to hour precision
+                if level == AnonymizationLevel.FULL and 'timestamp' in anonymized:
+                    dt = datetime.fromisoformat(anonymized['timestamp'])
+                    anonymized['timestamp'] = dt.replace(minute=0, second=0, microsecond=0).isoformat()
+                
+                event["data"] = anonymized
+                anonymized_events.append(event)
+            except Exception as e:
+                logger.error(f"Failed to anonymize event {event.get('type')}: {e}")
+                self._metrics["anonymization_failures"] += 1
+                self._metrics["events_dropped"] += 1
+        
+        if noisy_fields:
+            values = np.array([data[key] for data, key in noisy_fields], dtype=float)
+            noisy = values + self._laplace_noise(len(noisy_fields), sensitivity=1.0, epsilon=1.0)
+            for (data, key), value in zip(noisy_fields, noisy.tolist()):
+                data[key] = value
+        
+        return anonymized_events
     
     def _hash_user_id(self, user_id: str) -> str:
         """Create consistent hash of user ID"""
         return hashlib.sha256(f"{user_id}:research:v1".encode()).hexdigest()[:16]
     
-    def _generate_laplace_noise(self, sensitivity: float, epsilon: float) -> float:
+    def _laplace_noise(self, size: int, sensitivity: float, epsilon: float) -> np.ndarray:
         """Generate Laplacian noise for differential privacy"""
-        import random
-        import math
-        u = random.random() - 0.5
-        return -sensitivity / epsilon * math.copysign(1, u) * math.log(1 - 2 * abs(u))
+        return self._rng.laplace(0.0, sensitivity / epsilon, size)
+    
+    async def _next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Take the next queued event, waiting up to timeout for one.
+        
+        Returns None on timeout, and as soon as the queue is empty once
+        the bus is stopping.
+        """
+        try:
+            return self._event_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            if timeout <= 0 or self._stopping.is_set():
+                return None
+        
+        getter = asyncio.ensure_future(self._event_queue.get())
+        stopper = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait({getter, stopper}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopper.cancel()
+            # A cancelled get never takes an event off the queue
+            getter.cancel()
+        if getter.done() and not getter.cancelled():
+            return getter.result()
+        return None
     
     async def _process_events(self) -> None:
-        """Process queued events in batches"""
+        """
+        Process queued events in batches.
+        
+        Exits when the queue stays empty for a whole batch timeout, or,
+        once flush() signals the bus to stop, after processing the batch
+        it holds and draining the queue.
+        """
         self._processing = True
+        loop = asyncio.get_running_loop()
         
         try:
             while True:
                 # Collect batch
                 batch = []
-                deadline = datetime.utcnow() + timedelta(seconds=self._buffer_timeout)
+                deadline = loop.time() + self._buffer_timeout
                 
                 while len(batch) < self._buffer_size:
-                    try:
-                        timeout = (deadline - datetime.utcnow()).total_seconds()
-                        if timeout <= 0:
-                            break
-                        
-                        event = await asyncio.wait_for(
-                            self._event_queue.get(),
-                            timeout=timeout
-                        )
-                        batch.append(event)
-                    except asyncio.TimeoutError:
+                    event = await self._next_event(deadline - loop.time())
+                    if event is None:
                         break
+                    batch.append(event)
                 
                 if not batch:
                     # No events to process
-                    self._processing = False
                     break
                 
                 # Process batch
                 await self._process_batch(batch)
-                
+        
         except Exception as e:
             logger.error(f"Event processor error: {e}")
+        finally:
             self._processing = False
     
     async def _process_batch(self, events: List[Dict[str, Any]]) -> None:
-        """Process a batch of events"""
+        """Anonymize a batch of events, then dispatch and store it concurrently"""
+        events = self._anonymize_batch(events)
+        if events:
+            await asyncio.gather(
+                self._dispatch_batch(events),
+                self._store_events(events)
+            )
+    
+    async def _dispatch_batch(self, events: List[Dict[str, Any]]) -> None:
+        """Dispatch events to subscribers, running subscribers concurrently"""
+        started = time.monotonic()
+        
+        deliveries: Dict[str, tuple] = {}
         for event in events:
-            await self._dispatch_event(event)
+            for pattern, handlers in self._subscribers.items():
+                if self._matches_pattern(event["type"], pattern):
+                    for handler_info in handlers:
+                        deliveries.setdefault(handler_info["id"], (handler_info, []))[1].append(event)
         
-        # Store events for research
-        await self._store_events(events)
-    
-    async def _process_immediate(self, event: Dict[str, Any]) -> None:
-        """Process high-priority event immediately"""
-        await self._dispatch_event(event)
-        await self._store_events([event])
-    
-    async def _dispatch_event(self, event: Dict[str, Any]) -> None:
-        """Dispatch event to subscribers"""
-        event_type = event["type"]
+        await asyncio.gather(*(
+            self._deliver(handler_info, subscriber_events)
+            for handler_info, subscriber_events in deliveries.values()
+        ))
         
-        for pattern, handlers in self._subscribers.items():
-            if self._matches_pattern(event_type, pattern):
-                for handler_info in handlers:
-                    try:
-                        handler = handler_info["handler"]
-                        await handler(event)
-                    except Exception as e:
-                        logger.error(f"Handler error for event {event_type}: {e}")
+        latency_ms = (time.monotonic() - started) * 1000
+        batches = self._metrics["batches_dispatched"] = self._metrics["batches_dispatched"] + 1
+        self._dispatch_latency["last_ms"] = latency_ms
+        self._dispatch_latency["avg_ms"] += (latency_ms - self._dispatch_latency["avg_ms"]) / batches
+        self._dispatch_latency["max_ms"] = max(self._dispatch_latency["max_ms"], latency_ms)
+    
+    async def _deliver(self, handler_info: Dict[str, Any], events: List[Dict[str, Any]]) -> None:
+        """Deliver events to one subscriber in order, bounding each call by the handler timeout"""
+        handler = handler_info["handler"]
+        for event in events:
+            try:
+                await asyncio.wait_for(handler(event), timeout=self._handler_timeout)
+            except asyncio.TimeoutError:
+                self._metrics["handler_timeouts"] += 1
+                logger.warning(f"Handler {handler_info['id']} timed out on event {event['type']}")
+            except Exception as e:
+                logger.error(f"Handler error for event {event['type']}: {e}")
     
     def _matches_pattern(self, event_type: str, pattern: str) -> bool:
         """Check if event type matches subscription pattern"""
@@ -340,21 +495,79 @@ class ResearchBus:
         return event_type == pattern
     
     async def _store_events(self, events: List[Dict[str, Any]]) -> None:
-        """Store events for research analysis"""
-        # TODO: Implement storage to research database
-        # This would write to a time-series database or data lake
-        pass
+        """
+        Store events for research analysis.
+        
+        A batch that fails to store is retried with the next one; the
+        backlog is capped at the queue size, dropping its oldest events.
+        """
+        async with self._store_lock:
+            pending = self._store_backlog + events
+            try:
+                await self._store.append(pending)
+            except Exception as e:
+                logger.error(f"Failed to store {len(pending)} research events: {e}")
+                self._metrics["store_failures"] += 1
+                overflow = len(pending) - self._event_queue.maxsize
+                if overflow > 0:
+                    self._metrics["events_dropped"] += overflow
+                    pending = pending[overflow:]
+                self._store_backlog = pending
+                return
+            
+            self._store_backlog = []
+            self._metrics["events_stored"] += len(pending)
+    
+    async def flush(self) -> None:
+        """
+        Process everything still queued and retry any unstored events.
+        
+        The processor is signalled to stop and awaited, so the batch it
+        is collecting is processed too and batches stay in order for each
+        subscriber. The bus can be used again afterwards.
+        """
+        self._stopping.set()
+        try:
+            if self._processor is not None:
+                await self._processor
+            
+            # Events queued while no processor was running
+            while not self._event_queue.empty():
+                batch = [
+                    self._event_queue.get_nowait()
+                    for _ in range(min(self._buffer_size, self._event_queue.qsize()))
+                ]
+                await self._process_batch(batch)
+            if self._store_backlog:
+                await self._store_events([])
+        finally:
+            self._stopping.clear()
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get research bus metrics"""
         return {
             **self._metrics,
             "queue_size": self._event_queue.qsize(),
+            "queue_capacity": self._event_queue.maxsize,
+            "store_backlog": len(self._store_backlog),
+            "dispatch_latency_ms": dict(self._dispatch_latency),
             "subscribers": sum(len(h) for h in self._subscribers.values()),
             "patterns": list(self._subscribers.keys())
         }
 
 
+# Singleton instance
+_research_bus: Optional[ResearchBus] = None
+
+
+def get_research_bus() -> ResearchBus:
+    """Get or create research bus singleton"""
+    global _research_bus
+    if _research_bus is None:
+        _research_bus = ResearchBus()
+    return _research_bus
+
+
 class ResearchEventLogger:
     """
     Structured logger for research events.
@@ -365,7 +578,7 @@ class ResearchEventLogger:
     
     def __init__(self, plugin_name: str):
         self.plugin_name = plugin_name
-        self.bus = ResearchBus()
+        self.bus = get_research_bus()
     
     async def log_hypothesis_test(
         self,
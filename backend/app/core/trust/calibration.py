@@ -5,11 +5,26 @@ Track 1: Production-ready trust mechanisms
 """
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Optional, Any, Tuple
 from pydantic import BaseModel, Field, validator
 from enum import Enum
 import math
 
+import numpy as np
+from sqlalchemy import select, update, values, column, func, literal, String, Float, DateTime
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.trust import TrustCalibrationState
+
+# Trust dimensions in storage/array order, and their weights in overall trust
+DIMENSIONS = ("performance", "purpose", "process")
+DIMENSION_WEIGHTS = (0.5, 0.25, 0.25)  # Performance heavily weighted
+
+# Effective number of recent signals behind the volatility estimate
+VOLATILITY_WINDOW = 20
+
 
 class TrustDimension(str, Enum):
     """Dimensions of trust in automation"""
@@ -56,6 +71,8 @@ class TrustState(BaseModel):
     
     # Actual system reliability (if known)
     actual_reliability: Optional[float] = None
+    success_count: int = 0
+    total_count: int = 0
     
     # Calibration assessment
     calibration: CalibrationLevel = CalibrationLevel.CALIBRATED
@@ -63,6 +80,7 @@ class TrustState(BaseModel):
     
     # Trust dynamics
     trust_velocity: float = 0.0  # Rate of trust change
+    signal_mean: float = 0.0  # Recent average signal value
     volatility: float = 0.0  # How much trust fluctuates
     
     # History
@@ -80,6 +98,9 @@ class TrustCalibrator:
     """
     Implements Lee & See trust calibration framework
     Helps users maintain appropriate trust in AI systems
+    
+    The calibrator holds no per-component state: it maps a TrustState to
+    its successor, and TrustCalibrationService persists the result.
     """
     
     def __init__(self, 
@@ -97,46 +118,34 @@ class TrustCalibrator:
         self.initial_trust = initial_trust
         self.learning_rate = learning_rate
         self.decay_rate = decay_rate
-        
-        # Trust states for different components
-        self.trust_states: Dict[str, TrustState] = {}
-        
-        # Trust history for analysis
-        self.signal_history: Dict[str, List[TrustSignal]] = {}
     
-    def get_or_create_state(self, component_id: str) -> TrustState:
-        """Get or create trust state for a component"""
-        if component_id not in self.trust_states:
-            self.trust_states[component_id] = TrustState(
-                performance_trust=self.initial_trust,
-                purpose_trust=self.initial_trust,
-                process_trust=self.initial_trust,
-                overall_trust=self.initial_trust
-            )
-            self.signal_history[component_id] = []
-        return self.trust_states[component_id]
+    def new_state(self, now: Optional[datetime] = None) -> TrustState:
+        """Create the baseline trust state for a new component"""
+        return TrustState(
+            performance_trust=self.initial_trust,
+            purpose_trust=self.initial_trust,
+            process_trust=self.initial_trust,
+            overall_trust=self.initial_trust,
+            last_updated=now or datetime.now(timezone.utc)
+        )
     
     def add_trust_signal(
         self,
-        component_id: str,
+        state: TrustState,
         signal: TrustSignal
     ) -> TrustState:
         """
         Process a trust signal and update trust state
         
         Args:
-            component_id: ID of the component (e.g., "agent_engineer")
+            state: Current trust state of the component
             signal: Trust signal to process
             
         Returns:
-            Updated trust state
+            Updated trust state (a new object; state is not modified)
         """
-        state = self.get_or_create_state(component_id)
-        
-        # Store signal in history
-        if component_id not in self.signal_history:
-            self.signal_history[component_id] = []
-        self.signal_history[component_id].append(signal)
+        previous_update = state.last_updated
+        state = self.decayed(state, signal.timestamp)
         
         # Update relevant dimension
         old_trust = getattr(state, f"{signal.dimension.value}_trust")
@@ -149,25 +158,50 @@ class TrustCalibrator:
         # Update trust state
         setattr(state, f"{signal.dimension.value}_trust", new_trust)
         
-        # Update overall trust (weighted average)
-        state.overall_trust = (
-            state.performance_trust * 0.5 +  # Performance heavily weighted
-            state.purpose_trust * 0.25 +
-            state.process_trust * 0.25
-        )
-        
         # Calculate trust velocity
-        time_delta = (datetime.now(timezone.utc) - state.last_updated).total_seconds()
+        time_delta = (signal.timestamp - previous_update).total_seconds()
         if time_delta > 0:
             state.trust_velocity = (new_trust - old_trust) / time_delta
         
-        # Update volatility (standard deviation of recent signals)
-        recent_signals = self.signal_history[component_id][-20:]  # Last 20 signals
-        if len(recent_signals) > 1:
-            values = [s.value for s in recent_signals]
-            mean = sum(values) / len(values)
-            variance = sum((v - mean) ** 2 for v in values) / len(values)
-            state.volatility = math.sqrt(variance)
+        # Update volatility (exponentially weighted deviation of recent signals)
+        if state.signal_count == 0:
+            state.signal_mean = signal.value
+        else:
+            alpha = 2 / (VOLATILITY_WINDOW + 1)
+            deviation = signal.value - state.signal_mean
+            increment = alpha * deviation
+            state.signal_mean += increment
+            state.volatility = math.sqrt((1 - alpha) * (state.volatility ** 2 + deviation * increment))
+        
+        state.signal_count += 1
+        self._refresh(state)
+        
+        return state
+    
+    def record_operation(self, state: TrustState, success: bool) -> TrustState:
+        """
+        Count an operation outcome towards the component's actual reliability
+        
+        Args:
+            state: Trust state to update in place
+            success: Whether the operation succeeded
+            
+        Returns:
+            The updated trust state
+        """
+        state.total_count += 1
+        if success:
+            state.success_count += 1
+        state.actual_reliability = state.success_count / state.total_count
+        self._refresh(state)
+        return state
+    
+    def _refresh(self, state: TrustState) -> None:
+        """Recompute overall trust and calibration from the dimension trusts"""
+        state.overall_trust = sum(
+            getattr(state, f"{dimension}_trust") * weight
+            for dimension, weight in zip(DIMENSIONS, DIMENSION_WEIGHTS)
+        )
         
         # Update calibration if we have reliability data
         if state.actual_reliability is not None:
@@ -176,11 +210,6 @@ class TrustCalibrator:
                 state.overall_trust,
                 state.actual_reliability
             )
-        
-        state.signal_count += 1
-        state.last_updated = datetime.now(timezone.utc)
-        
-        return state
     
     def _assess_calibration(
         self,
@@ -212,52 +241,97 @@ class TrustCalibrator:
         else:
             return CalibrationLevel.UNDERTRUST
     
-    def decay_trust(self, component_id: str, time_elapsed: float) -> TrustState:
+    def decay_factor(self, time_elapsed: float) -> float:
+        """Fraction of the distance from baseline that remains after time_elapsed seconds"""
+        return math.exp(-self.decay_rate * max(time_elapsed, 0) / 3600)  # Per hour
+    
+    def decayed(self, state: TrustState, now: Optional[datetime] = None) -> TrustState:
         """
         Apply trust decay over time (trust returns to baseline without signals)
         
+        Decay is exponential, so one step over the whole elapsed time equals
+        any sequence of shorter steps; it is applied when a state is read
+        rather than by periodic sweeps.
+        
         Args:
-            component_id: Component ID
-            time_elapsed: Time since last update in seconds
+            state: Trust state as of state.last_updated
+            now: Time to decay to (defaults to the current time)
             
         Returns:
-            Updated trust state
+            Decayed trust state (a new object; state is not modified)
         """
-        state = self.get_or_create_state(component_id)
-        
-        # Apply exponential decay toward initial trust
-        decay_factor = math.exp(-self.decay_rate * time_elapsed / 3600)  # Per hour
+        now = now or datetime.now(timezone.utc)
+        decay_factor = self.decay_factor((now - state.last_updated).total_seconds())
+        
+        decayed = state.model_copy(update={
+            f"{dimension}_trust": self.initial_trust + (getattr(state, f"{dimension}_trust") - self.initial_trust) * decay_factor
+            for dimension in DIMENSIONS
+        })
+        decayed.last_updated = max(now, state.last_updated)
+        self._refresh(decayed)
+        return decayed
+    
+    def recalibrate(
+        self,
+        trust: np.ndarray,
+        time_elapsed: np.ndarray,
+        success_count: np.ndarray,
+        total_count: np.ndarray,
+        threshold: float = 0.15
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decay and reassess many components at once
         
-        for dimension in ["performance", "purpose", "process"]:
-            current = getattr(state, f"{dimension}_trust")
-            decayed = self.initial_trust + (current - self.initial_trust) * decay_factor
-            setattr(state, f"{dimension}_trust", decayed)
+        Vectorized counterpart of decayed() for bulk recalibration.
         
-        # Update overall trust
-        state.overall_trust = (
-            state.performance_trust * 0.5 +
-            state.purpose_trust * 0.25 +
-            state.process_trust * 0.25
+        Args:
+            trust: (n, 3) dimension trusts in DIMENSIONS order
+            time_elapsed: (n,) seconds since each state was last updated
+            success_count: (n,) successful operations per component
+            total_count: (n,) total operations per component
+            threshold: Acceptable calibration gap
+            
+        Returns:
+            Tuple of (decayed trusts, overall trust, calibration gap, calibration level values)
+        """
+        decay_factor = np.exp(-self.decay_rate * np.maximum(time_elapsed, 0) / 3600)
+        trust = self.initial_trust + (trust - self.initial_trust) * decay_factor[:, np.newaxis]
+        overall = trust @ np.asarray(DIMENSION_WEIGHTS)
+        
+        # Same rules as _assess_calibration; components without reliability
+        # data keep the default level
+        known = total_count > 0
+        reliability = np.divide(success_count, total_count, out=np.zeros_like(overall), where=known)
+        gap = np.where(known, overall - reliability, 0.0)
+        calibration = np.select(
+            [~known, overall < 0.2, overall > 0.9, np.abs(gap) <= threshold, gap > threshold],
+            [
+                CalibrationLevel.CALIBRATED.value,
+                CalibrationLevel.DISTRUST.value,
+                CalibrationLevel.BLIND_TRUST.value,
+                CalibrationLevel.CALIBRATED.value,
+                CalibrationLevel.OVERTRUST.value,
+            ],
+            default=CalibrationLevel.UNDERTRUST.value
         )
         
-        state.last_updated = datetime.now(timezone.utc)
-        return state
+        return trust, overall, gap, calibration
     
     def get_trust_recommendation(
         self,
-        component_id: str
+        component_id: str,
+        state: TrustState
     ) -> Dict[str, Any]:
         """
         Get trust recommendation for user
         
         Args:
             component_id: Component ID
+            state: Current trust state of the component
             
         Returns:
             Trust recommendation with explanation
         """
-        state = self.get_or_create_state(component_id)
-        
         recommendations = []
         
         # Check calibration
@@ -330,7 +404,6 @@ class TrustCalibrator:
     
     def calculate_system_reliability(
         self,
-        component_id: str,
         success_count: int,
         total_count: int,
         confidence_level: float = 0.95
@@ -339,7 +412,6 @@ class TrustCalibrator:
         Calculate system reliability with confidence interval
         
         Args:
-            component_id: Component ID
             success_count: Number of successful operations
             total_count: Total number of operations
             confidence_level: Confidence level for interval
@@ -366,24 +438,96 @@ class TrustCalibrator:
         lower = max(0, center - margin)
         upper = min(1, center + margin)
         
-        # Update trust state with reliability
-        state = self.get_or_create_state(component_id)
-        state.actual_reliability = reliability
-        state.calibration_gap = state.overall_trust - reliability
-        state.calibration = self._assess_calibration(state.overall_trust, reliability)
-        
         return reliability, (lower, upper)
 
 
 # Service layer for trust calibration
 class TrustCalibrationService:
-    """Service for managing trust calibration"""
+    """
+    Service for managing trust calibration
+    
+    State lives in the trust_calibration_states table, one row per
+    component, so it survives restarts and is shared across replicas.
+    Reads are a single primary-key lookup with decay applied on the fly.
+    """
+    
+    def __init__(self, db: AsyncSession, calibrator: Optional[TrustCalibrator] = None):
+        self.db = db
+        self.calibrator = calibrator or TrustCalibrator()
+    
+    def _to_state(self, row: TrustCalibrationState) -> TrustState:
+        """Build the trust state stored in a row, as of its last update"""
+        state = TrustState(
+            performance_trust=row.performance_trust,
+            purpose_trust=row.purpose_trust,
+            process_trust=row.process_trust,
+            actual_reliability=row.success_count / row.total_count if row.total_count else None,
+            success_count=row.success_count,
+            total_count=row.total_count,
+            calibration=row.calibration,
+            calibration_gap=row.calibration_gap,
+            trust_velocity=row.trust_velocity,
+            signal_mean=row.signal_mean,
+            volatility=row.volatility,
+            signal_count=row.signal_count,
+            last_updated=row.last_updated
+        )
+        self.calibrator._refresh(state)
+        return state
+    
+    @staticmethod
+    def _to_columns(state: TrustState) -> Dict[str, Any]:
+        """Map a trust state to trust_calibration_states columns"""
+        return {
+            "performance_trust": state.performance_trust,
+            "purpose_trust": state.purpose_trust,
+            "process_trust": state.process_trust,
+            "success_count": state.success_count,
+            "total_count": state.total_count,
+            "calibration": state.calibration.value,
+            "calibration_gap": state.calibration_gap,
+            "trust_velocity": state.trust_velocity,
+            "signal_mean": state.signal_mean,
+            "volatility": state.volatility,
+            "signal_count": state.signal_count,
+            "last_updated": state.last_updated
+        }
+    
+    async def _lock_state(self, component_id: str) -> TrustCalibrationState:
+        """Load a component's state row for update, creating it if missing"""
+        row = await self.db.get(
+            TrustCalibrationState, component_id, with_for_update=True, populate_existing=True
+        )
+        if row is None:
+            # Concurrent first writers race on the insert, not on the update
+            await self.db.execute(
+                insert(TrustCalibrationState)
+                .values(component_id=component_id, **self._to_columns(self.calibrator.new_state()))
+                .on_conflict_do_nothing(index_elements=[TrustCalibrationState.component_id])
+            )
+            row = await self.db.get(
+                TrustCalibrationState, component_id, with_for_update=True, populate_existing=True
+            )
+        return row
     
-    def __init__(self):
-        self.calibrator = TrustCalibrator()
+    async def _record(
+        self,
+        component_id: str,
+        signal: TrustSignal,
+        success: Optional[bool] = None
+    ) -> TrustState:
+        """Apply a signal (and optionally an operation outcome) and persist the result"""
+        row = await self._lock_state(component_id)
+        
+        state = self.calibrator.add_trust_signal(self._to_state(row), signal)
+        if success is not None:
+            self.calibrator.record_operation(state, success)
+        
+        for key, value in self._to_columns(state).items():
+            setattr(row, key, value)
+        await self.db.commit()
         
-        # Track success/failure for reliability calculation
-        self.operation_counts: Dict[str, Dict[str, int]] = {}
+        return state
     
     async def record_success(
         self,
@@ -392,12 +536,6 @@ class TrustCalibrationService:
     ) -> TrustState:
         """Record a successful operation"""
         
-        # Track for reliability
-        if component_id not in self.operation_counts:
-            self.operation_counts[component_id] = {"success": 0, "total": 0}
-        self.operation_counts[component_id]["success"] += 1
-        self.operation_counts[component_id]["total"] += 1
-        
         # Create positive trust signal
         signal = TrustSignal(
             dimension=dimension,
@@ -406,7 +544,7 @@ class TrustCalibrationService:
             context={"operation": "success"}
         )
         
-        return self.calibrator.add_trust_signal(component_id, signal)
+        return await self._record(component_id, signal, success=True)
     
     async def record_failure(
         self,
@@ -416,11 +554,6 @@ class TrustCalibrationService:
     ) -> TrustState:
         """Record a failed operation"""
         
-        # Track for reliability
-        if component_id not in self.operation_counts:
-            self.operation_counts[component_id] = {"success": 0, "total": 0}
-        self.operation_counts[component_id]["total"] += 1
-        
         # Create negative trust signal
         signal = TrustSignal(
             dimension=dimension,
@@ -429,7 +562,7 @@ class TrustCalibrationService:
             context={"operation": "failure", "severity": severity}
         )
         
-        return self.calibrator.add_trust_signal(component_id, signal)
+        return await self._record(component_id, signal, success=False)
     
     async def record_explanation(
         self,
@@ -446,11 +579,18 @@ class TrustCalibrationService:
             context={"explanation_quality": quality}
         )
         
-        return self.calibrator.add_trust_signal(component_id, signal)
+        return await self._record(component_id, signal)
     
-    async def get_trust_state(self, component_id: str) -> TrustState:
+    async def get_trust_state(
+        self,
+        component_id: str,
+        now: Optional[datetime] = None
+    ) -> TrustState:
         """Get current trust state for a component"""
-        return self.calibrator.get_or_create_state(component_id)
+        row = await self.db.get(TrustCalibrationState, component_id)
+        if row is None:
+            return self.calibrator.new_state(now)
+        return self.calibrator.decayed(self._to_state(row), now)
     
     async def get_reliability(
         self,
@@ -458,19 +598,100 @@ class TrustCalibrationService:
     ) -> Optional[Tuple[float, Tuple[float, float]]]:
         """Get calculated reliability for a component"""
         
-        if component_id not in self.operation_counts:
-            return None
-        
-        counts = self.operation_counts[component_id]
-        if counts["total"] == 0:
+        row = await self.db.get(TrustCalibrationState, component_id)
+        if row is None or row.total_count == 0:
             return None
         
         return self.calibrator.calculate_system_reliability(
-            component_id,
-            counts["success"],
-            counts["total"]
+            row.success_count,
+            row.total_count
         )
     
     async def get_recommendations(self, component_id: str) -> Dict[str, Any]:
         """Get trust recommendations for a component"""
-        return self.calibrator.get_trust_recommendation(component_id)
\ No newline at end of file
+        state = await self.get_trust_state(component_id)
+        return self.calibrator.get_trust_recommendation(component_id, state)
+    
+    async def recalibrate_all(
+        self,
+        now: Optional[datetime] = None,
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Fold decay into every stored state and reassess its calibration
+        
+        Reads never need this (decay is applied on read); it keeps the
+        stored calibration columns current for queries over components.
+        Components are processed in primary-key order, one batch per
+        transaction, skipping rows locked by concurrent writers.
+        
+        Args:
+            now: Time to recalibrate to (defaults to the current time)
+            batch_size: Components per transaction
+            
+        Returns:
+            Number of components recalibrated
+        """
+        now = now or datetime.now(timezone.utc)
+        batch_size = batch_size or settings.TRUST_RECALIBRATION_BATCH_SIZE
+        now_value = literal(now, DateTime(timezone=True))
+        
+        recalibrated_count = 0
+        last_component_id = None
+        while True:
+            query = (
+                select(
+                    TrustCalibrationState.component_id,
+                    TrustCalibrationState.performance_trust,
+                    TrustCalibrationState.purpose_trust,
+                    TrustCalibrationState.process_trust,
+                    TrustCalibrationState.success_count,
+                    TrustCalibrationState.total_count,
+                    func.extract('epoch', now_value - TrustCalibrationState.last_updated)
+                )
+                .order_by(TrustCalibrationState.component_id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            if last_component_id is not None:
+                query = query.where(TrustCalibrationState.component_id > last_component_id)
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                break
+            
+            component_ids = [row[0] for row in rows]
+            data = np.array([row[1:] for row in rows], dtype=float)
+            trust, _, gap, calibration = self.calibrator.recalibrate(
+                data[:, 0:3], data[:, 5], data[:, 3], data[:, 4]
+            )
+            
+            recalibrated = values(
+                column('component_id', String),
+                column('performance_trust', Float),
+                column('purpose_trust', Float),
+                column('process_trust', Float),
+                column('calibration', String),
+                column('calibration_gap', Float),
+                name='recalibrated'
+            ).data(list(zip(component_ids, *trust.T.tolist(), calibration.tolist(), gap.tolist())))
+            await self.db.execute(
+                update(TrustCalibrationState)
+                .where(TrustCalibrationState.component_id == recalibrated.c.component_id)
+                .values(
+                    performance_trust=recalibrated.c.performance_trust,
+                    purpose_trust=recalibrated.c.purpose_trust,
+                    process_trust=recalibrated.c.process_trust,
+                    calibration=recalibrated.c.calibration,
+                    calibration_gap=recalibrated.c.calibration_gap,
+                    last_updated=func.greatest(TrustCalibrationState.last_updated, now_value)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+            
+            recalibrated_count += len(rows)
+            last_component_id = component_ids[-1]
+            if len(rows) < batch_size:
+                break
+        
+        return recalibrated_count
@@ -12,12 +12,13 @@ from typing import Generator, Optional
 import psycopg2
 from psycopg2.extras import DictCursor
 from psycopg2.pool import ThreadedConnectionPool
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.db.instrumentation import setup_engine_events
 
 logger = get_logger(__name__)
 
@@ -188,30 +189,6 @@ def close_connection_pool() -> None:
         logger.info("Connection pool closed")
 
 
-def setup_engine_events(engine: Engine) -> None:
-    """
-    Set up SQLAlchemy engine events for monitoring and debugging.
-    
-    Args:
-        engine: The SQLAlchemy engine
-    """
-    @event.listens_for(engine, "before_cursor_execute")
-    def before_cursor_execute(
-        conn, cursor, statement, parameters, context, executemany
-    ):
-        conn.info.setdefault("query_start_time", []).append(time.time())
-        if settings.APP_DEBUG:
-            logger.debug(f"Executing query: {statement}")
-    
-    @event.listens_for(engine, "after_cursor_execute")
-    def after_cursor_execute(
-        conn, cursor, statement, parameters, context, executemany
-    ):
-        total_time = time.time() - conn.info["query_start_time"].pop()
-        if settings.APP_DEBUG:
-            logger.debug(f"Query executed in {total_time:.4f}s")
-
-
 def get_engine(connection_string: Optional[str] = None) -> Engine:
     """
     Create a SQLAlchemy engine with appropriate configuration.
@@ -226,11 +203,11 @@ def get_engine(connection_string: Optional[str] = None) -> Engine:
     
     engine = create_engine(
         connection_string,
-        pool_pre_ping=True,  # Detect and recover from disconnects
-        pool_size=5,  # Number of connections to keep open
-        max_overflow=10,  # Maximum number of connections above pool_size
-        pool_timeout=30,  # Timeout for getting a connection from the pool
-        pool_recycle=1800,  # Recycle connections after 30 minutes
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # Detect and recover from disconnects
+        pool_size=settings.DB_POOL_SIZE,  # Number of connections to keep open
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Maximum number of connections above pool_size
+        pool_timeout=settings.DB_POOL_TIMEOUT,  # Timeout for getting a connection from the pool
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections after this many seconds
         echo=settings.APP_DEBUG,  # Log SQL if in debug mode
     )
     
@@ -0,0 +1,193 @@
+"""
+Database Query Instrumentation
+
+This module times every statement executed through instrumented engines,
+accounts queries to the request that issued them, logs slow queries by
+normalized statement fingerprint and, in development, warns when a
+request repeats one statement often enough to suggest an N+1 pattern.
+"""
+
+import hashlib
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+slow_query_logger = get_logger("app.db.slow_query")
+
+# Literal and placeholder patterns replaced when fingerprinting a statement
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:\s*,\s*\1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    """Queries executed while handling one request."""
+    path: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+
+# Statistics of the request being handled, set by QueryMetricsMiddleware
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+# Process-wide totals
+_metrics: Dict[str, float] = {
+    "requests": 0,
+    "queries": 0,
+    "query_time_ms": 0.0,
+    "max_queries_per_request": 0,
+    "slow_queries": 0,
+    "n_plus_one_warnings": 0,
+}
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """
+    Normalize a statement so that executions differing only in values match.
+    
+    Literals and bind placeholders become "?", lists of placeholders (as
+    produced by expanding IN parameters) collapse to "(?+)" and repeated
+    VALUES rows to a single row.
+    
+    Args:
+        statement: SQL statement
+    
+    Returns:
+        Tuple of (normalized statement, short hex digest)
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    normalized = _REPEATED_ROWS.sub(r"\1, ...", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?+)", normalized)
+    digest = hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest()
+    return normalized, digest
+
+
+def begin_request(path: str = "") -> QueryStats:
+    """
+    Start accounting queries to the current request.
+    
+    Args:
+        path: Request path, for N+1 warnings
+    
+    Returns:
+        Statistics that fill in as the request runs queries
+    """
+    stats = QueryStats(path=path)
+    _request_stats.set(stats)
+    return stats
+
+
+def end_request(stats: QueryStats) -> None:
+    """Add a finished request's statistics to the process totals."""
+    _request_stats.set(None)
+    _metrics["requests"] += 1
+    _metrics["max_queries_per_request"] = max(_metrics["max_queries_per_request"], stats.count)
+
+
+def record_query(statement: str, duration_ms: float) -> None:
+    """
+    Account one executed statement.
+    
+    Args:
+        statement: SQL statement as sent to the database
+        duration_ms: Execution time in milliseconds
+    """
+    _metrics["queries"] += 1
+    _metrics["query_time_ms"] += duration_ms
+    
+    if duration_ms >= settings.DB_SLOW_QUERY_MS:
+        _metrics["slow_queries"] += 1
+        normalized, digest = fingerprint(statement)
+        slow_query_logger.warning(
+            "Slow query",
+            extra={
+                "fingerprint": digest,
+                "duration_ms": round(duration_ms, 2),
+                "statement": normalized,
+            }
+        )
+    
+    stats = _request_stats.get()
+    if stats is None:
+        return
+    
+    stats.count += 1
+    stats.total_ms += duration_ms
+    
+    if settings.APP_ENV == "development":
+        normalized, digest = fingerprint(statement)
+        stats.fingerprints[digest] += 1
+        if stats.fingerprints[digest] == settings.DB_N_PLUS_ONE_THRESHOLD:
+            _metrics["n_plus_one_warnings"] += 1
+            logger.warning(
+                "Possible N+1 query",
+                extra={
+                    "path": stats.path,
+                    "fingerprint": digest,
+                    "repeats": settings.DB_N_PLUS_ONE_THRESHOLD,
+                    "statement": normalized,
+                }
+            )
+
+
+def get_query_metrics() -> Dict[str, Any]:
+    """Get process-wide query metrics."""
+    requests = _metrics["requests"]
+    return {
+        **_metrics,
+        "avg_queries_per_request": _metrics["queries"] / requests if requests else 0.0,
+    }
+
+
+def setup_engine_events(engine: Engine) -> None:
+    """
+    Set up SQLAlchemy engine events for monitoring and debugging.
+    
+    For an AsyncEngine, pass its sync_engine.
+    
+    Args:
+        engine: The SQLAlchemy engine
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+        if settings.APP_DEBUG:
+            logger.debug(f"Executing query: {statement}")
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        total_time = time.perf_counter() - conn.info["query_start_time"].pop()
+        record_query(statement, total_time * 1000)
+        if settings.APP_DEBUG:
+            logger.debug(f"Query executed in {total_time:.4f}s")
+    
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start_time"):
+            connection.info["query_start_time"].pop()
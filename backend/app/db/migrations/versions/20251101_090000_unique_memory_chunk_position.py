@@ -0,0 +1,48 @@
+"""unique_memory_chunk_position
+
+Revision ID: 3b8e2f1a9c47
+Revises: 69c253fe9879
+Create Date: 2025-11-01 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e2f1a9c47'
+down_revision: Union[str, None] = '69c253fe9879'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bulk ingestion merges chunks with ON CONFLICT (memory_id, chunk_index),
+    # which needs a unique index. Drop stale duplicates first, keeping the newest row.
+    op.execute("""
+        DELETE FROM memory_chunks a
+        USING memory_chunks b
+        WHERE a.memory_id = b.memory_id
+          AND a.chunk_index = b.chunk_index
+          AND a.ctid < b.ctid
+    """)
+    op.drop_index('ix_memory_chunks_memory_id_chunk_index', table_name='memory_chunks')
+    op.create_index(
+        'ix_memory_chunks_memory_id_chunk_index',
+        'memory_chunks',
+        ['memory_id', 'chunk_index'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_memory_chunks_memory_id_chunk_index', table_name='memory_chunks')
+    op.create_index(
+        'ix_memory_chunks_memory_id_chunk_index',
+        'memory_chunks',
+        ['memory_id', 'chunk_index'],
+        unique=False
+    )
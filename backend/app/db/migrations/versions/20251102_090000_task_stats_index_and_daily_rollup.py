@@ -0,0 +1,62 @@
+"""task_stats_index_and_daily_rollup
+
+Revision ID: 5d1c7a3e9b20
+Revises: 3b8e2f1a9c47
+Create Date: 2025-11-02 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c7a3e9b20'
+down_revision: Union[str, None] = '3b8e2f1a9c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Covering index for GET /tasks/stats: the per-user aggregate only reads
+    # these columns, so it can be answered with an index-only scan
+    op.create_index(
+        'ix_tasks_user_id_status_stats',
+        'tasks',
+        ['user_id', 'status'],
+        postgresql_include=[
+            'priority', 'quest_type', 'due_date', 'completed_at',
+            'estimated_duration_minutes', 'actual_duration_minutes',
+            'difficulty', 'experience_points',
+        ]
+    )
+
+    op.create_table(
+        'task_daily_stats',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('completed_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('experience_points', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.UniqueConstraint('user_id', 'day', name='uq_task_daily_stats_user_id_day')
+    )
+
+    # Backfill the rollup from tasks completed so far
+    op.execute("""
+        INSERT INTO task_daily_stats (user_id, day, completed_count, experience_points)
+        SELECT user_id, CAST(completed_at AS date), count(*), coalesce(sum(experience_points), 0)
+        FROM tasks
+        WHERE status = 'completed' AND completed_at IS NOT NULL
+        GROUP BY user_id, CAST(completed_at AS date)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_daily_stats')
+    op.drop_index('ix_tasks_user_id_status_stats', table_name='tasks')
@@ -0,0 +1,48 @@
+"""recurrence_horizon
+
+Revision ID: 8a4f2c6d1e73
+Revises: 5d1c7a3e9b20
+Create Date: 2025-11-03 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f2c6d1e73'
+down_revision: Union[str, None] = '5d1c7a3e9b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('occurrence_date', sa.DateTime(), nullable=True))
+    # Recurring instances are inserted with ON CONFLICT DO NOTHING on this
+    # index, which makes materializing an occurrence twice a no-op
+    op.create_index(
+        'uq_tasks_recurring_parent_id_occurrence_date',
+        'tasks',
+        ['recurring_parent_id', 'occurrence_date'],
+        unique=True,
+        postgresql_where=sa.text('recurring_parent_id IS NOT NULL')
+    )
+
+    op.add_column('task_schedules', sa.Column('recurrence_generated_until', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_task_schedules_recurrence_generated_until',
+        'task_schedules',
+        ['recurrence_generated_until'],
+        postgresql_where=sa.text('recurrence_pattern IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_schedules_recurrence_generated_until', table_name='task_schedules')
+    op.drop_column('task_schedules', 'recurrence_generated_until')
+    op.drop_index('uq_tasks_recurring_parent_id_occurrence_date', table_name='tasks')
+    op.drop_column('tasks', 'occurrence_date')
@@ -0,0 +1,75 @@
+"""task_reminders
+
+Revision ID: c2e7b4a9f160
+Revises: 8a4f2c6d1e73
+Create Date: 2025-11-04 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7b4a9f160'
+down_revision: Union[str, None] = '8a4f2c6d1e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_reminders',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('remind_at', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+    )
+    # Due-time index: each dispatch tick only reads reminders whose time has come
+    op.create_index(
+        'ix_task_reminders_pending_remind_at',
+        'task_reminders',
+        ['remind_at'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+    op.create_index('ix_task_reminders_task_id', 'task_reminders', ['task_id'])
+
+    # Backfill the reminders of pending tasks due in the future, with the
+    # offsets of REMINDER_OFFSETS in app/services/task/reminder_scheduler.py
+    op.execute("""
+        INSERT INTO task_reminders (task_id, user_id, remind_at)
+        SELECT t.id, t.user_id, t.due_date - o.offset_interval
+        FROM tasks t
+        JOIN (VALUES
+            ('urgent', interval '2 days'), ('urgent', interval '1 day'),
+            ('urgent', interval '4 hours'), ('urgent', interval '1 hour'),
+            ('high', interval '2 days'), ('high', interval '1 day'),
+            ('high', interval '4 hours'), ('high', interval '1 hour'),
+            ('medium', interval '1 day'), ('medium', interval '4 hours'),
+            ('low', interval '1 day')
+        ) AS o (priority, offset_interval) ON o.priority = lower(t.priority::text)
+        WHERE t.status = 'pending'
+          AND t.due_date - o.offset_interval > (now() AT TIME ZONE 'utc')
+    """)
+    # Tasks due too soon for any regular reminder get one right away
+    op.execute("""
+        INSERT INTO task_reminders (task_id, user_id, remind_at)
+        SELECT t.id, t.user_id, (now() AT TIME ZONE 'utc')
+        FROM tasks t
+        WHERE t.status = 'pending'
+          AND t.due_date > (now() AT TIME ZONE 'utc')
+          AND NOT EXISTS (SELECT 1 FROM task_reminders r WHERE r.task_id = t.id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('task_reminders')
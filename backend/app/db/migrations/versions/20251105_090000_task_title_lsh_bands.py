@@ -0,0 +1,56 @@
+"""task_title_lsh_bands
+
+Revision ID: 4f9d1b6e2a85
+Revises: c2e7b4a9f160
+Create Date: 2025-11-05 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.minhash import text_bands
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f9d1b6e2a85'
+down_revision: Union[str, None] = 'c2e7b4a9f160'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('title_lsh_bands', postgresql.ARRAY(sa.BigInteger()), nullable=True))
+
+    # Backfill band keys of existing titles; they are computed in Python
+    # (app.utils.minhash), so walk the table in keyset batches
+    bind = op.get_bind()
+    update = sa.text("UPDATE tasks SET title_lsh_bands = :bands WHERE id = :id").bindparams(
+        sa.bindparam('bands', type_=postgresql.ARRAY(sa.BigInteger()))
+    )
+    last_id = None
+    while True:
+        params = {'limit': BACKFILL_BATCH_SIZE}
+        query = "SELECT id, title FROM tasks"
+        if last_id is not None:
+            query += " WHERE id > :last_id"
+            params['last_id'] = last_id
+        query += " ORDER BY id LIMIT :limit"
+        rows = bind.execute(sa.text(query), params).all()
+        if not rows:
+            break
+        bind.execute(update, [{'id': task_id, 'bands': text_bands(title)} for task_id, title in rows])
+        last_id = rows[-1][0]
+
+    op.create_index('ix_tasks_title_lsh_bands', 'tasks', ['title_lsh_bands'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_title_lsh_bands', table_name='tasks')
+    op.drop_column('tasks', 'title_lsh_bands')
@@ -0,0 +1,47 @@
+"""negotiation_deadline_indexes
+
+Revision ID: 7b3e5a1c9d24
+Revises: 4f9d1b6e2a85
+Create Date: 2025-11-06 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e5a1c9d24'
+down_revision: Union[str, None] = '4f9d1b6e2a85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only negotiations that can still time out are indexed; the predicates
+    # must match NEGOTIATION_DEADLINE_PENDING / FINALIZATION_DEADLINE_PENDING
+    # in app/db/models/negotiation.py
+    op.create_index(
+        'ix_negotiations_negotiation_deadline_pending',
+        'negotiations',
+        ['negotiation_deadline'],
+        postgresql_where=sa.text("status IN ('INITIATED', 'NEGOTIATING')")
+    )
+    op.create_index(
+        'ix_negotiations_finalization_deadline_pending',
+        'negotiations',
+        ['finalization_deadline'],
+        postgresql_where=sa.text("status = 'CONSENSUS_REACHED'")
+    )
+
+    op.execute("ALTER TYPE receipttype ADD VALUE IF NOT EXISTS 'NEGOTIATION_EXPIRED'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Note: NEGOTIATION_EXPIRED stays in the receipttype enum (PostgreSQL
+    # cannot drop enum values)
+    op.drop_index('ix_negotiations_finalization_deadline_pending', table_name='negotiations')
+    op.drop_index('ix_negotiations_negotiation_deadline_pending', table_name='negotiations')
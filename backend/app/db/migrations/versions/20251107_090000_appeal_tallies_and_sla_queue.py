@@ -0,0 +1,62 @@
+"""appeal_tallies_and_sla_queue
+
+Revision ID: e1a6c3f8b592
+Revises: 7b3e5a1c9d24
+Create Date: 2025-11-07 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a6c3f8b592'
+down_revision: Union[str, None] = '7b3e5a1c9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('appeals', sa.Column('uphold_votes', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('appeals', sa.Column('overturn_votes', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('appeals', sa.Column('sla_breached_at', sa.DateTime(), nullable=True))
+
+    # Backfill tallies from the votes recorded so far
+    op.execute("""
+        UPDATE appeals SET
+            uphold_votes = (
+                SELECT count(*) FROM json_each(appeal_metadata -> 'votes') AS v
+                WHERE v.value ->> 'vote' = 'uphold'
+            ),
+            overturn_votes = (
+                SELECT count(*) FROM json_each(appeal_metadata -> 'votes') AS v
+                WHERE v.value ->> 'vote' = 'overturn'
+            )
+        WHERE json_typeof(appeal_metadata -> 'votes') = 'object'
+    """)
+
+    # The predicates must match APPEAL_UNDER_REVIEW in app/db/models/trust.py
+    op.create_index(
+        'ix_appeals_review_deadline_under_review',
+        'appeals',
+        ['review_deadline'],
+        postgresql_where=sa.text("status IN ('PENDING', 'REVIEWING')")
+    )
+    op.create_index(
+        'ix_appeals_review_deadline_sla_queue',
+        'appeals',
+        ['review_deadline'],
+        postgresql_where=sa.text("status IN ('PENDING', 'REVIEWING') AND sla_breached_at IS NULL")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_appeals_review_deadline_sla_queue', table_name='appeals')
+    op.drop_index('ix_appeals_review_deadline_under_review', table_name='appeals')
+    op.drop_column('appeals', 'sla_breached_at')
+    op.drop_column('appeals', 'overturn_votes')
+    op.drop_column('appeals', 'uphold_votes')
@@ -0,0 +1,44 @@
+"""trust_calibration_states
+
+Revision ID: 9c2d7e4f1a36
+Revises: e1a6c3f8b592
+Create Date: 2025-11-08 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2d7e4f1a36'
+down_revision: Union[str, None] = 'e1a6c3f8b592'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'trust_calibration_states',
+        sa.Column('component_id', sa.String(length=255), nullable=False),
+        sa.Column('performance_trust', sa.Float(), nullable=False),
+        sa.Column('purpose_trust', sa.Float(), nullable=False),
+        sa.Column('process_trust', sa.Float(), nullable=False),
+        sa.Column('success_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('calibration', sa.String(length=20), nullable=False, server_default='calibrated'),
+        sa.Column('calibration_gap', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('trust_velocity', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('signal_mean', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('volatility', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('signal_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_updated', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('component_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('trust_calibration_states')
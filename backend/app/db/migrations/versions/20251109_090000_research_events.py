@@ -0,0 +1,46 @@
+"""research_events
+
+Revision ID: 3e8a5b1d7c49
+Revises: 9c2d7e4f1a36
+Create Date: 2025-11-09 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8a5b1d7c49'
+down_revision: Union[str, None] = '9c2d7e4f1a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'research_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('event_type', sa.String(length=255), nullable=False),
+        sa.Column('plugin', sa.String(length=255), nullable=True),
+        sa.Column('priority', sa.String(length=20), nullable=False),
+        sa.Column('anonymization_level', sa.String(length=20), nullable=False),
+        sa.Column('schema_version', sa.String(length=20), nullable=False),
+        sa.Column('user_hash', sa.String(length=16), nullable=True),
+        sa.Column('consent_verified', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('data', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_research_events_created_at', 'research_events', ['created_at'], postgresql_using='brin')
+    op.create_index('ix_research_events_event_type_created_at', 'research_events', ['event_type', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_research_events_event_type_created_at', table_name='research_events')
+    op.drop_index('ix_research_events_created_at', table_name='research_events')
+    op.drop_table('research_events')
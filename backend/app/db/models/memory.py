@@ -105,7 +105,7 @@ class MemoryChunk(BaseModel):
     # Indexes for performance
     __table_args__ = (
         Index("ix_memory_chunks_memory_id", "memory_id"),
-        Index("ix_memory_chunks_memory_id_chunk_index", "memory_id", "chunk_index"),
+        Index("ix_memory_chunks_memory_id_chunk_index", "memory_id", "chunk_index", unique=True),
         # Additional indexes will be added for pgvector
     )
     
@@ -8,7 +8,7 @@ Core of the "Trust Without Central Authority" primitive demonstration.
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from uuid import uuid4
-from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey, Enum, Integer, Float
+from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey, Enum, Integer, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from app.db.session import Base
@@ -26,6 +26,13 @@ class NegotiationStatus(str, enum.Enum):
     DISPUTED = "disputed"                # Party contests binding agreement
 
 
+# Negotiations whose deadlines can still pass. Kept as SQL literals so the
+# partial deadline indexes and the timeout queries use identical predicates
+# (a partial index is only usable when the query implies its WHERE clause)
+NEGOTIATION_DEADLINE_PENDING = "status IN ('INITIATED', 'NEGOTIATING')"
+FINALIZATION_DEADLINE_PENDING = "status = 'CONSENSUS_REACHED'"
+
+
 class NegotiationMessageType(str, enum.Enum):
     """Types of messages in a negotiation."""
     INITIATE = "initiate"                # Start negotiation with proposal
@@ -96,6 +103,20 @@ class Negotiation(Base):
     initiator = relationship("User", foreign_keys=[initiator_id], backref="negotiations_initiated")
     messages = relationship("NegotiationMessage", back_populates="negotiation", order_by="NegotiationMessage.created_at")
 
+    # Deadline indexes: only negotiations that can still time out (see NegotiationService.check_timeouts)
+    __table_args__ = (
+        Index(
+            "ix_negotiations_negotiation_deadline_pending",
+            "negotiation_deadline",
+            postgresql_where=text(NEGOTIATION_DEADLINE_PENDING),
+        ),
+        Index(
+            "ix_negotiations_finalization_deadline_pending",
+            "finalization_deadline",
+            postgresql_where=text(FINALIZATION_DEADLINE_PENDING),
+        ),
+    )
+
 
 class NegotiationMessage(Base):
     """
@@ -62,6 +62,7 @@ class ReceiptType(str, enum.Enum):
     NEGOTIATION_BINDING = "negotiation_binding"
     NEGOTIATION_WITHDRAWN = "negotiation_withdrawn"
     NEGOTIATION_DISPUTED = "negotiation_disputed"
+    NEGOTIATION_EXPIRED = "negotiation_expired"
 
     # Consent operations
     CONSENT_GIVEN = "consent_given"
@@ -0,0 +1,37 @@
+"""Research event models for the Mnemosyne application."""
+from sqlalchemy import Column, String, DateTime, Boolean, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.session import Base
+
+
+class ResearchEvent(Base):
+    """
+    An anonymized event published on the research bus.
+    
+    The table is append-only: rows are bulk-loaded with COPY by
+    ResearchEventStore and never updated.
+    """
+    
+    __tablename__ = "research_events"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+    event_type = Column(String(255), nullable=False)
+    plugin = Column(String(255), nullable=True)
+    priority = Column(String(20), nullable=False)
+    anonymization_level = Column(String(20), nullable=False)
+    schema_version = Column(String(20), nullable=False)
+    user_hash = Column(String(16), nullable=True)
+    consent_verified = Column(Boolean, nullable=False, default=False)
+    data = Column(JSON, nullable=False)
+    
+    __table_args__ = (
+        # Rows arrive in time order, so a BRIN index stays tiny
+        Index("ix_research_events_created_at", "created_at", postgresql_using="brin"),
+        Index("ix_research_events_event_type_created_at", "event_type", "created_at"),
+    )
+    
+    def __repr__(self) -> str:
+        """Return string representation of the research event."""
+        return f"<ResearchEvent(id={self.id}, event_type={self.event_type}, created_at={self.created_at})>"
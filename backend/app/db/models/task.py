@@ -10,20 +10,24 @@ from sqlalchemy import (
     Column,
     String,
     Integer,
+    BigInteger,
     Float,
+    Date,
     DateTime,
     ForeignKey,
     Text,
     Boolean,
     JSON,
     Index,
-    Enum
+    Enum,
+    UniqueConstraint
 )
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import enum
 
 from app.db.base_model import BaseModel
+from app.utils.minhash import text_bands
 
 
 class TaskStatus(str, enum.Enum):
@@ -67,6 +71,12 @@ class Task(BaseModel):
     # Core task fields
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
+    # MinHash LSH band keys of the title, for duplicate lookups (see TaskSimilarityIndex)
+    title_lsh_bands = Column(
+        ARRAY(BigInteger),
+        default=lambda context: text_bands(context.get_current_parameters().get("title")),
+        nullable=True
+    )
     description = Column(Text, nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.PENDING, nullable=False)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
@@ -103,6 +113,7 @@ class Task(BaseModel):
     is_recurring = Column(Boolean, default=False, nullable=False)
     recurrence_rule = Column(String(255), nullable=True)  # RRULE format
     recurring_parent_id = Column(UUID(as_uuid=True), nullable=True)
+    occurrence_date = Column(DateTime, nullable=True)  # Occurrence of the recurring parent this instance is for
     
     # Task metadata
     tags = Column(ARRAY(String), default=[], nullable=False)
@@ -125,6 +136,37 @@ class Task(BaseModel):
     task_logs = relationship("TaskLog", back_populates="task", cascade="all, delete-orphan")
     schedule = relationship("TaskSchedule", back_populates="task", uselist=False, cascade="all, delete-orphan")
     
+    # Covering index for task statistics: per-user aggregates are answered
+    # from the index alone (see TaskAnalyticsService)
+    __table_args__ = (
+        # One instance per occurrence of a recurring task (see RecurringTaskService)
+        Index(
+            "uq_tasks_recurring_parent_id_occurrence_date",
+            "recurring_parent_id",
+            "occurrence_date",
+            unique=True,
+            postgresql_where=recurring_parent_id.isnot(None),
+        ),
+        # Duplicate lookups by title band (see TaskSimilarityIndex)
+        Index("ix_tasks_title_lsh_bands", "title_lsh_bands", postgresql_using="gin"),
+        Index(
+            "ix_tasks_user_id_status_stats",
+            "user_id",
+            "status",
+            postgresql_include=[
+                "priority", "quest_type", "due_date", "completed_at",
+                "estimated_duration_minutes", "actual_duration_minutes",
+                "difficulty", "experience_points",
+            ],
+        ),
+    )
+    
+    @validates("title")
+    def _update_title_lsh_bands(self, key: str, title: str) -> str:
+        """Keep the title's LSH band keys in step with the title."""
+        self.title_lsh_bands = text_bands(title)
+        return title
+    
     def calculate_experience(self) -> int:
         """Calculate experience points based on task properties."""
         base_xp = self.difficulty * 10
@@ -196,3 +238,23 @@ class TaskLog(BaseModel):
     
     # Relationships for ORM
     task = relationship("Task", back_populates="task_logs")
+
+
+class TaskDailyStats(BaseModel):
+    """
+    Per-user daily rollup of task completions.
+    
+    Maintained on task state transitions (see TaskAnalyticsService) so
+    completion streaks are computed over one row per active day instead of
+    every completed task.
+    """
+    __tablename__ = "task_daily_stats"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    completed_count = Column(Integer, default=0, nullable=False)
+    experience_points = Column(Integer, default=0, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_task_daily_stats_user_id_day"),
+    )
@@ -0,0 +1,52 @@
+"""Task reminder models for the Mnemosyne application."""
+import enum
+
+from sqlalchemy import Column, ForeignKey, String, DateTime, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.db.base_model import BaseModel
+
+
+class ReminderStatus(str, enum.Enum):
+    """Reminder lifecycle states."""
+    PENDING = "pending"
+    SENT = "sent"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class TaskReminder(BaseModel):
+    """
+    A reminder for a task, due at remind_at.
+    
+    Pending reminders are claimed in remind_at order by the reminder
+    scheduler (see ReminderScheduler); claiming pushes remind_at forward
+    by a lease, so a reminder whose dispatch never finished becomes due again.
+    """
+    
+    __tablename__ = "task_reminders"
+    
+    task_id = Column(UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    remind_at = Column(DateTime, nullable=False)
+    status = Column(String(20), default=ReminderStatus.PENDING.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    task = relationship("Task")
+    
+    __table_args__ = (
+        # Due-time index: each tick only reads reminders whose time has come
+        Index(
+            "ix_task_reminders_pending_remind_at",
+            "remind_at",
+            postgresql_where=(status == ReminderStatus.PENDING.value),
+        ),
+        Index("ix_task_reminders_task_id", "task_id"),
+    )
+    
+    def __repr__(self) -> str:
+        """Return string representation of the task reminder."""
+        return f"<TaskReminder(id={self.id}, task_id={self.task_id}, remind_at={self.remind_at}, status={self.status})>"
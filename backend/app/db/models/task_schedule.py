@@ -1,7 +1,7 @@
 """Task schedule models for the Mnemosyne application."""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, ForeignKey, String, DateTime, Boolean, Integer
+from sqlalchemy import Column, ForeignKey, String, DateTime, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -23,12 +23,22 @@ class TaskSchedule(BaseModel):
     recurrence_pattern = Column(String, nullable=True)  # For future recurring tasks
     recurrence_count = Column(Integer, nullable=True)  # Number of recurrences
     recurrence_end_date = Column(DateTime, nullable=True)  # End date for recurrences
+    recurrence_generated_until = Column(DateTime, nullable=True)  # Instances exist up to here (exclusive)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
     task = relationship("Task", back_populates="schedule")
     
+    # Schedules due for recurrence horizon extension
+    __table_args__ = (
+        Index(
+            "ix_task_schedules_recurrence_generated_until",
+            "recurrence_generated_until",
+            postgresql_where=recurrence_pattern.isnot(None),
+        ),
+    )
+    
     def __repr__(self) -> str:
         """Return string representation of the task schedule."""
         return f"<TaskSchedule(id={self.id}, task_id={self.task_id}, due_time={self.due_time})>"
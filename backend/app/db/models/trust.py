@@ -8,7 +8,7 @@ and governance with appeals process.
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import uuid4
-from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey, Enum, Float, Boolean, Integer
+from sqlalchemy import Column, String, Text, DateTime, JSON, ForeignKey, Enum, Float, Boolean, Integer, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from app.db.session import Base
@@ -43,6 +43,11 @@ class AppealStatus(str, enum.Enum):
     ESCALATED = "escalated"
 
 
+# Appeals still under review, as a SQL literal shared by the partial SLA
+# deadline indexes and the queries that must match them
+APPEAL_UNDER_REVIEW = "status IN ('PENDING', 'REVIEWING')"
+
+
 class TrustEvent(Base):
     """
     Trust events with neutral language (not "violations").
@@ -110,16 +115,35 @@ class Appeal(Base):
     witness_ids = Column(ARRAY(UUID(as_uuid=True)))  # Array of witness user IDs
     review_board_ids = Column(ARRAY(UUID(as_uuid=True)))  # Multiple reviewers for important cases
     
+    # Board vote tally, kept in step with appeal_metadata['votes'] on every vote
+    uphold_votes = Column(Integer, nullable=False, default=0, server_default='0')
+    overturn_votes = Column(Integer, nullable=False, default=0, server_default='0')
+    
     # Timestamps
     submitted_at = Column(DateTime, default=datetime.utcnow)
     resolved_at = Column(DateTime)
     review_deadline = Column(DateTime)  # SLA for review
+    sla_breached_at = Column(DateTime)  # When the SLA monitor recorded the missed deadline
     
     # Metadata
     appeal_metadata = Column(JSON)
     
     # Relationships
     appellant = relationship("User", foreign_keys=[appellant_id], backref="appeals_filed")
+    
+    # SLA deadline indexes: overdue appeals, and the queue of breaches not yet recorded
+    __table_args__ = (
+        Index(
+            "ix_appeals_review_deadline_under_review",
+            "review_deadline",
+            postgresql_where=text(APPEAL_UNDER_REVIEW),
+        ),
+        Index(
+            "ix_appeals_review_deadline_sla_queue",
+            "review_deadline",
+            postgresql_where=text(f"{APPEAL_UNDER_REVIEW} AND sla_breached_at IS NULL"),
+        ),
+    )
 
 
 class TrustRelationship(Base):
@@ -212,4 +236,37 @@ class ConsciousnessMap(Base):
     last_observed = Column(DateTime)
     
     # Relationships
-    user = relationship("User", foreign_keys=[user_id], backref="consciousness_map", uselist=False)
\ No newline at end of file
+    user = relationship("User", foreign_keys=[user_id], backref="consciousness_map", uselist=False)
+
+class TrustCalibrationState(Base):
+    """
+    Persisted trust calibration state for a system component.
+    
+    Dimension trusts are stored as of last_updated and decayed toward the
+    baseline on read (see TrustCalibrator.decayed), so idle components are
+    never swept. Reliability is kept as running success/total counters.
+    """
+    __tablename__ = "trust_calibration_states"
+    
+    component_id = Column(String(255), primary_key=True)  # e.g. "agent_engineer"
+    
+    # Trust scores by dimension (0-1), as of last_updated
+    performance_trust = Column(Float, nullable=False)
+    purpose_trust = Column(Float, nullable=False)
+    process_trust = Column(Float, nullable=False)
+    
+    # Reliability aggregates
+    success_count = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=False, default=0)
+    
+    # Calibration assessment as of last_updated
+    calibration = Column(String(20), nullable=False, default="calibrated")
+    calibration_gap = Column(Float, nullable=False, default=0.0)
+    
+    # Trust dynamics (exponentially weighted signal statistics)
+    trust_velocity = Column(Float, nullable=False, default=0.0)
+    signal_mean = Column(Float, nullable=False, default=0.0)
+    volatility = Column(Float, nullable=False, default=0.0)
+    signal_count = Column(Integer, nullable=False, default=0)
+    
+    last_updated = Column(DateTime(timezone=True), nullable=False)
@@ -6,29 +6,64 @@ utilities for database access.
 """
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.db.instrumentation import setup_engine_events
 
 logger = get_logger(__name__)
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URI,
-    pool_pre_ping=True,  # Enable reconnection on stale connections
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,  # Enable reconnection on stale connections
     echo=settings.APP_DEBUG,  # Log SQL if in debug mode
     future=True,  # Use SQLAlchemy 2.0 style
 )
 
+
+def _create_async_engine(database_uri: str) -> AsyncEngine:
+    """
+    Create an instrumented asyncpg engine with the configured pool.
+    
+    Args:
+        database_uri: postgresql:// connection URI
+        
+    Returns:
+        The async engine
+    """
+    async_engine = create_async_engine(
+        database_uri.replace("postgresql://", "postgresql+asyncpg://"),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        echo=settings.APP_DEBUG,
+        # Prepared statements cached per connection by the asyncpg dialect
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    setup_engine_events(async_engine.sync_engine)
+    return async_engine
+
+
 # Create async SQLAlchemy engine
-async_engine = create_async_engine(
-    settings.DATABASE_URI.replace("postgresql://", "postgresql+asyncpg://"),
-    pool_pre_ping=True,
-    echo=settings.APP_DEBUG,
-)
+async_engine = _create_async_engine(settings.DATABASE_URI)
+
+# Read-only engine: the replica when configured, otherwise the primary's
+# pool with every transaction started READ ONLY
+async_read_engine = (
+    _create_async_engine(settings.DB_REPLICA_URI) if settings.DB_REPLICA_URI else async_engine
+).execution_options(postgresql_readonly=True)
+
+setup_engine_events(engine)
 
 # Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
@@ -38,6 +73,13 @@ async_session_maker = sessionmaker(
     autoflush=False, 
     bind=async_engine
 )
+async_read_session_maker = sessionmaker(
+    class_=AsyncSession, 
+    autocommit=False, 
+    autoflush=False, 
+    expire_on_commit=False,
+    bind=async_read_engine
+)
 
 # Create declarative base for models
 Base = declarative_base()
@@ -75,6 +117,21 @@ async def get_async_db():
         await session.close()
 
 
+async def get_async_read_db():
+    """
+    Get a read-only async database session.
+    
+    The session runs in READ ONLY transactions (on the replica when
+    DB_REPLICA_URI is set) and is never committed, so read-only requests
+    skip the commit round trip.
+    
+    Yields:
+        An SQLAlchemy async session
+    """
+    async with async_read_session_maker() as session:
+        yield session
+
+
 def init_db():
     """
     Initialize the database, creating tables if they don't exist.
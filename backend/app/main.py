@@ -25,6 +25,7 @@ from app.core.middleware import RequestIDMiddleware
 from app.core.auth.manager import get_auth_manager
 from app.middleware.receipt_enforcement import ReceiptEnforcementMiddleware
 from app.middleware.rate_limit import rate_limiter, RateLimitMiddleware
+from app.middleware.query_metrics import QueryMetricsMiddleware
 
 # Configure logging
 configure_logging()
@@ -43,6 +44,9 @@ app = FastAPI(
 # Request ID middleware (executes first)
 app.add_middleware(RequestIDMiddleware)
 
+# Query metrics middleware (per-request query count and time)
+app.add_middleware(QueryMetricsMiddleware)
+
 # Rate limiting middleware (prevent abuse)
 app.add_middleware(RateLimitMiddleware, rate_limiter=rate_limiter)
 
@@ -204,6 +208,16 @@ async def startup_event():
     available_methods = auth_manager.get_available_methods()
     logger.info(f"Authentication initialized with methods: {available_methods}")
 
+    # Initialize feature flags and their propagation between replicas
+    from app.core.features import FeatureFlags
+    FeatureFlags.initialize(settings.FEATURE_FLAGS_CONFIG_PATH)
+    try:
+        await FeatureFlags.start_sync(settings.REDIS_URI)
+        logger.info("Feature flag sync started")
+    except Exception as e:
+        logger.warning(f"Failed to start feature flag sync: {e}")
+        logger.warning("Feature flag changes will not propagate between replicas")
+
     # Initialize tool registry
     try:
         from app.services.tools import tool_registry
@@ -250,6 +264,22 @@ async def shutdown_event():
         except Exception as e:
             logger.error(f"Error shutting down scheduler: {e}")
 
+    # Stop feature flag sync, flushing buffered audit entries
+    try:
+        from app.core.features import FeatureFlags
+        await FeatureFlags.stop_sync()
+        logger.info("Feature flag sync stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping feature flag sync: {e}")
+
+    # Flush queued research events to the event store
+    try:
+        from app.core.research_bus import get_research_bus
+        await get_research_bus().flush()
+        logger.info("Research bus flushed")
+    except Exception as e:
+        logger.warning(f"Failed to flush research bus: {e}")
+
     # Cleanup tool registry
     try:
         from app.services.tools import tool_registry
@@ -0,0 +1,33 @@
+"""
+Query Metrics Middleware
+
+Accounts database queries to each request and reports them in response
+headers, so per-endpoint query counts (and N+1 fixes) can be checked.
+"""
+
+from typing import Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.db.instrumentation import begin_request, end_request
+
+
+class QueryMetricsMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware that counts and times the queries of each request.
+
+    Adds X-DB-Query-Count and X-DB-Query-Time-Ms to every response and
+    folds the request into the process-wide query metrics.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        stats = begin_request(request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            end_request(stats)
+
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Query-Time-Ms"] = f"{stats.total_ms:.2f}"
+        return response
@@ -197,10 +197,14 @@ class TaskStats(BaseModel):
     completed_tasks: int = 0
     in_progress_tasks: int = 0
     overdue_tasks: int = 0
+    tasks_by_status: Dict[str, int] = Field(default_factory=dict)
+    tasks_by_priority: Dict[str, int] = Field(default_factory=dict)
+    tasks_by_due_date: Dict[str, int] = Field(default_factory=dict)  # open tasks only
     
     # Game stats
     total_experience: int = 0
     current_streak: int = 0
+    longest_streak: int = 0
     tasks_by_quest_type: Dict[str, int] = Field(default_factory=dict)
     
     # Time stats
@@ -69,6 +69,7 @@ class AppealResponse(BaseModel):
     submitted_at: datetime
     resolved_at: Optional[datetime]
     review_deadline: Optional[datetime]
+    sla_breached_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -11,9 +11,11 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 import random
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, update, func, text
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db.models.trust import Appeal, TrustEvent, AppealStatus
+from app.core.config import settings
+from app.db.models.trust import Appeal, TrustEvent, AppealStatus, APPEAL_UNDER_REVIEW
 from app.db.models.user import User
 
 logger = logging.getLogger(__name__)
@@ -253,22 +255,37 @@ class AppealResolutionService:
         logger.info(f"Transitioned appeal {appeal_id} from {old_status.value} to {new_status.value}")
         return appeal
 
-    async def check_sla_violations(self) -> List[Appeal]:
+    async def check_sla_violations(
+        self,
+        now: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        breached_since: Optional[datetime] = None
+    ) -> List[Appeal]:
         """Check for appeals that have exceeded their review deadline.
 
+        A range scan of the partial review deadline index, most overdue first.
+
+        Args:
+            now: Current time (defaults to now)
+            limit: Maximum appeals to return
+            breached_since: Only appeals whose breach the SLA monitor
+                recorded at or after this time
+
         Returns:
             List of appeals with SLA violations
         """
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
 
-        result = await self.db.execute(
-            select(Appeal).where(
-                and_(
-                    Appeal.status.in_([AppealStatus.PENDING, AppealStatus.REVIEWING]),
-                    Appeal.review_deadline < now
-                )
-            )
+        query = (
+            select(Appeal)
+            .where(text(APPEAL_UNDER_REVIEW), Appeal.review_deadline < now)
+            .order_by(Appeal.review_deadline)
         )
+        if breached_since:
+            query = query.where(Appeal.sla_breached_at >= breached_since)
+        if limit:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
 
         overdue_appeals = result.scalars().all()
 
@@ -277,6 +294,60 @@ class AppealResolutionService:
 
         return overdue_appeals
 
+    async def drain_sla_queue(
+        self,
+        now: Optional[datetime] = None,
+        batch_size: Optional[int] = None
+    ) -> List[UUID]:
+        """Record SLA breaches of appeals whose review deadline has passed.
+
+        Drains the SLA deadline queue (appeals under review whose breach is
+        not recorded yet) in batches claimed with FOR UPDATE SKIP LOCKED,
+        stamping sla_breached_at with one statement per batch, so each
+        breach is recorded once even with several schedulers running.
+
+        Args:
+            now: Current time (defaults to now)
+            batch_size: Appeals per batch (defaults to APPEAL_SLA_BATCH_SIZE)
+
+        Returns:
+            IDs of the appeals whose breach was recorded
+        """
+        now = now or datetime.utcnow()
+        batch_size = batch_size or settings.APPEAL_SLA_BATCH_SIZE
+
+        breached: List[UUID] = []
+        while True:
+            due = (
+                select(Appeal.id)
+                .where(
+                    text(APPEAL_UNDER_REVIEW),
+                    Appeal.sla_breached_at.is_(None),
+                    Appeal.review_deadline < now
+                )
+                .order_by(Appeal.review_deadline)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.db.execute(
+                update(Appeal)
+                .where(Appeal.id.in_(due.scalar_subquery()))
+                .values(sla_breached_at=now)
+                .returning(Appeal.id)
+                .execution_options(synchronize_session=False)
+            )
+            batch = list(result.scalars())
+            await self.db.commit()
+            breached.extend(batch)
+
+            if len(batch) < batch_size:
+                break
+
+        if breached:
+            logger.warning(f"Recorded SLA breaches for {len(breached)} appeals")
+
+        return breached
+
     async def escalate_appeal(
         self,
         appeal_id: UUID,
@@ -338,7 +409,8 @@ class AppealResolutionService:
         Raises:
             ValueError: If reviewer not on board or invalid vote
         """
-        appeal = await self.db.get(Appeal, appeal_id)
+        # Lock the appeal so concurrent votes update the tally one at a time
+        appeal = await self.db.get(Appeal, appeal_id, with_for_update=True, populate_existing=True)
         if not appeal:
             raise ValueError(f"Appeal {appeal_id} not found")
 
@@ -350,26 +422,36 @@ class AppealResolutionService:
         if vote not in ['uphold', 'overturn']:
             raise ValueError(f"Invalid vote: {vote}. Must be 'uphold' or 'overturn'")
 
-        # Initialize votes structure if needed
-        if not appeal.appeal_metadata:
-            appeal.appeal_metadata = {}
-        if 'votes' not in appeal.appeal_metadata:
-            appeal.appeal_metadata['votes'] = {}
-
-        # Record vote
-        appeal.appeal_metadata['votes'][str(reviewer_id)] = {
+        # Replace any earlier vote by the same reviewer
+        votes = dict((appeal.appeal_metadata or {}).get('votes', {}))
+        previous_vote = votes.get(str(reviewer_id), {}).get('vote')
+        votes[str(reviewer_id)] = {
             'vote': vote,
             'reasoning': reasoning,
             'timestamp': datetime.utcnow().isoformat()
         }
 
-        await self.db.commit()
-        await self.db.refresh(appeal)
+        # The appeal row is locked, so the tally moves with the vote
+        uphold_delta = (vote == 'uphold') - (previous_vote == 'uphold')
+        overturn_delta = (vote == 'overturn') - (previous_vote == 'overturn')
+        result = await self.db.execute(
+            update(Appeal)
+            .where(Appeal.id == appeal_id)
+            .values(
+                appeal_metadata={**(appeal.appeal_metadata or {}), 'votes': votes},
+                uphold_votes=Appeal.uphold_votes + uphold_delta,
+                overturn_votes=Appeal.overturn_votes + overturn_delta
+            )
+            .returning(Appeal.uphold_votes, Appeal.overturn_votes)
+            .execution_options(synchronize_session=False)
+        )
+        uphold_count, overturn_count = result.one()
+        set_committed_value(appeal, 'appeal_metadata', {**(appeal.appeal_metadata or {}), 'votes': votes})
+        set_committed_value(appeal, 'uphold_votes', uphold_count)
+        set_committed_value(appeal, 'overturn_votes', overturn_count)
+        board_size = len(appeal.review_board_ids)
 
-        # Calculate current tally
-        votes = appeal.appeal_metadata.get('votes', {})
-        uphold_count = sum(1 for v in votes.values() if v['vote'] == 'uphold')
-        overturn_count = sum(1 for v in votes.values() if v['vote'] == 'overturn')
+        await self.db.commit()
 
         logger.info(f"Recorded vote for appeal {appeal_id}: {vote} (tally: {uphold_count} uphold, {overturn_count} overturn)")
 
@@ -379,9 +461,10 @@ class AppealResolutionService:
             'current_tally': {
                 'uphold': uphold_count,
                 'overturn': overturn_count,
-                'total_votes': len(votes),
-                'board_size': len(appeal.review_board_ids)
-            }
+                'total_votes': uphold_count + overturn_count,
+                'board_size': board_size
+            },
+            'consensus': self._tally_consensus(uphold_count, overturn_count, board_size)
         }
 
     async def check_board_consensus(
@@ -398,19 +481,28 @@ class AppealResolutionService:
         Returns:
             "uphold" or "overturn" if consensus reached, None otherwise
         """
-        appeal = await self.db.get(Appeal, appeal_id)
-        if not appeal or not appeal.review_board_ids:
+        result = await self.db.execute(
+            select(Appeal.uphold_votes, Appeal.overturn_votes, func.cardinality(Appeal.review_board_ids))
+            .where(Appeal.id == appeal_id)
+        )
+        tally = result.one_or_none()
+        if not tally or not tally[2]:
             return None
 
-        votes = appeal.appeal_metadata.get('votes', {}) if appeal.appeal_metadata else {}
+        return self._tally_consensus(*tally)
 
-        if not votes:
-            return None
+    @staticmethod
+    def _tally_consensus(uphold_count: int, overturn_count: int, board_size: int) -> Optional[str]:
+        """Outcome of a vote tally: majority vote (> 50% of board).
 
-        board_size = len(appeal.review_board_ids)
-        uphold_count = sum(1 for v in votes.values() if v['vote'] == 'uphold')
-        overturn_count = sum(1 for v in votes.values() if v['vote'] == 'overturn')
+        Args:
+            uphold_count: Votes to uphold
+            overturn_count: Votes to overturn
+            board_size: Number of board members
 
+        Returns:
+            "uphold" or "overturn" if consensus reached, None otherwise
+        """
         # Majority threshold
         majority = (board_size // 2) + 1
 
@@ -12,17 +12,24 @@ from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, update, and_, or_, func, text, values, column, String
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config import settings
 from app.db.models.negotiation import (
     Negotiation,
     NegotiationMessage,
     NegotiationStatus,
-    NegotiationMessageType
+    NegotiationMessageType,
+    NEGOTIATION_DEADLINE_PENDING,
+    FINALIZATION_DEADLINE_PENDING
 )
+from app.db.models.receipt import ReceiptType
 from app.db.models.user import User
 from app.db.models.trust import Appeal, AppealStatus
 from app.services.crypto_service import CryptoService
+from app.services.receipt_service import ReceiptService
 
 logger = logging.getLogger(__name__)
 
@@ -653,46 +660,60 @@ class NegotiationService:
 
         return negotiation, appeal
 
-    async def check_timeouts(self) -> Dict[str, List[Negotiation]]:
-        """Check for negotiations past their deadlines.
+    async def check_timeouts(
+        self,
+        now: Optional[datetime] = None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, List[Negotiation]]:
+        """Expire negotiations past their deadlines.
+
+        Works in batches: each batch claims due negotiations through the
+        partial deadline indexes with FOR UPDATE SKIP LOCKED (so concurrent
+        checkers split the work), expires them with one UPDATE, emits one
+        receipt per participant with one insert and commits.
+
+        Args:
+            now: Current time (defaults to now)
+            batch_size: Negotiations per batch (defaults to NEGOTIATION_TIMEOUT_BATCH_SIZE)
 
         Returns:
             Dict with 'negotiation_timeouts' and 'finalization_timeouts' lists
         """
-        now = datetime.utcnow()
-
-        # Find negotiations past deadline without consensus
-        negotiation_result = await self.db.execute(
-            select(Negotiation).where(
-                and_(
-                    Negotiation.status.in_([
-                        NegotiationStatus.INITIATED,
-                        NegotiationStatus.NEGOTIATING
-                    ]),
-                    Negotiation.negotiation_deadline < now
-                )
-            )
-        )
-        negotiation_timeouts = list(negotiation_result.scalars())
-
-        # Find consensus past finalization deadline
-        finalization_result = await self.db.execute(
-            select(Negotiation).where(
-                and_(
-                    Negotiation.status == NegotiationStatus.CONSENSUS_REACHED,
-                    Negotiation.finalization_deadline < now
+        now = now or datetime.utcnow()
+        batch_size = batch_size or settings.NEGOTIATION_TIMEOUT_BATCH_SIZE
+
+        negotiation_timeouts: List[Negotiation] = []
+        finalization_timeouts: List[Negotiation] = []
+
+        while True:
+            result = await self.db.execute(
+                select(Negotiation)
+                .where(
+                    or_(
+                        and_(text(NEGOTIATION_DEADLINE_PENDING), Negotiation.negotiation_deadline < now),
+                        and_(text(FINALIZATION_DEADLINE_PENDING), Negotiation.finalization_deadline < now)
+                    )
                 )
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
             )
-        )
-        finalization_timeouts = list(finalization_result.scalars())
+            batch = list(result.scalars())
+            if not batch:
+                break
 
-        # Update expired negotiations
-        for negotiation in negotiation_timeouts + finalization_timeouts:
-            negotiation.status = NegotiationStatus.EXPIRED
-            negotiation.content_hash = self._calculate_negotiation_hash(negotiation)
+            for negotiation in batch:
+                if negotiation.status == NegotiationStatus.CONSENSUS_REACHED:
+                    finalization_timeouts.append(negotiation)
+                else:
+                    negotiation_timeouts.append(negotiation)
 
-        if negotiation_timeouts or finalization_timeouts:
+            await self._expire(batch, now)
             await self.db.commit()
+
+            if len(batch) < batch_size:
+                break
+
+        if negotiation_timeouts or finalization_timeouts:
             logger.warning(f"Found {len(negotiation_timeouts)} negotiation timeouts and {len(finalization_timeouts)} finalization timeouts")
 
         return {
@@ -700,6 +721,81 @@ class NegotiationService:
             'finalization_timeouts': finalization_timeouts
         }
 
+    async def next_deadline(self) -> Optional[datetime]:
+        """Earliest deadline of a negotiation that can still time out.
+
+        Both minimums are read from the partial deadline indexes.
+
+        Returns:
+            The next deadline, or None if no negotiation is pending
+        """
+        next_negotiation = (
+            select(func.min(Negotiation.negotiation_deadline))
+            .where(text(NEGOTIATION_DEADLINE_PENDING))
+            .scalar_subquery()
+        )
+        next_finalization = (
+            select(func.min(Negotiation.finalization_deadline))
+            .where(text(FINALIZATION_DEADLINE_PENDING))
+            .scalar_subquery()
+        )
+        result = await self.db.execute(select(func.least(next_negotiation, next_finalization)))
+        return result.scalar()
+
+    async def _expire(self, negotiations: List[Negotiation], now: datetime) -> None:
+        """Expire claimed negotiations and emit their receipts, without committing.
+
+        Args:
+            negotiations: Negotiations locked by the caller
+            now: Expiry time
+        """
+        hashes = []
+        receipts = []
+        for negotiation in negotiations:
+            previous_status = negotiation.status
+            # The new content hash covers the expired status
+            set_committed_value(negotiation, 'status', NegotiationStatus.EXPIRED)
+            content_hash = self._calculate_negotiation_hash(negotiation)
+            set_committed_value(negotiation, 'content_hash', content_hash)
+            set_committed_value(negotiation, 'updated_at', now)
+            hashes.append((negotiation.id, content_hash))
+
+            deadline = 'finalization' if previous_status == NegotiationStatus.CONSENSUS_REACHED else 'negotiation'
+            for participant_id in negotiation.participant_ids:
+                receipts.append({
+                    'user_id': participant_id,
+                    'receipt_type': ReceiptType.NEGOTIATION_EXPIRED,
+                    'action': f"Negotiation expired: {negotiation.title}",
+                    'entity_type': "negotiation",
+                    'entity_id': negotiation.id,
+                    'context': {
+                        'negotiation_id': str(negotiation.id),
+                        'previous_status': previous_status.value,
+                        'deadline': deadline,
+                        'content_hash': content_hash
+                    },
+                    'explanation': f"The {deadline} deadline passed",
+                    'correlation_id': str(negotiation.id)
+                })
+
+        expired = values(
+            column('id', PG_UUID(as_uuid=True)),
+            column('content_hash', String),
+            name='expired'
+        ).data(hashes)
+        await self.db.execute(
+            update(Negotiation)
+            .where(Negotiation.id == expired.c.id)
+            .values(
+                status=NegotiationStatus.EXPIRED,
+                content_hash=expired.c.content_hash,
+                updated_at=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        await ReceiptService(self.db).create_receipts(receipts, timestamp=now)
+
     # Helper methods
 
     def _check_consensus(self, negotiation: Negotiation) -> bool:
@@ -7,11 +7,11 @@ Handles the creation and management of receipts for transparency and audit trail
 import logging
 import hashlib
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, insert
 from sqlalchemy.orm import selectinload
 from fastapi import Request
 
@@ -277,6 +277,86 @@ class ReceiptService:
             await self.db.rollback()
             raise
     
+    async def create_receipts(
+        self,
+        receipts: List[Dict[str, Any]],
+        timestamp: Optional[datetime] = None
+    ) -> List[UUID]:
+        """Create many system-generated receipts with a single insert.
+
+        Each user's receipts are chained onto that user's latest receipt,
+        fetched for all users in one query, and onto each other in list
+        order (timestamps are spaced one microsecond apart to keep that
+        order). Does not commit; the caller commits together with the
+        change the receipts document.
+
+        Args:
+            receipts: Receipt fields as accepted by create_receipt; each
+                needs user_id, receipt_type and action
+            timestamp: Receipt timestamp (defaults to now)
+
+        Returns:
+            IDs of the created receipts
+        """
+        if not receipts:
+            return []
+
+        timestamp = timestamp or datetime.utcnow()
+        user_ids = {receipt['user_id'] for receipt in receipts}
+        last_receipts = await self.db.execute(
+            select(Receipt.user_id, Receipt.content_hash)
+            .where(Receipt.user_id.in_(user_ids))
+            .order_by(Receipt.user_id, Receipt.timestamp.desc())
+            .distinct(Receipt.user_id)
+        )
+        previous_hashes = {user_id: content_hash for user_id, content_hash in last_receipts.all()}
+
+        rows = []
+        user_offsets: Dict[UUID, int] = {}
+        for receipt in receipts:
+            user_id = receipt['user_id']
+            offset = user_offsets.get(user_id, 0)
+            user_offsets[user_id] = offset + 1
+
+            receipt_data = {
+                'id': uuid4(),
+                'user_id': user_id,
+                'receipt_type': receipt['receipt_type'],
+                'timestamp': timestamp + timedelta(microseconds=offset),
+                'action': receipt['action'],
+                'entity_type': receipt.get('entity_type'),
+                'entity_id': receipt.get('entity_id'),
+                'context': receipt.get('context'),
+                'request_data': None,
+                'response_data': None,
+                'persona_mode': None,
+                'worldview_profile': None,
+                'decisions_made': receipt.get('decisions_made'),
+                'confidence_score': receipt.get('confidence_score'),
+                'alternatives_considered': None,
+                'consent_basis': receipt.get('consent_basis'),
+                'data_categories': receipt.get('data_categories'),
+                'privacy_impact': receipt.get('privacy_impact'),
+                'user_visible': receipt.get('user_visible', True),
+                'explanation': receipt.get('explanation'),
+                'service_name': "mnemosyne-backend",
+                'service_version': settings.VERSION if hasattr(settings, 'VERSION') else "1.0.0",
+                'correlation_id': receipt.get('correlation_id') or str(uuid4()),
+                'parent_receipt_id': receipt.get('parent_receipt_id'),
+                'ip_address': None,
+                'user_agent': None,
+                'session_id': None,
+                'previous_hash': previous_hashes.get(user_id)
+            }
+            receipt_data['content_hash'] = self._calculate_content_hash(receipt_data)
+            previous_hashes[user_id] = receipt_data['content_hash']
+            rows.append(receipt_data)
+
+        await self.db.execute(insert(Receipt), rows)
+
+        logger.info(f"Created {len(rows)} receipts for {len(user_ids)} users")
+        return [row['id'] for row in rows]
+
     async def get_user_receipts(
         self,
         user_id: UUID,
@@ -7,6 +7,7 @@ single execution across multiple instances (e.g., Docker Swarm).
 
 import logging
 import uuid
+from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from redis import asyncio as aioredis
 from typing import Callable, Optional
@@ -50,31 +51,85 @@ class SchedulerService:
 
     def _register_jobs(self):
         """Register all periodic background jobs."""
-        # Negotiation timeout checker - every 5 minutes
+        # Negotiation timeout checker - wakes at the next deadline and
+        # reschedules itself (see check_negotiation_timeouts)
+        self._schedule_timeout_checker(delay_seconds=0)
+        logger.info("Registered job: timeout_checker (at next negotiation deadline)")
+
+        # Receipt checkpoint creator - every 30 minutes
         self.scheduler.add_job(
             self.run_with_lock,
-            args=["timeout_checker", self.check_negotiation_timeouts],
+            args=["receipt_checkpoint", self.create_receipt_checkpoints],
             trigger="interval",
-            minutes=5,
-            id="timeout_checker",
+            minutes=30,
+            id="receipt_checkpoint",
             max_instances=1,
             replace_existing=True
         )
-        logger.info("Registered job: timeout_checker (every 5 minutes)")
+        logger.info("Registered job: receipt_checkpoint (every 30 minutes)")
 
-        # Receipt checkpoint creator - every 30 minutes
+        # Recurring task horizon - materializes recurring task instances
+        # up to RECURRENCE_HORIZON_DAYS ahead
         self.scheduler.add_job(
             self.run_with_lock,
-            args=["receipt_checkpoint", self.create_receipt_checkpoints],
+            args=["recurrence_horizon", self.extend_recurrence_horizon],
             trigger="interval",
-            minutes=30,
-            id="receipt_checkpoint",
+            minutes=settings.RECURRENCE_EXTEND_MINUTES,
+            id="recurrence_horizon",
             max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(timezone.utc),
             replace_existing=True
         )
-        logger.info("Registered job: receipt_checkpoint (every 30 minutes)")
+        logger.info(f"Registered job: recurrence_horizon (every {settings.RECURRENCE_EXTEND_MINUTES} minutes)")
+
+        # Vector index maintenance - daily when the maintenance window opens;
+        # the lock is held for the whole window since rebuilds can be long
+        from app.services.vector_store.vector_index_manager import MaintenanceWindow
+        window = MaintenanceWindow.parse(settings.VECTOR_INDEX_MAINTENANCE_WINDOW)
+        window_seconds = max(300, int(window.length.total_seconds()))
+        self.scheduler.add_job(
+            self.run_with_lock,
+            args=["vector_index_maintenance", self.run_vector_index_maintenance],
+            kwargs={"lock_seconds": window_seconds},
+            trigger="cron",
+            hour=window.start.hour,
+            minute=window.start.minute,
+            timezone=timezone.utc,
+            id="vector_index_maintenance",
+            max_instances=1,
+            misfire_grace_time=window_seconds,
+            replace_existing=True
+        )
+        logger.info(f"Registered job: vector_index_maintenance (daily at {window.start:%H:%M} UTC)")
+
+        # Task reminder dispatch - runs on every instance; reminders are
+        # claimed with SKIP LOCKED, so instances split the due work
+        self.scheduler.add_job(
+            self.dispatch_task_reminders,
+            trigger="interval",
+            seconds=settings.REMINDER_TICK_SECONDS,
+            id="reminder_dispatch",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+        logger.info(f"Registered job: reminder_dispatch (every {settings.REMINDER_TICK_SECONDS} seconds)")
 
-    async def run_with_lock(self, job_name: str, func: Callable):
+        # Appeal SLA monitor - runs on every instance; the SLA deadline
+        # queue is drained with SKIP LOCKED
+        self.scheduler.add_job(
+            self.drain_appeal_sla_queue,
+            trigger="interval",
+            seconds=settings.APPEAL_SLA_CHECK_SECONDS,
+            id="appeal_sla_monitor",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+        logger.info(f"Registered job: appeal_sla_monitor (every {settings.APPEAL_SLA_CHECK_SECONDS} seconds)")
+
+    async def run_with_lock(self, job_name: str, func: Callable, lock_seconds: int = 300):
         """Execute a job with distributed lock to prevent duplicate execution.
 
         Only one instance across all servers will execute the job at a time.
@@ -82,6 +137,7 @@ class SchedulerService:
         Args:
             job_name: Unique name for the job (used as lock key)
             func: Async function to execute
+            lock_seconds: Lock expiry, in case the job hangs
         """
         if not self.redis:
             logger.error(f"Redis not initialized, cannot run job {job_name}")
@@ -89,12 +145,12 @@ class SchedulerService:
 
         lock_key = f"scheduler:lock:{job_name}"
 
-        # Try to acquire lock with 5-minute expiry
+        # Try to acquire lock with expiry
         acquired = await self.redis.set(
             lock_key,
             self.instance_id,
             nx=True,  # Only set if key doesn't exist
-            ex=300    # 5-minute timeout (in case job hangs)
+            ex=lock_seconds
         )
 
         if not acquired:
@@ -121,13 +177,37 @@ class SchedulerService:
             except Exception as e:
                 logger.error(f"Error releasing lock for {job_name}: {e}")
 
+    def _schedule_timeout_checker(self, delay_seconds: float):
+        """Schedule the next negotiation timeout check.
+
+        Args:
+            delay_seconds: Seconds until the check, capped at
+                NEGOTIATION_TIMEOUT_MAX_SLEEP_SECONDS so deadlines set by other
+                instances in the meantime are never missed by much
+        """
+        delay_seconds = min(max(delay_seconds, 0), settings.NEGOTIATION_TIMEOUT_MAX_SLEEP_SECONDS)
+        self.scheduler.add_job(
+            self.check_negotiation_timeouts,
+            trigger="date",
+            run_date=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+            id="timeout_checker",
+            max_instances=1,
+            misfire_grace_time=None,
+            replace_existing=True
+        )
+
     async def check_negotiation_timeouts(self):
-        """Check and expire timed-out negotiations."""
+        """Expire timed-out negotiations, then sleep until the next deadline.
+
+        Runs on every instance without the Redis lock: due negotiations are
+        claimed with SKIP LOCKED, so instances split the work.
+        """
         from app.db.session import async_session_maker
         from app.services.negotiation_service import NegotiationService
 
-        async with async_session_maker() as session:
-            try:
+        delay_seconds = settings.NEGOTIATION_TIMEOUT_MAX_SLEEP_SECONDS
+        try:
+            async with async_session_maker() as session:
                 service = NegotiationService(session)
                 result = await service.check_timeouts()
 
@@ -144,9 +224,65 @@ class SchedulerService:
                 else:
                     logger.debug("No negotiations timed out")
 
+                next_deadline = await service.next_deadline()
+                if next_deadline:
+                    # Deadlines are naive UTC; wake just after the deadline passes
+                    delay_seconds = (next_deadline - datetime.utcnow()).total_seconds() + 1
+
+        except Exception as e:
+            logger.error(f"Error checking negotiation timeouts: {e}", exc_info=True)
+
+        finally:
+            self._schedule_timeout_checker(delay_seconds)
+
+    async def dispatch_task_reminders(self):
+        """Send task reminders whose time has come."""
+        from app.db.session import async_session_maker
+        from app.services.task.reminder_engine import ReminderEngine
+
+        async with async_session_maker() as session:
+            try:
+                result = await ReminderEngine(session).check_and_send_reminders()
+                if result["reminders_claimed"]:
+                    logger.info(
+                        f"Sent {result['reminders_sent']} reminder(s) "
+                        f"to {result['users_notified']} user(s)"
+                    )
+            except Exception as e:
+                logger.error(f"Error dispatching task reminders: {e}", exc_info=True)
+
+    async def extend_recurrence_horizon(self):
+        """Create recurring task instances that have come inside the horizon."""
+        from app.db.session import async_session_maker
+        from app.services.task.recurring_task_service import RecurringTaskService
+
+        async with async_session_maker() as session:
+            result = await RecurringTaskService(session).extend_horizon()
+            if result["created"]:
+                logger.info(
+                    f"Created {result['created']} recurring task instance(s) "
+                    f"for {result['schedules']} schedule(s)"
+                )
+
+    async def run_vector_index_maintenance(self):
+        """Check vector indexes and rebuild the ones that need it."""
+        from app.services.vector_store.vector_index_manager import run_scheduled_index_maintenance
+
+        results = await run_scheduled_index_maintenance()
+        rebuilt = [name for name, result in results.items() if result.get("reindexed")]
+        if rebuilt:
+            logger.info(f"Rebuilt vector indexes: {', '.join(rebuilt)}")
+
+    async def drain_appeal_sla_queue(self):
+        """Record SLA breaches of appeals past their review deadline."""
+        from app.db.session import async_session_maker
+        from app.services.appeals_service import AppealResolutionService
+
+        async with async_session_maker() as session:
+            try:
+                await AppealResolutionService(session).drain_sla_queue()
             except Exception as e:
-                logger.error(f"Error checking negotiation timeouts: {e}", exc_info=True)
-                raise
+                logger.error(f"Error draining appeal SLA queue: {e}", exc_info=True)
 
     async def create_receipt_checkpoints(self):
         """Create verification checkpoints for receipt chains.
@@ -4,7 +4,8 @@ Task service package for the Mnemosyne application.
 
 from .task_service import TaskService
 from .task_schedule_service import TaskScheduleService
-from .recurring_task_service import RecurringTaskService, RecurrenceType
+from .recurrence import RecurrenceType
+from .recurring_task_service import RecurringTaskService
 
 __all__ = [
     "TaskService",
@@ -0,0 +1,338 @@
+"""
+Recurrence rules for the Mnemosyne application.
+
+This module evaluates recurrence patterns arithmetically: the n-th
+occurrence of a rule is computed directly from the rule's anchor date, and
+the first occurrence after any point in time is found by jumping to it, so
+expanding a window of occurrences costs time proportional to the number of
+occurrences in the window rather than to the days since the anchor.
+
+Rules accept the patterns understood by RecurringTaskService
+("every 2 weeks", "weekdays", ...) and a subset of RFC 5545 RRULE
+("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;COUNT=10").
+"""
+import calendar
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class RecurrenceType(str, Enum):
+    """Enumeration of supported recurrence types."""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+    CUSTOM = "custom"
+
+
+WEEKDAY_NAMES = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6
+}
+RRULE_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+RRULE_FREQUENCIES = {
+    "DAILY": RecurrenceType.DAILY,
+    "WEEKLY": RecurrenceType.WEEKLY,
+    "MONTHLY": RecurrenceType.MONTHLY,
+    "YEARLY": RecurrenceType.YEARLY,
+}
+
+
+def parse_recurrence_pattern(pattern: str) -> Dict[str, Any]:
+    """
+    Parse a recurrence pattern string into structured data.
+
+    Supported patterns:
+    - "daily" or "every day"
+    - "weekly" or "every week"
+    - "monthly" or "every month"
+    - "yearly" or "every year"
+    - "every N days/weeks/months/years"
+    - "weekdays" (Monday-Friday)
+    - "weekends" (Saturday-Sunday)
+    - "every monday,wednesday,friday"
+    - RRULE: "FREQ=...;INTERVAL=...;BYDAY=...;COUNT=...;UNTIL=..."
+
+    Args:
+        pattern: The recurrence pattern string.
+
+    Returns:
+        Dictionary containing parsed recurrence data.
+
+    Raises:
+        ValueError: If the pattern is invalid or unsupported.
+    """
+    if not pattern:
+        raise ValueError("Recurrence pattern cannot be empty")
+
+    if "FREQ=" in pattern.upper():
+        return _parse_rrule(pattern)
+
+    pattern = pattern.lower().strip()
+
+    # Simple patterns
+    simple_patterns = {
+        "daily": {"type": RecurrenceType.DAILY, "interval": 1},
+        "every day": {"type": RecurrenceType.DAILY, "interval": 1},
+        "weekly": {"type": RecurrenceType.WEEKLY, "interval": 1},
+        "every week": {"type": RecurrenceType.WEEKLY, "interval": 1},
+        "monthly": {"type": RecurrenceType.MONTHLY, "interval": 1},
+        "every month": {"type": RecurrenceType.MONTHLY, "interval": 1},
+        "yearly": {"type": RecurrenceType.YEARLY, "interval": 1},
+        "every year": {"type": RecurrenceType.YEARLY, "interval": 1},
+        "weekdays": {"type": RecurrenceType.CUSTOM, "weekdays": [0, 1, 2, 3, 4]},  # Mon-Fri
+        "weekends": {"type": RecurrenceType.CUSTOM, "weekdays": [5, 6]},  # Sat-Sun
+    }
+
+    if pattern in simple_patterns:
+        return dict(simple_patterns[pattern])
+
+    # Pattern: "every N days/weeks/months/years"
+    interval_match = re.match(r"every (\d+) (day|week|month|year)s?", pattern)
+    if interval_match:
+        interval = int(interval_match.group(1))
+        unit = interval_match.group(2)
+        if interval < 1:
+            raise ValueError(f"Recurrence interval must be positive: {pattern}")
+
+        type_mapping = {
+            "day": RecurrenceType.DAILY,
+            "week": RecurrenceType.WEEKLY,
+            "month": RecurrenceType.MONTHLY,
+            "year": RecurrenceType.YEARLY,
+        }
+
+        return {"type": type_mapping[unit], "interval": interval}
+
+    # Pattern: "every monday,wednesday,friday"
+    weekday_match = re.match(r"every ((?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)(?:,(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday))*)", pattern)
+    if weekday_match:
+        weekday_names = weekday_match.group(1).split(",")
+        weekdays = [WEEKDAY_NAMES[day.strip()] for day in weekday_names]
+        return {"type": RecurrenceType.CUSTOM, "weekdays": weekdays}
+
+    raise ValueError(f"Unsupported recurrence pattern: {pattern}")
+
+
+def _parse_rrule(pattern: str) -> Dict[str, Any]:
+    """Parse the supported subset of an RFC 5545 RRULE."""
+    parts = {}
+    for part in pattern.strip().removeprefix("RRULE:").split(";"):
+        if not part:
+            continue
+        key, _, value = part.partition("=")
+        parts[key.strip().upper()] = value.strip().upper()
+
+    unsupported = set(parts) - {"FREQ", "INTERVAL", "BYDAY", "COUNT", "UNTIL", "WKST"}
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(unsupported))}")
+    if parts.get("FREQ") not in RRULE_FREQUENCIES:
+        raise ValueError(f"Unsupported RRULE frequency: {parts.get('FREQ')}")
+
+    data: Dict[str, Any] = {"type": RRULE_FREQUENCIES[parts["FREQ"]], "interval": int(parts.get("INTERVAL", "1"))}
+    if data["interval"] < 1:
+        raise ValueError("RRULE INTERVAL must be positive")
+    if "BYDAY" in parts:
+        try:
+            data["weekdays"] = [RRULE_WEEKDAYS[day] for day in parts["BYDAY"].split(",")]
+        except KeyError:
+            raise ValueError(f"Unsupported RRULE BYDAY: {parts['BYDAY']}")
+        if data["type"] not in (RecurrenceType.DAILY, RecurrenceType.WEEKLY):
+            raise ValueError("RRULE BYDAY is only supported with FREQ=DAILY or FREQ=WEEKLY")
+        if data["type"] == RecurrenceType.DAILY:
+            # A daily rule limited to some weekdays is a weekly rule on those days
+            if data["interval"] != 1:
+                raise ValueError("RRULE BYDAY with FREQ=DAILY requires INTERVAL=1")
+            data["type"] = RecurrenceType.CUSTOM
+    if "COUNT" in parts:
+        data["count"] = int(parts["COUNT"])
+    if "UNTIL" in parts:
+        until = parts["UNTIL"].rstrip("Z")
+        data["until"] = datetime.strptime(until, "%Y%m%dT%H%M%S" if "T" in until else "%Y%m%d")
+    return data
+
+
+def add_months(date: datetime, months: int) -> datetime:
+    """Add months to a date, clamping the day to the length of the target month."""
+    month_index = date.month - 1 + months
+    year = date.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    A recurrence rule anchored at a start date.
+
+    Occurrence 0 is the first date on or after the anchor that matches the
+    rule (the anchor itself unless the rule is limited to weekdays).
+    Monthly and yearly occurrences are computed from the anchor, not from
+    the previous occurrence, so a rule anchored on the 31st lands on the
+    last day of shorter months without drifting.
+
+    A rule has two end dates: until, the exclusive end date of the series,
+    and rrule_until, the RRULE UNTIL part, which RFC 5545 makes inclusive.
+    """
+    start: datetime
+    type: RecurrenceType
+    interval: int = 1
+    weekdays: Tuple[int, ...] = ()
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    rrule_until: Optional[datetime] = None
+
+    @classmethod
+    def from_data(
+        cls,
+        start: datetime,
+        recurrence_data: Dict[str, Any],
+        count: Optional[int] = None,
+        until: Optional[datetime] = None
+    ) -> "RecurrenceRule":
+        """
+        Build a rule from parse_recurrence_pattern output.
+
+        Args:
+            start: Anchor date of the rule.
+            recurrence_data: Parsed recurrence data.
+            count: Total number of occurrences (overrides the pattern's COUNT).
+            until: Exclusive end date; the pattern's inclusive UNTIL still applies.
+        """
+        weekdays = tuple(sorted(set(recurrence_data.get("weekdays") or ())))
+        rule_type = RecurrenceType(recurrence_data["type"])
+        if rule_type == RecurrenceType.CUSTOM and not weekdays:
+            raise ValueError("Custom recurrence requires weekdays")
+        return cls(
+            start=start,
+            type=rule_type,
+            interval=int(recurrence_data.get("interval", 1)),
+            weekdays=weekdays,
+            count=count if count is not None else recurrence_data.get("count"),
+            until=until,
+            rrule_until=recurrence_data.get("until"),
+        )
+
+    @classmethod
+    def from_pattern(
+        cls,
+        start: datetime,
+        pattern: str,
+        count: Optional[int] = None,
+        until: Optional[datetime] = None
+    ) -> "RecurrenceRule":
+        return cls.from_data(start, parse_recurrence_pattern(pattern), count, until)
+
+    @property
+    def _by_weekday(self) -> bool:
+        return bool(self.weekdays) and self.type in (RecurrenceType.WEEKLY, RecurrenceType.CUSTOM)
+
+    def nth(self, n: int) -> datetime:
+        """
+        The n-th occurrence (0-based), ignoring count and until.
+
+        Args:
+            n: Occurrence index.
+
+        Returns:
+            The date of the occurrence.
+        """
+        if self._by_weekday:
+            # Weekday rules: the anchor's week holds the matching days on or
+            # after the anchor, every interval-th week after it holds all of them
+            week_start = self.start - timedelta(days=self.start.weekday())
+            first_week = [day for day in self.weekdays if day >= self.start.weekday()]
+            if n < len(first_week):
+                return week_start + timedelta(days=first_week[n])
+            week, slot = divmod(n - len(first_week), len(self.weekdays))
+            return week_start + timedelta(weeks=(week + 1) * self.interval, days=self.weekdays[slot])
+        if self.type == RecurrenceType.DAILY:
+            return self.start + timedelta(days=n * self.interval)
+        if self.type == RecurrenceType.WEEKLY:
+            return self.start + timedelta(weeks=n * self.interval)
+        if self.type == RecurrenceType.MONTHLY:
+            return add_months(self.start, n * self.interval)
+        if self.type == RecurrenceType.YEARLY:
+            return add_months(self.start, 12 * n * self.interval)
+        raise ValueError(f"Unsupported recurrence type: {self.type}")
+
+    def index_at_or_after(self, when: datetime) -> int:
+        """
+        Index of the first occurrence on or after a date.
+
+        Computed from the elapsed time; at most a couple of occurrences are
+        stepped over to correct for months of different lengths.
+        """
+        if when <= self.start:
+            return 0
+        if self._by_weekday:
+            weeks = (when - self.start).days // 7 // self.interval
+            first_week = sum(1 for day in self.weekdays if day >= self.start.weekday())
+            n = max(0, first_week + (weeks - 1) * len(self.weekdays))
+        elif self.type == RecurrenceType.DAILY:
+            n = (when - self.start) // timedelta(days=self.interval)
+        elif self.type == RecurrenceType.WEEKLY:
+            n = (when - self.start) // timedelta(weeks=self.interval)
+        else:
+            months = (when.year - self.start.year) * 12 + when.month - self.start.month
+            step = self.interval * (12 if self.type == RecurrenceType.YEARLY else 1)
+            n = max(0, months // step - 1)
+        while n > 0 and self.nth(n - 1) >= when:
+            n -= 1
+        while self.nth(n) < when:
+            n += 1
+        return n
+
+    def _in_bounds(self, n: int, date: datetime) -> bool:
+        return (
+            (self.count is None or n < self.count)
+            and (self.until is None or date < self.until)
+            and (self.rrule_until is None or date <= self.rrule_until)
+        )
+
+    def between(self, after: datetime, before: datetime, first_index: int = 0) -> Iterator[Tuple[int, datetime]]:
+        """
+        Occurrences in [after, before), respecting count and until.
+
+        Args:
+            after: Inclusive window start.
+            before: Exclusive window end.
+            first_index: Skip occurrences with a lower index.
+
+        Yields:
+            (index, date) pairs in order.
+        """
+        n = max(first_index, self.index_at_or_after(after))
+        while True:
+            date = self.nth(n)
+            if date >= before or not self._in_bounds(n, date):
+                return
+            yield n, date
+            n += 1
+
+    def first(self, limit: int) -> Iterator[Tuple[int, datetime]]:
+        """The first occurrences of the rule, at most limit of them."""
+        for n in range(limit):
+            date = self.nth(n)
+            if not self._in_bounds(n, date):
+                return
+            yield n, date
+
+    def last_date(self) -> Optional[datetime]:
+        """Date of the final occurrence, or None if the rule is unbounded."""
+        ends = []
+        if self.count is not None:
+            ends.append(self.count)
+        if self.until is not None:
+            ends.append(self.index_at_or_after(self.until))
+        if self.rrule_until is not None:
+            end = self.index_at_or_after(self.rrule_until)
+            ends.append(end + 1 if self.nth(end) == self.rrule_until else end)
+        if not ends:
+            return None
+        last = min(ends) - 1
+        return self.nth(last) if last >= 0 else None
@@ -3,29 +3,33 @@ Recurring task service for the Mnemosyne application.
 
 This module provides business logic for managing recurring tasks,
 including parsing recurrence patterns and generating task instances.
+Instances are materialized lazily: only occurrences inside a rolling
+horizon (RECURRENCE_HORIZON_DAYS) exist as tasks, and extend_horizon
+moves every schedule's horizon forward as time passes.
 """
+import logging
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Generator
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
-import re
-from enum import Enum
 
+from sqlalchemy import select, update, or_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.repositories.task import TaskRepository
 from app.db.repositories.task_schedule import TaskScheduleRepository
 from app.db.models.task import Task, TaskStatus, TaskPriority
 from app.db.models.task_schedule import TaskSchedule
+from app.services.task.recurrence import RecurrenceRule, parse_recurrence_pattern
+from app.services.task.reminder_scheduler import ReminderScheduler
 from app.services.task.task_service import TaskService
+from app.utils.common import utc_now
 
+logger = logging.getLogger(__name__)
 
-class RecurrenceType(str, Enum):
-    """Enumeration of supported recurrence types."""
-    DAILY = "daily"
-    WEEKLY = "weekly"
-    MONTHLY = "monthly"
-    YEARLY = "yearly"
-    CUSTOM = "custom"
+# Watermark of schedules whose recurrence has ended
+GENERATED_TO_END = datetime.max
 
 
 class RecurringTaskService:
@@ -52,15 +56,8 @@ class RecurringTaskService:
         """
         Parse a recurrence pattern string into structured data.
         
-        Supported patterns:
-        - "daily" or "every day"
-        - "weekly" or "every week"
-        - "monthly" or "every month"
-        - "yearly" or "every year"
-        - "every N days/weeks/months/years"
-        - "weekdays" (Monday-Friday)
-        - "weekends" (Saturday-Sunday)
-        - "every monday,wednesday,friday"
+        See app.services.task.recurrence.parse_recurrence_pattern for the
+        supported patterns, including RRULE strings.
         
         Args:
             pattern: The recurrence pattern string.
@@ -71,56 +68,7 @@ class RecurringTaskService:
         Raises:
             ValueError: If the pattern is invalid or unsupported.
         """
-        if not pattern:
-            raise ValueError("Recurrence pattern cannot be empty")
-        
-        pattern = pattern.lower().strip()
-        
-        # Simple patterns
-        simple_patterns = {
-            "daily": {"type": RecurrenceType.DAILY, "interval": 1},
-            "every day": {"type": RecurrenceType.DAILY, "interval": 1},
-            "weekly": {"type": RecurrenceType.WEEKLY, "interval": 1},
-            "every week": {"type": RecurrenceType.WEEKLY, "interval": 1},
-            "monthly": {"type": RecurrenceType.MONTHLY, "interval": 1},
-            "every month": {"type": RecurrenceType.MONTHLY, "interval": 1},
-            "yearly": {"type": RecurrenceType.YEARLY, "interval": 1},
-            "every year": {"type": RecurrenceType.YEARLY, "interval": 1},
-            "weekdays": {"type": RecurrenceType.CUSTOM, "weekdays": [0, 1, 2, 3, 4]},  # Mon-Fri
-            "weekends": {"type": RecurrenceType.CUSTOM, "weekdays": [5, 6]},  # Sat-Sun
-        }
-        
-        if pattern in simple_patterns:
-            return simple_patterns[pattern]
-        
-        # Pattern: "every N days/weeks/months/years"
-        interval_match = re.match(r"every (\d+) (day|week|month|year)s?", pattern)
-        if interval_match:
-            interval = int(interval_match.group(1))
-            unit = interval_match.group(2)
-            
-            type_mapping = {
-                "day": RecurrenceType.DAILY,
-                "week": RecurrenceType.WEEKLY,
-                "month": RecurrenceType.MONTHLY,
-                "year": RecurrenceType.YEARLY,
-            }
-            
-            return {"type": type_mapping[unit], "interval": interval}
-        
-        # Pattern: "every monday,wednesday,friday"
-        weekday_match = re.match(r"every ((?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)(?:,(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday))*)", pattern)
-        if weekday_match:
-            weekday_names = weekday_match.group(1).split(",")
-            weekday_mapping = {
-                "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
-                "friday": 4, "saturday": 5, "sunday": 6
-            }
-            
-            weekdays = [weekday_mapping[day.strip()] for day in weekday_names]
-            return {"type": RecurrenceType.CUSTOM, "weekdays": weekdays}
-        
-        raise ValueError(f"Unsupported recurrence pattern: {pattern}")
+        return parse_recurrence_pattern(pattern)
     
     def generate_recurring_dates(
         self,
@@ -143,97 +91,91 @@ class RecurringTaskService:
         Returns:
             List of datetime objects representing recurring dates.
         """
-        dates = []
-        current_date = start_date
-        generated_count = 0
-        
-        # Safety limit
-        if count and count > max_instances:
-            count = max_instances
-        
-        recurrence_type = recurrence_data["type"]
-        
-        while generated_count < (count or max_instances):
-            # Check end date condition
-            if end_date and current_date >= end_date:
-                break
-            
-            # Add current date if it matches the pattern
-            if self._date_matches_pattern(current_date, recurrence_data):
-                dates.append(current_date)
-                generated_count += 1
-            
-            # Move to next potential date
-            current_date = self._get_next_date(current_date, recurrence_type, recurrence_data)
-            
-            # Safety check to prevent infinite loops
-            if current_date > start_date + timedelta(days=365 * 10):  # 10 years max
-                break
-        
-        return dates
+        rule = RecurrenceRule.from_data(start_date, recurrence_data, until=end_date)
+        limit = min(count, max_instances) if count else max_instances
+        return [date for _, date in rule.first(limit)]
+    
+    def _schedule_rule(self, schedule: TaskSchedule) -> RecurrenceRule:
+        """Recurrence rule of a schedule, anchored at its due time."""
+        return RecurrenceRule.from_pattern(
+            schedule.due_time,
+            schedule.recurrence_pattern,
+            count=schedule.recurrence_count,
+            until=schedule.recurrence_end_date
+        )
     
-    def _date_matches_pattern(self, date: datetime, recurrence_data: Dict[str, Any]) -> bool:
+    def _instance_rows(
+        self,
+        master_task: Task,
+        schedule: TaskSchedule,
+        rule: RecurrenceRule,
+        now: datetime,
+        horizon_end: datetime
+    ) -> Tuple[List[Dict[str, Any]], datetime]:
         """
-        Check if a date matches the recurrence pattern.
+        Task rows for a schedule's occurrences not yet materialized.
+        
+        Occurrence 0 is the master task itself. Occurrences are taken from
+        the schedule's watermark (or from now, for a schedule that has none
+        yet) up to the horizon, jumping straight to the first one instead of
+        walking the dates before it.
         
-        Args:
-            date: The date to check.
-            recurrence_data: Parsed recurrence data.
-            
         Returns:
-            True if the date matches the pattern, False otherwise.
+            The rows and the schedule's new watermark.
         """
-        recurrence_type = recurrence_data["type"]
-        
-        if recurrence_type == RecurrenceType.CUSTOM:
-            if "weekdays" in recurrence_data:
-                return date.weekday() in recurrence_data["weekdays"]
-        
-        return True  # For interval-based patterns, all dates in sequence match
+        window_start = schedule.recurrence_generated_until or max(schedule.due_time, now)
+        rows = []
+        for index, due_date in rule.between(window_start, horizon_end, first_index=1):
+            rows.append({
+                "user_id": master_task.user_id,
+                "title": f"{master_task.title} (#{index})",
+                "description": master_task.description,
+                "status": TaskStatus.PENDING,
+                "priority": master_task.priority or TaskPriority.MEDIUM,
+                "due_date": due_date,
+                "estimated_duration_minutes": master_task.estimated_duration_minutes,
+                "difficulty": master_task.difficulty or 1,
+                "quest_type": master_task.quest_type,
+                "visibility_mask": master_task.visibility_mask or "private",
+                "tags": list(master_task.tags or []),
+                "task_metadata": {
+                    **(master_task.task_metadata or {}),
+                    "recurring_master_id": str(master_task.id),
+                    "recurring_instance": index,
+                    "recurring_pattern": schedule.recurrence_pattern
+                },
+                "parent_id": master_task.id,
+                "agent_id": master_task.agent_id,
+                "recurring_parent_id": master_task.id,
+                "occurrence_date": due_date,
+            })
+        
+        last_date = rule.last_date()
+        watermark = GENERATED_TO_END if last_date is not None and last_date < horizon_end else horizon_end
+        return rows, watermark
     
-    def _get_next_date(self, current_date: datetime, recurrence_type: RecurrenceType, recurrence_data: Dict[str, Any]) -> datetime:
+    async def _insert_instances(self, rows: List[Dict[str, Any]]) -> List[Task]:
         """
-        Get the next date in the recurrence sequence.
+        Insert task instances in one bulk statement.
+        
+        Idempotent: an occurrence that already exists for its master task
+        (unique on recurring_parent_id, occurrence_date) is skipped, so
+        overlapping or repeated horizon extensions never duplicate tasks.
+        Reminders of the created tasks are scheduled in the same transaction.
         
-        Args:
-            current_date: The current date.
-            recurrence_type: The type of recurrence.
-            recurrence_data: Parsed recurrence data.
-            
         Returns:
-            The next date in the sequence.
+            The tasks that were created.
         """
-        interval = recurrence_data.get("interval", 1)
-        
-        if recurrence_type == RecurrenceType.DAILY:
-            return current_date + timedelta(days=interval)
-        elif recurrence_type == RecurrenceType.WEEKLY:
-            return current_date + timedelta(weeks=interval)
-        elif recurrence_type == RecurrenceType.MONTHLY:
-            # Handle month boundaries properly
-            next_month = current_date.month + interval
-            next_year = current_date.year + (next_month - 1) // 12
-            next_month = ((next_month - 1) % 12) + 1
-            
-            try:
-                return current_date.replace(year=next_year, month=next_month)
-            except ValueError:
-                # Handle cases like Feb 31 -> Feb 28/29
-                import calendar
-                last_day = calendar.monthrange(next_year, next_month)[1]
-                day = min(current_date.day, last_day)
-                return current_date.replace(year=next_year, month=next_month, day=day)
-        elif recurrence_type == RecurrenceType.YEARLY:
-            try:
-                return current_date.replace(year=current_date.year + interval)
-            except ValueError:
-                # Handle leap year edge case (Feb 29)
-                return current_date.replace(year=current_date.year + interval, day=28)
-        elif recurrence_type == RecurrenceType.CUSTOM:
-            # For custom patterns, move to next day and let matching logic handle it
-            return current_date + timedelta(days=1)
-        
-        return current_date + timedelta(days=1)
+        if not rows:
+            return []
+        stmt = insert(Task).on_conflict_do_nothing(
+            index_elements=[Task.recurring_parent_id, Task.occurrence_date],
+            index_where=Task.recurring_parent_id.isnot(None)
+        ).returning(Task)
+        result = await self.db.scalars(stmt, rows)
+        created = list(result.all())
+        await ReminderScheduler(self.db).schedule_for_new_tasks(created)
+        return created
     
     async def create_recurring_task_instances(
         self,
@@ -241,17 +183,23 @@ class RecurringTaskService:
         user_id: UUID,
         recurrence_pattern: str,
         count: Optional[int] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        now: Optional[datetime] = None
     ) -> List[Task]:
         """
-        Create recurring task instances based on a master task.
+        Make a task recurring and create its instances within the horizon.
+        
+        The pattern, count and end date are stored on the task's schedule.
+        Occurrences from now until the horizon are created immediately, later
+        ones by extend_horizon as time passes.
         
         Args:
             task_id: The ID of the master task.
             user_id: The ID of the user.
             recurrence_pattern: The recurrence pattern string.
-            count: Maximum number of instances to create.
+            count: Total number of occurrences, including the master task.
             end_date: End date for recurrence.
+            now: Reference time for the horizon (defaults to the current UTC time).
             
         Returns:
             List of created task instances.
@@ -260,8 +208,8 @@ class RecurringTaskService:
             ValueError: If the task doesn't exist or pattern is invalid.
         """
         # Get the master task
-        master_task = await self.task_repository.get_by_id(task_id)
-        if not master_task or master_task.user_id != user_id:
+        master_task = await self.task_repository.get_task_by_id(task_id)
+        if not master_task or str(master_task.user_id) != str(user_id):
             raise ValueError("Task not found or access denied")
         
         # Get the task schedule
@@ -269,43 +217,102 @@ class RecurringTaskService:
         if not schedule:
             raise ValueError("Task must have a schedule to create recurring instances")
         
-        # Parse recurrence pattern
-        recurrence_data = self.parse_recurrence_pattern(recurrence_pattern)
+        # Validate the pattern before storing it
+        parse_recurrence_pattern(recurrence_pattern)
+        schedule.recurrence_pattern = recurrence_pattern
+        schedule.recurrence_count = count
+        schedule.recurrence_end_date = end_date
+        schedule.recurrence_generated_until = None
+        master_task.is_recurring = True
+        master_task.recurrence_rule = recurrence_pattern
+        
+        now = now or utc_now()
+        horizon_end = now + timedelta(days=settings.RECURRENCE_HORIZON_DAYS)
+        rows, watermark = self._instance_rows(master_task, schedule, self._schedule_rule(schedule), now, horizon_end)
+        created_tasks = await self._insert_instances(rows)
+        schedule.recurrence_generated_until = watermark
+        await self.db.flush()
         
-        # Generate recurring dates
-        start_date = schedule.due_time
-        recurring_dates = self.generate_recurring_dates(
-            start_date,
-            recurrence_data,
-            count,
-            end_date
-        )
+        return created_tasks
+    
+    async def extend_horizon(
+        self,
+        now: Optional[datetime] = None,
+        horizon_days: Optional[int] = None,
+        batch_size: int = 500
+    ) -> Dict[str, int]:
+        """
+        Materialize the occurrences of every recurring schedule up to the horizon.
         
-        # Create task instances
-        created_tasks = []
-        for i, due_date in enumerate(recurring_dates[1:], 1):  # Skip first date (original task)
-            # Create new task instance
-            new_task = await self.task_service.create_task(
-                title=f"{master_task.title} (#{i})",
-                user_id=user_id,
-                description=master_task.description,
-                status=TaskStatus.PENDING,
-                priority=master_task.priority,
-                due_date=due_date,
-                tags=master_task.tags,
-                metadata={
-                    **master_task.metadata,
-                    "recurring_master_id": str(task_id),
-                    "recurring_instance": i,
-                    "recurring_pattern": recurrence_pattern
-                },
-                parent_id=task_id,
-                agent_id=master_task.agent_id
+        SchedulerService runs this every RECURRENCE_EXTEND_MINUTES. Schedules
+        are processed in primary-key batches; each batch costs one query for
+        the schedules due for extension, one bulk insert and one bulk
+        watermark update, and is committed on its own. Schedules whose
+        recurrence has ended or cannot be parsed are never selected again.
+        
+        Args:
+            now: Reference time (defaults to the current UTC time).
+            horizon_days: How far ahead to materialize (defaults to RECURRENCE_HORIZON_DAYS).
+            batch_size: Schedules per batch.
+            
+        Returns:
+            Counts of schedules processed, tasks created and invalid schedules.
+        """
+        now = now or utc_now()
+        horizon_end = now + timedelta(
+            days=settings.RECURRENCE_HORIZON_DAYS if horizon_days is None else horizon_days
+        )
+        summary = {"schedules": 0, "created": 0, "invalid": 0}
+        last_id = None
+        
+        while True:
+            query = (
+                select(TaskSchedule, Task)
+                .join(Task, Task.id == TaskSchedule.task_id)
+                .where(
+                    TaskSchedule.recurrence_pattern.isnot(None),
+                    or_(
+                        TaskSchedule.recurrence_generated_until.is_(None),
+                        TaskSchedule.recurrence_generated_until < horizon_end
+                    )
+                )
+                .order_by(TaskSchedule.id)
+                .limit(batch_size)
             )
+            if last_id is not None:
+                query = query.where(TaskSchedule.id > last_id)
+            batch = (await self.db.execute(query)).all()
+            if not batch:
+                break
+            last_id = batch[-1][0].id
             
-            created_tasks.append(new_task)
+            rows = []
+            watermarks = []
+            for schedule, master_task in batch:
+                try:
+                    rule = self._schedule_rule(schedule)
+                except ValueError as e:
+                    # Marked done so it is not selected again until the pattern is replaced
+                    logger.warning(f"Skipping schedule {schedule.id} with invalid recurrence: {e}")
+                    summary["invalid"] += 1
+                    watermarks.append({"id": schedule.id, "recurrence_generated_until": GENERATED_TO_END})
+                    continue
+                schedule_rows, watermark = self._instance_rows(master_task, schedule, rule, now, horizon_end)
+                rows.extend(schedule_rows)
+                watermarks.append({"id": schedule.id, "recurrence_generated_until": watermark})
+            
+            created = await self._insert_instances(rows)
+            if watermarks:
+                await self.db.execute(update(TaskSchedule), watermarks)
+            await self.db.commit()
+            
+            summary["schedules"] += len(batch)
+            summary["created"] += len(created)
+            # Committed objects are expired; don't keep a growing identity map
+            self.db.expunge_all()
         
-        return created_tasks
+        logger.info(f"Extended recurrence horizon to {horizon_end.isoformat()}: {summary}")
+        return summary
     
     async def update_recurring_task_series(
         self,
@@ -7,7 +7,7 @@ scheduled checks, notification preparation, and reminder templates.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from uuid import UUID
 import asyncio
 import json
@@ -15,9 +15,17 @@ import json
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models.task import Task
+from app.core.config import settings
+from app.db.models.task import Task, TaskStatus
+from app.db.models.task_reminder import ReminderStatus
 from app.db.models.user import User
 from app.services.task.task_intelligence import TaskIntelligenceService
+from app.services.task.reminder_scheduler import (
+    ClaimedReminder,
+    ReminderScheduler,
+    reminder_times,
+    reminder_type_for
+)
 from app.services.llm.llm_service_enhanced import EnhancedLLMService, EnhancedLLMConfig
 
 logger = logging.getLogger(__name__)
@@ -37,68 +45,152 @@ class ReminderEngine:
         """
         self.db = db
         self.task_intelligence = TaskIntelligenceService(db)
+        self.scheduler = ReminderScheduler(db)
         self.llm_config = EnhancedLLMConfig(
             temperature=0.7,
             memory_enabled=True
         )
         
-    async def check_and_send_reminders(self) -> Dict[str, Any]:
+    async def check_and_send_reminders(
+        self,
+        now: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+        max_batches: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
-        Check for tasks needing reminders and prepare notifications.
+        Dispatch the reminders whose time has come.
         
-        This method should be called periodically (e.g., every hour)
-        to check for upcoming tasks and generate reminders.
+        This method should be called periodically (e.g., every minute).
+        Reminders are claimed from the due-time index in batches, grouped
+        by user into one message each, and marked sent. Safe to run on
+        several replicas at once: each reminder is claimed by one of them.
         
+        Args:
+            now: Current time (defaults to the current UTC time)
+            batch_size: Reminders claimed per batch (defaults to REMINDER_BATCH_SIZE)
+            max_batches: Stop after this many batches (None drains all due reminders)
+            
         Returns:
             Summary of reminders processed
         """
-        # Get all active users
-        result = await self.db.execute(
-            select(User).where(User.is_active == True)
-        )
-        users = result.scalars().all()
-        
-        reminders_sent = 0
-        users_notified = 0
+        now = now or datetime.utcnow()
+        batch_size = batch_size or settings.REMINDER_BATCH_SIZE
+        
+        summary = {
+            "timestamp": now.isoformat(),
+            "batches": 0,
+            "reminders_claimed": 0,
+            "reminders_sent": 0,
+            "reminders_dropped": 0,
+            "reminders_failed": 0,
+            "users_notified": 0
+        }
         
-        for user in users:
-            # Get upcoming reminders for this user
-            user_reminders = await self.task_intelligence.get_upcoming_reminders(
-                user_id=user.id,
-                hours_ahead=24
-            )
+        while max_batches is None or summary["batches"] < max_batches:
+            claimed = await self.scheduler.claim_due(now=now, limit=batch_size)
+            # Release the row locks; the lease keeps the claim
+            await self.db.commit()
+            if not claimed:
+                break
+            summary["batches"] += 1
+            summary["reminders_claimed"] += len(claimed)
             
-            if user_reminders:
-                # Generate personalized reminder message
+            await self._dispatch_batch(claimed, now, summary)
+            await self.db.commit()
+            
+            if len(claimed) < batch_size:
+                break
+        
+        if summary["reminders_claimed"]:
+            logger.info("Dispatched due reminders", extra=summary)
+        return summary
+    
+    async def _dispatch_batch(
+        self,
+        claimed: List[ClaimedReminder],
+        now: datetime,
+        summary: Dict[str, Any]
+    ) -> None:
+        """
+        Send one batch of claimed reminders, one message per user.
+        
+        Reminders for tasks that are gone, no longer pending or past due are
+        dropped. A failed send leaves the reminders claimed, so they are
+        retried when the lease expires, until REMINDER_MAX_ATTEMPTS.
+        """
+        tasks = await self.scheduler.load_tasks(claimed)
+        
+        by_user: Dict[UUID, List[Tuple[ClaimedReminder, Dict[str, Any]]]] = {}
+        dropped = []
+        for reminder in claimed:
+            task = tasks.get(reminder.task_id)
+            if not task or task.status != TaskStatus.PENDING or not task.due_date or task.due_date <= now:
+                dropped.append(reminder.id)
+                continue
+            hours_until = (task.due_date - now).total_seconds() / 3600
+            task_reminder = {
+                "reminder_id": str(reminder.id),
+                "task_id": str(task.id),
+                "title": task.title,
+                "description": task.description,
+                "priority": task.priority,
+                "due_date": task.due_date.isoformat(),
+                "hours_until_due": round(hours_until, 1),
+                "reminder_type": reminder_type_for(hours_until)
+            }
+            by_user.setdefault(reminder.user_id, []).append((reminder, task_reminder))
+        
+        await self.scheduler.mark(dropped, ReminderStatus.CANCELLED)
+        summary["reminders_dropped"] += len(dropped)
+        
+        for user_id, entries in by_user.items():
+            user_reminders = [task_reminder for _, task_reminder in entries]
+            try:
                 reminder_message = await self._generate_reminder_message(
-                    user_id=user.id,
+                    user_id=user_id,
                     reminders=user_reminders
                 )
-                
-                # Store reminder for delivery (webhook, email, etc.)
                 await self._store_reminder_for_delivery(
-                    user_id=user.id,
+                    user_id=user_id,
                     reminder_message=reminder_message,
                     task_reminders=user_reminders
                 )
-                
-                reminders_sent += len(user_reminders)
-                users_notified += 1
-                
-                logger.info(
-                    f"Generated reminders for user",
-                    extra={
-                        "user_id": str(user.id),
-                        "reminder_count": len(user_reminders)
-                    }
+            except Exception as e:
+                exhausted = [reminder.id for reminder, _ in entries if reminder.attempts >= settings.REMINDER_MAX_ATTEMPTS]
+                await self.scheduler.mark(exhausted, ReminderStatus.FAILED)
+                summary["reminders_failed"] += len(exhausted)
+                logger.error(
+                    f"Failed to dispatch reminders: {e}",
+                    extra={"user_id": str(user_id), "reminder_count": len(entries)}
                 )
+                continue
+            
+            await self.scheduler.mark([reminder.id for reminder, _ in entries], ReminderStatus.SENT, now)
+            summary["reminders_sent"] += len(entries)
+            summary["users_notified"] += 1
+    
+    async def snooze_reminder(
+        self,
+        reminder_id: UUID,
+        user_id: UUID,
+        minutes: int = 60
+    ) -> bool:
+        """
+        Snooze a reminder by putting it back into the schedule.
         
-        return {
-            "timestamp": datetime.utcnow().isoformat(),
-            "users_checked": len(users),
-            "users_notified": users_notified,
-            "reminders_sent": reminders_sent
-        }
+        Args:
+            reminder_id: Reminder to snooze
+            user_id: Owner of the reminder
+            minutes: How long to snooze
+            
+        Returns:
+            True if the reminder was found
+        """
+        snoozed = await self.scheduler.snooze(
+            reminder_id, user_id, datetime.utcnow() + timedelta(minutes=minutes)
+        )
+        await self.db.commit()
+        return snoozed
     
     async def _generate_reminder_message(
         self,
@@ -289,36 +381,5 @@ class ReminderEngine:
         if not task or not task.due_date:
             return []
         
-        reminders = []
-        now = datetime.utcnow()
-        
-        # Calculate time until due
-        time_until_due = task.due_date - now
-        hours_until_due = time_until_due.total_seconds() / 3600
-        
-        # Generate reminders based on priority and time
-        if task.priority == "high":
-            # High priority: more frequent reminders
-            if hours_until_due > 48:
-                reminders.append(task.due_date - timedelta(days=2))
-            if hours_until_due > 24:
-                reminders.append(task.due_date - timedelta(days=1))
-            if hours_until_due > 4:
-                reminders.append(task.due_date - timedelta(hours=4))
-            if hours_until_due > 1:
-                reminders.append(task.due_date - timedelta(hours=1))
-        elif task.priority == "medium":
-            # Medium priority: balanced reminders
-            if hours_until_due > 24:
-                reminders.append(task.due_date - timedelta(days=1))
-            if hours_until_due > 4:
-                reminders.append(task.due_date - timedelta(hours=4))
-        else:
-            # Low priority: minimal reminders
-            if hours_until_due > 24:
-                reminders.append(task.due_date - timedelta(days=1))
-        
-        # Filter out past reminders
-        reminders = [r for r in reminders if r > now]
-        
-        return sorted(reminders)
\ No newline at end of file
+        # Same offsets the reminder scheduler uses for the task
+        return reminder_times(task.priority, task.due_date, datetime.utcnow())
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""
+Task reminder scheduler for the Mnemosyne application.
+
+This module keeps task reminders in a due-time index (task_reminders,
+indexed on remind_at for pending reminders) and hands out the ones whose
+time has come. Claiming uses FOR UPDATE SKIP LOCKED and pushes the claimed
+reminders' remind_at forward by a lease, so several scheduler replicas can
+tick concurrently without sending a reminder twice, and a reminder whose
+dispatch never completed becomes due again once its lease runs out.
+A tick therefore costs O(due reminders), independent of the number of
+users or tasks.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.task import Task, TaskPriority, TaskStatus
+from app.db.models.task_reminder import ReminderStatus, TaskReminder
+from app.utils.common import utc_now
+
+# How long before the due date reminders fire, by task priority
+REMINDER_OFFSETS: Dict[TaskPriority, Tuple[timedelta, ...]] = {
+    TaskPriority.URGENT: (timedelta(days=2), timedelta(days=1), timedelta(hours=4), timedelta(hours=1)),
+    TaskPriority.HIGH: (timedelta(days=2), timedelta(days=1), timedelta(hours=4), timedelta(hours=1)),
+    TaskPriority.MEDIUM: (timedelta(days=1), timedelta(hours=4)),
+    TaskPriority.LOW: (timedelta(days=1),),
+}
+
+
+def reminder_times(priority: Optional[TaskPriority], due_date: datetime, now: datetime) -> List[datetime]:
+    """
+    Reminder times for a task that are still in the future.
+
+    A task due so soon that every regular reminder has passed gets one
+    immediate reminder.
+
+    Args:
+        priority: Task priority (None counts as medium).
+        due_date: Task due date.
+        now: Current time.
+
+    Returns:
+        Sorted reminder times.
+    """
+    if due_date <= now:
+        return []
+    offsets = REMINDER_OFFSETS.get(priority or TaskPriority.MEDIUM, REMINDER_OFFSETS[TaskPriority.MEDIUM])
+    times = sorted(due_date - offset for offset in offsets if due_date - offset > now)
+    return times or [now]
+
+
+def reminder_type_for(hours_until_due: float) -> str:
+    """Urgency class of a reminder from the hours left until the task is due."""
+    if hours_until_due <= 1:
+        return "urgent"
+    elif hours_until_due <= 4:
+        return "soon"
+    elif hours_until_due <= 24:
+        return "today"
+    return "upcoming"
+
+
+@dataclass
+class ClaimedReminder:
+    """A due reminder claimed for dispatch."""
+    id: UUID
+    task_id: UUID
+    user_id: UUID
+    attempts: int
+
+
+class ReminderScheduler:
+    """
+    Due-time index of task reminders.
+
+    Reminders are (re)scheduled whenever a task's due date, priority or
+    status changes, and claimed in batches by ReminderEngine.
+    """
+
+    def __init__(self, db: AsyncSession, lease_seconds: Optional[int] = None):
+        """
+        Initialize the reminder scheduler.
+
+        Args:
+            db: The SQLAlchemy async database session.
+            lease_seconds: How long a claim is held before the reminder is due
+                again (defaults to REMINDER_CLAIM_LEASE_SECONDS).
+        """
+        self.db = db
+        self.lease = timedelta(
+            seconds=settings.REMINDER_CLAIM_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        )
+
+    @staticmethod
+    def _reminder_rows(task: Task, now: datetime) -> List[Dict]:
+        """Reminder rows for a task's current state; only pending tasks with a due date get any."""
+        if task.status != TaskStatus.PENDING or not task.due_date:
+            return []
+        return [
+            {"task_id": task.id, "user_id": task.user_id, "remind_at": remind_at}
+            for remind_at in reminder_times(task.priority, task.due_date, now)
+        ]
+
+    async def schedule_for_task(self, task: Task, now: Optional[datetime] = None) -> int:
+        """
+        Replace a task's pending reminders with ones for its current state.
+
+        Only pending tasks with a due date get reminders.
+
+        Args:
+            task: The task.
+            now: Current time (defaults to the current UTC time).
+
+        Returns:
+            Number of reminders scheduled.
+        """
+        now = now or utc_now()
+        await self.cancel_for_task(task.id)
+        rows = self._reminder_rows(task, now)
+        if rows:
+            await self.db.execute(TaskReminder.__table__.insert(), rows)
+        return len(rows)
+
+    async def schedule_for_new_tasks(self, tasks: Iterable[Task], now: Optional[datetime] = None) -> int:
+        """
+        Schedule reminders for tasks just created, in one bulk insert.
+
+        The tasks must already be flushed. New tasks have no reminders, so
+        nothing is cancelled first.
+
+        Args:
+            tasks: The new tasks.
+            now: Current time (defaults to the current UTC time).
+
+        Returns:
+            Number of reminders scheduled.
+        """
+        now = now or utc_now()
+        rows = [row for task in tasks for row in self._reminder_rows(task, now)]
+        if rows:
+            await self.db.execute(TaskReminder.__table__.insert(), rows)
+        return len(rows)
+
+    async def cancel_for_task(self, task_id: Union[UUID, str]) -> None:
+        """Drop a task's pending reminders."""
+        await self.db.execute(
+            delete(TaskReminder).where(
+                TaskReminder.task_id == task_id,
+                TaskReminder.status == ReminderStatus.PENDING.value
+            )
+        )
+
+    async def claim_due(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[ClaimedReminder]:
+        """
+        Claim reminders whose time has come, oldest first.
+
+        One statement: rows locked by a concurrent claim are skipped, and
+        claimed rows get remind_at = now + lease so they stay invisible to
+        other schedulers while being dispatched. The caller should commit
+        right away to release the row locks.
+
+        Args:
+            now: Current time (defaults to the current UTC time).
+            limit: Maximum reminders to claim (defaults to REMINDER_BATCH_SIZE).
+
+        Returns:
+            The claimed reminders.
+        """
+        now = now or utc_now()
+        due = (
+            select(TaskReminder.id)
+            .where(
+                TaskReminder.status == ReminderStatus.PENDING.value,
+                TaskReminder.remind_at <= now
+            )
+            .order_by(TaskReminder.remind_at)
+            .limit(limit or settings.REMINDER_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(TaskReminder)
+            .where(TaskReminder.id.in_(due.scalar_subquery()))
+            .values(remind_at=now + self.lease, attempts=TaskReminder.attempts + 1)
+            .returning(TaskReminder.id, TaskReminder.task_id, TaskReminder.user_id, TaskReminder.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        return [ClaimedReminder(*row) for row in result.all()]
+
+    async def load_tasks(self, reminders: Iterable[ClaimedReminder]) -> Dict[UUID, Task]:
+        """Tasks of claimed reminders, fetched in one query."""
+        task_ids = {reminder.task_id for reminder in reminders}
+        if not task_ids:
+            return {}
+        result = await self.db.execute(select(Task).where(Task.id.in_(task_ids)))
+        return {task.id: task for task in result.scalars().all()}
+
+    async def mark(self, reminder_ids: List[UUID], status: ReminderStatus, now: Optional[datetime] = None) -> None:
+        """Set the final status of dispatched (or dropped) reminders."""
+        if not reminder_ids:
+            return
+        values = {"status": status.value}
+        if status == ReminderStatus.SENT:
+            values["sent_at"] = now or utc_now()
+        await self.db.execute(
+            update(TaskReminder)
+            .where(TaskReminder.id.in_(reminder_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def snooze(
+        self,
+        reminder_id: Union[UUID, str],
+        user_id: Union[UUID, str],
+        until: datetime
+    ) -> bool:
+        """
+        Snooze a reminder: put it back in the index at a later time.
+
+        Args:
+            reminder_id: The reminder to snooze.
+            user_id: Owner of the reminder.
+            until: When the reminder is due again.
+
+        Returns:
+            True if the reminder was found.
+        """
+        result = await self.db.execute(
+            update(TaskReminder)
+            .where(TaskReminder.id == reminder_id, TaskReminder.user_id == user_id)
+            .values(remind_at=until, status=ReminderStatus.PENDING.value, attempts=0, sent_at=None)
+            .returning(TaskReminder.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.first() is not None
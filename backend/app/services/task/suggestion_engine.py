@@ -18,6 +18,7 @@ from app.db.models.task import Task, TaskStatus
 from app.db.models.memory import Memory
 from app.db.models.conversation import Conversation, Message
 from app.services.memory.memory_service_enhanced import MemoryService
+from app.services.task.task_similarity import TaskSimilarityIndex
 from app.services.llm.llm_service_enhanced import EnhancedLLMService, EnhancedLLMConfig
 
 logger = logging.getLogger(__name__)
@@ -37,6 +38,7 @@ class TaskSuggestionEngine:
         """
         self.db = db
         self.memory_service = MemoryService(db)
+        self.similarity_index = TaskSimilarityIndex(db)
         self.llm_config = EnhancedLLMConfig(
             temperature=0.8,  # Higher for more creative suggestions
             memory_enabled=True
@@ -71,6 +73,16 @@ class TaskSuggestionEngine:
         suggestions.extend(await self._suggest_from_memories(user_id, memories))
         suggestions.extend(await self._suggest_time_based_tasks(user_id, context))
         
+        # Drop suggestions for tasks the user already has open
+        if suggestions:
+            duplicates = await self.similarity_index.find_duplicates(
+                user_id, [suggestion["title"] for suggestion in suggestions]
+            )
+            suggestions = [
+                suggestion for suggestion, is_duplicate in zip(suggestions, duplicates)
+                if not is_duplicate
+            ]
+        
         # Use LLM to refine and rank suggestions
         refined_suggestions = await self._refine_suggestions_with_llm(
             user_id, suggestions, patterns, context
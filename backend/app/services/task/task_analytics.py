@@ -0,0 +1,296 @@
+"""
+Task analytics service for the Mnemosyne application.
+
+This module computes a user's task statistics inside the database. Status,
+priority, quest type and due-date breakdowns come from one grouped aggregate
+over the covering index on tasks (user_id, status), and completion streaks
+from a gaps-and-islands window query over the days with completions. The
+whole report is a single statement whose result size is bounded by the
+number of enum combinations, however many tasks the user has.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Optional, Union
+from uuid import UUID
+
+from sqlalchemy import Date, Integer, case, cast, func, null, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.task import Task, TaskDailyStats, TaskStatus
+from app.schemas.task import TaskStats
+from app.utils.common import utc_now
+
+# Statuses whose due dates still matter
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED)
+
+
+class TaskAnalyticsService:
+    """
+    Service for task statistics and completion streaks.
+
+    Streaks are read from the task_daily_stats rollup when
+    TASK_STATS_DAILY_ROLLUP is enabled, which keeps them cheap for users
+    with long histories; the rollup is maintained by record_transition.
+    """
+
+    def __init__(self, db: AsyncSession, use_rollup: Optional[bool] = None):
+        """
+        Initialize the task analytics service.
+
+        Args:
+            db: The SQLAlchemy async database session.
+            use_rollup: Use the daily rollup table (defaults to TASK_STATS_DAILY_ROLLUP).
+        """
+        self.db = db
+        self.use_rollup = settings.TASK_STATS_DAILY_ROLLUP if use_rollup is None else use_rollup
+
+    async def get_stats(self, user_id: Union[UUID, str], now: Optional[datetime] = None) -> TaskStats:
+        """
+        Compute the statistics of a user's tasks in one round trip.
+
+        Args:
+            user_id: The ID of the user.
+            now: Reference time for due dates and streaks (defaults to the current UTC time).
+
+        Returns:
+            Task statistics including breakdowns and streaks.
+        """
+        now = now or utc_now()
+        rows = (await self.db.execute(self.stats_query(user_id, now))).all()
+        return self.build_stats(rows)
+
+    def stats_query(self, user_id: Union[UUID, str], now: datetime):
+        """
+        Build the statistics query.
+
+        Returns one row per (status, priority, quest type, due bucket) group,
+        each carrying the user's current and longest streak.
+        """
+        start_of_day = datetime(now.year, now.month, now.day)
+        due_bucket = case(
+            (Task.status.notin_(OPEN_STATUSES), null()),
+            (Task.due_date.is_(None), "no_due_date"),
+            (Task.due_date < now, "overdue"),
+            (Task.due_date < start_of_day + timedelta(days=1), "due_today"),
+            (Task.due_date < start_of_day + timedelta(days=7), "due_this_week"),
+            else_="later"
+        ).label("due_bucket")
+        on_time = (Task.due_date.isnot(None)) & (Task.completed_at <= Task.due_date)
+        current_streak, longest_streak = self._streak_columns(user_id, now.date())
+
+        return (
+            select(
+                Task.status,
+                Task.priority,
+                Task.quest_type,
+                due_bucket,
+                func.count().label("tasks"),
+                func.coalesce(func.sum(Task.estimated_duration_minutes), 0).label("estimated_minutes"),
+                func.coalesce(func.sum(Task.actual_duration_minutes), 0).label("actual_minutes"),
+                func.coalesce(func.sum(Task.experience_points), 0).label("experience"),
+                func.coalesce(func.sum(Task.difficulty), 0).label("difficulty"),
+                func.count().filter(on_time).label("on_time"),
+                current_streak.label("current_streak"),
+                longest_streak.label("longest_streak"),
+            )
+            .where(Task.user_id == user_id)
+            .group_by(Task.status, Task.priority, Task.quest_type, "due_bucket")
+        )
+
+    def _streak_columns(self, user_id: Union[UUID, str], today: date):
+        """
+        Current and longest completion streak as scalar subqueries.
+
+        Consecutive days minus their row number are constant within a run
+        (an "island"), so grouping by that difference yields every streak.
+        The current streak is the run ending today or yesterday: it stays
+        alive until a whole day passes without a completion.
+        """
+        if self.use_rollup:
+            days = select(TaskDailyStats.day.label("day")).where(
+                TaskDailyStats.user_id == user_id,
+                TaskDailyStats.completed_count > 0
+            )
+        else:
+            completed_day = cast(Task.completed_at, Date)
+            days = select(completed_day.label("day")).where(
+                Task.user_id == user_id,
+                Task.status == TaskStatus.COMPLETED,
+                Task.completed_at.isnot(None)
+            ).distinct()
+        days = days.subquery("completion_days")
+
+        islands = select(
+            days.c.day,
+            (days.c.day - cast(func.row_number().over(order_by=days.c.day), Integer)).label("island")
+        ).subquery("islands")
+        runs = select(
+            func.max(islands.c.day).label("last_day"),
+            func.count().label("length")
+        ).group_by(islands.c.island).cte("streak_runs")
+
+        current = select(func.coalesce(func.max(runs.c.length), 0)).where(
+            runs.c.last_day >= today - timedelta(days=1)
+        ).scalar_subquery()
+        longest = select(func.coalesce(func.max(runs.c.length), 0)).scalar_subquery()
+        return current, longest
+
+    @staticmethod
+    def build_stats(rows) -> TaskStats:
+        """
+        Fold the grouped rows of stats_query into TaskStats.
+
+        Completion time, experience and on-time rate only count completed
+        tasks; the overdue count only counts pending tasks.
+        """
+        stats = TaskStats()
+        total_difficulty = 0
+        on_time_count = 0
+
+        for row in rows:
+            status = _value(row.status)
+            count = row.tasks
+            stats.total_tasks += count
+            stats.tasks_by_status[status] = stats.tasks_by_status.get(status, 0) + count
+
+            priority = _value(row.priority)
+            stats.tasks_by_priority[priority] = stats.tasks_by_priority.get(priority, 0) + count
+
+            if row.quest_type is not None:
+                quest_type = _value(row.quest_type)
+                stats.tasks_by_quest_type[quest_type] = stats.tasks_by_quest_type.get(quest_type, 0) + count
+
+            if row.due_bucket is not None:
+                stats.tasks_by_due_date[row.due_bucket] = stats.tasks_by_due_date.get(row.due_bucket, 0) + count
+
+            if status == TaskStatus.COMPLETED.value:
+                stats.completed_tasks += count
+                stats.total_experience += row.experience
+                stats.total_time_actual += row.actual_minutes
+                on_time_count += row.on_time
+            elif status == TaskStatus.IN_PROGRESS.value:
+                stats.in_progress_tasks += count
+            elif status == TaskStatus.PENDING.value and row.due_bucket == "overdue":
+                stats.overdue_tasks += count
+
+            stats.total_time_estimated += row.estimated_minutes
+            total_difficulty += row.difficulty
+            stats.current_streak = row.current_streak
+            stats.longest_streak = row.longest_streak
+
+        if stats.completed_tasks > 0:
+            stats.on_time_completion_rate = on_time_count / stats.completed_tasks
+            if stats.total_time_actual > 0:
+                stats.average_completion_time = stats.total_time_actual / stats.completed_tasks
+
+        if stats.total_tasks > 0:
+            stats.average_difficulty = total_difficulty / stats.total_tasks
+
+        return stats
+
+    async def record_transition(
+        self,
+        user_id: Union[UUID, str],
+        previous_status: Optional[TaskStatus],
+        status: TaskStatus,
+        completed_at: Optional[datetime],
+        experience_points: int = 0
+    ) -> None:
+        """
+        Apply a task status change to the daily rollup.
+
+        Completing a task adds it to the day it was completed on; reopening
+        a completed task removes it again.
+
+        Args:
+            user_id: The ID of the task's owner.
+            previous_status: Status before the change.
+            status: Status after the change.
+            completed_at: Completion time of the task (before a reopen).
+            experience_points: Experience the completion was worth.
+        """
+        if not self.use_rollup or completed_at is None or previous_status == status:
+            return
+        if status == TaskStatus.COMPLETED:
+            delta = 1
+        elif previous_status == TaskStatus.COMPLETED:
+            delta = -1
+        else:
+            return
+        await self._add_to_day(user_id, completed_at, delta, experience_points)
+
+    async def record_deletion(self, task: Task) -> None:
+        """
+        Remove a hard-deleted task from the daily rollup.
+
+        Soft-deleted tasks stay in the rollup, as they do in a rebuild.
+
+        Args:
+            task: The task being deleted.
+        """
+        if not self.use_rollup or task.status != TaskStatus.COMPLETED or task.completed_at is None:
+            return
+        await self._add_to_day(task.user_id, task.completed_at, -1, task.experience_points)
+
+    async def _add_to_day(
+        self,
+        user_id: Union[UUID, str],
+        completed_at: datetime,
+        delta: int,
+        experience_points: Optional[int]
+    ) -> None:
+        """Add delta completions (and their experience) to a day of the rollup."""
+        stmt = insert(TaskDailyStats).values(
+            user_id=user_id,
+            day=completed_at.date(),
+            completed_count=delta,
+            experience_points=delta * (experience_points or 0)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TaskDailyStats.user_id, TaskDailyStats.day],
+            set_={
+                "completed_count": TaskDailyStats.completed_count + stmt.excluded.completed_count,
+                "experience_points": TaskDailyStats.experience_points + stmt.excluded.experience_points,
+                "updated_at": utc_now(),
+            }
+        )
+        await self.db.execute(stmt)
+
+    async def rebuild_daily_rollup(self, user_id: Optional[Union[UUID, str]] = None) -> None:
+        """
+        Recompute the daily rollup from the tasks table.
+
+        Needed after enabling TASK_STATS_DAILY_ROLLUP on a database where
+        transitions were not being recorded.
+
+        Args:
+            user_id: Only rebuild this user's rollup (all users if None).
+        """
+        scope = true() if user_id is None else TaskDailyStats.user_id == user_id
+        await self.db.execute(TaskDailyStats.__table__.delete().where(scope))
+
+        completed_day = cast(Task.completed_at, Date)
+        rollup = select(
+            Task.user_id,
+            completed_day,
+            func.count(),
+            func.coalesce(func.sum(Task.experience_points), 0),
+            func.now(),
+            func.now()
+        ).where(
+            Task.status == TaskStatus.COMPLETED,
+            Task.completed_at.isnot(None),
+            true() if user_id is None else Task.user_id == user_id
+        ).group_by(Task.user_id, completed_day)
+        await self.db.execute(
+            insert(TaskDailyStats).from_select(
+                ["user_id", "day", "completed_count", "experience_points", "created_at", "updated_at"],
+                rollup,
+                include_defaults=False
+            )
+        )
+
+
+def _value(member: Any) -> Any:
+    return member.value if hasattr(member, "value") else member
@@ -16,7 +16,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.task import Task
 from app.db.models.conversation import Conversation, Message
 from app.db.models.memory import Memory
+from app.services.task.reminder_scheduler import ReminderScheduler
 from app.services.task.task_extractor import TaskExtractor
+from app.services.task.task_similarity import TaskSimilarityIndex
 from app.services.memory.memory_service_enhanced import MemoryService
 
 logger = logging.getLogger(__name__)
@@ -36,6 +38,7 @@ class TaskIntelligenceService:
         """
         self.db = db
         self.task_extractor = TaskExtractor()
+        self.similarity_index = TaskSimilarityIndex(db)
         self.memory_service = MemoryService(db)
     
     async def process_conversation_for_tasks(
@@ -93,17 +96,25 @@ class TaskIntelligenceService:
         
         created_tasks = []
         if auto_create and extracted_tasks:
+            # Check all extracted tasks against existing ones in one lookup
+            duplicates = await self.similarity_index.find_duplicates(
+                user_id,
+                [task_data["description"] for task_data in extracted_tasks],
+                within_batch=True
+            )
+            
             # Create tasks in database
-            for task_data in extracted_tasks:
-                # Check if similar task already exists
-                if not await self._task_already_exists(user_id, task_data["description"]):
+            for task_data, is_duplicate in zip(extracted_tasks, duplicates):
+                if not is_duplicate:
                     task = await self._create_task_from_extraction(
                         task_data, conversation_id, user_id
                     )
                     created_tasks.append(task)
         
-        # Commit all tasks
+        # Schedule reminders and commit all tasks
         if created_tasks:
+            await self.db.flush()
+            await ReminderScheduler(self.db).schedule_for_new_tasks(created_tasks)
             await self.db.commit()
         
         return {
@@ -127,40 +138,9 @@ class TaskIntelligenceService:
         }
     
     async def _task_already_exists(self, user_id: UUID, description: str) -> bool:
-        """Check if a similar task already exists for the user."""
-        # Simple check - look for tasks with very similar titles
-        result = await self.db.execute(
-            select(Task)
-            .where(Task.user_id == user_id)
-            .where(Task.status.in_(["pending", "in_progress"]))
-        )
-        
-        existing_tasks = result.scalars().all()
-        
-        # Normalize description
-        normalized_new = description.lower().strip()
-        
-        for task in existing_tasks:
-            normalized_existing = task.title.lower().strip()
-            
-            # Check for high similarity
-            if self._calculate_similarity(normalized_new, normalized_existing) > 0.8:
-                return True
-        
-        return False
-    
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
-        """Calculate simple text similarity."""
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        return intersection / union if union > 0 else 0.0
+        """Check if a similar open task already exists for the user."""
+        duplicates = await self.similarity_index.find_duplicates(user_id, [description])
+        return duplicates[0]
     
     async def _create_task_from_extraction(
         self,
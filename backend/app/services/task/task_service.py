@@ -13,6 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.repositories.task import TaskRepository
 from app.db.models.task import Task, TaskLog, TaskStatus, TaskPriority, QuestType
+from app.services.task.reminder_scheduler import ReminderScheduler
+from app.services.task.task_analytics import TaskAnalyticsService
 
 
 class TaskService:
@@ -102,6 +104,9 @@ class TaskService:
         
         task = await self.repository.create_task(task_data)
         
+        if task.due_date:
+            await ReminderScheduler(self.db).schedule_for_task(task)
+        
         # Create a log entry for task creation
         await self.create_task_log(
             task_id=task.id,
@@ -223,10 +228,33 @@ class TaskService:
         original_task = await self.repository.get_task_by_id(task_id, include_inactive=True)
         if not original_task:
             return None
+        # The repository updates the same instance, so keep what the rollup needs
+        previous_status = original_task.status
+        previous_completed_at = original_task.completed_at
+        previous_experience = original_task.experience_points
+        previous_schedule = (original_task.due_date, original_task.priority)
             
         # Update the task
         updated_task = await self.repository.update_task(task_id, update_data)
         
+        # Keep the daily completion rollup in step with status transitions
+        if updated_task and updated_task.status != previous_status:
+            reopened = previous_status == TaskStatus.COMPLETED
+            await TaskAnalyticsService(self.db).record_transition(
+                user_id=updated_task.user_id,
+                previous_status=previous_status,
+                status=updated_task.status,
+                completed_at=previous_completed_at if reopened else updated_task.completed_at,
+                experience_points=previous_experience if reopened else updated_task.experience_points
+            )
+        
+        # Reminders depend on the due date, priority and status
+        if updated_task and (
+            updated_task.status != previous_status
+            or (updated_task.due_date, updated_task.priority) != previous_schedule
+        ):
+            await ReminderScheduler(self.db).schedule_for_task(updated_task)
+        
         # Create a log entry for the update
         log_message = "Task updated"
         log_metadata = {}
@@ -275,6 +303,10 @@ class TaskService:
         if not task:
             return False
             
+        # A hard-deleted completion no longer counts towards the daily rollup
+        if hard_delete:
+            await TaskAnalyticsService(self.db).record_deletion(task)
+        
         # Delete the task
         result = await self.repository.delete_task(task_id, hard_delete)
         
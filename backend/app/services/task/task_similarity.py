@@ -0,0 +1,112 @@
+"""
+Task similarity index for the Mnemosyne application.
+
+This module finds open tasks that duplicate candidate task titles. Every
+task stores the MinHash LSH band keys of its title in tasks.title_lsh_bands,
+which has a GIN index over all tasks, so a whole batch of candidates is
+checked with one indexed query that returns only open tasks sharing a band
+with some candidate; exact token Jaccard similarity is then computed for
+those few rows instead of for the user's whole backlog. The bands are
+built from punctuation-free word tokens, but the exact comparison keeps
+the whitespace-split words of the original rule, so "rent" and "rent!"
+still count as different words.
+"""
+from typing import Dict, FrozenSet, List, Sequence, Set, Union
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.task import Task, TaskStatus
+from app.utils.minhash import jaccard_similarity, lsh_bands, minhash_signature, normalize_tokens
+
+# Token Jaccard similarity above which two titles are the same task
+DUPLICATE_THRESHOLD = 0.8
+
+OPEN_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+
+
+def title_words(title: str) -> FrozenSet[str]:
+    """Lowercase whitespace-separated words of a title, as compared by the duplicate rule."""
+    return frozenset(title.lower().split())
+
+
+class TaskSimilarityIndex:
+    """
+    Duplicate detection for candidate tasks against a user's open tasks.
+    """
+
+    def __init__(self, db: AsyncSession, threshold: float = DUPLICATE_THRESHOLD):
+        """
+        Initialize the similarity index.
+
+        Args:
+            db: The SQLAlchemy async database session.
+            threshold: Similarity above which a candidate is a duplicate.
+        """
+        self.db = db
+        self.threshold = threshold
+
+    async def find_duplicates(
+        self,
+        user_id: Union[UUID, str],
+        titles: Sequence[str],
+        within_batch: bool = False
+    ) -> List[bool]:
+        """
+        Check a batch of candidate titles against the user's open tasks.
+
+        Args:
+            user_id: Owner of the tasks.
+            titles: Candidate task titles.
+            within_batch: Also count a candidate as a duplicate when it is
+                similar to an earlier, non-duplicate candidate of the batch.
+
+        Returns:
+            For each title, whether it duplicates a task.
+        """
+        candidates = [title_words(title) for title in titles]
+        bands = [lsh_bands(minhash_signature(normalize_tokens(title))) for title in titles]
+
+        existing = await self._tasks_sharing_bands(user_id, {key for keys in bands for key in keys})
+
+        duplicates = []
+        accepted: List[FrozenSet[str]] = []
+        for tokens, keys in zip(candidates, bands):
+            matches = {
+                task_tokens
+                for key in keys
+                for task_tokens in existing.get(key, ())
+            }
+            if within_batch:
+                matches.update(accepted)
+            is_duplicate = any(
+                jaccard_similarity(tokens, other) > self.threshold for other in matches
+            )
+            duplicates.append(is_duplicate)
+            if not is_duplicate:
+                accepted.append(tokens)
+        return duplicates
+
+    async def _tasks_sharing_bands(
+        self,
+        user_id: Union[UUID, str],
+        band_keys: Set[int]
+    ) -> Dict[int, List[FrozenSet[str]]]:
+        """Title words of the user's open tasks, by band key they share with the candidates."""
+        if not band_keys:
+            return {}
+        result = await self.db.execute(
+            select(Task.title, Task.title_lsh_bands)
+            .where(
+                Task.user_id == user_id,
+                Task.status.in_(OPEN_STATUSES),
+                Task.title_lsh_bands.overlap(list(band_keys))
+            )
+        )
+        by_band: Dict[int, List[FrozenSet[str]]] = {}
+        for title, task_bands in result.all():
+            tokens = title_words(title)
+            for key in set(task_bands or ()) & band_keys:
+                by_band.setdefault(key, []).append(tokens)
+        return by_band
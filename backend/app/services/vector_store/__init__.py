@@ -4,9 +4,13 @@ Vector Store Package
 This package provides interfaces for storing and retrieving vector embeddings,
 with implementations for various backends including PostgreSQL with pgvector.
 """
+from app.services.vector_store.bulk_ingest import BulkVectorIngestor, IngestProgress, IngestResult
 from app.services.vector_store.pgvector_store import PGVectorStore, MemoryVectorStore
 
 __all__ = [
+    "BulkVectorIngestor",
+    "IngestProgress",
+    "IngestResult",
     "PGVectorStore",
     "MemoryVectorStore",
 ]
@@ -0,0 +1,362 @@
+"""
+Bulk Vector Ingestion
+
+This module provides COPY-based bulk loading for pgvector tables. Rows are
+streamed through asyncpg's binary COPY into a temporary staging table and
+merged into the target with a single INSERT ... ON CONFLICT per batch, which
+replaces one round trip per row with one per batch.
+"""
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional,
+    Sequence, Union
+)
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    from pgvector.asyncpg import register_vector
+except ImportError:
+    register_vector = None
+
+
+# Set up module logger
+logger = logging.getLogger(__name__)
+
+# Index access methods treated as ANN indexes when deferring maintenance
+ANN_INDEX_METHODS = ("ivfflat", "hnsw")
+
+
+@dataclass
+class IngestProgress:
+    """
+    Progress snapshot reported after each merged batch.
+    """
+    table_name: str
+    rows_done: int
+    batches_done: int
+    elapsed_seconds: float
+    rows_total: Optional[int] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_done / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+@dataclass
+class IngestResult:
+    """
+    Outcome of a bulk ingestion run.
+    """
+    rows: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    ids: List[Any] = field(default_factory=list)
+    skipped_columns: List[str] = field(default_factory=list)
+    rebuilt_indexes: List[str] = field(default_factory=list)
+
+
+ProgressCallback = Callable[[IngestProgress], Union[None, Awaitable[None]]]
+
+
+@dataclass
+class _ColumnInfo:
+    name: str
+    udt_name: str
+    has_default: bool
+
+
+class BulkVectorIngestor:
+    """
+    Streams rows into a pgvector table with binary COPY and merges them.
+
+    Each batch is copied into a session-local staging table created with
+    ``LIKE <table> INCLUDING DEFAULTS`` (so server defaults such as
+    ``gen_random_uuid()`` ids are filled in during COPY) and then merged with
+    ``INSERT ... SELECT ... ON CONFLICT``. Without conflict columns the merge
+    is a plain insert.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        id_column: str = "id",
+        conflict_columns: Optional[Sequence[str]] = None,
+        batch_size: int = 5000
+    ):
+        """
+        Initialize a bulk ingestor.
+
+        Args:
+            table_name: Name of the target table
+            id_column: Primary key column returned for each merged row
+            conflict_columns: Columns of a unique index to merge on
+            batch_size: Number of rows copied and merged per statement
+        """
+        self.table_name = table_name
+        self.id_column = id_column
+        self.conflict_columns = list(conflict_columns or [])
+        self.batch_size = batch_size
+        self._columns: Optional[Dict[str, _ColumnInfo]] = None
+
+    @staticmethod
+    async def _driver_connection(db: AsyncSession) -> Any:
+        """Get the asyncpg connection behind a session, joining its transaction."""
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def _load_columns(self, pg: Any) -> Dict[str, _ColumnInfo]:
+        if self._columns is None:
+            rows = await pg.fetch(
+                "SELECT column_name, udt_name, column_default IS NOT NULL AS has_default "
+                "FROM information_schema.columns "
+                "WHERE table_name = $1 AND table_schema = ANY(current_schemas(false)) "
+                "ORDER BY ordinal_position",
+                self.table_name
+            )
+            if not rows:
+                raise ValueError(f"Table {self.table_name} does not exist")
+            self._columns = {
+                row["column_name"]: _ColumnInfo(row["column_name"], row["udt_name"], row["has_default"])
+                for row in rows
+            }
+        return self._columns
+
+    @staticmethod
+    def _encode(value: Any, udt_name: str) -> Any:
+        """Adapt Python values to what asyncpg's binary COPY codecs expect."""
+        if value is None:
+            return None
+        if udt_name == "vector":
+            return np.asarray(value, dtype=np.float32)
+        if udt_name in ("json", "jsonb") and not isinstance(value, str):
+            return json.dumps(value)
+        if udt_name.startswith("_") and isinstance(value, np.ndarray):
+            return value.tolist()
+        return value
+
+    def _merge_sql(self, staging: str, columns: List[str]) -> str:
+        column_list = ", ".join(columns)
+        sql = f"INSERT INTO {self.table_name} ({column_list}) SELECT {column_list} FROM {staging}"
+        if self.conflict_columns:
+            updates = [
+                c for c in columns
+                if c not in self.conflict_columns and c != self.id_column and c != "created_at"
+            ]
+            target = ", ".join(self.conflict_columns)
+            if updates:
+                assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in updates)
+                sql += f" ON CONFLICT ({target}) DO UPDATE SET {assignments}"
+            else:
+                sql += f" ON CONFLICT ({target}) DO NOTHING"
+        return sql + f" RETURNING {self.id_column}"
+
+    async def _copy_and_merge(
+        self,
+        pg: Any,
+        batch: List[Dict[str, Any]],
+        columns: List[str],
+        copy_columns: List[str],
+        udt_names: List[str],
+        return_ids: bool
+    ) -> List[Any]:
+        staging = f"_stage_{self.table_name}"
+        await pg.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+            f"(LIKE {self.table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        records = [
+            tuple(self._encode(row.get(c), udt) for c, udt in zip(copy_columns, udt_names))
+            for row in batch
+        ]
+        await pg.copy_records_to_table(staging, records=records, columns=copy_columns)
+        merged = await pg.fetch(self._merge_sql(staging, columns))
+        await pg.execute(f"TRUNCATE {staging}")
+        return [row[0] for row in merged] if return_ids else []
+
+    async def ingest(
+        self,
+        db: AsyncSession,
+        rows: Iterable[Dict[str, Any]],
+        progress: Optional[ProgressCallback] = None,
+        defer_indexes: bool = False,
+        commit_every_batch: bool = False,
+        return_ids: bool = True
+    ) -> IngestResult:
+        """
+        Copy and merge rows into the target table in batches.
+
+        Columns are taken from the first row; keys that are not columns of
+        the target table are skipped with a warning. The caller owns the
+        transaction unless ``commit_every_batch`` is set, which commits after
+        each batch so long backfills hold locks and WAL only per batch.
+
+        Args:
+            db: Database session
+            rows: Row dictionaries keyed by column name
+            progress: Optional callback (sync or async) invoked after each batch
+            defer_indexes: Drop ANN indexes for the load and rebuild them after
+            commit_every_batch: Commit the session after every merged batch
+            return_ids: Collect the ids of merged rows
+
+        Returns:
+            Ingestion result with row counts, timings and ids
+        """
+        result = IngestResult()
+        total = len(rows) if hasattr(rows, "__len__") else None
+        start = time.perf_counter()
+        registered: set = set()
+        columns: Optional[List[str]] = None
+        copy_columns: List[str] = []
+        udt_names: List[str] = []
+
+        async def flush(batch: List[Dict[str, Any]]) -> None:
+            nonlocal columns
+            pg = await self._driver_connection(db)
+            if columns is None:
+                known = await self._load_columns(pg)
+                copy_columns.extend(c for c in batch[0] if c in known)
+                result.skipped_columns = [c for c in batch[0] if c not in known]
+                if result.skipped_columns:
+                    logger.warning(
+                        f"Skipping columns not in {self.table_name}: {', '.join(result.skipped_columns)}"
+                    )
+                if self.id_column not in copy_columns and not known[self.id_column].has_default:
+                    raise ValueError(f"Rows must provide {self.id_column} for {self.table_name}")
+                udt_names.extend(known[c].udt_name for c in copy_columns)
+                columns = copy_columns if self.id_column in copy_columns else [self.id_column] + copy_columns
+
+            if "vector" in udt_names and id(pg) not in registered:
+                if register_vector is None:
+                    raise RuntimeError("pgvector is required to COPY into vector columns")
+                await register_vector(pg)
+                registered.add(id(pg))
+
+            ids = await self._copy_and_merge(pg, batch, columns, copy_columns, udt_names, return_ids)
+            result.ids.extend(ids)
+            result.rows += len(batch)
+            result.batches += 1
+            if commit_every_batch:
+                await db.commit()
+
+            if progress is not None:
+                snapshot = IngestProgress(
+                    table_name=self.table_name,
+                    rows_done=result.rows,
+                    batches_done=result.batches,
+                    elapsed_seconds=time.perf_counter() - start,
+                    rows_total=total
+                )
+                outcome = progress(snapshot)
+                if outcome is not None:
+                    await outcome
+
+        async with self._maybe_defer_indexes(db, defer_indexes, commit_every_batch) as rebuilt:
+            batch: List[Dict[str, Any]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    await flush(batch)
+                    batch = []
+            if batch:
+                await flush(batch)
+
+        result.rebuilt_indexes = rebuilt
+        result.elapsed_seconds = time.perf_counter() - start
+        logger.info(
+            f"Ingested {result.rows} rows into {self.table_name} in {result.batches} batches "
+            f"({result.elapsed_seconds:.2f}s)"
+        )
+        return result
+
+    @asynccontextmanager
+    async def _maybe_defer_indexes(
+        self,
+        db: AsyncSession,
+        enabled: bool,
+        commit: bool
+    ) -> AsyncIterator[List[str]]:
+        rebuilt: List[str] = []
+        if not enabled:
+            yield rebuilt
+            return
+        async with self.deferred_indexes(db, commit=commit) as names:
+            yield rebuilt
+            rebuilt.extend(names)
+
+    @asynccontextmanager
+    async def deferred_indexes(
+        self,
+        db: AsyncSession,
+        commit: bool = False,
+        maintenance_work_mem: Optional[str] = "1GB"
+    ) -> AsyncIterator[List[str]]:
+        """
+        Drop the table's ANN indexes for the duration of a bulk load.
+
+        Maintaining an ivfflat or HNSW index row by row is far slower than
+        building it once over the loaded data. The index definitions are read
+        from ``pg_indexes`` and replayed on exit, even if the load fails.
+        Dropping takes an exclusive lock on the table, so this is meant for
+        offline backfills rather than live traffic.
+
+        Args:
+            db: Database session
+            commit: Commit after dropping and after rebuilding
+            maintenance_work_mem: Memory for the rebuild (None keeps the default)
+
+        Yields:
+            Names of the deferred indexes
+        """
+        pg = await self._driver_connection(db)
+        definitions = await pg.fetch(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = $1 AND indexdef ~* $2",
+            self.table_name,
+            f"USING ({'|'.join(ANN_INDEX_METHODS)}) "
+        )
+        for index in definitions:
+            await pg.execute(f'DROP INDEX IF EXISTS "{index["indexname"]}"')
+            logger.info(f"Deferred ANN index {index['indexname']} on {self.table_name}")
+        if commit and definitions:
+            await db.commit()
+
+        names = [index["indexname"] for index in definitions]
+        failed = False
+        try:
+            yield names
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            # Without per-batch commits a failed load rolls the drops back with it
+            if definitions and (commit or not failed):
+                if failed:
+                    await db.rollback()
+                pg = await self._driver_connection(db)
+                if maintenance_work_mem:
+                    await pg.execute(f"SET LOCAL maintenance_work_mem = '{maintenance_work_mem}'")
+                for index in definitions:
+                    rebuild_start = time.perf_counter()
+                    await pg.execute(index["indexdef"])
+                    logger.info(
+                        f"Rebuilt ANN index {index['indexname']} "
+                        f"in {time.perf_counter() - rebuild_start:.2f}s"
+                    )
+                if commit:
+                    await db.commit()
+
+
+# Export classes
+__all__ = [
+    "ANN_INDEX_METHODS",
+    "IngestProgress",
+    "IngestResult",
+    "BulkVectorIngestor",
+]
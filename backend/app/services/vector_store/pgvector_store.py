@@ -7,7 +7,7 @@ operations and similarity search capabilities.
 """
 import logging
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple, Union, TypeVar, Generic
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union, TypeVar, Generic
 from sqlalchemy import text, func, Column, Float, cast
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,6 +15,8 @@ from sqlalchemy.future import select
 
 from app.db.session import get_db
 from app.core.config import settings
+from app.services.vector_store.bulk_ingest import BulkVectorIngestor, IngestResult, ProgressCallback
+from app.utils.common import utc_now
 
 
 # Set up module logger
@@ -39,7 +41,8 @@ class PGVectorStore(Generic[T]):
         id_column: str,
         embedding_column: str,
         dimension: int = 1536,  # Default for OpenAI ada-002 embeddings
-        distance_strategy: str = "cosine"  # Options: cosine, l2, inner_product
+        distance_strategy: str = "cosine",  # Options: cosine, l2, inner_product
+        conflict_columns: Optional[Sequence[str]] = None
     ):
         """
         Initialize a PGVector store.
@@ -50,12 +53,18 @@ class PGVectorStore(Generic[T]):
             embedding_column: Name of the embedding column in the table
             dimension: Dimension of the embedding vectors
             distance_strategy: Distance strategy to use for similarity search
+            conflict_columns: Unique columns that identify a row for upserts
         """
         self.table_name = table_name
         self.id_column = id_column
         self.embedding_column = embedding_column
         self.dimension = dimension
         self.distance_strategy = distance_strategy
+        self.ingestor = BulkVectorIngestor(
+            table_name=table_name,
+            id_column=id_column,
+            conflict_columns=conflict_columns
+        )
     
     async def initialize(self, db: AsyncSession) -> bool:
         """
@@ -211,42 +220,68 @@ class PGVectorStore(Generic[T]):
         try:
             if len(items) != len(embeddings):
                 raise ValueError("Number of items and embeddings must match")
-                
-            ids = []
-            for i, (item, embedding) in enumerate(zip(items, embeddings)):
-                # Prepare item data
+            
+            # Merge extra fields and embeddings into the rows to copy
+            rows = []
+            for item, embedding in zip(items, embeddings):
                 item_data = {**item}
                 if extra_fields:
                     item_data.update(extra_fields)
-                
-                # Add embedding
                 item_data[self.embedding_column] = embedding
-                
-                # Generate columns and values for INSERT
-                columns = ", ".join(item_data.keys())
-                placeholders = ", ".join(f":{key}" for key in item_data.keys())
-                
-                # Create insert query
-                query = text(
-                    f"INSERT INTO {self.table_name} ({columns}) "
-                    f"VALUES ({placeholders}) "
-                    f"RETURNING {self.id_column}"
-                )
-                
-                # Execute query
-                result = await db.execute(query, item_data)
-                item_id = result.scalar_one()
-                ids.append(item_id)
+                rows.append(item_data)
+            
+            result = await self.ingestor.ingest(db, rows)
             
             # Commit transaction
             await db.commit()
             
-            return ids
+            return result.ids
         except Exception as e:
             logger.error(f"Error in batch_add_embeddings: {e}")
             await db.rollback()
             return []
     
+    async def bulk_ingest(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        db: AsyncSession,
+        batch_size: Optional[int] = None,
+        defer_indexes: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> IngestResult:
+        """
+        Backfill rows (each including its embedding) in committed batches.
+        
+        Unlike batch_add_embeddings this streams any iterable without
+        materializing it, commits after every batch and does not collect ids.
+        
+        Args:
+            rows: Row dictionaries keyed by column name
+            db: Database session
+            batch_size: Rows per COPY batch (defaults to the ingestor setting)
+            defer_indexes: Drop ANN indexes during the load and rebuild them after
+            progress: Optional callback invoked after each batch
+            
+        Returns:
+            Ingestion result with row counts and timings
+        """
+        ingestor = self.ingestor
+        if batch_size:
+            ingestor = BulkVectorIngestor(
+                table_name=self.table_name,
+                id_column=self.id_column,
+                conflict_columns=self.ingestor.conflict_columns,
+                batch_size=batch_size
+            )
+        return await ingestor.ingest(
+            db,
+            rows,
+            progress=progress,
+            defer_indexes=defer_indexes,
+            commit_every_batch=True,
+            return_ids=False
+        )
+    
     async def delete_embeddings(
         self,
         ids: List[str],
@@ -387,7 +422,8 @@ class MemoryVectorStore(PGVectorStore):
             id_column="id",
             embedding_column="embedding",
             dimension=dimension,
-            distance_strategy="cosine"
+            distance_strategy="cosine",
+            conflict_columns=("memory_id", "chunk_index")
         )
     
     async def search_memories(
@@ -457,23 +493,26 @@ class MemoryVectorStore(PGVectorStore):
         Returns:
             List of chunk IDs
         """
-        # First, delete any existing chunks for this memory
+        # Chunks are merged on (memory_id, chunk_index); only trailing chunks
+        # left over from a longer previous version need deleting
         await db.execute(
-            text(f"DELETE FROM {self.table_name} WHERE memory_id = :memory_id"),
-            {"memory_id": memory_id}
+            text(f"DELETE FROM {self.table_name} WHERE memory_id = :memory_id AND chunk_index >= :count"),
+            {"memory_id": memory_id, "count": len(chunks)}
         )
         
         # Add common fields to all chunks
+        now = utc_now()
         extra_fields = {
             "memory_id": memory_id,
             "user_id": user_id,
-            "created_at": func.now(),
-            "updated_at": func.now()
+            "created_at": now,
+            "updated_at": now
         }
+        items = [{"chunk_index": i, **chunk} for i, chunk in enumerate(chunks)]
         
         # Add new chunks with embeddings
         return await self.batch_add_embeddings(
-            items=chunks,
+            items=items,
             embeddings=embeddings,
             db=db,
             extra_fields=extra_fields
@@ -6,10 +6,16 @@ and handling vector operations for efficient similarity searches.
 """
 import logging
 import asyncio
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, time as dtime
 from typing import List, Dict, Any, Optional, Tuple, Union, Set
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, async_engine, async_session_maker
 from app.services.vector_store.pgvector_store import PGVectorStore, MemoryVectorStore
 from app.core.config import settings
 
@@ -17,6 +23,135 @@ from app.core.config import settings
 # Set up module logger
 logger = logging.getLogger(__name__)
 
+# Operator classes and ordering operators per distance strategy
+DISTANCE_OPS = {
+    "cosine": ("vector_cosine_ops", "<=>"),
+    "l2": ("vector_l2_ops", "<->"),
+    "inner_product": ("vector_ip_ops", "<#>"),
+}
+
+
+@dataclass
+class IndexParams:
+    """
+    Build parameters for an ANN index.
+    """
+    method: str  # ivfflat or hnsw
+    lists: Optional[int] = None
+    m: Optional[int] = None
+    ef_construction: Optional[int] = None
+
+    def search_setting(self) -> str:
+        """Query-time setting matching these build parameters."""
+        if self.method == "ivfflat":
+            return f"SET LOCAL ivfflat.probes = {max(1, round(math.sqrt(self.lists)))}"
+        return f"SET LOCAL hnsw.ef_search = {max(40, self.ef_construction // 2)}"
+
+    def with_clause(self) -> str:
+        if self.method == "ivfflat":
+            return f"WITH (lists = {self.lists})"
+        return f"WITH (m = {self.m}, ef_construction = {self.ef_construction})"
+
+    @classmethod
+    def from_indexdef(cls, indexdef: str) -> Optional["IndexParams"]:
+        """Parse the parameters of an existing index from its definition."""
+        method = re.search(r"USING (ivfflat|hnsw)", indexdef, re.IGNORECASE)
+        if not method:
+            return None
+        options = dict(re.findall(r"(\w+)\s*=\s*'?(\d+)'?", indexdef.split("WITH", 1)[-1]))
+        if method.group(1).lower() == "ivfflat":
+            return cls("ivfflat", lists=int(options.get("lists", 100)))
+        return cls("hnsw", m=int(options.get("m", 16)), ef_construction=int(options.get("ef_construction", 64)))
+
+    def drifted_from(self, other: Optional["IndexParams"]) -> bool:
+        """Whether an index built with other is far enough from these parameters to rebuild."""
+        if other is None or other.method != self.method:
+            return True
+        if self.method == "ivfflat":
+            return max(self.lists, other.lists) > 2 * min(self.lists, other.lists)
+        return self.m != other.m
+
+
+def choose_index_params(row_count: int, index_type: Optional[str] = None) -> IndexParams:
+    """
+    Choose ANN index parameters for a table size.
+    
+    Follows the pgvector guidance: ivfflat uses rows / 1000 lists up to a
+    million rows and sqrt(rows) beyond; HNSW grows m (and ef_construction
+    with it) as the graph gets larger. In auto mode small tables get
+    ivfflat, which builds much faster, and large ones get HNSW.
+    
+    Args:
+        row_count: Live rows in the table
+        index_type: hnsw, ivfflat or auto (defaults to settings)
+        
+    Returns:
+        Index parameters
+    """
+    index_type = (index_type or settings.VECTOR_INDEX_TYPE).lower()
+    if index_type == "auto":
+        index_type = "hnsw" if row_count >= settings.VECTOR_INDEX_HNSW_MIN_ROWS else "ivfflat"
+    
+    if index_type == "ivfflat":
+        if row_count <= 1_000_000:
+            lists = max(10, row_count // 1000)
+        else:
+            lists = int(math.sqrt(row_count))
+        return IndexParams("ivfflat", lists=lists)
+    
+    if row_count < 1_000_000:
+        m = 16
+    elif row_count < 10_000_000:
+        m = 24
+    else:
+        m = 32
+    return IndexParams("hnsw", m=m, ef_construction=4 * m)
+
+
+@dataclass
+class MaintenanceWindow:
+    """
+    Daily UTC window in which index rebuilds may run.
+    """
+    start: dtime
+    end: dtime
+
+    @classmethod
+    def parse(cls, spec: str) -> "MaintenanceWindow":
+        """Parse an "HH:MM-HH:MM" window; the end may wrap past midnight."""
+        start, end = (dtime.fromisoformat(part.strip()) for part in spec.split("-", 1))
+        return cls(start, end)
+
+    def contains(self, now: datetime) -> bool:
+        current = now.time()
+        if self.start <= self.end:
+            return self.start <= current < self.end
+        return current >= self.start or current < self.end
+
+    def next_start(self, now: datetime) -> datetime:
+        candidate = datetime.combine(now.date(), self.start)
+        return candidate if candidate > now else candidate + timedelta(days=1)
+
+    @property
+    def length(self) -> timedelta:
+        start = datetime.combine(datetime.min.date(), self.start)
+        end = datetime.combine(datetime.min.date(), self.end)
+        return (end - start) % timedelta(days=1)
+
+
+@dataclass
+class IndexHealth:
+    """
+    Observed state of a store's ANN index.
+    """
+    row_count: int = 0
+    dead_tuples: int = 0
+    current: Optional[IndexParams] = None
+    target: Optional[IndexParams] = None
+    recall: Optional[float] = None
+    recall_baseline: Optional[float] = None
+    reasons: List[str] = field(default_factory=list)
+
 
 class VectorIndexManager:
     """
@@ -81,81 +216,262 @@ class VectorIndexManager:
         """
         return self._stores.get(name)
     
-    async def run_maintenance(self, db: AsyncSession) -> Dict[str, Any]:
+    @staticmethod
+    def index_name(store: PGVectorStore) -> str:
+        return f"idx_{store.table_name}_{store.embedding_column}"
+    
+    async def get_index_health(self, store: PGVectorStore, db: AsyncSession) -> IndexHealth:
+        """
+        Collect table statistics and the current and ideal index parameters.
+        
+        Args:
+            store: Vector store to inspect
+            db: Database session
+            
+        Returns:
+            Index health without a recall measurement
+        """
+        stats_result = await db.execute(
+            text(
+                "SELECT n_live_tup AS row_count, n_dead_tup AS dead_tuples "
+                "FROM pg_stat_user_tables WHERE relname = :table_name"
+            ),
+            {"table_name": store.table_name}
+        )
+        stats = stats_result.mappings().one_or_none()
+        index_result = await db.execute(
+            text(
+                "SELECT indexdef, "
+                "obj_description(format('%I.%I', schemaname, indexname)::regclass, 'pg_class') AS comment "
+                "FROM pg_indexes WHERE tablename = :table_name AND indexname = :index_name"
+            ),
+            {"table_name": store.table_name, "index_name": self.index_name(store)}
+        )
+        index = index_result.mappings().one_or_none()
+        baseline = re.search(r"recall_baseline=([0-9.]+)", index["comment"] or "") if index else None
+        
+        health = IndexHealth(
+            row_count=stats["row_count"] if stats else 0,
+            dead_tuples=stats["dead_tuples"] if stats else 0,
+            current=IndexParams.from_indexdef(index["indexdef"]) if index else None,
+            recall_baseline=float(baseline.group(1)) if baseline else None
+        )
+        health.target = choose_index_params(health.row_count)
+        return health
+    
+    async def save_recall_baseline(self, store: PGVectorStore, db: AsyncSession, recall: Optional[float]) -> None:
+        """
+        Record an index's post-build recall as a comment on the index.
+        
+        Kept in the database next to the index definition, the baseline
+        survives restarts, is shared by every instance and goes away with
+        the index when it is rebuilt.
+        """
+        if recall is None:
+            return
+        await db.execute(text(f"COMMENT ON INDEX {self.index_name(store)} IS 'recall_baseline={recall:.4f}'"))
+    
+    async def measure_recall(
+        self,
+        store: PGVectorStore,
+        db: AsyncSession,
+        sample_size: Optional[int] = None,
+        k: int = 10,
+        params: Optional[IndexParams] = None
+    ) -> Optional[float]:
+        """
+        Estimate index recall@k on a sample of stored vectors.
+        
+        Each sampled vector is searched once through the index and once with
+        index scans disabled (exact results); recall is the mean overlap.
+        
+        Args:
+            store: Vector store to measure
+            db: Database session
+            sample_size: Number of query vectors to sample
+            k: Neighbours compared per query
+            params: Parameters of the index, to apply matching search settings
+            
+        Returns:
+            Mean recall, or None if the table has no vectors
+        """
+        sample_size = sample_size or settings.VECTOR_INDEX_RECALL_SAMPLE_SIZE
+        _, operator = DISTANCE_OPS[store.distance_strategy]
+        column = store.embedding_column
+        
+        sample = await db.execute(
+            text(
+                f"SELECT {column}::vector::text FROM {store.table_name} "
+                f"WHERE {column} IS NOT NULL ORDER BY random() LIMIT :n"
+            ),
+            {"n": sample_size}
+        )
+        queries = [row[0] for row in sample.all()]
+        if not queries:
+            return None
+        
+        search = text(
+            f"SELECT {store.id_column} FROM {store.table_name} "
+            f"ORDER BY {column} {operator} CAST(:q AS vector) LIMIT :k"
+        )
+        if params is not None:
+            await db.execute(text(params.search_setting()))
+        approximate = []
+        for query in queries:
+            result = await db.execute(search, {"q": query, "k": k})
+            approximate.append({row[0] for row in result.all()})
+        
+        await db.execute(text("SET LOCAL enable_indexscan = off"))
+        try:
+            overlaps = []
+            for query, found in zip(queries, approximate):
+                result = await db.execute(search, {"q": query, "k": k})
+                exact = {row[0] for row in result.all()}
+                if exact:
+                    overlaps.append(len(found & exact) / len(exact))
+        finally:
+            await db.execute(text("SET LOCAL enable_indexscan = on"))
+        
+        return sum(overlaps) / len(overlaps) if overlaps else None
+    
+    async def rebuild_index(self, store: PGVectorStore, params: IndexParams) -> float:
+        """
+        Build a replacement index concurrently and swap it in.
+        
+        The new index is built with CREATE INDEX CONCURRENTLY under a
+        temporary name while the old one keeps serving queries, then both are
+        renamed in one short transaction and the old index is dropped
+        concurrently. Queries never run without an index.
+        
+        Args:
+            store: Vector store to reindex
+            params: Parameters for the new index
+            
+        Returns:
+            Build time in seconds
+        """
+        ops, _ = DISTANCE_OPS[store.distance_strategy]
+        index_name = self.index_name(store)
+        new_name = f"{index_name}_new"
+        old_name = f"{index_name}_old"
+        
+        async with async_engine.connect() as conn:
+            # CONCURRENTLY cannot run inside a transaction block
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"SET maintenance_work_mem = '{settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM}'"))
+            # A failed earlier build leaves an INVALID index behind
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}"))
+            
+            start = time.perf_counter()
+            try:
+                await conn.execute(text(
+                    f"CREATE INDEX CONCURRENTLY {new_name} ON {store.table_name} "
+                    f"USING {params.method} ({store.embedding_column} {ops}) {params.with_clause()}"
+                ))
+            except Exception:
+                await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_name}"))
+                raise
+            build_seconds = time.perf_counter() - start
+        
+        async with async_engine.begin() as conn:
+            await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            await conn.execute(text(f"ALTER INDEX IF EXISTS {index_name} RENAME TO {old_name}"))
+            await conn.execute(text(f"ALTER INDEX {new_name} RENAME TO {index_name}"))
+        
+        async with async_engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}"))
+            await conn.execute(text(f"VACUUM ANALYZE {store.table_name}"))
+        
+        logger.info(
+            f"Rebuilt {index_name} as {params.method} {params.with_clause()} in {build_seconds:.1f}s"
+        )
+        return build_seconds
+    
+    async def run_maintenance(
+        self,
+        db: AsyncSession,
+        force: bool = False,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Run maintenance tasks on vector stores.
         
-        This includes rebuilding indexes, vacuuming tables, and
-        analyzing query performance.
+        A store needs a rebuild when its index is missing, when the table has
+        grown or shrunk enough that different parameters fit, when dead
+        tuples exceed 10%, or when sampled recall has drifted below its
+        post-build baseline. Recall is only sampled inside the maintenance
+        window, and rebuilds only run there unless forced; outside it the
+        rebuild is reported as scheduled for the next window.
         
         Args:
             db: Database session
+            force: Rebuild immediately regardless of the window
+            now: Current UTC time (for testing)
             
         Returns:
             Dictionary with maintenance results
         """
+        now = now or datetime.utcnow()
+        window = MaintenanceWindow.parse(settings.VECTOR_INDEX_MAINTENANCE_WINDOW)
+        in_window = force or window.contains(now)
+        
         # Avoid running multiple maintenance tasks simultaneously
         async with self._maintenance_lock:
             results = {}
             
             for name, store in self._stores.items():
                 try:
-                    # Get table statistics
-                    stats_query = f"""
-                        SELECT 
-                            relname as table_name,
-                            n_live_tup as row_count,
-                            n_dead_tup as dead_tuples,
-                            last_analyze,
-                            last_vacuum
-                        FROM 
-                            pg_stat_user_tables
-                        WHERE 
-                            relname = '{store.table_name}'
-                    """
-                    stats_result = await db.execute(stats_query)
-                    stats = stats_result.mappings().one_or_none()
+                    health = await self.get_index_health(store, db)
                     
-                    # Rebuild index if needed
-                    needs_reindex = False
-                    if stats and stats["row_count"] > 1000 and stats["dead_tuples"] > stats["row_count"] * 0.1:
-                        needs_reindex = True
-                        
-                    if needs_reindex:
-                        logger.info(f"Rebuilding index for {store.table_name}")
-                        # Get index name
-                        index_name = f"idx_{store.table_name}_{store.embedding_column}"
-                        
-                        # Drop and recreate index
-                        await db.execute(f"DROP INDEX IF EXISTS {index_name}")
-                        
-                        # Determine index method
-                        if store.distance_strategy == "cosine":
-                            index_method = "vector_cosine_ops"
-                        elif store.distance_strategy == "l2":
-                            index_method = "vector_l2_ops"
-                        else:
-                            index_method = "vector_ip_ops"
-                        
-                        # Create index
-                        await db.execute(f"""
-                            CREATE INDEX {index_name} 
-                            ON {store.table_name} 
-                            USING ivfflat ({store.embedding_column} {index_method})
-                            WITH (lists = 100)
-                        """)
-                        
-                        # Vacuum analyze the table
-                        await db.execute(f"VACUUM ANALYZE {store.table_name}")
-                        
-                    # Store results
-                    results[name] = {
-                        "stats": dict(stats) if stats else None,
-                        "reindexed": needs_reindex
+                    if health.current is None:
+                        health.reasons.append("missing")
+                    elif health.target.drifted_from(health.current):
+                        health.reasons.append("parameters")
+                    if health.row_count > 1000 and health.dead_tuples > health.row_count * 0.1:
+                        health.reasons.append("dead_tuples")
+                    
+                    if in_window and health.current is not None and not health.reasons:
+                        health.recall = await self.measure_recall(store, db, params=health.current)
+                        baseline = health.recall_baseline
+                        if health.recall is not None and (
+                            health.recall < settings.VECTOR_INDEX_MIN_RECALL
+                            or (baseline is not None
+                                and baseline - health.recall > settings.VECTOR_INDEX_RECALL_TOLERANCE)
+                        ):
+                            health.reasons.append("recall")
+                        elif baseline is None:
+                            await self.save_recall_baseline(store, db, health.recall)
+
+                    needs_reindex = bool(health.reasons)
+                    result = {
+                        "stats": {"row_count": health.row_count, "dead_tuples": health.dead_tuples},
+                        "index": health.current.__dict__ if health.current else None,
+                        "recall": health.recall,
+                        "reasons": health.reasons,
+                        "reindexed": False
                     }
                     
+                    if needs_reindex and in_window:
+                        logger.info(f"Rebuilding index for {store.table_name}: {', '.join(health.reasons)}")
+                        # The health and recall queries left this session holding a lock on
+                        # the table, and DROP INDEX CONCURRENTLY on the rebuild's own
+                        # connection would wait on it forever
+                        await db.commit()
+                        result["build_seconds"] = await self.rebuild_index(store, health.target)
+                        result["index"] = health.target.__dict__
+                        result["reindexed"] = True
+                        result["recall"] = await self.measure_recall(store, db, params=health.target)
+                        await self.save_recall_baseline(store, db, result["recall"])
+                    elif needs_reindex:
+                        result["scheduled_for"] = window.next_start(now).isoformat()
+                    
+                    # Store results
+                    results[name] = result
+                    
                 except Exception as e:
                     logger.error(f"Error during maintenance for {name}: {e}")
+                    await db.rollback()
                     results[name] = {"error": str(e)}
             
             await db.commit()
@@ -311,3 +627,10 @@ async def initialize_vector_stores():
     """Initialize all vector stores at application startup."""
     async with get_db() as db:
         await vector_index_manager.initialize_all(db)
+
+
+# Scheduled task for index maintenance
+async def run_scheduled_index_maintenance():
+    """Run index maintenance; SchedulerService starts this when the maintenance window opens."""
+    async with async_session_maker() as db:
+        return await vector_index_manager.run_maintenance(db)
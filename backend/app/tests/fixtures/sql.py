@@ -0,0 +1,24 @@
+"""
+SQL helpers for unit tests that run services against a mocked session.
+"""
+from sqlalchemy.dialects import postgresql
+
+
+def compile_sql(statement):
+    """
+    Render a statement the way PostgreSQL would receive it.
+
+    Returns:
+        str: The SQL text, with bound parameters as placeholders
+    """
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def sql_params(statement):
+    """
+    Bound parameters of a statement compiled for PostgreSQL.
+
+    Returns:
+        dict: Parameter values by name
+    """
+    return statement.compile(dialect=postgresql.dialect()).params
@@ -13,7 +13,9 @@ from app.services.task.task_intelligence import TaskIntelligenceService
 from app.services.task.task_extractor import TaskExtractor
 from app.services.task.reminder_engine import ReminderEngine
 from app.services.task.suggestion_engine import TaskSuggestionEngine
+from app.services.task.reminder_scheduler import ClaimedReminder
 from app.db.models.task import Task, TaskStatus, TaskPriority
+from app.db.models.task_reminder import ReminderStatus
 from app.db.models.conversation import Conversation, Message
 
 
@@ -138,7 +140,7 @@ class TestTaskIntelligence:
         
         # Test service
         service = TaskIntelligenceService(mock_db_session)
-        service._task_already_exists = AsyncMock(return_value=False)
+        service.similarity_index.find_duplicates = AsyncMock(side_effect=lambda u, titles, within_batch: [False] * len(titles))
         service._link_task_to_memories = AsyncMock()
         
         result = await service.process_conversation_for_tasks(
@@ -215,35 +217,42 @@ class TestReminderEngine:
     """Test reminder engine functionality."""
     
     async def test_check_and_send_reminders(self, mock_db_session):
-        """Test checking for and sending reminders."""
-        # Mock active users
-        mock_user = Mock()
-        mock_user.id = uuid4()
-        mock_user.is_active = True
+        """Test dispatching claimed reminders grouped by user."""
+        now = datetime.utcnow()
+        user_id = uuid4()
         
-        mock_db_session.execute = AsyncMock()
-        mock_db_session.execute.return_value = Mock(
-            scalars=Mock(return_value=Mock(all=Mock(return_value=[mock_user])))
-        )
+        mock_task = Mock()
+        mock_task.id = uuid4()
+        mock_task.title = "Test task"
+        mock_task.description = None
+        mock_task.priority = TaskPriority.HIGH
+        mock_task.status = TaskStatus.PENDING
+        mock_task.due_date = now + timedelta(hours=2)
+        
+        claimed = [
+            ClaimedReminder(id=uuid4(), task_id=mock_task.id, user_id=user_id, attempts=1),
+            ClaimedReminder(id=uuid4(), task_id=uuid4(), user_id=user_id, attempts=1)  # Task deleted
+        ]
         
         engine = ReminderEngine(mock_db_session)
-        engine.task_intelligence = Mock()
-        engine.task_intelligence.get_upcoming_reminders = AsyncMock(return_value=[
-            {
-                "task_id": str(uuid4()),
-                "title": "Test task",
-                "hours_until_due": 2,
-                "reminder_type": "soon"
-            }
-        ])
+        engine.scheduler = Mock()
+        engine.scheduler.claim_due = AsyncMock(return_value=claimed)
+        engine.scheduler.load_tasks = AsyncMock(return_value={mock_task.id: mock_task})
+        engine.scheduler.mark = AsyncMock()
         engine._generate_reminder_message = AsyncMock(return_value="You have 1 task due soon")
         engine._store_reminder_for_delivery = AsyncMock()
         
-        result = await engine.check_and_send_reminders()
+        result = await engine.check_and_send_reminders(now=now, batch_size=10)
         
-        assert result["users_checked"] == 1
+        assert result["batches"] == 1
+        assert result["reminders_claimed"] == 2
+        assert result["reminders_dropped"] == 1
         assert result["users_notified"] == 1
         assert result["reminders_sent"] == 1
+        task_reminders = engine._store_reminder_for_delivery.await_args.kwargs["task_reminders"]
+        assert task_reminders[0]["reminder_type"] == "soon"
+        engine.scheduler.mark.assert_any_await([claimed[1].id], ReminderStatus.CANCELLED)
+        engine.scheduler.mark.assert_any_await([claimed[0].id], ReminderStatus.SENT, now)
     
     async def test_smart_reminder_schedule(self, mock_db_session):
         """Test generating smart reminder schedules."""
@@ -325,6 +334,7 @@ class TestSuggestionEngine:
         engine._suggest_from_memories = AsyncMock(return_value=[])
         engine._suggest_time_based_tasks = AsyncMock(return_value=[])
         engine._refine_suggestions_with_llm = AsyncMock(side_effect=lambda u, s, p, c: s[:5])
+        engine.similarity_index.find_duplicates = AsyncMock(return_value=[False])
         
         suggestions = await engine.generate_suggestions(user_id)
         
@@ -0,0 +1,193 @@
+"""
+Unit tests for AppealResolutionService vote tallies and SLA monitoring.
+
+This module tests incremental board vote tallies, O(1) consensus checks and
+the SLA deadline queries.
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.models.trust import Appeal, AppealStatus
+from app.schemas.trust import AppealResponse
+from app.services.appeals_service import AppealResolutionService
+from app.tests.fixtures.sql import compile_sql, sql_params
+
+NOW = datetime(2025, 11, 7, 12)
+
+
+def make_appeal(board_size=3, votes=None):
+    return Appeal(
+        id=uuid.uuid4(),
+        trust_event_id=uuid.uuid4(),
+        appellant_id=uuid.uuid4(),
+        status=AppealStatus.REVIEWING,
+        review_board_ids=[uuid.uuid4() for _ in range(board_size)],
+        appeal_metadata={"votes": votes} if votes else None,
+        uphold_votes=0,
+        overturn_votes=0
+    )
+
+
+def mock_db(appeal, tally):
+    db = AsyncMock()
+    db.get.return_value = appeal
+    result = MagicMock()
+    result.one.return_value = tally
+    db.execute.return_value = result
+    return db
+
+
+def tallying_db(appeal):
+    """Session whose vote updates apply their counter deltas to stored totals."""
+    stored = {"uphold": 0, "overturn": 0}
+
+    async def execute(statement):
+        params = sql_params(statement)
+        stored["uphold"] += params["uphold_votes_1"]
+        stored["overturn"] += params["overturn_votes_1"]
+        appeal.appeal_metadata = params["appeal_metadata"]
+        result = MagicMock()
+        result.one.return_value = (stored["uphold"], stored["overturn"])
+        return result
+
+    db = AsyncMock()
+    db.get.return_value = appeal
+    db.execute.side_effect = execute
+    return db
+
+
+class TestBoardVotes:
+
+    @pytest.mark.asyncio
+    async def test_vote_updates_tally_in_one_statement(self):
+        appeal = make_appeal()
+        reviewer_id = appeal.review_board_ids[0]
+        db = tallying_db(appeal)
+
+        result = await AppealResolutionService(db).record_board_vote(appeal.id, reviewer_id, "uphold", "Fair")
+
+        assert result["current_tally"] == {"uphold": 1, "overturn": 0, "total_votes": 1, "board_size": 3}
+        assert result["consensus"] is None
+        assert db.get.await_args.kwargs["with_for_update"] is True
+        assert db.execute.await_count == 1
+        assert appeal.appeal_metadata["votes"][str(reviewer_id)]["vote"] == "uphold"
+        assert appeal.uphold_votes == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_vote_moves_between_counters(self):
+        appeal = make_appeal(board_size=5)
+        first, second, third, fourth = appeal.review_board_ids[:4]
+        service = AppealResolutionService(tallying_db(appeal))
+
+        await service.record_board_vote(appeal.id, first, "uphold")
+        await service.record_board_vote(appeal.id, second, "overturn")
+        changed = await service.record_board_vote(appeal.id, first, "overturn")
+
+        assert changed["current_tally"]["uphold"] == 0
+        assert changed["current_tally"]["overturn"] == 2
+        assert changed["consensus"] is None
+
+        await service.record_board_vote(appeal.id, third, "uphold")
+        decided = await service.record_board_vote(appeal.id, fourth, "overturn")
+
+        assert decided["current_tally"] == {"uphold": 1, "overturn": 3, "total_votes": 4, "board_size": 5}
+        assert decided["consensus"] == "overturn"
+
+    @pytest.mark.asyncio
+    async def test_repeated_vote_is_counted_once(self):
+        appeal = make_appeal()
+        reviewer_id = appeal.review_board_ids[0]
+        service = AppealResolutionService(tallying_db(appeal))
+
+        await service.record_board_vote(appeal.id, reviewer_id, "uphold")
+        result = await service.record_board_vote(appeal.id, reviewer_id, "uphold", "Still fair")
+
+        assert result["current_tally"]["total_votes"] == 1
+        assert appeal.appeal_metadata["votes"][str(reviewer_id)]["reasoning"] == "Still fair"
+
+    @pytest.mark.asyncio
+    async def test_reviewer_must_be_on_board(self):
+        appeal = make_appeal()
+        db = mock_db(appeal, (0, 0))
+
+        with pytest.raises(ValueError):
+            await AppealResolutionService(db).record_board_vote(appeal.id, uuid.uuid4(), "uphold")
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.parametrize("uphold, overturn, board_size, expected", [
+        (2, 0, 3, "uphold"), (1, 1, 3, None), (0, 3, 5, "overturn"), (2, 2, 4, None)
+    ])
+    def test_tally_consensus(self, uphold, overturn, board_size, expected):
+        assert AppealResolutionService._tally_consensus(uphold, overturn, board_size) == expected
+
+    @pytest.mark.asyncio
+    async def test_check_board_consensus_reads_counters(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.one_or_none.return_value = (3, 1, 5)
+        db.execute.return_value = result
+
+        assert await AppealResolutionService(db).check_board_consensus(uuid.uuid4()) == "uphold"
+        sql = compile_sql(db.execute.await_args.args[0])
+        assert "cardinality(appeals.review_board_ids)" in sql
+
+
+class TestSla:
+
+    @pytest.mark.asyncio
+    async def test_violations_are_an_index_range_query(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        db.execute.return_value = result
+
+        await AppealResolutionService(db).check_sla_violations(now=NOW)
+
+        sql = compile_sql(db.execute.await_args.args[0])
+        assert "WHERE status IN ('PENDING', 'REVIEWING') AND appeals.review_deadline <" in sql
+        assert sql.endswith("ORDER BY appeals.review_deadline")
+
+    @pytest.mark.asyncio
+    async def test_violations_filter_on_recorded_breach(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        db.execute.return_value = result
+
+        await AppealResolutionService(db).check_sla_violations(now=NOW, breached_since=NOW)
+
+        sql = compile_sql(db.execute.await_args.args[0])
+        assert "appeals.sla_breached_at >=" in sql
+
+    @pytest.mark.asyncio
+    async def test_drain_marks_breaches_in_batches(self):
+        first, second = [uuid.uuid4(), uuid.uuid4()], [uuid.uuid4()]
+        db = AsyncMock()
+        results = []
+        for ids in (first, second):
+            result = MagicMock()
+            result.scalars.return_value = iter(ids)
+            results.append(result)
+        db.execute.side_effect = results
+
+        breached = await AppealResolutionService(db).drain_sla_queue(now=NOW, batch_size=2)
+
+        assert breached == first + second
+        assert db.commit.await_count == 2
+        statement = db.execute.await_args.args[0]
+        assert sql_params(statement)["sla_breached_at"] == NOW
+        assert "FOR UPDATE SKIP LOCKED" in compile_sql(statement)
+
+    def test_recorded_breach_is_exposed(self):
+        appeal = make_appeal()
+        appeal.appeal_reason = "Unfair rating"
+        appeal.submitted_at = NOW - timedelta(days=10)
+        appeal.review_deadline = NOW - timedelta(days=3)
+        appeal.sla_breached_at = NOW
+
+        response = AppealResponse.model_validate(appeal)
+
+        assert response.sla_breached_at == NOW
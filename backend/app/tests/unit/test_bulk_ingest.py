@@ -0,0 +1,134 @@
+"""
+Unit tests for BulkVectorIngestor.
+
+This module tests batching, column handling and merge SQL with a fake
+asyncpg connection standing in for the database.
+"""
+import uuid
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from app.services.vector_store.bulk_ingest import BulkVectorIngestor
+
+
+COLUMNS = [
+    {"column_name": "id", "udt_name": "uuid", "has_default": True},
+    {"column_name": "memory_id", "udt_name": "uuid", "has_default": False},
+    {"column_name": "chunk_index", "udt_name": "int4", "has_default": False},
+    {"column_name": "content", "udt_name": "text", "has_default": False},
+    {"column_name": "embedding", "udt_name": "vector", "has_default": False},
+    {"column_name": "chunk_metadata", "udt_name": "json", "has_default": False},
+]
+
+
+class FakeConnection:
+    """Records statements and COPY batches like an asyncpg connection."""
+
+    def __init__(self):
+        self.executed = []
+        self.copies = []
+        self._staged = 0
+
+    async def fetch(self, query, *args):
+        if "information_schema.columns" in query:
+            return COLUMNS
+        if "pg_indexes" in query:
+            return [{"indexname": "idx_chunks_embedding", "indexdef": "CREATE INDEX idx_chunks_embedding ON memory_chunks USING ivfflat (embedding)"}]
+        self.executed.append(query)
+        return [(uuid.uuid4(),) for _ in range(self._staged)]
+
+    async def set_type_codec(self, *args, **kwargs):
+        pass
+
+    async def execute(self, query, *args):
+        self.executed.append(query)
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies.append((table, columns, records))
+        self._staged = len(records)
+
+
+@pytest.fixture
+def fake_pg():
+    """Create a fake asyncpg connection."""
+    return FakeConnection()
+
+
+@pytest.fixture
+def mock_db_session(fake_pg):
+    """Create a mock session exposing the fake driver connection."""
+    raw = MagicMock(driver_connection=fake_pg)
+    connection = MagicMock()
+    connection.get_raw_connection = AsyncMock(return_value=raw)
+    session = AsyncMock()
+    session.connection = AsyncMock(return_value=connection)
+    return session
+
+
+def make_rows(count):
+    memory_id = uuid.uuid4()
+    return [
+        {
+            "memory_id": memory_id,
+            "chunk_index": i,
+            "content": f"chunk {i}",
+            "embedding": [0.1] * 4,
+            "chunk_metadata": {"i": i},
+            "user_id": "ignored",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+class TestBulkVectorIngestor:
+    """Test cases for BulkVectorIngestor."""
+
+    async def test_batches_rows_through_copy(self, mock_db_session, fake_pg):
+        """Rows are copied in batches and every merged id is returned."""
+        ingestor = BulkVectorIngestor("memory_chunks", conflict_columns=("memory_id", "chunk_index"), batch_size=4)
+        progress = []
+
+        result = await ingestor.ingest(mock_db_session, make_rows(10), progress=progress.append)
+
+        assert [len(records) for _, _, records in fake_pg.copies] == [4, 4, 2]
+        assert len(result.ids) == 10
+        assert result.skipped_columns == ["user_id"]
+        assert [p.rows_done for p in progress] == [4, 8, 10]
+        assert progress[-1].rows_total == 10
+
+    async def test_encodes_values_for_binary_copy(self, mock_db_session, fake_pg):
+        """Vectors become float32 arrays and JSON values are serialized."""
+        ingestor = BulkVectorIngestor("memory_chunks")
+
+        await ingestor.ingest(mock_db_session, make_rows(1))
+
+        _, columns, records = fake_pg.copies[0]
+        row = dict(zip(columns, records[0]))
+        assert isinstance(row["embedding"], np.ndarray) and row["embedding"].dtype == np.float32
+        assert row["chunk_metadata"] == '{"i": 0}'
+
+    async def test_merge_updates_non_key_columns(self, mock_db_session, fake_pg):
+        """The merge upserts on the conflict columns and keeps ids and keys."""
+        ingestor = BulkVectorIngestor("memory_chunks", conflict_columns=("memory_id", "chunk_index"))
+
+        await ingestor.ingest(mock_db_session, make_rows(2))
+
+        merge = next(q for q in fake_pg.executed if q.startswith("INSERT INTO memory_chunks"))
+        assert "ON CONFLICT (memory_id, chunk_index) DO UPDATE SET content = EXCLUDED.content" in merge
+        assert "id = EXCLUDED.id" not in merge
+        assert merge.endswith("RETURNING id")
+
+    async def test_deferred_indexes_are_rebuilt(self, mock_db_session, fake_pg):
+        """ANN indexes are dropped before the load and recreated after it."""
+        ingestor = BulkVectorIngestor("memory_chunks", batch_size=5)
+
+        result = await ingestor.ingest(mock_db_session, make_rows(5), defer_indexes=True, commit_every_batch=True)
+
+        drop = fake_pg.executed.index('DROP INDEX IF EXISTS "idx_chunks_embedding"')
+        rebuild = fake_pg.executed.index("CREATE INDEX idx_chunks_embedding ON memory_chunks USING ivfflat (embedding)")
+        copy_merge = next(i for i, q in enumerate(fake_pg.executed) if q.startswith("INSERT INTO"))
+        assert drop < copy_merge < rebuild
+        assert result.rebuilt_indexes == ["idx_chunks_embedding"]
@@ -0,0 +1,139 @@
+"""
+Unit tests for feature flag evaluation and propagation.
+
+This module tests compiled flag predicates, cached per-principal
+evaluations, the bounded audit buffer and versioned change propagation.
+"""
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.features import FeatureFlags, FeatureFlagSync, FeatureStatus
+
+
+@pytest.fixture(autouse=True)
+def reset_flags():
+    FeatureFlags._user_overrides = {}
+    FeatureFlags._instance_config = {}
+    FeatureFlags._version = 0
+    FeatureFlags._sync = None
+    FeatureFlags._audit_log.clear()
+    FeatureFlags._audit_pending.clear()
+    FeatureFlags.initialize()
+    yield
+
+
+def mock_redis(version=1):
+    redis = MagicMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, version])
+    redis.pipeline.return_value.__aenter__.return_value = pipe
+    redis.publish = AsyncMock()
+    redis.hgetall = AsyncMock(return_value={})
+    return redis, pipe
+
+
+class TestEvaluation:
+
+    def test_statuses(self):
+        assert FeatureFlags.is_enabled(FeatureFlags.CORE_MLS_MESSAGING)
+        assert not FeatureFlags.is_enabled(FeatureFlags.EXPERIMENTAL_RESONANCE)
+        assert not FeatureFlags.is_enabled(FeatureFlags.CORE_MEMORY_V2)
+        assert FeatureFlags.is_enabled(FeatureFlags.CORE_MEMORY_V2, context={"is_beta_user": True})
+        assert not FeatureFlags.is_enabled("no.such.flag")
+
+    def test_override_and_instance_precedence(self):
+        FeatureFlags._instance_config = {FeatureFlags.EXPERIMENTAL_RESONANCE: {"enabled": True}}
+        FeatureFlags._compile()
+        FeatureFlags.set_user_override("u1", FeatureFlags.EXPERIMENTAL_RESONANCE, False)
+
+        assert FeatureFlags.is_enabled(FeatureFlags.EXPERIMENTAL_RESONANCE)
+        assert not FeatureFlags.is_enabled(FeatureFlags.EXPERIMENTAL_RESONANCE, "u1")
+
+    def test_evaluations_are_cached_per_principal(self):
+        with patch.object(FeatureFlags, "_evaluate", wraps=FeatureFlags._evaluate) as evaluate:
+            for _ in range(3):
+                FeatureFlags.is_enabled(FeatureFlags.CORE_MEMORY_V2, "u1")
+                FeatureFlags.is_enabled(FeatureFlags.CORE_MEMORY_V2, "u1", {"is_beta_user": True})
+
+        assert evaluate.call_count == 2
+
+    def test_change_invalidates_cache(self):
+        assert not FeatureFlags.is_enabled(FeatureFlags.EXPERIMENTAL_NULLIFIERS, "u1")
+
+        FeatureFlags.set_status(FeatureFlags.EXPERIMENTAL_NULLIFIERS, FeatureStatus.ENABLED)
+
+        assert FeatureFlags.is_enabled(FeatureFlags.EXPERIMENTAL_NULLIFIERS, "u1")
+
+    def test_audit_buffers_are_bounded(self):
+        capacity = FeatureFlags._audit_log.maxlen
+        for _ in range(capacity + 5):
+            FeatureFlags.is_enabled(FeatureFlags.CORE_MLS_MESSAGING, "u1")
+
+        assert len(FeatureFlags.export_audit_log()) == capacity
+        drained = FeatureFlags.drain_audit_entries(10)
+        assert len(drained) == 10
+        assert drained[0]["reason"] == "enabled" and drained[0]["user_id"] == "u1"
+        assert len(FeatureFlags._audit_pending) == capacity - 10
+        assert FeatureFlags.get_feature_report()["audit_summary"]["total_accesses"] == capacity
+
+
+class TestSync:
+
+    @pytest.mark.asyncio
+    async def test_publish_is_versioned(self):
+        sync = FeatureFlagSync("redis://localhost")
+        sync.redis, pipe = mock_redis(version=7)
+
+        assert await sync.publish("status:core.memory_v2", "enabled") == 7
+
+        pipe.hset.assert_called_once_with(FeatureFlagSync.STATE_KEY, "status:core.memory_v2", '"enabled"')
+        pipe.hincrby.assert_called_once_with(FeatureFlagSync.STATE_KEY, "_version", 1)
+        channel, message = sync.redis.publish.await_args.args
+        assert channel == FeatureFlagSync.CHANNEL
+        assert json.loads(message) == {"version": 7, "field": "status:core.memory_v2", "value": "enabled"}
+
+    @pytest.mark.asyncio
+    async def test_messages_apply_in_order(self):
+        sync = FeatureFlagSync("redis://localhost")
+        sync.redis, _ = mock_redis()
+        message = {"version": 1, "field": "override:u1:core.mls_messaging", "value": False}
+
+        await sync.handle_message(json.dumps(message))
+        await sync.handle_message(json.dumps({**message, "value": True}))  # stale, ignored
+
+        assert FeatureFlags._version == 1
+        assert not FeatureFlags.is_enabled(FeatureFlags.CORE_MLS_MESSAGING, "u1")
+        sync.redis.hgetall.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_gap_reloads_state(self):
+        sync = FeatureFlagSync("redis://localhost")
+        sync.redis, _ = mock_redis()
+        sync.redis.hgetall.return_value = {
+            "_version": "5",
+            "status:experimental.resonance": '"enabled"',
+            "override:u1:core.mls_messaging": "false",
+        }
+        FeatureFlags.set_user_override("u2", FeatureFlags.CORE_MLS_MESSAGING, False)
+
+        await sync.handle_message(json.dumps({"version": 5, "field": "status:experimental.resonance", "value": "enabled"}))
+
+        assert FeatureFlags._version == 5
+        assert FeatureFlags.is_enabled(FeatureFlags.EXPERIMENTAL_RESONANCE)
+        assert not FeatureFlags.is_enabled(FeatureFlags.CORE_MLS_MESSAGING, "u1")
+        assert FeatureFlags.is_enabled(FeatureFlags.CORE_MLS_MESSAGING, "u2")
+
+    @pytest.mark.asyncio
+    async def test_flush_audit_writes_capped_stream(self):
+        sync = FeatureFlagSync("redis://localhost")
+        sync.redis, pipe = mock_redis()
+        for _ in range(3):
+            FeatureFlags.is_enabled(FeatureFlags.CORE_MLS_MESSAGING)
+
+        assert await sync.flush_audit(batch_size=2) == 3
+
+        assert pipe.execute.await_count == 2
+        assert pipe.xadd.call_args.kwargs["approximate"] is True
+        assert len(FeatureFlags._audit_pending) == 0
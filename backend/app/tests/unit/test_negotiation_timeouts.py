@@ -0,0 +1,154 @@
+"""
+Unit tests for negotiation timeout processing.
+
+This module tests batch expiry of negotiations past their deadlines, the
+receipts emitted for them and the deadline-driven rescheduling of the
+timeout checker.
+"""
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.models.negotiation import Negotiation, NegotiationStatus
+from app.db.models.receipt import ReceiptType
+from app.services.negotiation_service import NegotiationService
+from app.services.scheduler_service import SchedulerService
+from app.tests.fixtures.sql import compile_sql
+
+NOW = datetime(2025, 11, 6, 12)
+
+
+def make_negotiation(status, participants=2):
+    return Negotiation(
+        id=uuid.uuid4(),
+        title="Shared garden",
+        participant_ids=[uuid.uuid4() for _ in range(participants)],
+        status=status,
+        current_terms={"plots": 4},
+        terms_version=1,
+        acceptances={},
+        finalizations={},
+        negotiation_deadline=NOW - timedelta(minutes=1),
+        finalization_deadline=NOW - timedelta(minutes=1)
+    )
+
+
+def result_of(scalars=None, rows=None):
+    result = MagicMock()
+    result.scalars.return_value = iter(scalars or [])
+    result.all.return_value = rows or []
+    return result
+
+
+@pytest.mark.asyncio
+async def test_check_timeouts_expires_batch():
+    pending = make_negotiation(NegotiationStatus.NEGOTIATING)
+    consensus = make_negotiation(NegotiationStatus.CONSENSUS_REACHED, participants=3)
+    db = AsyncMock()
+    db.execute.side_effect = [
+        result_of(scalars=[pending, consensus]),  # claim
+        result_of(),                              # expire
+        result_of(),                              # previous receipt hashes
+        result_of(),                              # receipts
+    ]
+
+    result = await NegotiationService(db).check_timeouts(now=NOW, batch_size=10)
+
+    assert result["negotiation_timeouts"] == [pending]
+    assert result["finalization_timeouts"] == [consensus]
+    assert pending.status == NegotiationStatus.EXPIRED
+    assert pending.content_hash == NegotiationService(db)._calculate_negotiation_hash(pending)
+    db.commit.assert_awaited_once()
+
+    claim, _, _, receipts = [call.args for call in db.execute.await_args_list]
+    claim_sql = compile_sql(claim[0])
+    assert "FOR UPDATE SKIP LOCKED" in claim_sql
+
+    rows = receipts[1]
+    assert len(rows) == 5
+    assert {row["receipt_type"] for row in rows} == {ReceiptType.NEGOTIATION_EXPIRED}
+    deadlines = {(row["entity_id"], row["context"]["deadline"], row["context"]["previous_status"]) for row in rows}
+    assert deadlines == {
+        (pending.id, "negotiation", "negotiating"),
+        (consensus.id, "finalization", "consensus_reached"),
+    }
+    assert {row["context"]["content_hash"] for row in rows if row["entity_id"] == pending.id} == {pending.content_hash}
+
+
+@pytest.mark.asyncio
+async def test_expiry_receipts_extend_participant_chains():
+    negotiation = make_negotiation(NegotiationStatus.NEGOTIATING)
+    veteran, newcomer = negotiation.participant_ids
+    db = AsyncMock()
+    db.execute.side_effect = [
+        result_of(scalars=[negotiation]),
+        result_of(),
+        result_of(rows=[(veteran, "last-hash")]),
+        result_of(),
+    ]
+
+    await NegotiationService(db).check_timeouts(now=NOW, batch_size=10)
+
+    rows = {row["user_id"]: row for row in db.execute.await_args.args[1]}
+    assert rows[veteran]["previous_hash"] == "last-hash"
+    assert rows[newcomer]["previous_hash"] is None
+    assert rows[veteran]["timestamp"] == NOW
+
+
+@pytest.mark.asyncio
+async def test_check_timeouts_commits_each_batch():
+    first, second = make_negotiation(NegotiationStatus.INITIATED), make_negotiation(NegotiationStatus.NEGOTIATING)
+    db = AsyncMock()
+    db.execute.side_effect = [
+        result_of(scalars=[first]), result_of(), result_of(), result_of(),
+        result_of(scalars=[second]), result_of(), result_of(), result_of(),
+        result_of(),
+    ]
+
+    result = await NegotiationService(db).check_timeouts(now=NOW, batch_size=1)
+
+    assert result["negotiation_timeouts"] == [first, second]
+    assert first.status == second.status == NegotiationStatus.EXPIRED
+    assert db.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_check_timeouts_nothing_due():
+    db = AsyncMock()
+    db.execute.return_value = result_of()
+
+    result = await NegotiationService(db).check_timeouts(now=NOW)
+
+    assert result == {"negotiation_timeouts": [], "finalization_timeouts": []}
+    assert db.execute.await_count == 1
+    db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_next_deadline_reads_pending_deadlines():
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalar.return_value = NOW
+    db.execute.return_value = result
+
+    assert await NegotiationService(db).next_deadline() == NOW
+    sql = compile_sql(db.execute.await_args.args[0])
+    assert sql.startswith("SELECT least(")
+    assert "WHERE status = 'CONSENSUS_REACHED'" in sql
+
+
+@pytest.mark.parametrize("delay, expected", [(-5, 0), (42, 42), (10_000, 300)])
+def test_timeout_checker_delay_is_capped(delay, expected):
+    service = SchedulerService(redis_url="redis://localhost")
+    service.scheduler = MagicMock()
+    before = datetime.utcnow()
+
+    service._schedule_timeout_checker(delay)
+
+    kwargs = service.scheduler.add_job.call_args.kwargs
+    assert kwargs["trigger"] == "date"
+    assert kwargs["id"] == "timeout_checker"
+    wait = (kwargs["run_date"].replace(tzinfo=None) - before).total_seconds()
+    assert expected <= wait < expected + 5
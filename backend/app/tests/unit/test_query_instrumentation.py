@@ -0,0 +1,125 @@
+"""
+Unit tests for database query instrumentation.
+
+This module tests statement fingerprinting, per-request query accounting,
+slow query logging and N+1 detection.
+"""
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.db import instrumentation
+from app.db.instrumentation import (
+    begin_request,
+    end_request,
+    fingerprint,
+    get_query_metrics,
+    record_query,
+    setup_engine_events,
+)
+from app.middleware.query_metrics import QueryMetricsMiddleware
+
+
+class TestFingerprint:
+
+    def test_values_do_not_change_fingerprint(self):
+        first = fingerprint("SELECT * FROM tasks WHERE id = 'a1' AND priority > 3 LIMIT 10")
+        second = fingerprint("SELECT  *\nFROM tasks WHERE id = 'b''2' AND priority > 7 LIMIT 50")
+
+        assert first == second
+        assert first[0] == "SELECT * FROM tasks WHERE id = ? AND priority > ? LIMIT ?"
+
+    def test_placeholders_and_lists_collapse(self):
+        short = fingerprint("SELECT id FROM users WHERE id IN ($1, $2)")
+        long = fingerprint("SELECT id FROM users WHERE id IN ($1, $2, $3, $4, $5)")
+
+        assert short == long
+        assert short[0] == "SELECT id FROM users WHERE id IN (?+)"
+        assert fingerprint("INSERT INTO t (a, b) VALUES (%(a_m0)s, %(b_m0)s), (%(a_m1)s, %(b_m1)s)")[0] == \
+            "INSERT INTO t (a, b) VALUES (?+), ..."
+
+    def test_identifiers_keep_digits(self):
+        normalized, _ = fingerprint("SELECT t1.col2 FROM task_v2 AS t1")
+
+        assert normalized == "SELECT t1.col2 FROM task_v2 AS t1"
+
+
+class TestAccounting:
+
+    def test_queries_are_accounted_to_request(self):
+        engine = create_engine("sqlite://")
+        setup_engine_events(engine)
+
+        stats = begin_request("/tasks")
+        with engine.connect() as connection:
+            for i in range(3):
+                connection.execute(text(f"SELECT {i}"))
+        end_request(stats)
+
+        assert stats.count == 3
+        assert stats.total_ms > 0
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert stats.count == 3
+
+    def test_slow_query_is_logged_with_fingerprint(self, monkeypatch, caplog):
+        monkeypatch.setattr(instrumentation.settings, "DB_SLOW_QUERY_MS", 100.0)
+        slow_before = get_query_metrics()["slow_queries"]
+
+        with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+            record_query("SELECT * FROM memories WHERE id = 42", 150.0)
+            record_query("SELECT * FROM memories WHERE id = 43", 5.0)
+
+        assert get_query_metrics()["slow_queries"] == slow_before + 1
+        (record,) = [r for r in caplog.records if r.name == "app.db.slow_query"]
+        assert record.statement == "SELECT * FROM memories WHERE id = ?"
+        assert record.fingerprint == fingerprint("SELECT * FROM memories WHERE id = 1")[1]
+
+    def test_n_plus_one_warns_once_in_development(self, monkeypatch, caplog):
+        monkeypatch.setattr(instrumentation.settings, "APP_ENV", "development")
+        monkeypatch.setattr(instrumentation.settings, "DB_N_PLUS_ONE_THRESHOLD", 3)
+
+        stats = begin_request("/memories")
+        with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+            for i in range(6):
+                record_query(f"SELECT * FROM memory_chunks WHERE memory_id = {i}", 1.0)
+            record_query("SELECT * FROM users WHERE id = 1", 1.0)
+        end_request(stats)
+
+        warnings = [r for r in caplog.records if r.getMessage() == "Possible N+1 query"]
+        assert len(warnings) == 1
+        assert warnings[0].path == "/memories"
+
+    def test_n_plus_one_detection_is_off_outside_development(self, monkeypatch):
+        monkeypatch.setattr(instrumentation.settings, "APP_ENV", "production")
+
+        stats = begin_request("/memories")
+        for i in range(20):
+            record_query(f"SELECT * FROM memory_chunks WHERE memory_id = {i}", 1.0)
+        end_request(stats)
+
+        assert stats.count == 20
+        assert not stats.fingerprints
+
+
+def test_middleware_reports_query_headers():
+    engine = create_engine("sqlite://")
+    setup_engine_events(engine)
+    app = FastAPI()
+    app.add_middleware(QueryMetricsMiddleware)
+
+    @app.get("/items")
+    async def items():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        return []
+
+    requests_before = get_query_metrics()["requests"]
+    response = TestClient(app).get("/items")
+
+    assert response.headers["X-DB-Query-Count"] == "2"
+    assert float(response.headers["X-DB-Query-Time-Ms"]) > 0
+    assert get_query_metrics()["requests"] == requests_before + 1
@@ -0,0 +1,239 @@
+"""
+Unit tests for recurrence rules and RecurringTaskService.
+
+This module tests arithmetic occurrence evaluation, RRULE parsing and the
+horizon-based materialization of recurring task instances.
+"""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.models.task import TaskPriority, TaskStatus
+from app.services.task.recurrence import RecurrenceRule, RecurrenceType, parse_recurrence_pattern
+from app.services.scheduler_service import SchedulerService
+from app.services.task.recurring_task_service import GENERATED_TO_END, RecurringTaskService
+from app.tests.fixtures.sql import compile_sql
+from app.utils.common import utc_now
+
+
+def walk(rule, after, before):
+    """Reference expansion stepping through every occurrence from the anchor."""
+    dates, n = [], 0
+    while rule.nth(n) < before:
+        if rule.nth(n) >= after:
+            dates.append(rule.nth(n))
+        n += 1
+    return dates
+
+
+@pytest.fixture
+def recurring_service():
+    return RecurringTaskService(AsyncMock())
+
+
+@pytest.fixture
+def master_task():
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title="Water plants", description=None,
+        priority=TaskPriority.HIGH, estimated_duration_minutes=10, difficulty=2, quest_type=None,
+        visibility_mask="private", tags=["home"], task_metadata={"room": "kitchen"}, agent_id=None
+    )
+
+
+def make_schedule(pattern, due_time, count=None, end_date=None, generated_until=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(), due_time=due_time, recurrence_pattern=pattern, recurrence_count=count,
+        recurrence_end_date=end_date, recurrence_generated_until=generated_until
+    )
+
+
+class TestRecurrenceRule:
+
+    def test_monthly_does_not_drift(self):
+        rule = RecurrenceRule.from_pattern(datetime(2024, 1, 31, 9), "monthly")
+
+        assert [rule.nth(n).day for n in range(5)] == [31, 29, 31, 30, 31]
+
+    def test_weekdays_skip_anchor_outside_set(self):
+        # 2024-01-06 is a Saturday
+        rule = RecurrenceRule.from_pattern(datetime(2024, 1, 6, 8), "weekdays")
+
+        assert [rule.nth(n) for n in range(3)] == [
+            datetime(2024, 1, 8, 8), datetime(2024, 1, 9, 8), datetime(2024, 1, 10, 8)
+        ]
+
+    def test_rrule(self):
+        data = parse_recurrence_pattern("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR;COUNT=4")
+        rule = RecurrenceRule.from_data(datetime(2024, 1, 3), data)
+
+        assert data["type"] == RecurrenceType.WEEKLY
+        assert [date.day for _, date in rule.first(10)] == [5, 15, 19, 29]
+        assert rule.last_date() == datetime(2024, 1, 29)
+
+    def test_rrule_rejects_unsupported_parts(self):
+        with pytest.raises(ValueError):
+            parse_recurrence_pattern("FREQ=MONTHLY;BYMONTHDAY=-1")
+
+    @pytest.mark.parametrize("pattern", [
+        "daily", "every 3 days", "every 2 weeks", "monthly", "every 5 months",
+        "yearly", "weekends", "every monday,thursday", "FREQ=WEEKLY;INTERVAL=3;BYDAY=TU,SU"
+    ])
+    def test_window_matches_reference(self, pattern):
+        rule = RecurrenceRule.from_pattern(datetime(2021, 3, 17, 7, 30), pattern)
+
+        for offset in (0, 1, 45, 400, 2000):
+            after = rule.start + timedelta(days=offset, hours=3)
+            before = after + timedelta(days=60)
+            assert [date for _, date in rule.between(after, before)] == walk(rule, after, before)
+
+    def test_until_is_exclusive(self):
+        rule = RecurrenceRule.from_pattern(datetime(2024, 1, 1), "daily", until=datetime(2024, 1, 4))
+
+        assert [date.day for _, date in rule.first(10)] == [1, 2, 3]
+        assert rule.last_date() == datetime(2024, 1, 3)
+
+    def test_rrule_until_is_inclusive(self):
+        rule = RecurrenceRule.from_pattern(datetime(2024, 1, 1), "FREQ=DAILY;UNTIL=20240105")
+
+        assert [date.day for _, date in rule.first(10)] == [1, 2, 3, 4, 5]
+        assert [date.day for _, date in rule.between(datetime(2024, 1, 3), datetime(2024, 2, 1))] == [3, 4, 5]
+        assert rule.last_date() == datetime(2024, 1, 5)
+
+    def test_end_date_and_rrule_until_both_apply(self):
+        rule = RecurrenceRule.from_pattern(
+            datetime(2024, 1, 1), "FREQ=DAILY;UNTIL=20240105", until=datetime(2024, 1, 3)
+        )
+
+        assert rule.last_date() == datetime(2024, 1, 2)
+
+
+class TestGenerateRecurringDates:
+
+    def test_count_and_safety_limit(self, recurring_service):
+        data = recurring_service.parse_recurrence_pattern("every 2 days")
+
+        dates = recurring_service.generate_recurring_dates(datetime(2024, 1, 1), data, count=500, max_instances=3)
+
+        assert dates == [datetime(2024, 1, 1), datetime(2024, 1, 3), datetime(2024, 1, 5)]
+
+
+class TestHorizon:
+
+    def test_instance_rows_skip_master_occurrence(self, recurring_service, master_task):
+        schedule = make_schedule("daily", datetime(2024, 1, 1, 9))
+        rule = recurring_service._schedule_rule(schedule)
+
+        rows, watermark = recurring_service._instance_rows(master_task, schedule, rule, datetime(2024, 1, 1), datetime(2024, 1, 4))
+
+        assert [row["occurrence_date"] for row in rows] == [datetime(2024, 1, 2, 9), datetime(2024, 1, 3, 9)]
+        assert rows[0]["title"] == "Water plants (#1)"
+        assert rows[0]["status"] == TaskStatus.PENDING
+        assert rows[0]["recurring_parent_id"] == master_task.id
+        assert rows[0]["task_metadata"]["room"] == "kitchen"
+        assert watermark == datetime(2024, 1, 4)
+
+    def test_new_schedule_starts_now(self, recurring_service, master_task):
+        schedule = make_schedule("daily", datetime(2020, 1, 1, 9))
+        rule = recurring_service._schedule_rule(schedule)
+
+        rows, _ = recurring_service._instance_rows(master_task, schedule, rule, datetime(2024, 1, 1, 12), datetime(2024, 1, 4))
+
+        assert [row["occurrence_date"] for row in rows] == [datetime(2024, 1, 2, 9), datetime(2024, 1, 3, 9)]
+
+    def test_extension_starts_at_watermark(self, recurring_service, master_task):
+        schedule = make_schedule("weekly", datetime(2020, 1, 6, 9), generated_until=datetime(2024, 1, 1))
+        rule = recurring_service._schedule_rule(schedule)
+
+        rows, _ = recurring_service._instance_rows(master_task, schedule, rule, datetime(2024, 1, 2), datetime(2024, 1, 31))
+
+        assert [row["occurrence_date"].day for row in rows] == [1, 8, 15, 22, 29]
+        assert rows[0]["task_metadata"]["recurring_instance"] == 208
+
+    def test_finished_rule_is_marked_done(self, recurring_service, master_task):
+        schedule = make_schedule("daily", datetime(2024, 1, 1), count=3)
+        rule = recurring_service._schedule_rule(schedule)
+
+        rows, watermark = recurring_service._instance_rows(master_task, schedule, rule, datetime(2024, 1, 1), datetime(2024, 2, 1))
+
+        assert len(rows) == 2
+        assert watermark == GENERATED_TO_END
+
+    @pytest.mark.asyncio
+    async def test_insert_is_single_idempotent_statement(self, master_task):
+        db = AsyncMock()
+        result = MagicMock()
+        result.all.return_value = []
+        db.scalars.return_value = result
+        service = RecurringTaskService(db)
+        schedule = make_schedule("daily", datetime(2024, 1, 1))
+        rows, _ = service._instance_rows(master_task, schedule, service._schedule_rule(schedule), datetime(2024, 1, 1), datetime(2024, 1, 20))
+
+        created = await service._insert_instances(rows)
+
+        assert created == []
+        assert db.scalars.await_count == 1
+        statement, params = db.scalars.await_args.args
+        sql = compile_sql(statement)
+        assert "ON CONFLICT (recurring_parent_id, occurrence_date) WHERE recurring_parent_id IS NOT NULL DO NOTHING" in sql
+        assert len(params) == 18
+
+    @pytest.mark.asyncio
+    async def test_created_instances_get_reminders(self, master_task):
+        db = AsyncMock()
+        due = utc_now() + timedelta(days=3)
+        instance = SimpleNamespace(
+            id=uuid.uuid4(), user_id=master_task.user_id, status=TaskStatus.PENDING,
+            priority=TaskPriority.HIGH, due_date=due
+        )
+        result = MagicMock()
+        result.all.return_value = [instance]
+        db.scalars.return_value = result
+        service = RecurringTaskService(db)
+
+        await service._insert_instances([{"due_date": due}])
+
+        statement, reminders = db.execute.await_args.args
+        assert compile_sql(statement).startswith("INSERT INTO task_reminders")
+        assert {reminder["task_id"] for reminder in reminders} == {instance.id}
+        assert len(reminders) == 4
+
+    @pytest.mark.asyncio
+    async def test_invalid_schedule_is_not_selected_again(self, master_task):
+        db = AsyncMock()
+        schedule = make_schedule("every blue moon", datetime(2024, 1, 1))
+        batch = MagicMock()
+        batch.all.return_value = [(schedule, master_task)]
+        done = MagicMock()
+        done.all.return_value = []
+        db.execute.side_effect = [batch, None, done]
+        service = RecurringTaskService(db)
+
+        summary = await service.extend_horizon(now=datetime(2024, 1, 1))
+
+        assert summary["invalid"] == 1
+        statement, watermarks = db.execute.await_args_list[1].args
+        assert watermarks == [{"id": schedule.id, "recurrence_generated_until": GENERATED_TO_END}]
+
+    @pytest.mark.asyncio
+    async def test_no_rows_no_statement(self):
+        db = AsyncMock()
+        service = RecurringTaskService(db)
+
+        assert await service._insert_instances([]) == []
+        db.scalars.assert_not_awaited()
+
+
+def test_horizon_extension_is_scheduled():
+    service = SchedulerService(redis_url="redis://localhost")
+    service.scheduler = MagicMock()
+
+    service._register_jobs()
+
+    jobs = {call.kwargs["id"]: call for call in service.scheduler.add_job.call_args_list}
+    job = jobs["recurrence_horizon"]
+    assert job.args == (service.run_with_lock,)
+    assert job.kwargs["args"] == ["recurrence_horizon", service.extend_recurrence_horizon]
+    assert job.kwargs["trigger"] == "interval"
@@ -0,0 +1,150 @@
+"""
+Unit tests for ReminderScheduler.
+
+This module tests reminder time computation, the shape of the claim
+statement and (re)scheduling of a task's reminders.
+"""
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.models.task import TaskPriority, TaskStatus
+from app.services.task.reminder_scheduler import (
+    ClaimedReminder,
+    ReminderScheduler,
+    reminder_times,
+    reminder_type_for
+)
+from app.tests.fixtures.sql import compile_sql, sql_params
+
+NOW = datetime(2025, 11, 4, 12)
+
+
+def make_task(status=TaskStatus.PENDING, priority=TaskPriority.HIGH, due_date=NOW + timedelta(days=3)):
+    return SimpleNamespace(id=uuid.uuid4(), user_id=uuid.uuid4(), status=status, priority=priority, due_date=due_date)
+
+
+class TestReminderTimes:
+
+    def test_high_priority(self):
+        due = NOW + timedelta(days=3)
+
+        assert reminder_times(TaskPriority.HIGH, due, NOW) == [
+            due - timedelta(days=2), due - timedelta(days=1), due - timedelta(hours=4), due - timedelta(hours=1)
+        ]
+
+    def test_past_offsets_dropped(self):
+        due = NOW + timedelta(hours=10)
+
+        assert reminder_times(TaskPriority.MEDIUM, due, NOW) == [due - timedelta(hours=4)]
+
+    def test_due_soon_reminds_now(self):
+        assert reminder_times(TaskPriority.LOW, NOW + timedelta(hours=2), NOW) == [NOW]
+
+    def test_overdue_gets_nothing(self):
+        assert reminder_times(TaskPriority.URGENT, NOW - timedelta(minutes=1), NOW) == []
+
+    def test_reminder_type(self):
+        assert [reminder_type_for(hours) for hours in (0.5, 3, 20, 40)] == ["urgent", "soon", "today", "upcoming"]
+
+
+class TestReminderScheduler:
+
+    @pytest.mark.asyncio
+    async def test_schedule_replaces_pending_reminders(self):
+        db = AsyncMock()
+        task = make_task()
+
+        scheduled = await ReminderScheduler(db).schedule_for_task(task, now=NOW)
+
+        assert scheduled == 4
+        cancel = db.execute.await_args_list[0].args[0]
+        assert sql_params(cancel) == {"task_id_1": task.id, "status_1": "pending"}
+        _, rows = db.execute.await_args_list[1].args
+        assert rows == [
+            {"task_id": task.id, "user_id": task.user_id, "remind_at": remind_at}
+            for remind_at in (NOW + timedelta(days=1), NOW + timedelta(days=2), NOW + timedelta(hours=68), NOW + timedelta(hours=71))
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rescheduling_follows_new_due_date(self):
+        db = AsyncMock()
+        task = make_task()
+        scheduler = ReminderScheduler(db)
+
+        await scheduler.schedule_for_task(task, now=NOW)
+        task.due_date = NOW + timedelta(hours=3)
+        task.priority = TaskPriority.LOW
+        scheduled = await scheduler.schedule_for_task(task, now=NOW)
+
+        assert scheduled == 1
+        _, rows = db.execute.await_args.args
+        assert [row["remind_at"] for row in rows] == [NOW]
+
+    @pytest.mark.asyncio
+    async def test_completed_task_only_cancels(self):
+        db = AsyncMock()
+
+        scheduled = await ReminderScheduler(db).schedule_for_task(make_task(status=TaskStatus.COMPLETED), now=NOW)
+
+        assert scheduled == 0
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_new_tasks_share_one_insert(self):
+        db = AsyncMock()
+        tasks = [make_task(), make_task(priority=TaskPriority.LOW), make_task(status=TaskStatus.COMPLETED)]
+
+        scheduled = await ReminderScheduler(db).schedule_for_new_tasks(tasks, now=NOW)
+
+        assert scheduled == 5
+        assert db.execute.await_count == 1
+        _, rows = db.execute.await_args.args
+        assert [row["task_id"] for row in rows] == [tasks[0].id] * 4 + [tasks[1].id]
+
+    @pytest.mark.asyncio
+    async def test_claim_is_one_skip_locked_statement(self):
+        db = AsyncMock()
+        reminder_id, task_id, user_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        result = MagicMock()
+        result.all.return_value = [(reminder_id, task_id, user_id, 1)]
+        db.execute.return_value = result
+
+        claimed = await ReminderScheduler(db, lease_seconds=60).claim_due(now=NOW, limit=10)
+
+        assert claimed == [ClaimedReminder(reminder_id, task_id, user_id, 1)]
+        statement = db.execute.await_args.args[0]
+        sql = compile_sql(statement)
+        assert sql.startswith("UPDATE task_reminders SET remind_at=")
+        assert "ORDER BY task_reminders.remind_at" in sql
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "RETURNING" in sql
+        assert sql_params(statement)["remind_at"] == NOW + timedelta(seconds=60)
+
+    @pytest.mark.asyncio
+    async def test_snooze_requeues(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.first.return_value = (uuid.uuid4(),)
+        db.execute.return_value = result
+        until = NOW + timedelta(minutes=30)
+
+        found = await ReminderScheduler(db).snooze(uuid.uuid4(), uuid.uuid4(), until)
+
+        assert found is True
+        params = sql_params(db.execute.await_args.args[0])
+        assert params["remind_at"] == until
+        assert params["status"] == "pending"
+        assert params["attempts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_snooze_unknown_reminder(self):
+        db = AsyncMock()
+        result = MagicMock()
+        result.first.return_value = None
+        db.execute.return_value = result
+
+        assert await ReminderScheduler(db).snooze(uuid.uuid4(), uuid.uuid4(), NOW) is False
@@ -0,0 +1,191 @@
+"""
+Unit tests for the research bus pipeline.
+
+This module tests queue overflow policies, batch anonymization,
+concurrent subscriber dispatch with timeouts and batched persistence.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+from app.core.research_bus import (
+    AnonymizationLevel,
+    EventPriority,
+    OverflowPolicy,
+    ResearchBus,
+)
+
+
+def make_bus(**kwargs):
+    return ResearchBus(store=AsyncMock(), **kwargs)
+
+
+def make_event(event_type="metric.recorded", data=None, level=AnonymizationLevel.BASIC, user_hash=None):
+    return {
+        "id": "00000000-0000-0000-0000-000000000000",
+        "timestamp": "2025-11-09T12:00:00",
+        "type": event_type,
+        "plugin": "test",
+        "priority": EventPriority.NORMAL.value,
+        "anonymization_level": level.value,
+        "data": dict(data or {}),
+        "metadata": {"schema_version": "1.0", "consent_verified": False, "user_hash": user_hash}
+    }
+
+
+class TestOverflow:
+
+    @pytest.mark.asyncio
+    async def test_drop_newest(self):
+        bus = make_bus(queue_size=2, overflow_policy=OverflowPolicy.DROP_NEWEST)
+
+        accepted = [await bus.publish("a", {"n": i}) for i in range(3)]
+        bus._processor.cancel()
+
+        assert accepted == [True, True, False]
+        assert [bus._event_queue.get_nowait()["data"]["n"] for _ in range(2)] == [0, 1]
+        assert bus.get_metrics()["events_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        bus = make_bus(queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+
+        accepted = [await bus.publish("a", {"n": i}) for i in range(3)]
+        bus._processor.cancel()
+
+        assert accepted == [True, True, True]
+        assert [bus._event_queue.get_nowait()["data"]["n"] for _ in range(2)] == [1, 2]
+        metrics = bus.get_metrics()
+        assert (metrics["events_dropped"], metrics["queue_size"], metrics["queue_capacity"]) == (1, 0, 2)
+
+
+class TestAnonymization:
+
+    def test_batch_draws_noise_once(self):
+        bus = make_bus()
+        events = [
+            make_event(data={"value": 1.0, "count": 3, "email": "a@b.c"}, level=AnonymizationLevel.DIFFERENTIAL),
+            make_event(data={"value": 2.0, "timestamp": "2025-11-09T12:34:56"}, level=AnonymizationLevel.FULL),
+            make_event(data={"value": 3.0, "user_id": "u1"}, user_hash="abc"),
+            make_event(data={"value": 4.0, "email": "x@y.z"}, level=AnonymizationLevel.NONE),
+        ]
+
+        with patch.object(bus, "_laplace_noise", return_value=np.array([0.5, 0.25, 0.125])) as noise:
+            anonymized = bus._anonymize_batch(events)
+
+        noise.assert_called_once_with(3, sensitivity=1.0, epsilon=1.0)
+        assert anonymized[0]["data"] == {"value": 1.5, "count": 3.25}
+        assert anonymized[1]["data"] == {"value": 2.125, "timestamp": "2025-11-09T12:00:00"}
+        assert anonymized[2]["data"] == {"value": 3.0, "user_hash": "abc"}
+        assert anonymized[3]["data"] == {"value": 4.0, "email": "x@y.z"}
+
+    def test_failed_event_is_dropped(self):
+        bus = make_bus()
+        events = [
+            make_event(data={"timestamp": "not a time"}, level=AnonymizationLevel.FULL),
+            make_event(data={"ok": "yes"}),
+        ]
+
+        assert [event["data"] for event in bus._anonymize_batch(events)] == [{"ok": "yes"}]
+        assert bus.get_metrics()["anonymization_failures"] == 1
+
+
+class TestDispatch:
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_times_out_without_blocking_others(self):
+        bus = make_bus(handler_timeout=0.05)
+        received = []
+
+        async def fast(event):
+            received.append(event["data"]["n"])
+
+        async def slow(event):
+            await asyncio.sleep(1)
+
+        await bus.subscribe("metric.*", fast)
+        await bus.subscribe("*", slow)
+
+        await bus._process_batch([make_event(data={"n": i}) for i in range(3)])
+
+        assert received == [0, 1, 2]
+        metrics = bus.get_metrics()
+        assert metrics["handler_timeouts"] == 3
+        assert metrics["batches_dispatched"] == 1
+        assert 150 <= metrics["dispatch_latency_ms"]["max_ms"] < 1000
+        bus._store.append.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_critical_event_is_stored_immediately(self):
+        bus = make_bus()
+
+        assert await bus.publish("alert", {"n": 1}, priority=EventPriority.CRITICAL)
+
+        (events,) = bus._store.append.await_args.args
+        assert [event["type"] for event in events] == ["alert"]
+        assert bus.get_metrics()["events_stored"] == 1
+
+
+class TestStorage:
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_with_next(self):
+        bus = make_bus(queue_size=3)
+        bus._store.append.side_effect = [RuntimeError("down"), None]
+        first = [make_event(data={"n": i}) for i in range(2)]
+        second = [make_event(data={"n": i}) for i in range(2, 4)]
+
+        await bus._store_events(first)
+        assert bus.get_metrics()["store_backlog"] == 2
+
+        await bus._store_events(second)
+        assert bus._store.append.await_args.args[0] == first + second
+        metrics = bus.get_metrics()
+        assert (metrics["store_failures"], metrics["events_stored"], metrics["store_backlog"]) == (1, 4, 0)
+
+    @pytest.mark.asyncio
+    async def test_backlog_is_bounded(self):
+        bus = make_bus(queue_size=2)
+        bus._store.append.side_effect = RuntimeError("down")
+
+        await bus._store_events([make_event(data={"n": i}) for i in range(3)])
+
+        assert [event["data"]["n"] for event in bus._store_backlog] == [1, 2]
+        assert bus.get_metrics()["events_dropped"] == 1
+
+
+class TestFlush:
+
+    @pytest.mark.asyncio
+    async def test_flush_processes_batch_held_by_processor(self):
+        bus = make_bus()
+        bus._buffer_timeout = 60
+        received = []
+
+        async def handler(event):
+            received.append(event["data"]["n"])
+
+        await bus.subscribe("*", handler)
+        for i in range(3):
+            await bus.publish("a", {"n": i})
+        await asyncio.sleep(0.01)  # the processor takes the events off the queue
+
+        await asyncio.wait_for(bus.flush(), timeout=1)
+
+        assert bus._processor.done()
+        assert received == [0, 1, 2]
+        (events,) = bus._store.append.await_args.args
+        assert [event["data"]["n"] for event in events] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_bus_accepts_events_after_flush(self):
+        bus = make_bus()
+        bus._buffer_timeout = 0.01
+
+        await bus.flush()
+        await bus.publish("a", {"n": 1})
+        await asyncio.wait_for(bus._processor, timeout=1)
+
+        assert bus.get_metrics()["events_stored"] == 1
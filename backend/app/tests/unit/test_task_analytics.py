@@ -0,0 +1,215 @@
+"""
+Unit tests for TaskAnalyticsService.
+
+This module tests how grouped statistics rows are folded into TaskStats,
+the shape of the generated SQL, and maintenance of the daily rollup.
+"""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.models.task import TaskStatus, TaskPriority, QuestType
+from app.services.task.task_analytics import TaskAnalyticsService
+from app.services.task.task_service import TaskService
+from app.tests.fixtures.sql import compile_sql, sql_params
+
+
+def make_row(status, priority=TaskPriority.MEDIUM, quest_type=None, due_bucket=None, tasks=1,
+             estimated_minutes=0, actual_minutes=0, experience=0, difficulty=1, on_time=0,
+             current_streak=0, longest_streak=0):
+    return SimpleNamespace(
+        status=status, priority=priority, quest_type=quest_type, due_bucket=due_bucket,
+        tasks=tasks, estimated_minutes=estimated_minutes, actual_minutes=actual_minutes,
+        experience=experience, difficulty=difficulty, on_time=on_time,
+        current_streak=current_streak, longest_streak=longest_streak
+    )
+
+
+def make_task(completed_at, experience_points=20):
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title="Done", status=TaskStatus.COMPLETED,
+        completed_at=completed_at, experience_points=experience_points
+    )
+
+
+def daily_rollup(db):
+    """Per-day totals after applying every rollup upsert the session received."""
+    totals = {}
+    for call in db.execute.await_args_list:
+        params = sql_params(call.args[0])
+        completed, experience = totals.get(params["day"], (0, 0))
+        totals[params["day"]] = (completed + params["completed_count"], experience + params["experience_points"])
+    return totals
+
+
+@pytest.fixture
+def mock_db():
+    db = AsyncMock()
+    return db
+
+
+class TestBuildStats:
+
+    def test_empty(self):
+        stats = TaskAnalyticsService.build_stats([])
+
+        assert stats.total_tasks == 0
+        assert stats.current_streak == 0
+        assert stats.average_completion_time is None
+        assert stats.average_difficulty == 0.0
+
+    def test_folds_groups(self):
+        streaks = {"current_streak": 3, "longest_streak": 7}
+        rows = [
+            make_row(TaskStatus.COMPLETED, TaskPriority.HIGH, QuestType.DAILY, tasks=4,
+                     estimated_minutes=100, actual_minutes=80, experience=60, difficulty=8, on_time=3, **streaks),
+            make_row(TaskStatus.COMPLETED, TaskPriority.LOW, None, tasks=1,
+                     actual_minutes=20, experience=10, difficulty=1, **streaks),
+            make_row(TaskStatus.PENDING, TaskPriority.HIGH, QuestType.DAILY, "overdue", tasks=2,
+                     estimated_minutes=30, experience=99, difficulty=4, **streaks),
+            make_row(TaskStatus.IN_PROGRESS, TaskPriority.MEDIUM, None, "overdue", tasks=1,
+                     actual_minutes=500, difficulty=2, **streaks),
+            make_row(TaskStatus.PENDING, TaskPriority.MEDIUM, QuestType.SOLO, "due_today", tasks=2,
+                     difficulty=5, **streaks),
+        ]
+
+        stats = TaskAnalyticsService.build_stats(rows)
+
+        assert stats.total_tasks == 10
+        assert stats.completed_tasks == 5
+        assert stats.in_progress_tasks == 1
+        # Only pending tasks count as overdue, but the due-date breakdown covers all open tasks
+        assert stats.overdue_tasks == 2
+        assert stats.tasks_by_due_date == {"overdue": 3, "due_today": 2}
+        assert stats.tasks_by_status == {"completed": 5, "pending": 4, "in_progress": 1}
+        assert stats.tasks_by_priority == {"high": 6, "low": 1, "medium": 3}
+        assert stats.tasks_by_quest_type == {"daily": 6, "solo": 2}
+        # Experience and actual time only come from completed tasks
+        assert stats.total_experience == 70
+        assert stats.total_time_actual == 100
+        assert stats.total_time_estimated == 130
+        assert stats.average_completion_time == 20.0
+        assert stats.on_time_completion_rate == 0.6
+        assert stats.average_difficulty == 2.0
+        assert stats.current_streak == 3
+        assert stats.longest_streak == 7
+
+
+class TestStatsQuery:
+
+    def test_single_grouped_statement(self):
+        service = TaskAnalyticsService(AsyncMock(), use_rollup=True)
+
+        sql = compile_sql(service.stats_query(uuid.uuid4(), datetime(2026, 1, 5, 12)))
+
+        assert "GROUP BY tasks.status, tasks.priority, tasks.quest_type, due_bucket" in sql
+        assert "FILTER (WHERE" in sql
+        assert "row_number() OVER (ORDER BY completion_days.day)" in sql
+        assert "FROM task_daily_stats" in sql
+
+    def test_streaks_without_rollup(self):
+        service = TaskAnalyticsService(AsyncMock(), use_rollup=False)
+
+        sql = compile_sql(service.stats_query(uuid.uuid4(), datetime(2026, 1, 5, 12)))
+
+        assert "task_daily_stats" not in sql
+        assert "SELECT DISTINCT CAST(tasks.completed_at AS DATE) AS day" in sql
+
+    @pytest.mark.asyncio
+    async def test_get_stats_is_one_round_trip(self, mock_db):
+        result = AsyncMock()
+        result.all = lambda: [make_row(TaskStatus.COMPLETED, current_streak=1, longest_streak=1)]
+        mock_db.execute.return_value = result
+        service = TaskAnalyticsService(mock_db, use_rollup=True)
+
+        stats = await service.get_stats(uuid.uuid4())
+
+        assert mock_db.execute.await_count == 1
+        assert stats.completed_tasks == 1
+        assert stats.current_streak == 1
+
+
+class TestRecordTransition:
+
+    @pytest.mark.asyncio
+    async def test_completion_increments_day(self, mock_db):
+        service = TaskAnalyticsService(mock_db, use_rollup=True)
+
+        await service.record_transition(
+            uuid.uuid4(), TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED,
+            datetime(2026, 1, 5, 23, 59), experience_points=15
+        )
+
+        assert daily_rollup(mock_db) == {datetime(2026, 1, 5).date(): (1, 15)}
+        assert "ON CONFLICT (user_id, day) DO UPDATE" in compile_sql(mock_db.execute.await_args.args[0])
+
+    @pytest.mark.asyncio
+    async def test_reopen_decrements_day(self, mock_db):
+        service = TaskAnalyticsService(mock_db, use_rollup=True)
+
+        await service.record_transition(
+            uuid.uuid4(), TaskStatus.COMPLETED, TaskStatus.PENDING,
+            datetime(2026, 1, 4, 8), experience_points=15
+        )
+
+        assert daily_rollup(mock_db) == {datetime(2026, 1, 4).date(): (-1, -15)}
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_task_lifecycle(self, mock_db):
+        service = TaskAnalyticsService(mock_db, use_rollup=True)
+        user_id = uuid.uuid4()
+        monday, tuesday = datetime(2026, 1, 5, 9), datetime(2026, 1, 6, 18)
+
+        # Two tasks completed on Monday, one reopened and completed again on Tuesday
+        await service.record_transition(user_id, TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED, monday, 10)
+        await service.record_transition(user_id, TaskStatus.PENDING, TaskStatus.COMPLETED, monday, 30)
+        await service.record_transition(user_id, TaskStatus.COMPLETED, TaskStatus.PENDING, monday, 30)
+        await service.record_transition(user_id, TaskStatus.PENDING, TaskStatus.COMPLETED, tuesday, 30)
+
+        assert daily_rollup(mock_db) == {monday.date(): (1, 10), tuesday.date(): (1, 30)}
+
+        await service.record_deletion(make_task(tuesday, experience_points=30))
+
+        assert daily_rollup(mock_db) == {monday.date(): (1, 10), tuesday.date(): (0, 0)}
+
+    @pytest.mark.asyncio
+    async def test_hard_delete_decrements_completion_day(self, mock_db):
+        task = make_task(datetime(2026, 1, 3, 10))
+        service = TaskService(mock_db)
+        service.repository = AsyncMock()
+        service.repository.get_task_by_id.return_value = task
+        service.repository.delete_task.return_value = True
+
+        with patch("app.services.task.task_analytics.settings.TASK_STATS_DAILY_ROLLUP", True):
+            assert await service.delete_task(task.id, hard_delete=True)
+
+        assert daily_rollup(mock_db) == {datetime(2026, 1, 3).date(): (-1, -20)}
+        service.repository.delete_task.assert_awaited_once_with(task.id, True)
+
+    @pytest.mark.asyncio
+    async def test_soft_delete_keeps_rollup(self, mock_db):
+        task = make_task(datetime(2026, 1, 3, 10))
+        service = TaskService(mock_db)
+        service.repository = AsyncMock()
+        service.repository.get_task_by_id.return_value = task
+        service.repository.delete_task.return_value = True
+
+        await service.delete_task(task.id)
+
+        mock_db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("previous, status, use_rollup", [
+        (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, True),
+        (TaskStatus.COMPLETED, TaskStatus.COMPLETED, True),
+        (TaskStatus.PENDING, TaskStatus.COMPLETED, False),
+    ])
+    async def test_ignored_transitions(self, mock_db, previous, status, use_rollup):
+        service = TaskAnalyticsService(mock_db, use_rollup=use_rollup)
+
+        await service.record_transition(uuid.uuid4(), previous, status, datetime(2026, 1, 5))
+
+        mock_db.execute.assert_not_awaited()
@@ -0,0 +1,110 @@
+"""
+Unit tests for TaskSimilarityIndex and MinHash utilities.
+
+This module tests title band keys, the indexed duplicate lookup and the
+exact similarity check applied to its candidates.
+"""
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.models.task import Task
+from app.services.task.task_similarity import TaskSimilarityIndex
+from app.tests.fixtures.sql import compile_sql
+from app.utils.minhash import BANDS, jaccard_similarity, normalize_tokens, text_bands
+
+
+def mock_db(titles):
+    db = AsyncMock()
+    result = MagicMock()
+    result.all.return_value = [(title, text_bands(title)) for title in titles]
+    db.execute.return_value = result
+    return db
+
+
+class TestMinHash:
+
+    def test_bands_are_stable_bigints(self):
+        bands = text_bands("Review the budget")
+
+        assert len(bands) == BANDS
+        assert bands == text_bands("review, the BUDGET!")
+        assert all(-(1 << 63) <= key < (1 << 63) for key in bands)
+
+    def test_empty_title_has_no_bands(self):
+        assert text_bands("") == []
+        assert text_bands("...") == []
+
+    def test_near_duplicates_share_bands(self):
+        title = "prepare the quarterly budget review for the finance team"
+
+        assert set(text_bands(title)) & set(text_bands(title + " today"))
+        assert not set(text_bands(title)) & set(text_bands("walk the dog"))
+
+    def test_jaccard(self):
+        assert jaccard_similarity(normalize_tokens("a b c"), normalize_tokens("b c d")) == 0.5
+        assert jaccard_similarity(frozenset(), normalize_tokens("a")) == 0.0
+
+    def test_task_title_sets_bands(self):
+        task = Task(title="Call the dentist")
+
+        assert task.title_lsh_bands == text_bands("Call the dentist")
+        task.title = "Call the plumber"
+        assert task.title_lsh_bands == text_bands("Call the plumber")
+
+
+class TestTaskSimilarityIndex:
+
+    @pytest.mark.asyncio
+    async def test_batch_is_one_indexed_query(self):
+        db = mock_db(["Prepare quarterly budget review for finance"])
+        index = TaskSimilarityIndex(db)
+
+        duplicates = await index.find_duplicates(uuid.uuid4(), [
+            "prepare quarterly budget review for finance",
+            "Book flights to Lisbon",
+        ])
+
+        assert duplicates == [True, False]
+        assert db.execute.await_count == 1
+        sql = compile_sql(db.execute.await_args.args[0])
+        assert "tasks.title_lsh_bands && " in sql
+
+    @pytest.mark.asyncio
+    async def test_shared_band_below_threshold_is_not_duplicate(self):
+        # Similarity 5/7: shares bands with high probability but is not a duplicate
+        db = mock_db(["buy milk eggs bread butter cheese"])
+
+        duplicates = await TaskSimilarityIndex(db).find_duplicates(
+            uuid.uuid4(), ["buy milk eggs bread butter cheese jam ham"]
+        )
+
+        assert duplicates == [False]
+
+    @pytest.mark.asyncio
+    async def test_within_batch(self):
+        db = mock_db([])
+        titles = ["email the landlord about rent", "Email the landlord about  rent", "water plants"]
+
+        assert await TaskSimilarityIndex(db).find_duplicates(uuid.uuid4(), titles) == [False, False, False]
+        assert await TaskSimilarityIndex(db).find_duplicates(uuid.uuid4(), titles, within_batch=True) == [False, True, False]
+
+    @pytest.mark.asyncio
+    async def test_punctuation_counts_as_part_of_a_word(self):
+        # Same bands, but the duplicate rule compares whitespace-split words:
+        # "rent!" is not "rent", so the similarity is 4/6
+        db = mock_db(["Email the landlord about rent"])
+
+        duplicates = await TaskSimilarityIndex(db).find_duplicates(
+            uuid.uuid4(), ["email the landlord about rent!", "EMAIL the landlord about rent"]
+        )
+
+        assert duplicates == [False, True]
+
+    @pytest.mark.asyncio
+    async def test_no_tokens_no_query(self):
+        db = mock_db([])
+
+        assert await TaskSimilarityIndex(db).find_duplicates(uuid.uuid4(), ["?!"]) == [False]
+        db.execute.assert_not_awaited()
@@ -0,0 +1,170 @@
+"""
+Unit tests for trust calibration.
+
+This module tests lazy closed-form trust decay, incremental reliability
+counters, the persisted calibration service and vectorized recalibration.
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.core.trust.calibration import (
+    CalibrationLevel,
+    TrustCalibrationService,
+    TrustCalibrator,
+    TrustDimension,
+    TrustSignal,
+)
+from app.db.models.trust import TrustCalibrationState
+from app.tests.fixtures.sql import compile_sql, sql_params
+
+NOW = datetime(2025, 11, 8, 12, tzinfo=timezone.utc)
+
+
+def make_row(component_id="agent_engineer", trust=(0.9, 0.7, 0.3), success=0, total=0, updated=NOW):
+    return TrustCalibrationState(
+        component_id=component_id,
+        performance_trust=trust[0],
+        purpose_trust=trust[1],
+        process_trust=trust[2],
+        success_count=success,
+        total_count=total,
+        calibration="calibrated",
+        calibration_gap=0.0,
+        trust_velocity=0.0,
+        signal_mean=0.0,
+        volatility=0.0,
+        signal_count=0,
+        last_updated=updated
+    )
+
+
+class TestTrustCalibrator:
+
+    def test_decay_is_closed_form(self):
+        calibrator = TrustCalibrator(decay_rate=0.5)
+        state = calibrator.new_state(NOW)
+        state.performance_trust = 0.9
+
+        once = calibrator.decayed(state, NOW + timedelta(hours=4))
+        twice = calibrator.decayed(calibrator.decayed(state, NOW + timedelta(hours=1)), NOW + timedelta(hours=4))
+
+        assert once.performance_trust == pytest.approx(0.5 + 0.4 * np.exp(-2))
+        assert twice.performance_trust == pytest.approx(once.performance_trust)
+        assert once.last_updated == NOW + timedelta(hours=4)
+        assert state.performance_trust == 0.9
+
+    def test_signal_updates_dimension_and_volatility(self):
+        calibrator = TrustCalibrator()
+        state = calibrator.new_state(NOW)
+        for value in (1.0, -1.0, 1.0):
+            signal = TrustSignal(dimension=TrustDimension.PERFORMANCE, signal_type="t", value=value, timestamp=NOW)
+            state = calibrator.add_trust_signal(state, signal)
+
+        assert state.signal_count == 3
+        assert state.volatility > 0.5
+        assert state.overall_trust == pytest.approx(
+            state.performance_trust * 0.5 + state.purpose_trust * 0.25 + state.process_trust * 0.25
+        )
+
+    def test_reliability_is_incremental(self):
+        calibrator = TrustCalibrator()
+        state = calibrator.new_state(NOW)
+        for success in (True, True, False, True):
+            calibrator.record_operation(state, success)
+
+        assert (state.success_count, state.total_count, state.actual_reliability) == (3, 4, 0.75)
+        assert state.calibration == CalibrationLevel.UNDERTRUST
+        reliability, (lower, upper) = calibrator.calculate_system_reliability(3, 4)
+        assert lower < reliability == 0.75 < upper
+
+    def test_recalibrate_matches_scalar_path(self):
+        calibrator = TrustCalibrator(decay_rate=0.1)
+        rng = np.random.default_rng(7)
+        trust = rng.uniform(0, 1, size=(50, 3))
+        elapsed = rng.uniform(0, 3600 * 48, size=50)
+        total = rng.integers(0, 20, size=50)
+        success = np.minimum(rng.integers(0, 20, size=50), total)
+
+        decayed, overall, gap, calibration = calibrator.recalibrate(trust, elapsed, success, total)
+
+        service = TrustCalibrationService(AsyncMock(), calibrator)
+        for i in range(50):
+            row = make_row(trust=trust[i], success=int(success[i]), total=int(total[i]))
+            state = calibrator.decayed(service._to_state(row), NOW + timedelta(seconds=elapsed[i]))
+            assert decayed[i] == pytest.approx([state.performance_trust, state.purpose_trust, state.process_trust])
+            assert overall[i] == pytest.approx(state.overall_trust)
+            assert gap[i] == pytest.approx(state.calibration_gap)
+            assert calibration[i] == state.calibration.value
+
+
+class TestTrustCalibrationService:
+
+    @pytest.mark.asyncio
+    async def test_read_is_one_keyed_lookup(self):
+        db = AsyncMock()
+        db.get.return_value = make_row(updated=NOW - timedelta(hours=10))
+
+        state = await TrustCalibrationService(db).get_trust_state("agent_engineer", now=NOW)
+
+        db.get.assert_awaited_once_with(TrustCalibrationState, "agent_engineer")
+        db.execute.assert_not_awaited()
+        assert state.performance_trust == pytest.approx(0.5 + 0.4 * np.exp(-0.1))
+
+    @pytest.mark.asyncio
+    async def test_unknown_component_reads_baseline(self):
+        db = AsyncMock()
+        db.get.return_value = None
+        service = TrustCalibrationService(db)
+
+        assert (await service.get_trust_state("new", now=NOW)).overall_trust == 0.5
+        assert await service.get_reliability("new") is None
+
+    @pytest.mark.asyncio
+    async def test_record_success_persists_counters(self):
+        row = make_row(success=1, total=2, updated=datetime.now(timezone.utc))
+        db = AsyncMock()
+        db.get.return_value = row
+
+        state = await TrustCalibrationService(db).record_success("agent_engineer")
+
+        assert db.get.await_args.kwargs["with_for_update"] is True
+        assert (row.success_count, row.total_count) == (2, 3)
+        assert row.performance_trust > 0.9
+        assert row.signal_count == 1 and state.signal_count == 1
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_first_record_inserts_row(self):
+        db = AsyncMock()
+        db.get.side_effect = [None, make_row(trust=(0.5, 0.5, 0.5))]
+
+        await TrustCalibrationService(db).record_failure("agent_engineer")
+
+        sql = compile_sql(db.execute.await_args.args[0])
+        assert sql.startswith("INSERT INTO trust_calibration_states")
+        assert sql.endswith("ON CONFLICT (component_id) DO NOTHING")
+
+    @pytest.mark.asyncio
+    async def test_recalibrate_all_updates_in_batches(self):
+        db = AsyncMock()
+        results = []
+        for batch in ([("a", 0.9, 0.5, 0.5, 1, 2, 3600.0)], [("b", 0.1, 0.1, 0.1, 0, 0, 0.0)], []):
+            result = MagicMock()
+            result.all.return_value = batch
+            results.extend([result, MagicMock()])
+        db.execute.side_effect = results
+
+        assert await TrustCalibrationService(db).recalibrate_all(now=NOW, batch_size=1) == 2
+        assert db.commit.await_count == 2
+
+        select_sql, update_sql = [
+            compile_sql(call.args[0]) for call in db.execute.await_args_list[2:4]
+        ]
+        assert "trust_calibration_states.component_id > " in select_sql
+        assert select_sql.endswith("FOR UPDATE SKIP LOCKED")
+        assert "FROM (VALUES" in update_sql
+        params = sql_params(db.execute.await_args_list[3].args[0])
+        assert {"b", CalibrationLevel.CALIBRATED.value, NOW} <= set(params.values())
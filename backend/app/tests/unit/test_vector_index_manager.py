@@ -0,0 +1,161 @@
+"""
+Unit tests for VectorIndexManager index lifecycle.
+
+This module tests index parameter selection, maintenance windows and the
+rebuild decisions made by run_maintenance.
+"""
+from datetime import datetime
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.scheduler_service import SchedulerService
+from app.services.vector_store.pgvector_store import MemoryVectorStore
+from app.services.vector_store.vector_index_manager import (
+    IndexHealth,
+    IndexParams,
+    MaintenanceWindow,
+    VectorIndexManager,
+    choose_index_params,
+)
+
+
+IN_WINDOW = datetime(2025, 11, 1, 3, 0)
+OUT_OF_WINDOW = datetime(2025, 11, 1, 14, 0)
+
+
+@pytest.fixture
+def manager():
+    """Create a manager with the memory store registered."""
+    manager = VectorIndexManager()
+    manager.register_store("memory", MemoryVectorStore())
+    manager.rebuild_index = AsyncMock(return_value=1.5)
+    return manager
+
+
+@pytest.fixture
+def mock_db_session():
+    """Create a mock database session."""
+    return AsyncMock()
+
+
+class TestIndexParams:
+    """Test cases for index parameter selection."""
+
+    def test_parameters_scale_with_table_size(self):
+        """ivfflat lists and HNSW m grow with the number of rows."""
+        assert choose_index_params(50_000, "ivfflat").lists == 50
+        assert choose_index_params(4_000_000, "ivfflat").lists == 2000
+        assert choose_index_params(500_000, "hnsw").m == 16
+        assert choose_index_params(20_000_000, "hnsw") == IndexParams("hnsw", m=32, ef_construction=128)
+
+    def test_auto_switches_to_hnsw(self):
+        """Auto mode builds ivfflat for small tables and HNSW for large ones."""
+        with patch("app.services.vector_store.vector_index_manager.settings") as settings:
+            settings.VECTOR_INDEX_HNSW_MIN_ROWS = 100_000
+            assert choose_index_params(10_000, "auto").method == "ivfflat"
+            assert choose_index_params(200_000, "auto").method == "hnsw"
+
+    def test_parses_existing_index(self):
+        """Parameters are recovered from pg_indexes definitions."""
+        params = IndexParams.from_indexdef(
+            "CREATE INDEX idx ON public.memory_chunks USING ivfflat (embedding vector_cosine_ops) WITH (lists='100')"
+        )
+
+        assert params == IndexParams("ivfflat", lists=100)
+        assert not IndexParams("ivfflat", lists=150).drifted_from(params)
+        assert IndexParams("ivfflat", lists=1000).drifted_from(params)
+
+    def test_window_wraps_midnight(self):
+        """Windows crossing midnight contain times on both sides of it."""
+        window = MaintenanceWindow.parse("23:00-02:00")
+
+        assert window.contains(datetime(2025, 11, 1, 23, 30))
+        assert window.contains(datetime(2025, 11, 2, 1, 0))
+        assert not window.contains(datetime(2025, 11, 2, 12, 0))
+        assert window.next_start(datetime(2025, 11, 2, 12, 0)) == datetime(2025, 11, 2, 23, 0)
+
+
+@pytest.mark.asyncio
+class TestRunMaintenance:
+    """Test cases for VectorIndexManager.run_maintenance."""
+
+    async def test_rebuild_waits_for_window(self, manager, mock_db_session):
+        """Outside the window a needed rebuild is only scheduled."""
+        health = IndexHealth(row_count=500_000, current=IndexParams("ivfflat", lists=100), target=IndexParams("ivfflat", lists=500))
+        manager.get_index_health = AsyncMock(return_value=health)
+
+        results = await manager.run_maintenance(mock_db_session, now=OUT_OF_WINDOW)
+
+        assert results["memory"]["reasons"] == ["parameters"]
+        assert results["memory"]["scheduled_for"].startswith("2025-11-02T02:00")
+        manager.rebuild_index.assert_not_awaited()
+
+    async def test_recall_drift_triggers_rebuild(self, manager, mock_db_session):
+        """A recall drop beyond the tolerance rebuilds inside the window."""
+        params = IndexParams("ivfflat", lists=100)
+        manager.get_index_health = AsyncMock(side_effect=[
+            IndexHealth(row_count=100_000, current=params, target=params),
+            IndexHealth(row_count=100_000, current=params, target=params, recall_baseline=0.97),
+        ])
+        manager.measure_recall = AsyncMock(side_effect=[0.97, 0.85, 0.98])
+
+        first = await manager.run_maintenance(mock_db_session, now=IN_WINDOW)
+        second = await manager.run_maintenance(mock_db_session, now=IN_WINDOW)
+
+        assert first["memory"]["reindexed"] is False
+        assert second["memory"]["reasons"] == ["recall"]
+        assert second["memory"]["reindexed"] is True
+        manager.rebuild_index.assert_awaited_once()
+        comments = [str(call.args[0]) for call in mock_db_session.execute.await_args_list]
+        assert comments == [
+            "COMMENT ON INDEX idx_memory_chunks_embedding IS 'recall_baseline=0.9700'",
+            "COMMENT ON INDEX idx_memory_chunks_embedding IS 'recall_baseline=0.9800'",
+        ]
+
+    async def test_rebuild_starts_outside_session_transaction(self, manager, mock_db_session):
+        """The session's transaction ends before the rebuild drops the old index."""
+        params = IndexParams("ivfflat", lists=100)
+        events = []
+        manager.get_index_health = AsyncMock(
+            side_effect=lambda *args: events.append("query") or IndexHealth(
+                row_count=100_000, current=params, target=params, recall_baseline=0.97
+            )
+        )
+        manager.measure_recall = AsyncMock(side_effect=lambda *args, **kwargs: events.append("query") or 0.85)
+        mock_db_session.commit.side_effect = lambda: events.append("commit")
+        manager.rebuild_index.side_effect = lambda *args: events.append("rebuild") or 1.5
+
+        results = await manager.run_maintenance(mock_db_session, now=IN_WINDOW)
+
+        assert results["memory"]["reindexed"] is True
+        assert events[events.index("rebuild") - 1] == "commit"
+
+    async def test_baseline_read_from_index_comment(self, manager, mock_db_session):
+        """The recall baseline survives restarts as a comment on the index."""
+        stats, index = MagicMock(), MagicMock()
+        stats.mappings.return_value.one_or_none.return_value = {"row_count": 5000, "dead_tuples": 0}
+        index.mappings.return_value.one_or_none.return_value = {
+            "indexdef": "CREATE INDEX idx ON memory_chunks USING ivfflat (embedding vector_cosine_ops) WITH (lists='10')",
+            "comment": "recall_baseline=0.9650",
+        }
+        mock_db_session.execute.side_effect = [stats, index]
+
+        health = await manager.get_index_health(manager.get_store("memory"), mock_db_session)
+
+        assert health.current == IndexParams("ivfflat", lists=10)
+        assert health.recall_baseline == 0.965
+
+
+def test_maintenance_runs_when_window_opens():
+    """The scheduler starts index maintenance daily at the window start."""
+    service = SchedulerService(redis_url="redis://localhost")
+    service.scheduler = MagicMock()
+
+    with patch("app.services.scheduler_service.settings.VECTOR_INDEX_MAINTENANCE_WINDOW", "02:30-05:00"):
+        service._register_jobs()
+
+    jobs = {call.kwargs["id"]: call.kwargs for call in service.scheduler.add_job.call_args_list}
+    job = jobs["vector_index_maintenance"]
+    assert job["args"] == ["vector_index_maintenance", service.run_vector_index_maintenance]
+    assert (job["trigger"], job["hour"], job["minute"]) == ("cron", 2, 30)
+    assert job["kwargs"] == {"lock_seconds": 9000}
@@ -0,0 +1,117 @@
+"""
+MinHash Utilities
+
+This module contains MinHash signatures and locality-sensitive hashing
+(LSH) bands for short texts such as task titles. Two texts whose token sets
+have Jaccard similarity s share at least one band with probability
+1 - (1 - s^ROWS_PER_BAND)^BANDS, so near-duplicates can be found with an
+index lookup on the bands followed by an exact comparison of the few
+candidates. All hashes are deterministic across processes, so bands can be
+stored in the database.
+"""
+
+import hashlib
+import random
+import re
+from typing import FrozenSet, List
+
+# 16 bands of 4 rows: texts with similarity 0.8 collide with probability 0.9998,
+# texts with similarity 0.3 with probability 0.12
+BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERMUTATIONS = BANDS * ROWS_PER_BAND
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _hash64(data: str) -> int:
+    """Stable 64-bit hash of a string."""
+    return int.from_bytes(hashlib.blake2b(data.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def normalize_tokens(text: str) -> FrozenSet[str]:
+    """
+    Split a text into its set of lowercase word tokens.
+
+    Args:
+        text: The text to tokenize
+
+    Returns:
+        The set of tokens, punctuation removed
+    """
+    return frozenset(re.findall(r'\w+', text.lower()))
+
+
+def jaccard_similarity(tokens1: FrozenSet[str], tokens2: FrozenSet[str]) -> float:
+    """
+    Compute the Jaccard similarity of two token sets.
+
+    Args:
+        tokens1: The first token set
+        tokens2: The second token set
+
+    Returns:
+        Similarity between 0.0 and 1.0 (0.0 if either set is empty)
+    """
+    if not tokens1 or not tokens2:
+        return 0.0
+    return len(tokens1 & tokens2) / len(tokens1 | tokens2)
+
+
+def minhash_signature(tokens: FrozenSet[str]) -> List[int]:
+    """
+    Compute the MinHash signature of a token set.
+
+    Args:
+        tokens: The token set
+
+    Returns:
+        NUM_PERMUTATIONS minimum hash values (empty for an empty set)
+    """
+    if not tokens:
+        return []
+    hashes = [_hash64(token) for token in tokens]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def lsh_bands(signature: List[int]) -> List[int]:
+    """
+    Hash a MinHash signature into LSH band keys.
+
+    Each band key is a signed 64-bit integer, so it fits a BIGINT column.
+
+    Args:
+        signature: A MinHash signature
+
+    Returns:
+        BANDS band keys (empty for an empty signature)
+    """
+    if not signature:
+        return []
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        key = _hash64(f"{band}:{','.join(map(str, rows))}")
+        keys.append(key - (1 << 64) if key >= (1 << 63) else key)
+    return keys
+
+
+def text_bands(text: str) -> List[int]:
+    """
+    Compute the LSH band keys of a text.
+
+    Args:
+        text: The text
+
+    Returns:
+        Band keys of the text's normalized tokens
+    """
+    return lsh_bands(minhash_signature(normalize_tokens(text or "")))
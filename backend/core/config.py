@@ -94,6 +94,11 @@ class Settings(BaseSettings):
     memory_importance_threshold: float = Field(default=0.5, env="MEMORY_IMPORTANCE_THRESHOLD")
     memory_vector_dimensions: int = Field(default=1536, env="MEMORY_VECTOR_DIMENSIONS")
     max_memory_search_results: int = Field(default=20, env="MAX_MEMORY_SEARCH_RESULTS")
+    memory_dedup_bloom_bits: int = Field(default=1 << 27, env="MEMORY_DEDUP_BLOOM_BITS")
+    memory_dedup_bloom_hashes: int = Field(default=7, env="MEMORY_DEDUP_BLOOM_HASHES")
+    memory_near_duplicate_distance: int = Field(default=3, env="MEMORY_NEAR_DUPLICATE_DISTANCE")
+    memory_skip_near_duplicates: bool = Field(default=True, env="MEMORY_SKIP_NEAR_DUPLICATES")
+    memory_cluster_similarity_threshold: float = Field(default=0.82, env="MEMORY_CLUSTER_SIMILARITY_THRESHOLD")
     
     # Deep Signal Configuration
     signal_cooldown_minutes: int = Field(default=15, env="SIGNAL_COOLDOWN")
@@ -0,0 +1,40 @@
+"""
+Memory deduplication signatures
+Adds content hash and SimHash LSH band columns with their indexes
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers
+revision = '002_memory_dedup_index'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add dedup columns and indexes to memories"""
+    op.add_column('memories', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('memories', sa.Column('simhash', sa.BigInteger, nullable=True))
+    op.add_column('memories', sa.Column('simhash_bands', postgresql.ARRAY(sa.Integer), nullable=True))
+
+    # Existing rows keep NULL hashes, which the partial unique index ignores
+    op.create_index(
+        'uq_memories_user_content_hash',
+        'memories',
+        ['user_id', 'content_hash'],
+        unique=True,
+        postgresql_where=sa.text("deleted_at IS NULL AND content_hash IS NOT NULL")
+    )
+    op.execute("CREATE INDEX ix_memories_simhash_bands ON memories USING gin (simhash_bands);")
+
+
+def downgrade() -> None:
+    """Drop dedup columns and indexes"""
+    op.drop_index('ix_memories_simhash_bands', table_name='memories')
+    op.drop_index('uq_memories_user_content_hash', table_name='memories')
+    op.drop_column('memories', 'simhash_bands')
+    op.drop_column('memories', 'simhash')
+    op.drop_column('memories', 'content_hash')
@@ -14,6 +14,7 @@ from core.database import db_manager
 from middleware.security import setup_middleware
 from core.redis_client import redis_manager
 from core.vectors import VectorStore
+from services.deduplication import memory_deduplicator
 
 # Configure logging
 logging.basicConfig(
@@ -41,6 +42,10 @@ async def lifespan(app: FastAPI):
     await redis_manager.initialize()
     logger.info("Redis connected")
     
+    # Seed the dedup Bloom filter from stored memories if Redis lost it;
+    # until then duplicate checks go to the database
+    memory_deduplicator.start_seeding()
+    
     # Vector store initialization deferred to Sprint 5
     logger.info("Vector store will be initialized in Sprint 5")
     
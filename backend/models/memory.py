@@ -7,9 +7,9 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, String, Text, Float, Integer, Boolean, DateTime, JSON, ForeignKey, Index, CheckConstraint, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, Float, Integer, BigInteger, Boolean, DateTime, JSON, ForeignKey, Index, CheckConstraint, Enum as SQLEnum, text
 from sqlalchemy.orm import relationship, Mapped
-from sqlalchemy.dialects.postgresql import JSONB, UUID as SQLAlchemyUUID
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, UUID as SQLAlchemyUUID
 from pgvector.sqlalchemy import Vector
 
 from core.database import Base, TimestampMixin, UUIDMixin, SoftDeleteMixin
@@ -54,6 +54,11 @@ class Memory(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     summary: Mapped[Optional[str]] = Column(Text, nullable=True)
     title: Mapped[Optional[str]] = Column(String(255), nullable=True)
     
+    # Deduplication signatures (see services/deduplication.py)
+    content_hash: Mapped[Optional[str]] = Column(String(64), nullable=True)
+    simhash: Mapped[Optional[int]] = Column(BigInteger, nullable=True)
+    simhash_bands: Mapped[Optional[List[int]]] = Column(ARRAY(Integer), nullable=True)
+    
     # Memory type and status
     memory_type: Mapped[MemoryType] = Column(
         SQLEnum(MemoryType),
@@ -161,6 +166,13 @@ class Memory(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
         Index("ix_memories_user_occurred", "user_id", "occurred_at"),
         Index("ix_memories_consolidation_group", "consolidation_group_id"),
         Index("ix_memories_drift", "drift_index"),
+        Index(
+            "uq_memories_user_content_hash",
+            "user_id", "content_hash",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL AND content_hash IS NOT NULL")
+        ),
+        Index("ix_memories_simhash_bands", "simhash_bands", postgresql_using="gin"),
         Index("ix_memories_embedding_content", "embedding_content", postgresql_using="ivfflat"),
         Index("ix_memories_embedding_semantic", "embedding_semantic", postgresql_using="ivfflat"),
         CheckConstraint("importance >= 0 AND importance <= 1", name="ck_memories_importance"),
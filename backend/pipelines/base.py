@@ -4,9 +4,16 @@ Async pipeline architecture with composable stages
 """
 
 import asyncio
+import contextlib
 import logging
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TypeVar, Generic, Callable, Union
+from collections import defaultdict
+from collections.abc import Mapping, MutableMapping
+from typing import (
+    Any, Dict, List, Optional, TypeVar, Generic, Callable, Union, Iterable, Iterator, Tuple
+)
 from datetime import datetime
 from enum import Enum
 import traceback
@@ -55,12 +62,176 @@ class PipelineResult(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class ContextAccessError(Exception):
+    """Raised when a stage touches a context key it did not declare"""
+    pass
+
+
+class StageProfiler:
+    """Aggregates per-stage timings across every run of a pipeline"""
+    
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+            'calls': 0,
+            'failures': 0,
+            'items': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'queue_wait_ms': 0.0,
+            'max_queue_wait_ms': 0.0,
+        })
+    
+    def record(
+        self,
+        stage_name: str,
+        duration_ms: float,
+        items: int,
+        queue_wait_ms: float,
+        failed: bool = False
+    ) -> None:
+        """Record a single stage execution"""
+        stats = self._stats[stage_name]
+        stats['calls'] += 1
+        stats['failures'] += int(failed)
+        stats['items'] += items
+        stats['total_ms'] += duration_ms
+        stats['max_ms'] = max(stats['max_ms'], duration_ms)
+        stats['queue_wait_ms'] += queue_wait_ms
+        stats['max_queue_wait_ms'] = max(stats['max_queue_wait_ms'], queue_wait_ms)
+    
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Return a snapshot of the collected stats with averages"""
+        report = {}
+        for stage_name, stats in self._stats.items():
+            calls = stats['calls'] or 1
+            report[stage_name] = {
+                **stats,
+                'avg_ms': stats['total_ms'] / calls,
+                'avg_queue_wait_ms': stats['queue_wait_ms'] / calls,
+            }
+        return report
+    
+    def reset(self) -> None:
+        """Drop all collected stats"""
+        self._stats.clear()
+
+
+class ExecutionContext(Mapping):
+    """
+    Context owned by a single pipeline run.
+    
+    Every run gets its own instance so concurrent runs never share state.
+    Stages see it through a StageContext view that only allows the keys
+    they declared; undeclared writes are rejected.
+    """
+    
+    def __init__(
+        self,
+        initial: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None,
+        profiler: Optional[StageProfiler] = None
+    ):
+        self.run_id = run_id or uuid.uuid4().hex
+        self.profiler = profiler
+        self._data: Dict[str, Any] = dict(initial or {})
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def set(self, key: str, value: Any) -> None:
+        """Write a key on behalf of the pipeline itself"""
+        self._data[key] = value
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a shallow copy of the current state"""
+        return dict(self._data)
+    
+    def view(self, stage: "PipelineStage") -> "StageContext":
+        """Return the access-checked view for a stage"""
+        return StageContext(self, stage.name, stage.reads, stage.writes)
+
+
+class StageContext(MutableMapping):
+    """Access-checked view of an ExecutionContext for one stage"""
+    
+    def __init__(
+        self,
+        run_context: ExecutionContext,
+        stage_name: str,
+        reads: Optional[frozenset],
+        writes: frozenset
+    ):
+        self.run_context = run_context
+        self._stage_name = stage_name
+        self._reads = reads
+        self._writes = writes
+    
+    def _check_read(self, key: str) -> None:
+        if self._reads is not None and key not in self._reads and key not in self._writes:
+            raise ContextAccessError(
+                f"Stage {self._stage_name} read undeclared context key '{key}'"
+            )
+    
+    def _check_write(self, key: str) -> None:
+        if key not in self._writes:
+            raise ContextAccessError(
+                f"Stage {self._stage_name} wrote undeclared context key '{key}'"
+            )
+    
+    def __getitem__(self, key: str) -> Any:
+        self._check_read(key)
+        return self.run_context._data[key]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        self._check_read(key)
+        return self.run_context._data.get(key, default)
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._check_write(key)
+        self.run_context._data[key] = value
+    
+    def __delitem__(self, key: str) -> None:
+        self._check_write(key)
+        del self.run_context._data[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in self.run_context._data:
+            if self._reads is None or key in self._reads or key in self._writes:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
 class PipelineStage(ABC, Generic[T, R]):
-    """Base class for pipeline stages"""
+    """
+    Base class for pipeline stages.
     
-    def __init__(self, name: str, required: bool = True):
+    Stages declare the context keys they read and write. `reads=None` allows
+    reading any key; writes are denied unless listed. `max_concurrency`
+    caps how many runs may be inside this stage at once.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        required: bool = True,
+        reads: Optional[Iterable[str]] = None,
+        writes: Iterable[str] = (),
+        max_concurrency: Optional[int] = None
+    ):
         self.name = name
         self.required = required
+        self.reads: Optional[frozenset] = frozenset(reads) if reads is not None else None
+        self.writes: frozenset = frozenset(writes)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
         self._logger = logging.getLogger(f"{__name__}.{name}")
     
     @abstractmethod
@@ -80,10 +251,40 @@ class PipelineStage(ABC, Generic[T, R]):
         self._logger.warning(f"Non-required stage {self.name} failed: {error}")
         return data  # Continue with original data for optional stages
     
-    async def execute(self, data: T, context: Dict[str, Any]) -> StageResult:
-        """Execute stage with error handling and timing"""
-        start_time = datetime.utcnow()
+    def _resolve_context(self, context: Any) -> Tuple[Any, Optional[StageProfiler]]:
+        """Turn whatever the caller passed into this stage's view"""
+        if isinstance(context, ExecutionContext):
+            return context.view(self), context.profiler
+        if isinstance(context, StageContext):
+            # Nested stages (e.g. ConditionalStage) get their own declarations
+            return context.run_context.view(self), context.run_context.profiler
+        # Legacy callers passing a plain dict
+        return context, None
+    
+    async def execute(self, data: T, context: Any) -> StageResult:
+        """Execute stage with error handling, concurrency limit and timing"""
+        stage_context, profiler = self._resolve_context(context)
+        queued_at = time.perf_counter()
+        
+        slot = self._semaphore if self._semaphore is not None else contextlib.nullcontext()
+        async with slot:
+            start = time.perf_counter()
+            queue_wait_ms = (start - queued_at) * 1000
+            result = await self._run(data, stage_context, start)
         
+        result.metadata['queue_wait_ms'] = queue_wait_ms
+        if profiler is not None:
+            profiler.record(
+                self.name,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                items=len(data) if isinstance(data, (list, tuple)) else 1,
+                queue_wait_ms=queue_wait_ms,
+                failed=result.status == PipelineStatus.FAILED
+            )
+        return result
+    
+    async def _run(self, data: T, context: Any, start: float) -> StageResult:
+        """Validate and process, converting failures into a StageResult"""
         try:
             # Validate input
             if not await self.validate(data):
@@ -92,18 +293,15 @@ class PipelineStage(ABC, Generic[T, R]):
             # Process data
             result = await self.process(data, context)
             
-            # Calculate duration
-            duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            
             return StageResult(
                 stage_name=self.name,
                 status=PipelineStatus.COMPLETED,
                 data=result,
-                duration_ms=duration_ms
+                duration_ms=int((time.perf_counter() - start) * 1000)
             )
             
         except Exception as e:
-            duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            duration_ms = int((time.perf_counter() - start) * 1000)
             self._logger.error(f"Stage {self.name} failed: {e}\n{traceback.format_exc()}")
             
             # Try error recovery
@@ -127,21 +325,39 @@ class PipelineStage(ABC, Generic[T, R]):
 
 
 class Pipeline(ABC, Generic[T, R]):
-    """Base pipeline class with composable stages"""
+    """
+    Base pipeline class with composable stages.
+    
+    Pipelines are safe to run concurrently: each run gets a fresh
+    ExecutionContext seeded from `default_context` plus per-call overrides.
+    """
     
     def __init__(
         self,
         name: str,
         stages: Optional[List[PipelineStage]] = None,
         parallel: bool = False,
-        continue_on_error: bool = False
+        continue_on_error: bool = False,
+        default_context: Optional[Dict[str, Any]] = None
     ):
         self.name = name
         self.stages = stages or []
         self.parallel = parallel
         self.continue_on_error = continue_on_error
+        self.default_context: Dict[str, Any] = dict(default_context or {})
+        self.profiler = StageProfiler()
         self._logger = logging.getLogger(f"{__name__}.{name}")
-        self._context: Dict[str, Any] = {}
+    
+    def new_context(self, overrides: Optional[Dict[str, Any]] = None) -> ExecutionContext:
+        """Create the isolated context for one run"""
+        initial = dict(self.default_context)
+        if overrides:
+            initial.update(overrides)
+        return ExecutionContext(initial, profiler=self.profiler)
+    
+    def get_profile(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage time, item counts and queue waits across all runs"""
+        return self.profiler.report()
     
     def add_stage(self, stage: PipelineStage) -> "Pipeline":
         """Add a stage to the pipeline"""
@@ -161,11 +377,16 @@ class Pipeline(ABC, Generic[T, R]):
         """Hook called after pipeline execution"""
         return data
     
-    async def execute_parallel(self, data: T) -> PipelineResult:
+    async def execute_parallel(
+        self,
+        data: T,
+        context: Optional[ExecutionContext] = None
+    ) -> PipelineResult:
         """Execute stages in parallel"""
+        context = context if context is not None else self.new_context()
         tasks = []
         for stage in self.stages:
-            task = asyncio.create_task(stage.execute(data, self._context))
+            task = asyncio.create_task(stage.execute(data, context))
             tasks.append(task)
         
         stage_results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -193,27 +414,33 @@ class Pipeline(ABC, Generic[T, R]):
             
             # Store in results
             if isinstance(stage_result, StageResult):
-                self._context[f"stage_{stage_result.stage_name}"] = stage_result
+                context.set(f"stage_{stage_result.stage_name}", stage_result)
         
         return PipelineResult(
             pipeline_name=self.name,
             status=PipelineStatus.COMPLETED if all_completed else PipelineStatus.PARTIAL,
             stages=[r for r in stage_results if isinstance(r, StageResult)],
             data=final_data,
-            error="; ".join(errors) if errors else None
+            error="; ".join(errors) if errors else None,
+            metadata={'run_id': context.run_id}
         )
     
-    async def execute_sequential(self, data: T) -> PipelineResult:
+    async def execute_sequential(
+        self,
+        data: T,
+        context: Optional[ExecutionContext] = None
+    ) -> PipelineResult:
         """Execute stages sequentially"""
+        context = context if context is not None else self.new_context()
         stage_results = []
         current_data = data
         
         for stage in self.stages:
-            result = await stage.execute(current_data, self._context)
+            result = await stage.execute(current_data, context)
             stage_results.append(result)
             
             # Store stage result in context
-            self._context[f"stage_{stage.name}"] = result
+            context.set(f"stage_{stage.name}", result)
             
             if result.status == PipelineStatus.COMPLETED or result.status == PipelineStatus.PARTIAL:
                 current_data = result.data if result.data is not None else current_data
@@ -223,7 +450,8 @@ class Pipeline(ABC, Generic[T, R]):
                         pipeline_name=self.name,
                         status=PipelineStatus.FAILED,
                         stages=stage_results,
-                        error=result.error
+                        error=result.error,
+                        metadata={'run_id': context.run_id}
                     )
         
         # Determine overall status
@@ -242,12 +470,18 @@ class Pipeline(ABC, Generic[T, R]):
             pipeline_name=self.name,
             status=status,
             stages=stage_results,
-            data=current_data
+            data=current_data,
+            metadata={'run_id': context.run_id}
         )
     
-    async def execute(self, data: T) -> PipelineResult:
-        """Execute the pipeline"""
+    async def execute(
+        self,
+        data: T,
+        context: Optional[Dict[str, Any]] = None
+    ) -> PipelineResult:
+        """Execute the pipeline in its own isolated context"""
         start_time = datetime.utcnow()
+        run_context = self.new_context(context)
         
         try:
             # Pre-processing hook
@@ -255,9 +489,9 @@ class Pipeline(ABC, Generic[T, R]):
             
             # Execute stages
             if self.parallel:
-                result = await self.execute_parallel(data)
+                result = await self.execute_parallel(data, run_context)
             else:
-                result = await self.execute_sequential(data)
+                result = await self.execute_sequential(data, run_context)
             
             # Post-processing hook
             if result.data is not None:
@@ -287,13 +521,18 @@ class Pipeline(ABC, Generic[T, R]):
                 total_duration_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000)
             )
     
-    async def execute_batch(self, items: List[T], max_concurrent: int = 10) -> List[PipelineResult]:
+    async def execute_batch(
+        self,
+        items: List[T],
+        max_concurrent: int = 10,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[PipelineResult]:
         """Execute pipeline on multiple items with concurrency control"""
         semaphore = asyncio.Semaphore(max_concurrent)
         
         async def process_item(item: T) -> PipelineResult:
             async with semaphore:
-                return await self.execute(item)
+                return await self.execute(item, context)
         
         tasks = [process_item(item) for item in items]
         return await asyncio.gather(*tasks)
@@ -311,16 +550,20 @@ class CompositePipeline(Pipeline[T, R]):
         super().__init__(name, parallel=parallel)
         self.pipelines = pipelines
     
-    async def execute(self, data: T) -> PipelineResult:
+    async def execute(
+        self,
+        data: T,
+        context: Optional[Dict[str, Any]] = None
+    ) -> PipelineResult:
         """Execute composed pipelines"""
         if self.parallel:
-            tasks = [p.execute(data) for p in self.pipelines]
+            tasks = [p.execute(data, context) for p in self.pipelines]
             results = await asyncio.gather(*tasks)
         else:
             results = []
             current_data = data
             for pipeline in self.pipelines:
-                result = await pipeline.execute(current_data)
+                result = await pipeline.execute(current_data, context)
                 results.append(result)
                 if result.data is not None:
                     current_data = result.data
@@ -356,9 +599,10 @@ class ConditionalStage(PipelineStage[T, T]):
         condition: Callable[[T, Dict[str, Any]], bool],
         true_stage: Optional[PipelineStage] = None,
         false_stage: Optional[PipelineStage] = None,
-        required: bool = True
+        required: bool = True,
+        **stage_options
     ):
-        super().__init__(name, required)
+        super().__init__(name, required, **stage_options)
         self.condition = condition
         self.true_stage = true_stage
         self.false_stage = false_stage
@@ -384,9 +628,10 @@ class TransformStage(PipelineStage[T, R]):
         self,
         name: str,
         transform_func: Callable[[T], Union[R, asyncio.Future[R]]],
-        required: bool = True
+        required: bool = True,
+        **stage_options
     ):
-        super().__init__(name, required)
+        super().__init__(name, required, **stage_options)
         self.transform_func = transform_func
     
     async def process(self, data: T, context: Dict[str, Any]) -> R:
@@ -404,9 +649,10 @@ class FilterStage(PipelineStage[List[T], List[T]]):
         self,
         name: str,
         filter_func: Callable[[T], bool],
-        required: bool = False
+        required: bool = False,
+        **stage_options
     ):
-        super().__init__(name, required)
+        super().__init__(name, required, **stage_options)
         self.filter_func = filter_func
     
     async def process(self, data: List[T], context: Dict[str, Any]) -> List[T]:
@@ -419,39 +665,113 @@ class FilterStage(PipelineStage[List[T], List[T]]):
 
 
 class BatchStage(PipelineStage[List[T], List[R]]):
-    """Stage that processes items in batches"""
+    """
+    Stage that processes items in batches.
+    
+    With `coalesce=True` items from concurrent runs are pooled into shared
+    batches, so `process_batch` sees up to `batch_size` items at once no
+    matter how small each run's input is. A partially filled batch is
+    flushed after `max_wait_ms`.
+    """
     
     def __init__(
         self,
         name: str,
         batch_size: int,
         process_batch: Callable[[List[T]], List[R]],
-        required: bool = True
+        required: bool = True,
+        coalesce: bool = False,
+        max_wait_ms: float = 5.0,
+        **stage_options
     ):
-        super().__init__(name, required)
+        super().__init__(name, required, **stage_options)
         self.batch_size = batch_size
         self.process_batch = process_batch
+        self.coalesce = coalesce
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[Tuple[List[T], asyncio.Future]] = []
+        self._pending_count = 0
+        self._flusher: Optional[asyncio.Task] = None
+    
+    async def _call_batch(self, batch: List[T]) -> List[R]:
+        if asyncio.iscoroutinefunction(self.process_batch):
+            return await self.process_batch(batch)
+        return self.process_batch(batch)
     
     async def process(self, data: List[T], context: Dict[str, Any]) -> List[R]:
         """Process in batches"""
+        if self.coalesce:
+            return await self._submit(data)
+        
         results = []
         
         for i in range(0, len(data), self.batch_size):
             batch = data[i:i + self.batch_size]
-            
-            if asyncio.iscoroutinefunction(self.process_batch):
-                batch_results = await self.process_batch(batch)
-            else:
-                batch_results = self.process_batch(batch)
-            
+            batch_results = await self._call_batch(batch)
             results.extend(batch_results)
         
         return results
+    
+    async def _submit(self, items: List[T]) -> List[R]:
+        """Queue a run's items for the next shared batch"""
+        if not items:
+            return []
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((list(items), future))
+        self._pending_count += len(items)
+        
+        if self._pending_count >= self.batch_size:
+            await self._flush()
+        elif self._flusher is None:
+            self._flusher = asyncio.create_task(self._delayed_flush())
+        
+        return await future
+    
+    async def _delayed_flush(self) -> None:
+        try:
+            await asyncio.sleep(self.max_wait_ms / 1000)
+        finally:
+            self._flusher = None
+        await self._flush()
+    
+    async def _flush(self) -> None:
+        """Run process_batch over everything pending and hand results back"""
+        pending, self._pending = self._pending, []
+        self._pending_count = 0
+        if not pending:
+            return
+        
+        items = [item for run_items, _ in pending for item in run_items]
+        try:
+            results: List[R] = []
+            for i in range(0, len(items), self.batch_size):
+                results.extend(await self._call_batch(items[i:i + self.batch_size]))
+            if len(results) != len(items):
+                raise ValueError(
+                    f"Batch stage {self.name} returned {len(results)} results "
+                    f"for {len(items)} items"
+                )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        offset = 0
+        for run_items, future in pending:
+            if not future.done():
+                future.set_result(results[offset:offset + len(run_items)])
+            offset += len(run_items)
 
 
 # Export classes
 __all__ = [
     'PipelineStatus',
+    'ContextAccessError',
+    'StageProfiler',
+    'ExecutionContext',
+    'StageContext',
     'StageResult',
     'PipelineResult',
     'PipelineStage',
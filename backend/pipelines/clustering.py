@@ -0,0 +1,339 @@
+"""
+Incremental embedding clustering for memory consolidation
+Online centroid clustering over an ANN index with persisted cluster state
+"""
+
+import base64
+import json
+import logging
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from core.config import get_settings
+
+try:
+    import hnswlib
+except ImportError:  # Optional: falls back to exact NumPy search
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, leaving zero rows untouched"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class CentroidIndex:
+    """
+    Nearest-centroid index.
+
+    Keeps centroids in a growable float32 matrix and answers top-1 cosine
+    queries by chunked matrix product. Once the number of centroids passes
+    `hnsw_threshold` and hnswlib is installed, queries go through an HNSW
+    graph instead.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        hnsw_threshold: int = 20000,
+        hnsw_m: int = 16,
+        hnsw_ef: int = 64
+    ):
+        self.dim = dim
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef = hnsw_ef
+        self._matrix = np.zeros((1024, dim), dtype=np.float32)
+        self._size = 0
+        self._hnsw = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def uses_hnsw(self) -> bool:
+        return self._hnsw is not None
+
+    def upsert(self, slots: np.ndarray, centroids: np.ndarray) -> None:
+        """Insert or replace centroids at the given integer slots"""
+        if len(slots) == 0:
+            return
+        needed = int(slots.max()) + 1
+        if needed > self._matrix.shape[0]:
+            capacity = max(needed, self._matrix.shape[0] * 2)
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[slots] = centroids
+        self._size = max(self._size, needed)
+
+        if self._hnsw is not None:
+            self._ensure_hnsw_capacity(self._size)
+            self._hnsw.add_items(centroids, slots)
+        elif hnswlib is not None and self._size >= self.hnsw_threshold:
+            self._build_hnsw()
+
+    def _build_hnsw(self) -> None:
+        index = hnswlib.Index(space='ip', dim=self.dim)
+        index.init_index(
+            max_elements=max(self._size * 2, 1024),
+            M=self.hnsw_m,
+            ef_construction=max(self.hnsw_ef * 2, 100)
+        )
+        index.set_ef(self.hnsw_ef)
+        index.add_items(self._matrix[:self._size], np.arange(self._size))
+        self._hnsw = index
+        logger.info(f"Switched centroid index to HNSW at {self._size} centroids")
+
+    def _ensure_hnsw_capacity(self, size: int) -> None:
+        if size > self._hnsw.get_max_elements():
+            self._hnsw.resize_index(size * 2)
+
+    def search(self, queries: np.ndarray, chunk_size: int = 2048) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (slot, similarity) of the nearest centroid for each query"""
+        n = len(queries)
+        if self._size == 0 or n == 0:
+            return np.full(n, -1, dtype=np.int64), np.full(n, -1.0, dtype=np.float32)
+
+        if self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(queries, k=1)
+            # hnswlib 'ip' space reports 1 - dot product
+            return labels[:, 0].astype(np.int64), (1.0 - distances[:, 0]).astype(np.float32)
+
+        slots = np.empty(n, dtype=np.int64)
+        sims = np.empty(n, dtype=np.float32)
+        centroids = self._matrix[:self._size]
+        for start in range(0, n, chunk_size):
+            scores = queries[start:start + chunk_size] @ centroids.T
+            best = scores.argmax(axis=1)
+            slots[start:start + chunk_size] = best
+            sims[start:start + chunk_size] = scores[np.arange(len(best)), best]
+        return slots, sims
+
+
+class ClusterStateStore:
+    """In-process cluster state; survives between cycles of one worker"""
+
+    def __init__(self):
+        self._clusters: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._assignments: Dict[str, Dict[str, str]] = {}
+
+    async def load_clusters(self, user_id: str) -> Dict[str, Tuple[np.ndarray, int]]:
+        """Return cluster_id -> (vector sum, member count)"""
+        return {
+            cluster_id: (np.array(entry['sum'], dtype=np.float32), entry['count'])
+            for cluster_id, entry in self._clusters.get(user_id, {}).items()
+        }
+
+    async def save_clusters(self, user_id: str, clusters: Dict[str, Tuple[np.ndarray, int]]) -> None:
+        """Persist changed clusters"""
+        stored = self._clusters.setdefault(user_id, {})
+        for cluster_id, (vector_sum, count) in clusters.items():
+            stored[cluster_id] = {'sum': vector_sum.copy(), 'count': count}
+
+    async def get_assignments(self, user_id: str, memory_ids: List[str]) -> Dict[str, str]:
+        """Return the known cluster for each memory id"""
+        assignments = self._assignments.get(user_id, {})
+        return {m: assignments[m] for m in memory_ids if m in assignments}
+
+    async def save_assignments(self, user_id: str, assignments: Dict[str, str]) -> None:
+        """Persist memory -> cluster assignments"""
+        self._assignments.setdefault(user_id, {}).update(assignments)
+
+
+class RedisClusterStateStore(ClusterStateStore):
+    """Cluster state in Redis hashes so it survives restarts and is shared by workers"""
+
+    def __init__(self, redis_manager, namespace: str = "consolidation"):
+        super().__init__()
+        self.redis = redis_manager
+        self.namespace = namespace
+
+    def _key(self, kind: str, user_id: str) -> str:
+        return f"{self.namespace}:{kind}:{user_id}"
+
+    async def load_clusters(self, user_id: str) -> Dict[str, Tuple[np.ndarray, int]]:
+        raw = await self.redis.client.hgetall(self._key("clusters", user_id))
+        clusters = {}
+        for cluster_id, payload in raw.items():
+            entry = json.loads(payload)
+            vector_sum = np.frombuffer(base64.b64decode(entry['sum']), dtype=np.float32).copy()
+            clusters[cluster_id] = (vector_sum, entry['count'])
+        return clusters
+
+    async def save_clusters(self, user_id: str, clusters: Dict[str, Tuple[np.ndarray, int]]) -> None:
+        if not clusters:
+            return
+        mapping = {
+            cluster_id: json.dumps({
+                'sum': base64.b64encode(vector_sum.astype(np.float32).tobytes()).decode(),
+                'count': count
+            })
+            for cluster_id, (vector_sum, count) in clusters.items()
+        }
+        await self.redis.client.hset(self._key("clusters", user_id), mapping=mapping)
+
+    async def get_assignments(self, user_id: str, memory_ids: List[str]) -> Dict[str, str]:
+        if not memory_ids:
+            return {}
+        values = await self.redis.client.hmget(self._key("assignments", user_id), memory_ids)
+        return {m: v for m, v in zip(memory_ids, values) if v is not None}
+
+    async def save_assignments(self, user_id: str, assignments: Dict[str, str]) -> None:
+        if assignments:
+            await self.redis.client.hset(self._key("assignments", user_id), mapping=assignments)
+
+
+class IncrementalClusterer:
+    """
+    Online centroid clustering.
+
+    Each new vector joins its nearest cluster when cosine similarity to the
+    centroid reaches `similarity_threshold`, otherwise it starts a new
+    cluster. Clusters keep an unnormalized vector sum and a count, so
+    centroids update exactly as members arrive and only new vectors are ever
+    compared. Work proceeds in chunks of `chunk_size`, keeping memory bounded
+    by the number of clusters rather than the number of memories.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        similarity_threshold: float = 0.82,
+        chunk_size: int = 4096,
+        hnsw_threshold: int = 20000
+    ):
+        self.dim = dim
+        self.similarity_threshold = similarity_threshold
+        self.chunk_size = chunk_size
+        self.index = CentroidIndex(dim, hnsw_threshold=hnsw_threshold)
+        self._cluster_ids: List[str] = []
+        self._slots: Dict[str, int] = {}
+        self._sums = np.zeros((0, dim), dtype=np.float32)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._dirty: set = set()
+
+    @property
+    def cluster_count(self) -> int:
+        return len(self._cluster_ids)
+
+    def load(self, clusters: Dict[str, Tuple[np.ndarray, int]]) -> None:
+        """Seed the clusterer with previously persisted clusters"""
+        if not clusters:
+            return
+        ids = list(clusters)
+        sums = np.stack([clusters[c][0] for c in ids]).astype(np.float32)
+        counts = np.array([clusters[c][1] for c in ids], dtype=np.int64)
+        self._append_clusters(ids, sums, counts)
+        self._dirty.clear()
+
+    def _append_clusters(self, ids: List[str], sums: np.ndarray, counts: np.ndarray) -> None:
+        start = len(self._cluster_ids)
+        self._cluster_ids.extend(ids)
+        for offset, cluster_id in enumerate(ids):
+            self._slots[cluster_id] = start + offset
+        self._sums = np.concatenate([self._sums, sums]) if len(self._sums) else sums.copy()
+        self._counts = np.concatenate([self._counts, counts])
+        self.index.upsert(np.arange(start, start + len(ids)), normalize_rows(sums))
+        self._dirty.update(range(start, start + len(ids)))
+
+    def assign(self, vectors: np.ndarray) -> List[str]:
+        """Assign each vector to a cluster, creating clusters as needed"""
+        vectors = normalize_rows(vectors)
+        assigned: List[str] = []
+        for start in range(0, len(vectors), self.chunk_size):
+            assigned.extend(self._assign_chunk(vectors[start:start + self.chunk_size]))
+        return assigned
+
+    def _assign_chunk(self, chunk: np.ndarray) -> List[str]:
+        slots, sims = self.index.search(chunk)
+        matched = sims >= self.similarity_threshold
+        result: List[Optional[int]] = [None] * len(chunk)
+
+        # Vectors that hit an existing cluster: one vectorized centroid update
+        hit_rows = np.nonzero(matched)[0]
+        if len(hit_rows):
+            hit_slots = slots[hit_rows]
+            np.add.at(self._sums, hit_slots, chunk[hit_rows])
+            np.add.at(self._counts, hit_slots, 1)
+            for row, slot in zip(hit_rows, hit_slots):
+                result[row] = int(slot)
+
+        # Leftovers cluster among themselves (leader clustering within the chunk)
+        new_sums: List[np.ndarray] = []
+        new_counts: List[int] = []
+        new_centroids = np.zeros((0, self.dim), dtype=np.float32)
+        base = len(self._cluster_ids)
+        for row in np.nonzero(~matched)[0]:
+            vector = chunk[row]
+            if len(new_centroids):
+                scores = new_centroids @ vector
+                best = int(scores.argmax())
+                if scores[best] >= self.similarity_threshold:
+                    new_sums[best] += vector
+                    new_counts[best] += 1
+                    new_centroids[best] = new_sums[best] / (np.linalg.norm(new_sums[best]) or 1.0)
+                    result[row] = base + best
+                    continue
+            new_sums.append(vector.copy())
+            new_counts.append(1)
+            new_centroids = np.vstack([new_centroids, vector[None, :]])
+            result[row] = base + len(new_sums) - 1
+
+        if len(hit_rows):
+            touched = np.unique(slots[hit_rows])
+            self.index.upsert(touched, normalize_rows(self._sums[touched]))
+            self._dirty.update(int(s) for s in touched)
+        if new_sums:
+            ids = [str(uuid.uuid4()) for _ in new_sums]
+            self._append_clusters(ids, np.stack(new_sums), np.array(new_counts, dtype=np.int64))
+
+        return [self._cluster_ids[slot] for slot in result]
+
+    def centroid(self, cluster_id: str) -> Optional[np.ndarray]:
+        """Unit centroid of a cluster, or None if it is not in the index"""
+        slot = self._slots.get(cluster_id)
+        if slot is None:
+            return None
+        vector_sum = self._sums[slot]
+        return vector_sum / (np.linalg.norm(vector_sum) or 1.0)
+
+    def size(self, cluster_id: str) -> int:
+        """Number of members in a cluster, 0 if it is not in the index"""
+        slot = self._slots.get(cluster_id)
+        return 0 if slot is None else int(self._counts[slot])
+
+    def dirty_clusters(self) -> Dict[str, Tuple[np.ndarray, int]]:
+        """Clusters changed since load(), ready to persist"""
+        return {
+            self._cluster_ids[slot]: (self._sums[slot], int(self._counts[slot]))
+            for slot in sorted(self._dirty)
+        }
+
+    def mark_clean(self) -> None:
+        self._dirty.clear()
+
+
+def coherence(vectors: np.ndarray, centroid: np.ndarray) -> float:
+    """Mean cosine similarity of members to their centroid"""
+    if len(vectors) == 0:
+        return 0.0
+    return float(np.clip(normalize_rows(vectors) @ centroid, -1.0, 1.0).mean())
+
+
+__all__ = [
+    'normalize_rows',
+    'CentroidIndex',
+    'ClusterStateStore',
+    'RedisClusterStateStore',
+    'IncrementalClusterer',
+    'coherence',
+]
@@ -12,6 +12,7 @@ import numpy as np
 
 from pydantic import BaseModel, Field
 from .base import Pipeline, PipelineStage
+from .clustering import ClusterStateStore, IncrementalClusterer, coherence, normalize_rows
 from models.memory import Memory, MemoryType, MemoryStatus
 from core.config import get_settings
 
@@ -99,7 +100,10 @@ class MemorySelectionStage(PipelineStage[str, List[ConsolidationCandidate]]):
                     access_count=memory.access_count,
                     domains=memory.domains,
                     tags=memory.tags,
-                    embedding=memory.embedding_content,
+                    embedding=(
+                        [float(x) for x in memory.embedding_content]
+                        if memory.embedding_content is not None else None
+                    ),
                     metadata=memory.metadata
                 ))
         else:
@@ -128,10 +132,29 @@ class MemorySelectionStage(PipelineStage[str, List[ConsolidationCandidate]]):
 
 
 class MemoryClusteringStage(PipelineStage[List[ConsolidationCandidate], List[ConsolidationGroup]]):
-    """Cluster related memories into groups"""
+    """
+    Cluster related memories into groups.
     
-    def __init__(self):
+    Memories with embeddings go through an IncrementalClusterer whose state
+    lives in a ClusterStateStore, so each cycle only assigns memories that
+    have never been clustered. Memories without embeddings fall back to the
+    metadata heuristic.
+    """
+    
+    def __init__(
+        self,
+        state_store: Optional[ClusterStateStore] = None,
+        similarity_threshold: Optional[float] = None,
+        chunk_size: int = 4096
+    ):
         super().__init__("memory_clustering", required=True)
+        self.state_store = state_store or ClusterStateStore()
+        self.similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else settings.memory_cluster_similarity_threshold
+        )
+        self.chunk_size = chunk_size
     
     def calculate_similarity(self, m1: ConsolidationCandidate, m2: ConsolidationCandidate) -> float:
         """Calculate similarity between two memories"""
@@ -156,25 +179,94 @@ class MemoryClusteringStage(PipelineStage[List[ConsolidationCandidate], List[Con
         
         # If embeddings available, use cosine similarity
         if m1.embedding and m2.embedding:
-            # Simplified cosine similarity
-            # In production, use proper vector operations
-            score += 0.5  # Placeholder
+            v1, v2 = normalize_rows(np.array([m1.embedding, m2.embedding]))
+            score += max(0.0, float(v1 @ v2)) * 0.5
         
         return min(1.0, score)
     
-    async def process(
+    def _make_group(
         self,
+        group_id: str,
+        members: List[ConsolidationCandidate],
+        coherence_score: float
+    ) -> ConsolidationGroup:
+        all_domains = []
+        all_tags = []
+        for mem in members:
+            all_domains.extend(mem.domains)
+            all_tags.extend(mem.tags)
+        
+        return ConsolidationGroup(
+            group_id=group_id,
+            user_id=members[0].user_id,
+            memories=members,
+            common_domains=list(set(all_domains))[:5],  # Top 5
+            common_tags=list(set(all_tags))[:10],  # Top 10
+            time_span=(
+                min(m.occurred_at for m in members),
+                max(m.occurred_at for m in members)
+            ),
+            coherence_score=coherence_score
+        )
+    
+    async def _cluster_embedded(
+        self,
+        user_id: str,
         candidates: List[ConsolidationCandidate],
-        context: Dict[str, Any]
+        min_group_size: int
     ) -> List[ConsolidationGroup]:
-        """Group related memories"""
-        if not candidates:
-            return []
+        """Assign new memories through the ANN clusterer and group by cluster"""
+        memory_ids = [c.memory_id for c in candidates]
+        known = await self.state_store.get_assignments(user_id, memory_ids)
+        new = [c for c in candidates if c.memory_id not in known]
+        
+        clusterer = IncrementalClusterer(
+            dim=len(candidates[0].embedding),
+            similarity_threshold=self.similarity_threshold,
+            chunk_size=self.chunk_size
+        )
+        clusterer.load(await self.state_store.load_clusters(user_id))
+        
+        assignments = dict(known)
+        if new:
+            vectors = np.array([c.embedding for c in new], dtype=np.float32)
+            new_ids = clusterer.assign(vectors)
+            new_assignments = {c.memory_id: cid for c, cid in zip(new, new_ids)}
+            await self.state_store.save_clusters(user_id, clusterer.dirty_clusters())
+            await self.state_store.save_assignments(user_id, new_assignments)
+            clusterer.mark_clean()
+            assignments.update(new_assignments)
+        
+        members_by_cluster: Dict[str, List[ConsolidationCandidate]] = defaultdict(list)
+        for candidate in candidates:
+            members_by_cluster[assignments[candidate.memory_id]].append(candidate)
+        
+        groups = []
+        for cluster_id, members in members_by_cluster.items():
+            if len(members) < min_group_size:
+                continue
+            vectors = np.array([m.embedding for m in members], dtype=np.float32)
+            centroid = clusterer.centroid(cluster_id)
+            if centroid is None:
+                # Stored assignment points at a cluster the index no longer has
+                centroid = normalize_rows(vectors.sum(axis=0, keepdims=True))[0]
+            score = coherence(vectors, centroid)
+            groups.append(self._make_group(cluster_id, members, score))
         
-        # Simple clustering based on similarity
+        logger.info(
+            f"Clustered {len(new)} new of {len(candidates)} embedded memories "
+            f"into {clusterer.cluster_count} clusters for user {user_id}"
+        )
+        return groups
+    
+    def _cluster_by_metadata(
+        self,
+        candidates: List[ConsolidationCandidate],
+        min_group_size: int
+    ) -> List[ConsolidationGroup]:
+        """Greedy heuristic grouping for memories without embeddings"""
         groups = []
         used_memories = set()
-        min_group_size = context.get('min_group_size', 2)
         
         for i, candidate in enumerate(candidates):
             if candidate.memory_id in used_memories:
@@ -183,9 +275,10 @@ class MemoryClusteringStage(PipelineStage[List[ConsolidationCandidate], List[Con
             # Start a new group
             group_memories = [candidate]
             used_memories.add(candidate.memory_id)
+            avg_similarity = 1.0
             
             # Find similar memories
-            for j, other in enumerate(candidates[i+1:], i+1):
+            for other in candidates[i+1:]:
                 if other.memory_id in used_memories:
                     continue
                 
@@ -202,31 +295,34 @@ class MemoryClusteringStage(PipelineStage[List[ConsolidationCandidate], List[Con
             
             # Only create group if it has enough members
             if len(group_memories) >= min_group_size:
-                # Calculate group properties
-                all_domains = []
-                all_tags = []
-                for mem in group_memories:
-                    all_domains.extend(mem.domains)
-                    all_tags.extend(mem.tags)
-                
-                common_domains = list(set(all_domains))
-                common_tags = list(set(all_tags))
-                
-                time_span = (
-                    min(m.occurred_at for m in group_memories),
-                    max(m.occurred_at for m in group_memories)
-                )
-                
-                group = ConsolidationGroup(
-                    group_id=f"group_{datetime.utcnow().timestamp()}_{i}",
-                    user_id=candidate.user_id,
-                    memories=group_memories,
-                    common_domains=common_domains[:5],  # Top 5
-                    common_tags=common_tags[:10],  # Top 10
-                    time_span=time_span,
-                    coherence_score=avg_similarity
-                )
-                groups.append(group)
+                groups.append(self._make_group(
+                    f"group_{datetime.utcnow().timestamp()}_{i}",
+                    group_memories,
+                    float(avg_similarity)
+                ))
+        
+        return groups
+    
+    async def process(
+        self,
+        candidates: List[ConsolidationCandidate],
+        context: Dict[str, Any]
+    ) -> List[ConsolidationGroup]:
+        """Group related memories"""
+        if not candidates:
+            return []
+        
+        min_group_size = context.get('min_group_size', 2)
+        embedded = [c for c in candidates if c.embedding]
+        plain = [c for c in candidates if not c.embedding]
+        
+        groups = []
+        if embedded:
+            groups.extend(await self._cluster_embedded(
+                embedded[0].user_id, embedded, min_group_size
+            ))
+        if plain:
+            groups.extend(self._cluster_by_metadata(plain, min_group_size))
         
         logger.info(f"Created {len(groups)} consolidation groups from {len(candidates)} memories")
         return groups
@@ -435,10 +531,10 @@ class ConsolidatedMemoryCreationStage(
 class MemoryConsolidationPipeline(Pipeline[str, List[ConsolidatedMemory]]):
     """Complete memory consolidation pipeline"""
     
-    def __init__(self, memory_service=None, llm_service=None):
+    def __init__(self, memory_service=None, llm_service=None, cluster_state_store=None):
         stages = [
             MemorySelectionStage(memory_service),
-            MemoryClusteringStage(),
+            MemoryClusteringStage(cluster_state_store),
             PatternExtractionStage(),
             SynthesisGenerationStage(llm_service),
             ConsolidatedMemoryCreationStage()
@@ -465,10 +561,8 @@ class MemoryConsolidationPipeline(Pipeline[str, List[ConsolidatedMemory]]):
             'min_group_size': min_group_size
         }
         
-        # Store context for stages
-        self._context = context
-        
-        result = await self.execute(user_id)
+        # Per-run context so concurrent users never see each other's settings
+        result = await self.execute(user_id, context)
         
         if result.status == 'completed' and result.data:
             return result.data
@@ -7,12 +7,14 @@ import logging
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import json
-import hashlib
 from urllib.parse import urlparse
 
 from pydantic import BaseModel, Field, validator
 from .base import Pipeline, PipelineStage, TransformStage
 from models.memory import MemoryType, MemoryStatus
+from services.deduplication import (
+    MemoryDeduplicator, DuplicateKind, content_hash as compute_content_hash, compute_simhash
+)
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -50,6 +52,7 @@ class ProcessedMemory(BaseModel):
     user_id: str
     content: str
     content_hash: str
+    simhash: Optional[int] = None
     summary: Optional[str] = None
     title: Optional[str] = None
     memory_type: MemoryType
@@ -121,25 +124,36 @@ class ValidationStage(PipelineStage[RawMemoryInput, RawMemoryInput]):
 
 
 class DeduplicationStage(PipelineStage[RawMemoryInput, RawMemoryInput]):
-    """Check for duplicate memories"""
+    """
+    Check for duplicate memories.
     
-    def __init__(self):
-        super().__init__("deduplication", required=False)
+    Always computes the exact content hash and SimHash fingerprint. With a
+    deduplicator it also looks them up and records `duplicate_of` /
+    `near_duplicate_of` in metadata so callers can skip embedding work.
+    """
+    
+    def __init__(self, deduplicator: Optional[MemoryDeduplicator] = None):
+        super().__init__("deduplication", required=False, writes=["content_hash", "simhash"])
+        self.deduplicator = deduplicator
     
     async def process(self, data: RawMemoryInput, context: Dict[str, Any]) -> RawMemoryInput:
-        """Generate content hash for deduplication"""
-        # Create hash of content for deduplication
-        content_hash = hashlib.sha256(
-            f"{data.user_id}:{data.content}".encode()
-        ).hexdigest()
+        """Generate dedup signatures and check for existing memories"""
+        content_hash = compute_content_hash(data.user_id, data.content)
+        simhash = compute_simhash(data.content)
         
         # Store in context for later use
         context['content_hash'] = content_hash
-        
-        # TODO: Check against database for existing hash
-        # For now, just add hash to metadata
+        context['simhash'] = simhash
         data.metadata['content_hash'] = content_hash
         
+        if self.deduplicator:
+            check = await self.deduplicator.check(data.user_id, content_hash, simhash)
+            if check.kind == DuplicateKind.EXACT:
+                data.metadata['duplicate_of'] = check.memory_id
+            elif check.kind == DuplicateKind.NEAR:
+                data.metadata['near_duplicate_of'] = check.memory_id
+                data.metadata['near_duplicate_distance'] = check.distance
+        
         return data
 
 
@@ -305,6 +319,7 @@ class SummarizationStage(PipelineStage[RawMemoryInput, ProcessedMemory]):
             user_id=data.user_id,
             content=data.content,
             content_hash=context.get('content_hash', ''),
+            simhash=context.get('simhash'),
             summary=summary,
             title=title,
             memory_type=data.memory_type,
@@ -332,12 +347,12 @@ class SummarizationStage(PipelineStage[RawMemoryInput, ProcessedMemory]):
 class MemoryCapturePipeline(Pipeline[RawMemoryInput, ProcessedMemory]):
     """Complete memory capture pipeline"""
     
-    def __init__(self):
+    def __init__(self, deduplicator: Optional[MemoryDeduplicator] = None):
         super().__init__(
             name="memory_capture",
             stages=[
                 ValidationStage(),
-                DeduplicationStage(),
+                DeduplicationStage(deduplicator),
                 MetadataExtractionStage(),
                 EmotionalAnalysisStage(),
                 SummarizationStage()
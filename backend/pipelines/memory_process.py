@@ -12,6 +12,7 @@ import numpy as np
 from .base import Pipeline, PipelineStage
 from .memory_capture import ProcessedMemory
 from models.memory import Memory, MemoryStatus
+from services.deduplication import simhash_bands, to_signed64
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -31,7 +32,7 @@ class EmbeddingStage(PipelineStage[ProcessedMemory, MemoryWithEmbeddings]):
     """Generate embeddings for memory"""
     
     def __init__(self, embedding_service=None):
-        super().__init__("embedding_generation", required=True)
+        super().__init__("embedding_generation", required=True, writes=["embeddings"])
         self.embedding_service = embedding_service  # Will be injected
     
     async def process(self, data: ProcessedMemory, context: Dict[str, Any]) -> MemoryWithEmbeddings:
@@ -80,7 +81,11 @@ class SimilaritySearchStage(PipelineStage[MemoryWithEmbeddings, MemoryWithEmbedd
     """Find similar memories for context and deduplication"""
     
     def __init__(self, search_service=None):
-        super().__init__("similarity_search", required=False)
+        super().__init__(
+            "similarity_search",
+            required=False,
+            writes=["potential_duplicates"]
+        )
         self.search_service = search_service  # Will be injected
     
     async def process(self, data: MemoryWithEmbeddings, context: Dict[str, Any]) -> MemoryWithEmbeddings:
@@ -322,7 +327,10 @@ class StoragePreparationStage(PipelineStage[MemoryWithEmbeddings, Dict[str, Any]
             'is_private': data.is_private,
             'sharing_level': data.sharing_level,
             'consolidation_count': 0,
-            'access_count': 0
+            'access_count': 0,
+            'content_hash': data.content_hash or None,
+            'simhash': to_signed64(data.simhash) if data.simhash is not None else None,
+            'simhash_bands': simhash_bands(data.simhash) if data.simhash is not None else None
         }
         
         # Prepare vector store record
@@ -433,17 +433,22 @@ class ReflectionPipeline(Pipeline[Memory, ReflectionJournal]):
             continue_on_error=False
         )
     
-    async def execute(self, memory: Memory) -> ReflectionJournal:
+    async def execute(
+        self,
+        memory: Memory,
+        context: Optional[Dict[str, Any]] = None
+    ) -> ReflectionJournal:
         """Execute reflection pipeline"""
+        run_context = self.new_context(context)
         try:
             # Generate fragments
-            fragments_result = await self.fragment_stage.execute(memory, self._context)
+            fragments_result = await self.fragment_stage.execute(memory, run_context)
             if fragments_result.status != 'completed':
                 raise Exception(f"Fragment generation failed: {fragments_result.error}")
             fragments = fragments_result.data
             
             # Calculate drift
-            drift_result = await self.drift_stage.execute((memory, fragments), self._context)
+            drift_result = await self.drift_stage.execute((memory, fragments), run_context)
             if drift_result.status != 'completed':
                 raise Exception(f"Drift calculation failed: {drift_result.error}")
             drift_indicators = drift_result.data
@@ -451,7 +456,7 @@ class ReflectionPipeline(Pipeline[Memory, ReflectionJournal]):
             # Calculate signal modulation
             modulation_result = await self.modulation_stage.execute(
                 (fragments, drift_indicators),
-                self._context
+                run_context
             )
             signal_modulation = modulation_result.data if modulation_result.status == 'completed' else 0.0
             
@@ -463,7 +468,7 @@ class ReflectionPipeline(Pipeline[Memory, ReflectionJournal]):
                 'signal_modulation': signal_modulation
             }
             
-            journal_result = await self.journal_stage.execute(journal_data, self._context)
+            journal_result = await self.journal_stage.execute(journal_data, run_context)
             if journal_result.status != 'completed':
                 raise Exception(f"Journal creation failed: {journal_result.error}")
             
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental consolidation clustering.
+
+Streams synthetic embeddings drawn around a fixed set of topics through
+IncrementalClusterer in cycles, the way REMConsolidationScheduler feeds it,
+and reports throughput, cluster count and peak RSS. Memory stays bounded by
+the number of clusters, not the number of memories.
+
+    python scripts/benchmark_consolidation_clustering.py --memories 1000000
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipelines.clustering import IncrementalClusterer
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--memories", type=int, default=1_000_000)
+    parser.add_argument("--cycle-size", type=int, default=50_000, help="new memories per consolidation cycle")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--topics", type=int, default=2_000)
+    parser.add_argument("--noise", type=float, default=0.03)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    topics = rng.standard_normal((args.topics, args.dim)).astype(np.float32)
+    clusterer = IncrementalClusterer(args.dim, similarity_threshold=args.threshold)
+
+    print(f"Clustering {args.memories:,} memories (dim={args.dim}, topics={args.topics})")
+    started = time.perf_counter()
+    processed = 0
+    while processed < args.memories:
+        n = min(args.cycle_size, args.memories - processed)
+        labels = rng.integers(0, args.topics, n)
+        cycle = topics[labels] + rng.standard_normal((n, args.dim)).astype(np.float32) * args.noise * np.sqrt(args.dim)
+
+        cycle_start = time.perf_counter()
+        clusterer.assign(cycle)
+        clusterer.mark_clean()
+        processed += n
+
+        print(
+            f"  {processed:>10,} memories | cycle {time.perf_counter() - cycle_start:6.2f}s | "
+            f"{clusterer.cluster_count:,} clusters | hnsw={clusterer.index.uses_hnsw} | "
+            f"peak RSS {peak_rss_mb():,.0f} MB"
+        )
+
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s ({processed / elapsed:,.0f} memories/s), peak RSS {peak_rss_mb():,.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
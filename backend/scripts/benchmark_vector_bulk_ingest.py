@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk vector ingestion against row-by-row inserts.
+
+Creates a scratch table shaped like memory_chunks (pgvector column, unique
+(memory_id, chunk_index), ivfflat index), loads synthetic chunks through the
+old one-INSERT-per-row path and through BulkVectorIngestor, and reports rows
+per second. The row-by-row path only runs on a sample and is extrapolated.
+Requires the configured database with the vector extension installed.
+
+    python scripts/benchmark_vector_bulk_ingest.py --rows 1000000 --defer-indexes
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+
+from app.db.session import async_session_maker
+from app.services.vector_store.bulk_ingest import BulkVectorIngestor
+
+TABLE = "bench_vector_ingest"
+
+
+def make_rows(count: int, dim: int, chunks_per_memory: int = 8):
+    rng = np.random.default_rng(11)
+    memory_id = uuid.uuid4()
+    for i in range(count):
+        if i % chunks_per_memory == 0:
+            memory_id = uuid.uuid4()
+        yield {
+            "memory_id": memory_id,
+            "chunk_index": i % chunks_per_memory,
+            "content": f"chunk {i}",
+            "embedding": rng.standard_normal(dim).astype(np.float32),
+        }
+
+
+async def reset_table(dim: int) -> None:
+    async with async_session_maker() as db:
+        await db.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        await db.execute(text(
+            f"CREATE TABLE {TABLE} ("
+            f"id UUID PRIMARY KEY DEFAULT gen_random_uuid(), "
+            f"memory_id UUID NOT NULL, chunk_index INTEGER NOT NULL, content TEXT NOT NULL, "
+            f"embedding vector({dim}), UNIQUE (memory_id, chunk_index))"
+        ))
+        await db.execute(text(
+            f"CREATE INDEX {TABLE}_embedding_idx ON {TABLE} "
+            f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)"
+        ))
+        await db.commit()
+
+
+async def row_by_row(count: int, dim: int) -> float:
+    started = time.perf_counter()
+    async with async_session_maker() as db:
+        for row in make_rows(count, dim):
+            row["embedding"] = str(row["embedding"].tolist())
+            await db.execute(
+                text(
+                    f"INSERT INTO {TABLE} (memory_id, chunk_index, content, embedding) "
+                    f"VALUES (:memory_id, :chunk_index, :content, CAST(:embedding AS vector)) RETURNING id"
+                ),
+                row
+            )
+        await db.commit()
+    return count / (time.perf_counter() - started)
+
+
+async def bulk(count: int, dim: int, batch_size: int, defer_indexes: bool) -> float:
+    ingestor = BulkVectorIngestor(TABLE, conflict_columns=("memory_id", "chunk_index"), batch_size=batch_size)
+
+    def report(progress):
+        if progress.batches_done % 20 == 0 or progress.rows_done == count:
+            print(f"    {progress.rows_done:>10,} rows | {progress.rows_per_second:,.0f} rows/s")
+
+    async with async_session_maker() as db:
+        result = await ingestor.ingest(
+            db,
+            make_rows(count, dim),
+            progress=report,
+            defer_indexes=defer_indexes,
+            commit_every_batch=True,
+            return_ids=False
+        )
+    if result.rebuilt_indexes:
+        print(f"    rebuilt {', '.join(result.rebuilt_indexes)}")
+    return result.rows / result.elapsed_seconds
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--sample", type=int, default=5_000, help="rows for the row-by-row baseline")
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--defer-indexes", action="store_true")
+    args = parser.parse_args()
+
+    await reset_table(args.dim)
+    print(f"Row-by-row INSERT ({args.sample:,} rows, dim={args.dim})")
+    baseline = await row_by_row(args.sample, args.dim)
+    print(f"  {baseline:,.0f} rows/s -> {args.rows / baseline / 60:,.1f} min for {args.rows:,} rows")
+
+    await reset_table(args.dim)
+    print(f"COPY + merge ({args.rows:,} rows, batch={args.batch_size:,}, defer_indexes={args.defer_indexes})")
+    copy_rate = await bulk(args.rows, args.dim, args.batch_size, args.defer_indexes)
+    print(f"  {copy_rate:,.0f} rows/s -> {args.rows / copy_rate / 60:,.1f} min ({copy_rate / baseline:,.1f}x)")
+
+    async with async_session_maker() as db:
+        await db.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        await db.commit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
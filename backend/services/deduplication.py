@@ -0,0 +1,328 @@
+"""
+Deduplication service for Mnemosyne Protocol
+Exact and near-duplicate detection for captured memories
+"""
+
+import asyncio
+import logging
+import hashlib
+import re
+from typing import List, Optional, Tuple
+from enum import Enum
+
+from pydantic import BaseModel
+from sqlalchemy import select, and_
+
+from models.memory import Memory
+from core.database import db_manager
+from core.redis_client import redis_manager
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def content_hash(user_id: str, content: str) -> str:
+    """Exact-duplicate key for a user's memory content"""
+    return hashlib.sha256(f"{user_id}:{content}".encode()).hexdigest()
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def compute_simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash over word shingles (unsigned)"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return 0
+    if len(tokens) < shingle_size:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        h = _hash64(shingle)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def to_signed64(value: int) -> int:
+    """Store unsigned fingerprints in a Postgres BIGINT"""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def simhash_bands(fingerprint: int) -> List[int]:
+    """
+    LSH band keys for a fingerprint.
+
+    Each band key packs the band index above its 16 fingerprint bits, so a
+    single int[] column with a GIN index can be probed with `&&`. By
+    pigeonhole, fingerprints within Hamming distance < SIMHASH_BANDS share
+    at least one band.
+    """
+    mask = (1 << _BAND_BITS) - 1
+    return [
+        (band << _BAND_BITS) | ((fingerprint >> (band * _BAND_BITS)) & mask)
+        for band in range(SIMHASH_BANDS)
+    ]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(to_unsigned64(a) ^ to_unsigned64(b)).count("1")
+
+
+class DuplicateKind(str, Enum):
+    """Outcome of a duplicate check"""
+    NEW = "new"
+    EXACT = "exact"
+    NEAR = "near"
+
+
+class DuplicateCheck(BaseModel):
+    """Result of checking content against existing memories"""
+    kind: DuplicateKind
+    memory_id: Optional[str] = None
+    distance: Optional[int] = None
+
+
+class RedisBloomFilter:
+    """
+    Bloom filter over Redis SETBIT/GETBIT.
+
+    A miss proves the key was never added, letting callers skip the
+    database entirely. Hits may be false positives and must be confirmed.
+
+    The bit just past the filter marks it as seeded with every existing
+    key. It lives in the same Redis key as the filter, so a flush or an
+    eviction clears both, and an unseeded filter answers nothing.
+    """
+
+    def __init__(
+        self,
+        key: str = "dedup:bloom",
+        size_bits: Optional[int] = None,
+        num_hashes: Optional[int] = None
+    ):
+        self.key = key
+        self.size_bits = size_bits or settings.memory_dedup_bloom_bits
+        self.num_hashes = num_hashes or settings.memory_dedup_bloom_hashes
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.num_hashes)]
+
+    async def add_many(self, items: List[str]) -> None:
+        if not items:
+            return
+        pipe = redis_manager.client.pipeline(transaction=False)
+        for item in items:
+            for position in self._positions(item):
+                pipe.setbit(self.key, position, 1)
+        await pipe.execute()
+
+    async def is_seeded(self) -> bool:
+        return bool(await redis_manager.client.getbit(self.key, self.size_bits))
+
+    async def mark_seeded(self) -> None:
+        await redis_manager.client.setbit(self.key, self.size_bits, 1)
+
+    async def contains_any(self, items: List[str]) -> Optional[List[bool]]:
+        """Membership for each item (False is definitive), or None if the filter is not seeded"""
+        if not items:
+            return []
+        pipe = redis_manager.client.pipeline(transaction=False)
+        pipe.getbit(self.key, self.size_bits)
+        for item in items:
+            for position in self._positions(item):
+                pipe.getbit(self.key, position)
+        seeded, *bits = await pipe.execute()
+        if not seeded:
+            return None
+        return [
+            all(bits[i * self.num_hashes:(i + 1) * self.num_hashes])
+            for i in range(len(items))
+        ]
+
+
+class MemoryDeduplicator:
+    """
+    Exact and near-duplicate detection in front of the embedding pipeline.
+
+    Checks go Bloom filter first, then the unique content-hash index, then
+    the SimHash band index. Only content that might already exist costs a
+    database round trip. Until the filter is seeded from the stored
+    memories (at startup, or again after Redis loses it) every check goes
+    to the database.
+    """
+
+    SEED_LOCK_KEY = "dedup:bloom:seeding"
+
+    def __init__(
+        self,
+        bloom: Optional[RedisBloomFilter] = None,
+        max_distance: Optional[int] = None
+    ):
+        self.bloom = bloom or RedisBloomFilter()
+        self.max_distance = (
+            max_distance if max_distance is not None
+            else settings.memory_near_duplicate_distance
+        )
+        self._seeding: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _bloom_keys(user_id: str, hash_value: str, bands: List[int]) -> List[str]:
+        return [f"h:{hash_value}"] + [f"b:{user_id}:{band}" for band in bands]
+
+    async def check(self, user_id: str, hash_value: str, fingerprint: int) -> DuplicateCheck:
+        """Classify content as new, an exact duplicate or a near duplicate"""
+        bands = simhash_bands(fingerprint)
+        try:
+            seen = await self.bloom.contains_any(self._bloom_keys(user_id, hash_value, bands))
+        except Exception as e:
+            logger.warning(f"Bloom filter unavailable, checking database: {e}")
+            seen = [True] * (1 + len(bands))
+        if seen is None:
+            self.start_seeding()
+            seen = [True] * (1 + len(bands))
+
+        if not any(seen):
+            return DuplicateCheck(kind=DuplicateKind.NEW)
+
+        async with db_manager.session() as session:
+            if seen[0]:
+                result = await session.execute(
+                    select(Memory.id).where(and_(
+                        Memory.user_id == user_id,
+                        Memory.content_hash == hash_value,
+                        Memory.deleted_at.is_(None)
+                    )).limit(1)
+                )
+                existing = result.scalar_one_or_none()
+                if existing is not None:
+                    return DuplicateCheck(kind=DuplicateKind.EXACT, memory_id=str(existing), distance=0)
+
+            if any(seen[1:]) and self.max_distance > 0:
+                result = await session.execute(
+                    select(Memory.id, Memory.simhash).where(and_(
+                        Memory.user_id == user_id,
+                        Memory.simhash_bands.overlap(bands),
+                        Memory.deleted_at.is_(None)
+                    )).limit(50)
+                )
+                best: Optional[Tuple[int, str]] = None
+                for memory_id, candidate in result.all():
+                    if candidate is None:
+                        continue
+                    distance = hamming_distance(candidate, fingerprint)
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, str(memory_id))
+                if best is not None:
+                    return DuplicateCheck(kind=DuplicateKind.NEAR, memory_id=best[1], distance=best[0])
+
+        return DuplicateCheck(kind=DuplicateKind.NEW)
+
+    async def remember(self, user_id: str, hash_value: str, fingerprint: int) -> None:
+        """Record stored content in the Bloom filter"""
+        try:
+            await self.bloom.add_many(self._bloom_keys(user_id, hash_value, simhash_bands(fingerprint)))
+        except Exception as e:
+            logger.warning(f"Failed to update dedup Bloom filter: {e}")
+
+
+    def start_seeding(self) -> None:
+        """Seed the Bloom filter in the background unless already seeding"""
+        if self._seeding is None or self._seeding.done():
+            self._seeding = asyncio.create_task(self.seed())
+
+    async def seed(self, batch_size: int = 5000) -> int:
+        """
+        Add every stored memory to the Bloom filter, then mark it seeded.
+
+        Memories are read in primary-key batches. Bits are only ever set, so
+        memories remembered while seeding are kept. Instances share the
+        filter, and a Redis lock lets one of them seed it at a time.
+
+        Returns:
+            Number of memories added (0 if already seeded or another
+            instance is seeding)
+        """
+        client = redis_manager.client
+        try:
+            if await self.bloom.is_seeded():
+                return 0
+            if not await client.set(self.SEED_LOCK_KEY, "1", nx=True, ex=3600):
+                return 0
+        except Exception as e:
+            logger.warning(f"Cannot seed dedup Bloom filter: {e}")
+            return 0
+
+        total = 0
+        try:
+            last_id = None
+            async with db_manager.session() as session:
+                while True:
+                    query = (
+                        select(Memory.id, Memory.user_id, Memory.content_hash, Memory.simhash_bands)
+                        .where(and_(Memory.deleted_at.is_(None), Memory.content_hash.isnot(None)))
+                        .order_by(Memory.id)
+                        .limit(batch_size)
+                    )
+                    if last_id is not None:
+                        query = query.where(Memory.id > last_id)
+                    rows = (await session.execute(query)).all()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+
+                    keys = []
+                    for _, user_id, hash_value, bands in rows:
+                        keys.extend(self._bloom_keys(user_id, hash_value, bands or []))
+                    await self.bloom.add_many(keys)
+                    total += len(rows)
+
+            await self.bloom.mark_seeded()
+            logger.info(f"Seeded dedup Bloom filter with {total} memories")
+        except Exception as e:
+            logger.error(f"Failed to seed dedup Bloom filter: {e}")
+        finally:
+            await client.delete(self.SEED_LOCK_KEY)
+        return total
+
+
+# Global deduplicator instance
+memory_deduplicator = MemoryDeduplicator()
+
+
+# Export classes and functions
+__all__ = [
+    'content_hash',
+    'compute_simhash',
+    'simhash_bands',
+    'hamming_distance',
+    'to_signed64',
+    'to_unsigned64',
+    'DuplicateKind',
+    'DuplicateCheck',
+    'RedisBloomFilter',
+    'MemoryDeduplicator',
+    'memory_deduplicator',
+]
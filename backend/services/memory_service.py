@@ -11,24 +11,28 @@ import uuid
 from sqlalchemy import select, update, delete, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from models.memory import Memory, MemoryType, MemoryStatus
 from models.user import User
 from core.database import db_manager
 from core.vectors import vector_store
 from core.redis_client import redis_manager, publish_memory_event
+from core.config import get_settings
 from pipelines.memory_capture import RawMemoryInput, MemoryCapturePipeline
 from pipelines.memory_process import MemoryProcessingPipeline
 from .embedding import embedding_service
+from .deduplication import memory_deduplicator, to_unsigned64
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 
 class MemoryService:
     """Service for memory CRUD operations"""
     
     def __init__(self):
-        self.capture_pipeline = MemoryCapturePipeline()
+        self.capture_pipeline = MemoryCapturePipeline(deduplicator=memory_deduplicator)
         self.processing_pipeline = MemoryProcessingPipeline(
             embedding_service=embedding_service,
             search_service=None  # Will be injected later
@@ -65,6 +69,16 @@ class MemoryService:
             
             processed_memory = capture_result.data
             
+            # Skip embedding and storage for content we already hold
+            duplicate_of = processed_memory.metadata.get('duplicate_of')
+            if not duplicate_of and settings.memory_skip_near_duplicates:
+                duplicate_of = processed_memory.metadata.get('near_duplicate_of')
+            if duplicate_of:
+                existing = await self.get_memory(duplicate_of, user_id)
+                if existing:
+                    logger.info(f"Skipped duplicate of memory {duplicate_of} for user {user_id}")
+                    return existing
+            
             # Run processing pipeline
             processing_result = await self.processing_pipeline.execute(processed_memory)
             if processing_result.status != 'completed' or not processing_result.data:
@@ -74,23 +88,54 @@ class MemoryService:
             
             # Store in database
             async with db_manager.session() as session:
-                db_record = storage_data['db_record']
-                
-                # Create Memory object
-                memory = Memory(**db_record)
+                values = dict(storage_data['db_record'])
+                values['metadata_json'] = values.pop('metadata', {})
+                values['source_metadata_json'] = values.pop('source_metadata', {})
                 
                 # Add embeddings if available
                 embeddings = storage_data['vector_record'].get('embeddings', {})
                 if embeddings.get('content'):
-                    memory.embedding_content = embeddings['content']
+                    values['embedding_content'] = embeddings['content']
                 if embeddings.get('semantic'):
-                    memory.embedding_semantic = embeddings['semantic']
+                    values['embedding_semantic'] = embeddings['semantic']
                 if embeddings.get('contextual'):
-                    memory.embedding_contextual = embeddings['contextual']
+                    values['embedding_contextual'] = embeddings['contextual']
                 
-                session.add(memory)
+                # The unique (user_id, content_hash) index settles races between
+                # concurrent captures of the same content
+                result = await session.execute(
+                    pg_insert(Memory)
+                    .values(id=uuid.uuid4(), **values)
+                    .on_conflict_do_nothing(
+                        index_elements=[Memory.user_id, Memory.content_hash],
+                        index_where=and_(
+                            Memory.deleted_at.is_(None),
+                            Memory.content_hash.isnot(None)
+                        )
+                    )
+                    .returning(Memory.id)
+                )
+                memory_id = result.scalar_one_or_none()
                 await session.commit()
-                await session.refresh(memory)
+                
+                if memory_id is None:
+                    existing = await session.execute(
+                        select(Memory).where(and_(
+                            Memory.user_id == user_id,
+                            Memory.content_hash == values['content_hash'],
+                            Memory.deleted_at.is_(None)
+                        ))
+                    )
+                    memory = existing.scalar_one()
+                    logger.info(f"Memory {memory.id} already stored for user {user_id}")
+                    return memory
+                
+                memory = await session.get(Memory, memory_id)
+                
+                if memory.simhash is not None:
+                    await memory_deduplicator.remember(
+                        user_id, memory.content_hash, to_unsigned64(memory.simhash)
+                    )
                 
                 # Store in vector store
                 await vector_store.store_memory(
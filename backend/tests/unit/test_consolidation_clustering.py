@@ -0,0 +1,124 @@
+"""
+Tests for incremental consolidation clustering.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from pipelines.clustering import ClusterStateStore, IncrementalClusterer
+from pipelines.consolidation import ConsolidationCandidate, MemoryClusteringStage
+
+
+def make_candidates(vectors, prefix):
+    now = datetime.utcnow()
+    return [
+        ConsolidationCandidate(
+            memory_id=f"{prefix}_{i}",
+            user_id="user",
+            content=f"memory {i}",
+            summary=None,
+            importance=0.5,
+            occurred_at=now - timedelta(hours=i),
+            consolidation_count=0,
+            last_accessed_at=None,
+            access_count=0,
+            domains=[],
+            tags=[],
+            embedding=vector.tolist(),
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def topic_vectors(rng, topics, n, noise=0.05):
+    labels = rng.integers(0, len(topics), n)
+    return labels, topics[labels] + rng.standard_normal((n, topics.shape[1])) * noise
+
+
+class TestIncrementalClusterer:
+    """Test cases for IncrementalClusterer."""
+
+    def test_recovers_topics(self):
+        """Vectors drawn around distinct topics land in one cluster per topic."""
+        rng = np.random.default_rng(0)
+        topics = rng.standard_normal((5, 32))
+        labels, vectors = topic_vectors(rng, topics, 500)
+
+        clusterer = IncrementalClusterer(32, similarity_threshold=0.8, chunk_size=64)
+        assigned = clusterer.assign(vectors)
+
+        assert clusterer.cluster_count == 5
+        for topic in range(5):
+            assert len({assigned[i] for i in np.nonzero(labels == topic)[0]}) == 1
+
+    def test_resume_from_persisted_state(self):
+        """A new clusterer loaded from saved sums keeps assigning to old clusters."""
+        rng = np.random.default_rng(1)
+        topics = rng.standard_normal((3, 16))
+        _, first = topic_vectors(rng, topics, 90)
+
+        clusterer = IncrementalClusterer(16, similarity_threshold=0.8)
+        first_ids = set(clusterer.assign(first))
+        saved = clusterer.dirty_clusters()
+
+        resumed = IncrementalClusterer(16, similarity_threshold=0.8)
+        resumed.load(saved)
+        _, second = topic_vectors(rng, topics, 30)
+
+        assert set(resumed.assign(second)) <= first_ids
+        assert sum(count for _, count in resumed.dirty_clusters().values()) == 120
+
+    def test_unknown_cluster(self):
+        """Looking up a cluster the index does not hold returns None and 0."""
+        clusterer = IncrementalClusterer(4)
+        clusterer.assign(np.eye(4)[:1])
+
+        assert clusterer.centroid("missing") is None
+        assert clusterer.size("missing") == 0
+
+
+@pytest.mark.asyncio
+class TestMemoryClusteringStage:
+    """Test cases for MemoryClusteringStage."""
+
+    async def test_only_new_memories_are_assigned(self):
+        """Later cycles reuse stored assignments and only cluster new memories."""
+        rng = np.random.default_rng(2)
+        topics = rng.standard_normal((2, 16))
+        store = ClusterStateStore()
+        stage = MemoryClusteringStage(store, similarity_threshold=0.8)
+
+        _, vectors = topic_vectors(rng, topics, 20)
+        first = make_candidates(vectors, "a")
+        groups = await stage.process(first, {"min_group_size": 2})
+        assert sum(len(g.memories) for g in groups) == 20
+        assert all(g.coherence_score > 0.9 for g in groups)
+
+        _, more = topic_vectors(rng, topics, 10)
+        second = make_candidates(more, "b")
+        groups = await MemoryClusteringStage(store, similarity_threshold=0.8).process(
+            first + second, {"min_group_size": 2}
+        )
+
+        assert len(groups) == 2
+        clusters = await store.load_clusters("user")
+        assert len(clusters) == 2
+        assert sum(count for _, count in clusters.values()) == 30
+
+    async def test_assignment_to_missing_cluster(self):
+        """Stored assignments to a cluster that was not persisted still form a group."""
+        rng = np.random.default_rng(3)
+        topics = rng.standard_normal((1, 16))
+        store = ClusterStateStore()
+        _, vectors = topic_vectors(rng, topics, 5)
+        candidates = make_candidates(vectors, "a")
+        await store.save_assignments("user", {c.memory_id: "lost" for c in candidates})
+
+        groups = await MemoryClusteringStage(store, similarity_threshold=0.8).process(
+            candidates, {"min_group_size": 2}
+        )
+
+        assert len(groups) == 1
+        assert len(groups[0].memories) == 5
+        assert groups[0].coherence_score > 0.9
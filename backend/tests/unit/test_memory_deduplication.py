@@ -0,0 +1,172 @@
+"""
+Tests for memory deduplication signatures and the capture dedup stage.
+"""
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pipelines.memory_capture import DeduplicationStage, RawMemoryInput
+from services.deduplication import (
+    DuplicateCheck,
+    DuplicateKind,
+    MemoryDeduplicator,
+    RedisBloomFilter,
+    compute_simhash,
+    content_hash,
+    hamming_distance,
+    simhash_bands,
+    to_signed64,
+    to_unsigned64,
+)
+
+
+ARTICLE = (
+    "Postgres partial indexes only cover rows matching a predicate, which keeps "
+    "them small and makes uniqueness constraints on live rows cheap to enforce."
+)
+
+
+class FakeDeduplicator:
+    def __init__(self, result: DuplicateCheck):
+        self.result = result
+        self.calls = []
+
+    async def check(self, user_id, hash_value, fingerprint):
+        self.calls.append((user_id, hash_value, fingerprint))
+        return self.result
+
+
+class TestSignatures:
+    """Test cases for SimHash signatures."""
+
+    def test_formatting_changes_are_near_duplicates(self):
+        """Case, punctuation and whitespace changes keep the fingerprint and its bands."""
+        recaptured = "  " + ARTICLE.upper().replace(",", "") + "!!"
+
+        assert content_hash("u", ARTICLE) != content_hash("u", recaptured)
+        assert hamming_distance(compute_simhash(ARTICLE), compute_simhash(recaptured)) == 0
+        assert simhash_bands(compute_simhash(ARTICLE)) == simhash_bands(compute_simhash(recaptured))
+
+    def test_unrelated_content_is_far(self):
+        """Unrelated text lands well outside the near-duplicate radius."""
+        other = compute_simhash("Reminder: water the plants and call the dentist on Friday morning.")
+
+        assert hamming_distance(compute_simhash(ARTICLE), other) > 3
+
+    def test_bands_are_distinct_per_position(self):
+        """Band keys encode their position so equal bits in different bands never collide."""
+        bands = simhash_bands(0)
+
+        assert len(set(bands)) == 4
+
+    def test_signed_round_trip(self):
+        """Fingerprints survive storage in a signed BIGINT."""
+        value = (1 << 64) - 5
+
+        assert to_signed64(value) < 0
+        assert to_unsigned64(to_signed64(value)) == value
+        assert hamming_distance(to_signed64(value), value) == 0
+
+
+@pytest.mark.asyncio
+class TestDeduplicationStage:
+    """Test cases for DeduplicationStage."""
+
+    async def test_marks_exact_duplicates(self):
+        """Exact matches are recorded so the service can skip embedding."""
+        existing = str(uuid.uuid4())
+        dedup = FakeDeduplicator(DuplicateCheck(kind=DuplicateKind.EXACT, memory_id=existing))
+        stage = DeduplicationStage(dedup)
+        data = RawMemoryInput(content=ARTICLE, user_id=str(uuid.uuid4()))
+        context = {}
+
+        result = await stage.process(data, context)
+
+        assert result.metadata["duplicate_of"] == existing
+        assert context["content_hash"] == result.metadata["content_hash"]
+        assert dedup.calls[0][2] == context["simhash"]
+
+    async def test_new_content_passes_through(self):
+        """New content only gains its signatures."""
+        stage = DeduplicationStage(FakeDeduplicator(DuplicateCheck(kind=DuplicateKind.NEW)))
+        data = RawMemoryInput(content=ARTICLE, user_id=str(uuid.uuid4()))
+
+        result = await stage.process(data, {})
+
+        assert "duplicate_of" not in result.metadata
+        assert "near_duplicate_of" not in result.metadata
+
+
+def fake_db(*results):
+    session = AsyncMock()
+    session.execute.side_effect = list(results)
+
+    @asynccontextmanager
+    async def session_scope():
+        yield session
+
+    return MagicMock(session=session_scope), session
+
+
+@pytest.mark.asyncio
+class TestBloomSeeding:
+    """Test cases for seeding the dedup Bloom filter."""
+
+    async def test_unseeded_filter_answers_nothing(self):
+        """Before seeding, a filter with no bits set does not claim content is new."""
+        bloom = RedisBloomFilter(size_bits=1024, num_hashes=3)
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(return_value=[0] + [0] * 6)
+        redis = MagicMock()
+        redis.client.pipeline.return_value = pipe
+
+        with patch("services.deduplication.redis_manager", redis):
+            assert await bloom.contains_any(["a", "b"]) is None
+            pipe.execute.return_value = [1] + [0] * 6
+            assert await bloom.contains_any(["a", "b"]) == [False, False]
+
+        pipe.getbit.assert_any_call(bloom.key, 1024)
+
+    async def test_unseeded_check_uses_database_and_seeds(self):
+        """Checks fall back to the database and trigger seeding."""
+        existing = uuid.uuid4()
+        bloom = AsyncMock()
+        bloom.contains_any.return_value = None
+        dedup = MemoryDeduplicator(bloom=bloom, max_distance=3)
+        dedup.start_seeding = MagicMock()
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = existing
+        db, _ = fake_db(result)
+
+        with patch("services.deduplication.db_manager", db):
+            check = await dedup.check("u", content_hash("u", ARTICLE), compute_simhash(ARTICLE))
+
+        assert check.kind == DuplicateKind.EXACT
+        assert check.memory_id == str(existing)
+        dedup.start_seeding.assert_called_once()
+
+    async def test_seed_loads_stored_memories(self):
+        """Seeding adds hashes and band keys of stored memories, then marks the filter."""
+        user_id = uuid.uuid4()
+        hash_value = content_hash(str(user_id), ARTICLE)
+        bands = simhash_bands(compute_simhash(ARTICLE))
+        bloom = AsyncMock()
+        bloom.is_seeded.return_value = False
+        dedup = MemoryDeduplicator(bloom=bloom, max_distance=3)
+        batch, empty = MagicMock(), MagicMock()
+        batch.all.return_value = [(uuid.uuid4(), user_id, hash_value, bands)]
+        empty.all.return_value = []
+        db, _ = fake_db(batch, empty)
+        redis = MagicMock()
+        redis.client.set = AsyncMock(return_value=True)
+        redis.client.delete = AsyncMock()
+
+        with patch("services.deduplication.db_manager", db), patch("services.deduplication.redis_manager", redis):
+            assert await dedup.seed() == 1
+
+        (keys,) = bloom.add_many.await_args.args
+        assert keys == dedup._bloom_keys(str(user_id), hash_value, bands)
+        bloom.mark_seeded.assert_awaited_once()
+        redis.client.delete.assert_awaited_once_with(MemoryDeduplicator.SEED_LOCK_KEY)
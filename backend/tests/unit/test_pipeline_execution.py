@@ -0,0 +1,159 @@
+"""
+Tests for isolated pipeline execution contexts, stage concurrency limits,
+coalesced batch stages and the stage profiler.
+"""
+import asyncio
+import random
+
+import pytest
+
+from pipelines.base import (
+    BatchStage,
+    ContextAccessError,
+    Pipeline,
+    PipelineStage,
+    PipelineStatus,
+)
+
+
+class MarkStage(PipelineStage[int, int]):
+    """Writes the run's input into the context, then yields"""
+
+    def __init__(self):
+        super().__init__("mark", writes=["marker"])
+
+    async def process(self, data: int, context):
+        context["marker"] = data
+        await asyncio.sleep(random.random() / 1000)
+        return data
+
+
+class CheckStage(PipelineStage[int, int]):
+    """Reads the marker back and fails if another run overwrote it"""
+
+    def __init__(self):
+        super().__init__("check", reads=["marker", "offset"])
+
+    async def process(self, data: int, context):
+        await asyncio.sleep(random.random() / 1000)
+        if context["marker"] != data:
+            raise AssertionError(f"context leaked: {context['marker']} != {data}")
+        return data + context.get("offset", 0)
+
+
+class UndeclaredWriteStage(PipelineStage[int, int]):
+    def __init__(self):
+        super().__init__("undeclared")
+
+    async def process(self, data: int, context):
+        context["marker"] = data
+        return data
+
+
+class TrackingStage(PipelineStage[int, int]):
+    def __init__(self, max_concurrency: int):
+        super().__init__("tracking", max_concurrency=max_concurrency)
+        self.active = 0
+        self.peak = 0
+
+    async def process(self, data: int, context):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        return data
+
+
+class SimplePipeline(Pipeline[int, int]):
+    pass
+
+
+@pytest.mark.asyncio
+class TestPipelineExecution:
+    """Test suite for pipeline execution contexts."""
+
+    async def test_isolation_under_1000_concurrent_runs(self):
+        """Concurrent runs never observe each other's context writes."""
+        pipeline = SimplePipeline("isolation", stages=[MarkStage(), CheckStage()])
+
+        results = await asyncio.gather(*[pipeline.execute(i) for i in range(1000)])
+
+        assert all(r.status == PipelineStatus.COMPLETED for r in results)
+        assert [r.data for r in results] == list(range(1000))
+        assert len({r.metadata["run_id"] for r in results}) == 1000
+
+    async def test_execute_batch_isolation_with_overrides(self):
+        """Per-call context overrides reach stages without leaking to other runs."""
+        pipeline = SimplePipeline("batch", stages=[MarkStage(), CheckStage()])
+
+        results = await pipeline.execute_batch(list(range(1000)), max_concurrent=1000, context={"offset": 5})
+        plain = await pipeline.execute(7)
+
+        assert [r.data for r in results] == [i + 5 for i in range(1000)]
+        assert plain.data == 7
+        assert pipeline.default_context == {}
+
+    async def test_undeclared_write_is_rejected(self):
+        """Stages cannot write keys they did not declare."""
+        pipeline = SimplePipeline("strict", stages=[UndeclaredWriteStage()])
+
+        result = await pipeline.execute(1)
+
+        assert result.status == PipelineStatus.FAILED
+        assert "undeclared context key" in result.error
+
+    async def test_undeclared_read_is_rejected(self):
+        """Stages with declared reads cannot read other keys."""
+        stage = CheckStage()
+        pipeline = SimplePipeline("reads", stages=[stage])
+        context = pipeline.new_context({"secret": 1, "marker": 3})
+
+        view = context.view(stage)
+
+        assert view["marker"] == 3
+        with pytest.raises(ContextAccessError):
+            view.get("secret")
+        assert set(view) == {"marker"}
+
+    async def test_stage_concurrency_limit(self):
+        """max_concurrency caps in-flight runs inside a stage."""
+        stage = TrackingStage(max_concurrency=4)
+        pipeline = SimplePipeline("limited", stages=[stage])
+
+        await asyncio.gather(*[pipeline.execute(i) for i in range(50)])
+
+        assert stage.peak <= 4
+        profile = pipeline.get_profile()["tracking"]
+        assert profile["calls"] == 50
+        assert profile["max_queue_wait_ms"] > 0
+
+    async def test_coalesced_batch_stage(self):
+        """Items from concurrent runs are processed in shared batches."""
+        calls = []
+
+        def double(batch):
+            calls.append(len(batch))
+            return [x * 2 for x in batch]
+
+        stage = BatchStage("double", batch_size=64, process_batch=double, coalesce=True, max_wait_ms=2)
+        pipeline = SimplePipeline("vectorized", stages=[stage])
+
+        results = await asyncio.gather(*[pipeline.execute([i, i + 1]) for i in range(200)])
+
+        assert [r.data for r in results] == [[i * 2, (i + 1) * 2] for i in range(200)]
+        assert sum(calls) == 400
+        assert len(calls) < 200
+        assert pipeline.get_profile()["double"]["items"] == 400
+
+    async def test_coalesced_batch_stage_propagates_errors(self):
+        """A failing batch fails every run that contributed to it."""
+        def broken(batch):
+            raise RuntimeError("boom")
+
+        stage = BatchStage("broken", batch_size=8, process_batch=broken, coalesce=True)
+        pipeline = SimplePipeline("broken", stages=[stage])
+
+        results = await asyncio.gather(*[pipeline.execute([i]) for i in range(4)])
+
+        assert all(r.status == PipelineStatus.FAILED for r in results)
+        assert all("boom" in r.error for r in results)
@@ -16,6 +16,7 @@ from core.config import get_settings
 from services.memory_service import MemoryService
 from services.search_service import vector_search_service
 from pipelines.consolidation import MemoryConsolidationPipeline, REMConsolidationScheduler
+from pipelines.clustering import RedisClusterStateStore
 from pipelines.reflection import ReflectionPipeline, ReflectionLayerManager
 
 logger = logging.getLogger(__name__)
@@ -261,7 +262,8 @@ class ConsolidationWorker(BaseWorker):
         super().__init__("consolidation_processor")
         self.memory_service = MemoryService()
         self.consolidation_pipeline = MemoryConsolidationPipeline(
-            memory_service=self.memory_service
+            memory_service=self.memory_service,
+            cluster_state_store=RedisClusterStateStore(redis_manager)
         )
         self.scheduler = REMConsolidationScheduler(self.consolidation_pipeline)
         self.cycle_hours = settings.memory_consolidation_interval_hours
@@ -4,12 +4,13 @@ Chatter Knowledge Platform API
 AI Agents: This is the main entry point. Key endpoints:
 - /sources: List available data sources
 - /ingest/{source}: Ingest data from a source
+- /sync/{source}: Incrementally sync a source (only changed documents)
 - /search: Search across ingested knowledge
 - /health: System health check
 """
 
 import os
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -17,7 +18,10 @@ import structlog
 
 from sources import list_sources, get_source
 from storage.vectors import VectorStore
+from storage.sync_state import SyncStateStore
 from processors.summarizer import DocumentSummarizer
+from processors.pipeline import IngestionPipeline
+from processors.sync import SyncEngine, supports_sync
 
 # Configure logging
 logger = structlog.get_logger()
@@ -32,12 +36,13 @@ app = FastAPI(
 # Initialize components (in production, use dependency injection)
 vector_store = None
 summarizer = None
+sync_state = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
-    global vector_store, summarizer
+    global vector_store, summarizer, sync_state
     
     logger.info("Initializing Chatter Knowledge Platform")
     
@@ -48,6 +53,14 @@ async def startup_event():
     # Initialize processor
     summarizer = DocumentSummarizer()
     
+    # Initialize sync state (incremental sync is unavailable without PostgreSQL)
+    try:
+        sync_state = SyncStateStore()
+        await sync_state.initialize()
+    except Exception as e:
+        logger.warning("Sync state unavailable, /sync disabled", error=str(e))
+        sync_state = None
+    
     logger.info("Initialization complete")
 
 
@@ -61,6 +74,13 @@ class IngestRequest(BaseModel):
     collection: Optional[str] = None
 
 
+class SyncRequest(BaseModel):
+    """Request to incrementally sync a source into a collection."""
+    collection: Optional[str] = None
+    full: bool = False
+    reconcile: bool = False
+
+
 class SearchRequest(BaseModel):
     """Search request across knowledge base."""
     query: str
@@ -92,7 +112,7 @@ async def health_check():
         "services": {
             "api": "up",
             "vector_store": "up" if vector_store and await vector_store.health_check() else "down",
-            "postgres": "up",  # TODO: Implement actual check
+            "postgres": "up" if sync_state and await sync_state.health_check() else "down",
             "redis": "up"      # TODO: Implement actual check
         }
     }
@@ -157,11 +177,16 @@ async def ingest_data(
         
         # Process in background if requested
         if request.process:
+            # Listings and search results only carry text previews
+            fetch = None
+            if request.query_type in ("list_documents", "search"):
+                fetch = getattr(source, "get_document", None)
             background_tasks.add_task(
                 process_and_store,
                 source_name=source_name,
                 data=data,
-                collection=request.collection
+                collection=request.collection,
+                fetch=fetch
             )
             
             return {
@@ -184,6 +209,55 @@ async def ingest_data(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/sync/{source_name}")
+async def sync_source(
+    source_name: str,
+    request: SyncRequest,
+    background_tasks: BackgroundTasks
+):
+    """
+    Incrementally sync a source into the knowledge base.
+    
+    Only documents changed since the last sync are processed; documents
+    with unchanged content are skipped and deleted ones are removed.
+    
+    AI Agents: Prefer this over /ingest for keeping a source up to date. Example:
+        POST /sync/outline
+        {
+            "full": false,
+            "reconcile": false
+        }
+    """
+    if sync_state is None:
+        raise HTTPException(status_code=503, detail="Sync state store unavailable")
+    try:
+        source = get_source(source_name)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not supports_sync(source):
+        raise HTTPException(status_code=400, detail=f"{source_name} does not support incremental sync")
+    
+    collection = request.collection
+    if not collection:
+        collections = source.get_collections()
+        collection = collections[0].name if collections else source_name
+    
+    background_tasks.add_task(
+        run_sync,
+        source_name=source_name,
+        source=source,
+        collection=collection,
+        full=request.full,
+        reconcile=request.reconcile
+    )
+    return {
+        "status": "sync_started",
+        "source": source_name,
+        "collection": collection,
+        "full": request.full
+    }
+
+
 @app.post("/search")
 async def search_knowledge(request: SearchRequest):
     """
@@ -226,11 +300,15 @@ async def list_collections():
 async def process_and_store(
     source_name: str, 
     data: List[Dict[str, Any]], 
-    collection: Optional[str] = None
+    collection: Optional[str] = None,
+    fetch: Optional[Callable[[str], Any]] = None
 ):
     """
     Process and store data in background.
     
+    Items flow through the staged ingestion pipeline: full documents are
+    fetched, summarized, embedded in batches and upserted concurrently.
+    
     AI Agents: This runs automatically after ingestion.
     """
     logger.info(f"Processing {len(data)} items from {source_name}")
@@ -244,31 +322,31 @@ async def process_and_store(
         if not collection and collections:
             collection = collections[0].name
         
-        # Process each item
-        processed_items = []
-        for item in data:
-            # Summarize if it's a document
-            if "text" in item or "content" in item:
-                summary = await summarizer.process(
-                    content=item.get("text") or item.get("content"),
-                    metadata=item
-                )
-                processed_items.append(summary)
-            else:
-                processed_items.append(item)
+        pipeline = IngestionPipeline(vector_store, summarizer, fetch=fetch)
+        report = await pipeline.run(data, collection)
         
-        # Store in vector database
-        await vector_store.add_documents(
-            documents=processed_items,
-            collection=collection
-        )
-        
-        logger.info(f"Stored {len(processed_items)} items in {collection}")
+        logger.info(f"Stored {report['stored']} items in {collection}", stages=report["stages"])
         
     except Exception as e:
         logger.error(f"Processing error for {source_name}", error=str(e))
 
 
+async def run_sync(source_name: str, source, collection: str, full: bool = False, reconcile: bool = False):
+    """
+    Run an incremental sync in the background.
+    
+    AI Agents: This runs automatically after /sync.
+    """
+    try:
+        engine = SyncEngine(vector_store, sync_state, summarizer)
+        await engine.sync(source_name, source, collection, full=full, reconcile=reconcile)
+    except Exception as e:
+        logger.error(f"Sync error for {source_name}", error=str(e))
+    finally:
+        if hasattr(source, "aclose"):
+            await source.aclose()
+
+
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
@@ -15,6 +15,25 @@ CREATE TABLE IF NOT EXISTS ingestion_logs (
 CREATE INDEX idx_ingestion_source ON ingestion_logs(source_name);
 CREATE INDEX idx_ingestion_status ON ingestion_logs(status);
 
+-- Incremental sync state: cursor per source/collection and a content hash per document
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    source_name VARCHAR(255) NOT NULL,
+    collection VARCHAR(255) NOT NULL,
+    cursor TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source_name, collection)
+);
+
+CREATE TABLE IF NOT EXISTS synced_documents (
+    source_name VARCHAR(255) NOT NULL,
+    collection VARCHAR(255) NOT NULL,
+    document_id VARCHAR(255) NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    revision INTEGER,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (source_name, collection, document_id)
+);
+
 -- Future: Task extraction table
 CREATE TABLE IF NOT EXISTS extracted_tasks (
     id SERIAL PRIMARY KEY,
@@ -4,6 +4,7 @@ Document processors for knowledge extraction.
 AI Agents: Available processors:
 - DocumentSummarizer: Extract summaries and key information
 - BatchProcessor: Process multiple documents efficiently
+- IngestionPipeline: Fetch, summarize, embed and store documents in concurrent stages
 
 Example:
     from processors import DocumentSummarizer
@@ -13,5 +14,6 @@ Example:
 """
 
 from .summarizer import DocumentSummarizer, BatchProcessor
+from .pipeline import IngestionPipeline
 
-__all__ = ["DocumentSummarizer", "BatchProcessor"]
\ No newline at end of file
+__all__ = ["DocumentSummarizer", "BatchProcessor", "IngestionPipeline"]
\ No newline at end of file
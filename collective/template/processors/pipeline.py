@@ -0,0 +1,294 @@
+"""
+Staged ingestion pipeline.
+
+AI Agents: This runs source items through four overlapping stages:
+
+    fetch -> summarize -> embed -> upsert
+
+Each stage has its own pool of workers and hands items to the next stage
+through a bounded queue, so a slow stage (usually summarization) applies
+backpressure upstream instead of letting work pile up in memory. Embedding
+and upserting work on batches. Per-stage throughput is reported at the end.
+
+Example:
+    pipeline = IngestionPipeline(vector_store, summarizer, fetch=source.get_document)
+    report = await pipeline.run(documents, collection="outline_documents")
+"""
+
+import asyncio
+import inspect
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from .summarizer import DocumentSummarizer
+
+logger = structlog.get_logger()
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage."""
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        wall = (self.finished_at or time.monotonic()) - self.started_at if self.started_at else 0.0
+        return {
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "wall_seconds": round(wall, 3),
+            "items_per_second": round(self.items_in / wall, 2) if wall > 0 else None,
+        }
+
+
+class IngestionPipeline:
+    """
+    Fetches, summarizes, embeds and upserts documents concurrently.
+
+    AI Agents: Concurrency and batching default to environment variables:
+    - FETCH_CONCURRENCY: Parallel full-document fetches (default 8)
+    - SUMMARIZE_CONCURRENCY: Parallel LLM summarizations (default 8)
+    - EMBED_BATCH_SIZE: Texts per embeddings request (default 64)
+    - EMBED_CONCURRENCY: Parallel embeddings requests (default 2)
+    - UPSERT_BATCH_SIZE: Points per Qdrant upsert (default 256)
+    - PIPELINE_QUEUE_SIZE: Items buffered between stages (default 64)
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        summarizer: Optional[DocumentSummarizer] = None,
+        fetch: Optional[Callable[[str], Any]] = None,
+        embedding_fields: List[str] = ["text", "content", "summary"],
+        fetch_concurrency: int = None,
+        summarize_concurrency: int = None,
+        embed_batch_size: int = None,
+        embed_concurrency: int = None,
+        upsert_batch_size: int = None,
+        queue_size: int = None,
+        batch_linger: float = 0.5
+    ):
+        """
+        Args:
+            vector_store: VectorStore to write to
+            summarizer: Summarizer for items with text (None stores items as fetched)
+            fetch: Function (sync or async) returning the full document for an item ID;
+                None uses items as given
+            embedding_fields: Fields to create embeddings from
+            fetch_concurrency: Parallel fetches
+            summarize_concurrency: Parallel summarizations
+            embed_batch_size: Texts per embeddings request
+            embed_concurrency: Parallel embeddings requests
+            upsert_batch_size: Points per upsert
+            queue_size: Items buffered between stages
+            batch_linger: Seconds a partial batch waits for more items
+        """
+        self.vector_store = vector_store
+        self.summarizer = summarizer
+        self.fetch = fetch
+        self.embedding_fields = embedding_fields
+        self.fetch_concurrency = fetch_concurrency or int(os.getenv("FETCH_CONCURRENCY", "8"))
+        self.summarize_concurrency = summarize_concurrency or int(os.getenv("SUMMARIZE_CONCURRENCY", "8"))
+        self.embed_batch_size = embed_batch_size or int(os.getenv("EMBED_BATCH_SIZE", "64"))
+        self.embed_concurrency = embed_concurrency or int(os.getenv("EMBED_CONCURRENCY", "2"))
+        self.upsert_batch_size = upsert_batch_size or int(os.getenv("UPSERT_BATCH_SIZE", "256"))
+        self.queue_size = queue_size or int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+        self.batch_linger = batch_linger
+
+    async def run(self, items: List[Dict[str, Any]], collection: str) -> Dict[str, Any]:
+        """
+        Run items through the pipeline into a collection.
+
+        Args:
+            items: Source items (documents or previews with an "id")
+            collection: Target collection name
+
+        Returns:
+            Report with the number of documents and points stored, the number
+            of failed items or batches, the IDs of documents stored unsummarized
+            because summarization failed, and per-stage statistics
+        """
+        await self.vector_store.create_collection(collection)
+        started = time.monotonic()
+
+        stages = [
+            StageStats("fetch", self.fetch_concurrency),
+            StageStats("summarize", self.summarize_concurrency),
+            StageStats("embed", self.embed_concurrency),
+            StageStats("upsert", 1),
+        ]
+        fetch, summarize, embed, upsert = stages
+        # queues[i] feeds stages[i]
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in stages]
+
+        stored_documents = set()
+        summary_failures = set()
+
+        async def summarize_one(item):
+            result = await self._summarize_one(item)
+            # The summarizer stores the original text when the LLM call fails
+            if "processing_error" in result:
+                summary_failures.add(_item_id(item))
+            return result
+
+        async def upsert_batch(points):
+            await self.vector_store.upsert_points(collection, points)
+            stored_documents.update(point.payload.get("_document_id") for point in points)
+            return points
+
+        workers = [
+            self._stage(fetch, queues[0], queues[1], summarize.workers, self._fetch_one),
+            self._stage(summarize, queues[1], queues[2], embed.workers, summarize_one),
+            self._batch_stage(embed, queues[2], queues[3], upsert.workers, self.embed_batch_size, self._embed_batch),
+            self._batch_stage(upsert, queues[3], None, 0, self.upsert_batch_size, upsert_batch),
+        ]
+        await asyncio.gather(self._feed(items, queues[0], fetch.workers), *workers)
+
+        report = {
+            "collection": collection,
+            "items": len(items),
+            "stored": len(stored_documents),
+            "points": upsert.items_out,
+            "errors": sum(stage.errors for stage in stages),
+            "summary_failures": sorted(summary_failures),
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "stages": {stage.name: stage.to_dict() for stage in stages},
+        }
+        logger.info("Ingestion pipeline finished", **report)
+        return report
+
+    async def _feed(self, items, queue: asyncio.Queue, consumers: int):
+        for item in items:
+            await queue.put(item)
+        for _ in range(consumers):
+            await queue.put(_DONE)
+
+    async def _stage(
+        self,
+        stats: StageStats,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        next_workers: int,
+        handle: Callable[[Any], Awaitable[Any]],
+    ):
+        """Run a per-item stage with stats.workers workers."""
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                stats.started_at = stats.started_at or time.monotonic()
+                stats.items_in += 1
+                begin = time.monotonic()
+                try:
+                    result = await handle(item)
+                except Exception as e:
+                    stats.errors += 1
+                    logger.error(f"Pipeline stage {stats.name} failed", error=str(e), id=_item_id(item))
+                    continue
+                finally:
+                    stats.busy_seconds += time.monotonic() - begin
+                stats.items_out += 1
+                if outbox is not None:
+                    await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(stats.workers)))
+        await self._finish(stats, outbox, next_workers)
+
+    async def _batch_stage(
+        self,
+        stats: StageStats,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        next_workers: int,
+        batch_size: int,
+        handle: Callable[[List[Any]], Awaitable[List[Any]]],
+    ):
+        """Run a stage that handles items in batches of up to batch_size."""
+        async def worker():
+            done = False
+            while not done:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                batch = [item]
+                # Top the batch up, waiting briefly for upstream stages
+                while len(batch) < batch_size:
+                    try:
+                        item = await asyncio.wait_for(inbox.get(), self.batch_linger)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is _DONE:
+                        done = True
+                        break
+                    batch.append(item)
+
+                stats.started_at = stats.started_at or time.monotonic()
+                stats.items_in += len(batch)
+                begin = time.monotonic()
+                try:
+                    results = await handle(batch)
+                except Exception as e:
+                    stats.errors += 1
+                    logger.error(f"Pipeline stage {stats.name} failed", error=str(e), batch_size=len(batch))
+                    continue
+                finally:
+                    stats.busy_seconds += time.monotonic() - begin
+                stats.items_out += len(results)
+                if outbox is not None:
+                    for result in results:
+                        await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(stats.workers)))
+        await self._finish(stats, outbox, next_workers)
+
+    async def _finish(self, stats: StageStats, outbox: Optional[asyncio.Queue], next_workers: int):
+        # Tell each worker of the next stage that no more input is coming
+        stats.finished_at = time.monotonic()
+        if outbox is not None:
+            for _ in range(next_workers):
+                await outbox.put(_DONE)
+
+    async def _fetch_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if self.fetch is None or "id" not in item:
+            return item
+        if inspect.iscoroutinefunction(self.fetch):
+            return await self.fetch(item["id"])
+        # Source connectors use blocking HTTP clients
+        return await asyncio.to_thread(self.fetch, item["id"])
+
+    async def _summarize_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        # Summarize if it's a document
+        if self.summarizer is None or not ("text" in item or "content" in item):
+            return item
+        return await self.summarizer.process(
+            content=item.get("text") or item.get("content"),
+            metadata=item
+        )
+
+    async def _embed_batch(self, documents: List[Dict[str, Any]]) -> List[Any]:
+        prepared = self.vector_store.prepare_documents(documents, self.embedding_fields)
+        if not prepared:
+            return []
+        embeddings = await self.vector_store.embed_texts([text for _, text in prepared])
+        return self.vector_store.build_points(prepared, embeddings)
+
+
+def _item_id(item: Any) -> Any:
+    return item.get("id", "unknown") if isinstance(item, dict) else "unknown"
@@ -5,8 +5,9 @@ AI Agents: This processor handles document summarization and extraction.
 It uses source-specific prompts when available.
 """
 
+import asyncio
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from langchain.chat_models import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 import structlog
@@ -155,8 +156,14 @@ class BatchProcessor:
     AI Agents: Use this for bulk processing.
     """
     
-    def __init__(self, summarizer: DocumentSummarizer = None):
+    def __init__(self, summarizer: DocumentSummarizer = None, max_concurrency: int = None):
+        """
+        Args:
+            summarizer: Summarizer to use (defaults to a new DocumentSummarizer)
+            max_concurrency: Documents summarized at once (defaults to SUMMARIZE_CONCURRENCY env var, 8)
+        """
         self.summarizer = summarizer or DocumentSummarizer()
+        self.max_concurrency = max_concurrency or int(os.getenv("SUMMARIZE_CONCURRENCY", "8"))
         
     async def process_batch(
         self, 
@@ -164,30 +171,28 @@ class BatchProcessor:
         batch_size: int = 10
     ) -> List[Dict[str, Any]]:
         """
-        Process documents in batches.
+        Process documents concurrently, at most max_concurrency at a time.
         
         Args:
             documents: List of documents to process
-            batch_size: Documents per batch
+            batch_size: Documents between progress log lines
             
         Returns:
-            Processed documents
+            Processed documents, in input order
         """
-        processed = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        completed = 0
         
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i + batch_size]
-            
-            # Process batch concurrently
-            batch_results = []
-            for doc in batch:
+        async def process_one(doc: Dict[str, Any]) -> Dict[str, Any]:
+            nonlocal completed
+            async with semaphore:
                 result = await self.summarizer.process(
                     content=doc.get("text") or doc.get("content", ""),
                     metadata=doc
                 )
-                batch_results.append(result)
-            
-            processed.extend(batch_results)
-            logger.info(f"Processed batch {i//batch_size + 1}, total: {len(processed)}")
+            completed += 1
+            if completed % batch_size == 0 or completed == len(documents):
+                logger.info(f"Processed {completed}/{len(documents)} documents")
+            return result
         
-        return processed
\ No newline at end of file
+        return list(await asyncio.gather(*(process_one(doc) for doc in documents)))
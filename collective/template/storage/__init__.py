@@ -3,6 +3,7 @@ Storage backends for the knowledge platform.
 
 AI Agents: Available storage:
 - VectorStore: Qdrant-based vector storage for semantic search
+- SyncStateStore: PostgreSQL-backed cursors and content hashes for incremental syncs
 - (Future) StructuredStore: PostgreSQL for metadata
 
 Example:
@@ -14,5 +15,6 @@ Example:
 """
 
 from .vectors import VectorStore
+from .sync_state import SyncStateStore
 
-__all__ = ["VectorStore"]
\ No newline at end of file
+__all__ = ["VectorStore", "SyncStateStore"]
\ No newline at end of file
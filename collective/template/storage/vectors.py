@@ -3,18 +3,63 @@ Vector storage implementation using Qdrant.
 
 AI Agents: This handles all vector database operations.
 Collections are automatically created based on source configurations.
+
+Point IDs are deterministic (UUIDv5 of document ID and chunk index), so
+re-ingesting a document overwrites its points instead of duplicating them.
 """
 
+import asyncio
+import hashlib
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition,
+    MatchValue, MatchAny, FilterSelector, PayloadSchemaType
+)
 import structlog
 from langchain.embeddings import OpenAIEmbeddings
 import uuid
 
 logger = structlog.get_logger()
 
+# Namespace for deterministic point IDs
+POINT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "chatter/vector-points")
+
+
+def point_id(document_id: str, chunk_index: int = 0) -> str:
+    """
+    Deterministic point ID for a chunk of a document.
+    
+    Args:
+        document_id: Source document ID
+        chunk_index: Position of the chunk within the document
+    """
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{document_id}:{chunk_index}"))
+
+
+def chunk_text(text: str, size: int, overlap: int) -> List[str]:
+    """
+    Split text into chunks of at most size characters, preferring paragraph
+    and line breaks, with overlap characters repeated between chunks.
+    """
+    if len(text) <= size:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            # Break at the last paragraph or line break in the second half of the window
+            cut = max(text.rfind("\n\n", start, end), text.rfind("\n", start, end))
+            if cut > start + size // 2:
+                end = cut
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
 
 class VectorStore:
     """
@@ -36,6 +81,9 @@ class VectorStore:
         self.url = url or os.getenv("QDRANT_URL", "http://localhost:6333")
         self.client = None
         self.embeddings = OpenAIEmbeddings()
+        self.embed_batch_size = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+        self.chunk_size = int(os.getenv("CHUNK_SIZE", "4000"))
+        self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "200"))
         
     async def initialize(self):
         """Initialize connection to Qdrant."""
@@ -73,6 +121,12 @@ class VectorStore:
                         distance=Distance.COSINE
                     )
                 )
+                # Index the document ID so updates and deletions can filter on it
+                self.client.create_payload_index(
+                    collection_name=name,
+                    field_name="_document_id",
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
                 logger.info(f"Created collection: {name}")
         except Exception as e:
             logger.error(f"Error creating collection {name}", error=str(e))
@@ -87,6 +141,10 @@ class VectorStore:
         """
         Add documents to vector store.
         
+        Documents are split into chunks of CHUNK_SIZE characters, embedded in
+        batches of EMBED_BATCH_SIZE with a single embeddings request per batch,
+        then upserted. Re-adding a document replaces its previous chunks.
+        
         Args:
             documents: List of documents with text and metadata
             collection: Target collection name
@@ -106,7 +164,41 @@ class VectorStore:
         # Ensure collection exists
         await self.create_collection(collection)
         
+        prepared = self.prepare_documents(documents, embedding_fields)
+        
         points = []
+        for i in range(0, len(prepared), self.embed_batch_size):
+            batch = prepared[i:i + self.embed_batch_size]
+            try:
+                embeddings = await self.embed_texts([text for _, text in batch])
+            except Exception as e:
+                logger.error(f"Embedding generation failed", error=str(e), batch_size=len(batch))
+                continue
+            points.extend(self.build_points(batch, embeddings))
+        
+        # Batch upsert
+        if points:
+            await self.upsert_points(collection, points)
+    
+    def prepare_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        embedding_fields: List[str] = ["text", "content", "summary"]
+    ) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Split documents into the chunks to embed, skipping documents without text.
+        
+        Each chunk's payload is the document plus "_document_id", "_chunk_index"
+        and "_text_hash" (hash of the document's full embedded text).
+        
+        Args:
+            documents: Documents to store
+            embedding_fields: Fields to create embeddings from
+            
+        Returns:
+            (chunk payload, chunk text) pairs
+        """
+        prepared = []
         for doc in documents:
             # Find text to embed
             text_to_embed = ""
@@ -118,35 +210,114 @@ class VectorStore:
                 logger.warning(f"No text to embed in document: {doc.get('id', 'unknown')}")
                 continue
             
-            # Generate embedding
-            try:
-                embedding = await self.embeddings.aembed_query(text_to_embed.strip())
-            except Exception as e:
-                logger.error(f"Embedding generation failed", error=str(e))
-                continue
+            text_hash = hashlib.sha256(text_to_embed.strip().encode("utf-8")).hexdigest()
+            # Documents without an ID are keyed by content, so identical ones collapse
+            document_id = str(doc.get("id") or text_hash)
+            for index, chunk in enumerate(chunk_text(text_to_embed.strip(), self.chunk_size, self.chunk_overlap)):
+                prepared.append(({
+                    **doc,
+                    "_document_id": document_id,
+                    "_chunk_index": index,
+                    "_text_hash": text_hash
+                }, chunk))
+        return prepared
+    
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with one embeddings request per EMBED_BATCH_SIZE texts.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            One embedding per text
+        """
+        embeddings = []
+        for i in range(0, len(texts), self.embed_batch_size):
+            embeddings.extend(await self.embeddings.aembed_documents(texts[i:i + self.embed_batch_size]))
+        return embeddings
+    
+    def build_points(
+        self,
+        prepared: List[Tuple[Dict[str, Any], str]],
+        embeddings: List[List[float]]
+    ) -> List[PointStruct]:
+        """
+        Build Qdrant points from prepared documents and their embeddings.
+        
+        Args:
+            prepared: (chunk payload, chunk text) pairs from prepare_documents()
+            embeddings: Embedding of each chunk's text
             
-            # Create point
-            point_id = str(uuid.uuid4())
+        Returns:
+            Points ready to upsert
+        """
+        points = []
+        for (doc, text), embedding in zip(prepared, embeddings):
             payload = {
                 **doc,
-                "_embedded_text": text_to_embed.strip()[:1000]  # Store what was embedded
+                "_embedded_text": text[:1000]  # Store what was embedded
             }
-            
             points.append(
                 PointStruct(
-                    id=point_id,
+                    id=point_id(doc["_document_id"], doc["_chunk_index"]),
                     vector=embedding,
                     payload=payload
                 )
             )
+        return points
+    
+    async def upsert_points(self, collection: str, points: List[PointStruct]):
+        """
+        Upsert points without blocking the event loop, then remove chunks
+        left over from earlier versions of the same documents.
         
-        # Batch upsert
-        if points:
-            self.client.upsert(
+        Args:
+            collection: Target collection name
+            points: Points to upsert
+        """
+        await asyncio.to_thread(
+            self.client.upsert,
+            collection_name=collection,
+            points=points
+        )
+        
+        # A document that now has fewer chunks keeps its old trailing chunks
+        # unless they are deleted; they carry the previous text hash
+        current = {p.payload["_document_id"]: p.payload["_text_hash"] for p in points if "_text_hash" in p.payload}
+        if current:
+            stale = Filter(should=[
+                Filter(
+                    must=[FieldCondition(key="_document_id", match=MatchValue(value=document_id))],
+                    must_not=[FieldCondition(key="_text_hash", match=MatchValue(value=text_hash))]
+                )
+                for document_id, text_hash in current.items()
+            ])
+            await asyncio.to_thread(
+                self.client.delete,
                 collection_name=collection,
-                points=points
+                points_selector=FilterSelector(filter=stale)
             )
-            logger.info(f"Added {len(points)} documents to {collection}")
+        logger.info(f"Added {len(points)} documents to {collection}")
+    
+    async def delete_documents(self, collection: str, document_ids: List[str]):
+        """
+        Delete every chunk of the given documents.
+        
+        Args:
+            collection: Collection name
+            document_ids: Source document IDs
+        """
+        if not document_ids:
+            return
+        await asyncio.to_thread(
+            self.client.delete,
+            collection_name=collection,
+            points_selector=FilterSelector(filter=Filter(must=[
+                FieldCondition(key="_document_id", match=MatchAny(any=[str(i) for i in document_ids]))
+            ]))
+        )
+        logger.info(f"Deleted {len(document_ids)} documents from {collection}")
     
     async def search(
         self, 
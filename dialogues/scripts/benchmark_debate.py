@@ -0,0 +1,75 @@
+"""
+Benchmark debate wall time against agent count with a mock LLM.
+
+The mock LLM sleeps for a fixed latency and reports fixed token usage, so the
+numbers reflect scheduling only. Each agent count is run serially
+(max_parallel=1) and with the given parallelism.
+
+Usage:
+    python scripts/benchmark_debate.py --agents 2 4 8 --latency 0.05 --parallel 16
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.dynamic_agent import DynamicAgent
+from src.agents.orchestrator_dynamic import OrchestratorAgent
+
+
+class MockJudge:
+    """Judge that ranks the first three agents after one mock LLM call."""
+    def __init__(self, name, llm):
+        self.name = name
+        self.llm = llm
+
+    def judge(self, agent_summaries, transcript, return_usage=False):
+        result = self.llm("judge", "summaries", return_usage=True)
+        ranks = {f"rank{i + 1}": {"agent": name, "rationale": "mock"} for i, name in enumerate(list(agent_summaries)[:3])}
+        return {"result": ranks, "usage": result["usage"]}
+
+
+def make_llm(latency):
+    def llm(system_prompt, user_prompt, return_usage=False):
+        time.sleep(latency)
+        return {"response": f"mock reply to {user_prompt[:20]}", "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}}
+    return llm
+
+
+def run_debate(agent_count, latency, max_parallel):
+    llm = make_llm(latency)
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator = OrchestratorAgent(llm=llm)
+    orchestrator.agents = [
+        DynamicAgent(f"Agent{i}", "Mock", "analyze", "critique") for i in range(agent_count)
+    ]
+    orchestrator.judges = [MockJudge(f"Judge{i}", llm) for i in range(3)]
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        log_entry = orchestrator.run("Is the unexamined life worth living?", max_parallel=max_parallel, persist=False)
+    return time.perf_counter() - start, len(log_entry["llm_calls"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock LLM latency in seconds")
+    parser.add_argument("--parallel", type=int, default=16, help="max_parallel for the parallel run")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LLM_POOL_WORKERS", str(args.parallel))
+    print(f"{'agents':>6} {'calls':>6} {'serial (s)':>11} {'parallel (s)':>13} {'speedup':>8}")
+    for count in args.agents:
+        serial, calls = run_debate(count, args.latency, 1)
+        parallel, _ = run_debate(count, args.latency, args.parallel)
+        print(f"{count:>6} {calls:>6} {serial:>11.2f} {parallel:>13.2f} {serial / parallel:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
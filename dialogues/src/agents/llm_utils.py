@@ -1,42 +1,154 @@
 """
 llm_utils.py - Utility functions for LLM API calls (OpenAI, etc.)
+
+One OpenAI client is shared per process (it pools HTTP connections and is
+thread-safe), tiktoken encoders are cached per model, responses are cached on
+disk in SQLite keyed by model, prompts and sampling parameters, and transient
+API errors are retried with jittered exponential backoff.
 """
 
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
 from src.config.settings import get_llm_config
+import openai
 from openai import OpenAI
 import tiktoken
 
-def estimate_prompt_size(prompt):
+# Errors worth retrying: rate limits, timeouts, dropped connections and 5xx responses
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+@lru_cache(maxsize=None)
+def get_client(api_key, base_url=None, timeout=120.0):
     """
-    Estimate the size of a prompt in tokens using tiktoken.
-    Fallback to a simple character count if tiktoken is not available.
+    Return the shared OpenAI client for an API key and endpoint.
+    Retries are handled by call_openai, so the client's own retries are disabled.
+    """
+    return OpenAI(api_key=api_key, base_url=base_url or None, timeout=timeout, max_retries=0)
+
+
+@lru_cache(maxsize=32)
+def get_encoding(model_name=None):
+    """
+    Return the tiktoken encoding for a model (cl100k_base for unknown models),
+    or None if no encoding can be loaded (e.g. offline without a tiktoken cache).
     """
     try:
-        return tiktoken.get_encoding(prompt).length
+        return tiktoken.encoding_for_model(model_name) if model_name else tiktoken.get_encoding("cl100k_base")
+    except KeyError:
+        return get_encoding(None) if model_name else None
     except Exception:
+        return None
+
+
+def estimate_prompt_size(prompt, model_name=None):
+    """
+    Count the tokens of a prompt using tiktoken.
+    Fallback to a simple character count if no tiktoken encoding is available.
+    """
+    encoding = get_encoding(model_name)
+    if encoding is None:
         return len(prompt) // 4  # rough estimate, 1 token ~ 4 characters
+    return len(encoding.encode(prompt, disallowed_special=()))
+
+
+class ResponseCache:
+    """
+    Content-addressed LLM response cache stored in SQLite.
+    Safe to share between threads; each write is a single autocommitted statement.
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, "
+            "usage TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**params):
+        """Hash the request parameters into a cache key."""
+        return hashlib.sha256(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
 
-def call_openai(system_prompt, user_prompt, return_usage=False):
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT response, usage FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {"response": row[0], "usage": json.loads(row[1])}
+
+    def put(self, key, model, response, usage):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, usage, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, json.dumps(usage), time.time()),
+            )
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(path):
+    """Return the shared ResponseCache for a path."""
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ResponseCache(path)
+        return _caches[path]
+
+
+def _retry_delay(attempt, error, base=1.0, cap=30.0):
+    """Full-jitter exponential backoff, honouring Retry-After when the API sends it."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def call_openai(system_prompt, user_prompt, return_usage=False, use_cache=True):
     """
     Call OpenAI API with a system and user prompt, return the response text and optional token usage.
     Args:
         system_prompt (str): The system prompt (agent persona, instructions)
         user_prompt (str): The user or debate prompt
         return_usage (bool): If True, return dict with response and token usage info
+        use_cache (bool): Serve and store the response in the on-disk cache (if LLM_CACHE_ENABLED)
     Returns:
         str: LLM response (default)
         OR
-        dict: {'response': ..., 'usage': {'prompt_tokens': ..., 'completion_tokens': ..., 'total_tokens': ...}}
+        dict: {'response': ..., 'usage': {'prompt_tokens': ..., 'completion_tokens': ..., 'total_tokens': ...}, 'cached': bool}
     """
     cfg = get_llm_config()
     if not cfg["api_key"]:
         return "[LLM not configured: Please set OPENAI_API_KEY]" if not return_usage else {"response": "[LLM not configured: Please set OPENAI_API_KEY]", "usage": {}}
-    
-    # Estimate prompt size
-    prompt_size = estimate_prompt_size(system_prompt + user_prompt)
-    
+
     # Get the actual model context window
     model_name = cfg["model_name"]
+
+    # Count prompt tokens, including the per-message chat overhead
+    prompt_size = estimate_prompt_size(system_prompt, model_name) + estimate_prompt_size(user_prompt, model_name) + 8
+
     # Default context window by model type
     if model_name.startswith("gpt-3.5"):
         model_context_window = 4096
@@ -57,35 +169,66 @@ def call_openai(system_prompt, user_prompt, return_usage=False):
     max_tokens = max(128, model_context_window - prompt_size)
     if model_context_window - prompt_size < 128:
         print(f"Warning: Available tokens for completion is very low (max_tokens={max_tokens}, context_window={model_context_window}, prompt_size={prompt_size})")
-    
-    try:
-        client = OpenAI(
-            api_key=cfg["api_key"],
-            base_url=cfg["base_url"] if "base_url" in cfg and cfg["base_url"] else None
-        )
-        response = client.chat.completions.create(
-            model=cfg["model_name"],
+
+    # Serve identical requests from the response cache
+    cache = get_response_cache(cfg["cache_path"]) if use_cache and cfg.get("cache_enabled") else None
+    cache_key = None
+    if cache is not None:
+        cache_key = ResponseCache.make_key(
+            model=model_name,
+            base_url=cfg.get("base_url"),
             temperature=cfg["temperature"],
-            max_tokens=int(max_tokens),  # Use int() to ensure max_tokens is an integer
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+            max_tokens=int(max_tokens),
+            system=system_prompt,
+            user=user_prompt,
         )
-        message_content = response.choices[0].message.content
-        usage = getattr(response, 'usage', None)
-        if return_usage:
-            if usage:
-                usage_dict = {
-                    "prompt_tokens": usage.prompt_tokens,
-                    "completion_tokens": usage.completion_tokens,
-                    "total_tokens": usage.total_tokens
-                }
-            else:
-                usage_dict = {}
-            return {"response": message_content, "usage": usage_dict}
-        return message_content
-    except Exception as e:
-        if return_usage:
-            return {"response": f"[LLM error: {e}]", "usage": {}}
-        return f"[LLM error: {e}]"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if return_usage:
+                return {"response": cached["response"], "usage": cached["usage"], "cached": True}
+            return cached["response"]
+
+    client = get_client(cfg["api_key"], cfg.get("base_url"), cfg.get("timeout", 120.0))
+    max_retries = cfg.get("max_retries", 4)
+    attempt = 0
+    while True:
+        try:
+            response = client.chat.completions.create(
+                model=model_name,
+                temperature=cfg["temperature"],
+                max_tokens=int(max_tokens),  # Use int() to ensure max_tokens is an integer
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ]
+            )
+            break
+        except RETRYABLE_ERRORS as e:
+            if attempt >= max_retries:
+                if return_usage:
+                    return {"response": f"[LLM error: {e}]", "usage": {}}
+                return f"[LLM error: {e}]"
+            delay = _retry_delay(attempt, e)
+            print(f"Warning: LLM call failed ({type(e).__name__}), retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            attempt += 1
+        except Exception as e:
+            if return_usage:
+                return {"response": f"[LLM error: {e}]", "usage": {}}
+            return f"[LLM error: {e}]"
+
+    message_content = response.choices[0].message.content
+    usage = getattr(response, 'usage', None)
+    if usage:
+        usage_dict = {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens
+        }
+    else:
+        usage_dict = {}
+    if cache is not None and message_content is not None:
+        cache.put(cache_key, model_name, message_content, usage_dict)
+    if return_usage:
+        return {"response": message_content, "usage": usage_dict, "cached": False}
+    return message_content
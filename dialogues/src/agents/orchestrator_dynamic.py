@@ -4,9 +4,10 @@ Dynamic orchestrator agent to manage debate flow with dynamically loaded philoso
 
 import json
 import os
-import concurrent.futures
-from typing import List, Tuple, Dict, Any, Optional
+import time
+from typing import Callable, List, Tuple, Dict, Any, Optional
 
+from src.debate.scheduler import DebateScheduler, DebateTask, LLMCallLog
 from .base import BaseAgent
 from .judge_loader import load_judges_from_directory
 from .quorum import quorum_decision
@@ -18,14 +19,17 @@ class OrchestratorAgent:
     Manages conversation flow and coordinates all philosophical agents for the debate.
     Loads agents dynamically from definition files.
     """
-    def __init__(self, agent_definitions_dir: Optional[str] = None):
+    def __init__(self, agent_definitions_dir: Optional[str] = None, llm: Optional[Callable[..., Dict[str, Any]]] = None):
         """
         Initialize the orchestrator with dynamically loaded agents.
         
         Args:
             agent_definitions_dir: Directory containing agent definition files
                                   If None, default to "agent_definitions"
+            llm: Callable with the signature of call_openai(..., return_usage=True)
+                 If None, llm_utils.call_openai is used
         """
+        self.llm = llm
         # Path to agent definitions
         if agent_definitions_dir is None:
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -41,23 +45,39 @@ class OrchestratorAgent:
             raise RuntimeError("Number of judge agents must be odd to provide quorum. Refusing to run.")
         self.history = []
 
-    def run(self, prompt: str, max_parallel: int = 1):
+    def _call_llm(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Call the configured LLM and return {'response': ..., 'usage': ...}."""
+        if self.llm is not None:
+            return self.llm(system_prompt, user_prompt, return_usage=True)
+        from .llm_utils import call_openai
+        return call_openai(system_prompt, user_prompt, return_usage=True)
+
+    def run(self, prompt: str, max_parallel: int = 1, on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+            persist: bool = True):
         """
-        Run a single round of multi-agent debate: Opening Statement, Rebuttal, Summarization, Judging.
+        Run a single round of multi-agent debate: Opening Statement, Rebuttal, Closing, Summarization, Judging.
+
+        The LLM calls run as a dependency graph on the shared LLM worker pool: each
+        rebuttal starts as soon as the opening it answers is ready, each closing as
+        soon as the rebuttals against that agent are in, and so on.
         Args:
             prompt (str): The philosophical prompt to debate
             max_parallel (int): Maximum number of parallel API calls (default: 1)
+            on_event (callable): Called with each transcript entry as soon as it is produced
+            persist (bool): Append the debate to debate_history.jsonl and compute its metrics (default: True)
+        Returns:
+            dict: The debate log entry
         """
         import json
         import os
         from collections import defaultdict
-        import concurrent.futures
 
         # --- Per-phase parallelism settings ---
         def get_phase_parallel(phase: str, default: int = 1) -> int:
             env_map = {
                 "opening": "PARALLEL_AGENTS_OPENING",
                 "rebuttal": "PARALLEL_AGENTS_REBUTTAL",
+                "closing": "PARALLEL_AGENTS_CLOSING",
                 "summary": "PARALLEL_AGENTS_SUMMARY",
                 "judging": "PARALLEL_AGENTS_JUDGING",
             }
@@ -76,163 +96,165 @@ class OrchestratorAgent:
                     pass
             return default
 
-        transcript = []
-        opening_statements = []
-        rebuttals = defaultdict(list)
-        agent_summaries = {}
+        phase_limits = {phase: max(1, get_phase_parallel(phase, max_parallel))
+                        for phase in ("opening", "rebuttal", "closing", "summary", "judging")}
+        scheduler = DebateScheduler(max(phase_limits.values()), phase_limits)
 
-        # Track token usage
-        token_usage = {"opening": [], "rebuttal": [], "summary": [], "judge": []}
+        # Per-call latency and token usage
+        calls = LLMCallLog()
 
-
-        def get_opening(agent):
-            from .llm_utils import call_openai
-            if hasattr(agent, 'opening_statement'):
-                result = call_openai(agent.opening_prompt, prompt, return_usage=True)
-            else:
-                result = call_openai(agent.analysis_prompt, prompt, return_usage=True)
-            response = result['response']
+        def llm(phase, agent_name, system_prompt, user_prompt, target=None):
+            started = time.time()
+            result = self._call_llm(system_prompt, user_prompt)
             usage = result.get('usage', {})
-            token_usage["opening"].append(usage)
-            print(f"{agent.name} ({agent.archetype}) [Opening]: {response}")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return (agent, response, {"phase": "opening", "agent": agent.name, "text": response})
+            calls.record(phase, agent_name, started, usage, target)
+            return result['response'], usage
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("opening", max_parallel)) as executor:
-            opening_results = list(executor.map(get_opening, self.agents)) # Opening statements phase parallelism
+        agents_by_name = {agent.name: agent for agent in self.agents}
+        names = list(agents_by_name)
 
-        opening_statements = [(agent, response) for agent, response, _ in opening_results]
-        transcript.extend([log for _, _, log in opening_results])
+        def rebuttals_against(results, name):
+            return [results[f"rebuttal:{other}->{name}"]["text"] for other in names if other != name]
 
-        # --- Rebuttal Phase (parallelized per agent) ---
-        def get_rebuttals(agent_opening):
-            from .llm_utils import call_openai
-            agent, opening = agent_opening
-            rebuttal_logs = []
-            rebuttal_list = []
-            for other_agent, other_opening in opening_statements:
-                if agent != other_agent:
-                    if hasattr(agent, 'rebuttal'):
-                        result = call_openai(agent.rebuttal_prompt, other_opening, return_usage=True)
-                    else:
-                        result = call_openai(agent.critique_prompt, other_opening, return_usage=True)
-                    rebuttal = result['response']
-                    usage = result.get('usage', {})
-                    token_usage["rebuttal"].append(usage)
-                    print(f"{agent.name} rebuts {other_agent.name}: {rebuttal}")
-                    if usage:
-                        print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-                    rebuttal_list.append({"target": other_agent.name, "text": rebuttal})
-                    rebuttal_logs.append({"phase": "rebuttal", "agent": agent.name, "target": other_agent.name, "text": rebuttal})
-            return agent.name, rebuttal_list, rebuttal_logs
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("rebuttal", max_parallel)) as executor:
-            rebuttal_results = list(executor.map(get_rebuttals, opening_statements)) # Rebuttal phase parallelism
-
-        rebuttals = {name: rebuttal_list for name, rebuttal_list, _ in rebuttal_results}
-        for _, _, logs in rebuttal_results:
-            transcript.extend(logs)
-
-        # --- Closing Statement Phase (parallelized) ---
-        # Each agent receives their worldview, opening, and all rebuttals against them, and generates a closing statement.
-        def get_closing(agent_opening):
-            from .llm_utils import call_openai
-            agent, opening = agent_opening
-            agent_rebuttals = rebuttals[agent.name]
-            rebuttals_against = []
-            for other_agent, rebuttal_list in rebuttals.items():
-                for r in rebuttal_list:
-                    if r["target"] == agent.name:
-                        rebuttals_against.append({"from": other_agent, "text": r["text"]})
-            # Compose worldview string (from agent definition)
-            worldview = getattr(agent, "worldview", None)
-            if worldview is None and hasattr(agent, "archetype"):
-                worldview = f"Archetype: {agent.archetype}"
-            closing_prompt = (
-                "You are to provide a closing response to the debate. "
-                "Consider your worldview, your opening statement, and the rebuttals you received. "
-                "Summarize your final position and address the main challenges raised against you.\n\n"
-                f"Worldview: {worldview}\n"
-                f"Opening Statement: {opening}\n"
-                f"Rebuttals Against You: {'; '.join([r['text'] for r in rebuttals_against])}"
-            )
-            # Use the agent's critique_prompt for closing, or fallback to analysis_prompt
-            prompt_to_use = getattr(agent, "closing_prompt", None) or getattr(agent, "critique_prompt", None) or getattr(agent, "analysis_prompt", None)
-            result = call_openai(prompt_to_use, closing_prompt, return_usage=True)
-            closing = result['response']
-            usage = result.get('usage', {})
-            token_usage["closing"].append(usage)
-            print(f"{agent.name} Closing: {closing}")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return agent.name, closing, {"phase": "closing", "agent": agent.name, "text": closing, "token_usage": usage}
+        def rebuttals_made(results, name):
+            return [results[f"rebuttal:{name}->{other}"]["text"] for other in names if other != name]
+
+        def get_opening(agent):
+            def run(results):
+                system_prompt = agent.opening_prompt if hasattr(agent, 'opening_statement') else agent.analysis_prompt
+                response, usage = llm("opening", agent.name, system_prompt, prompt)
+                return {"phase": "opening", "agent": agent.name, "text": response, "token_usage": usage}
+            return run
+
+        def get_rebuttal(agent, other_agent):
+            def run(results):
+                other_opening = results[f"opening:{other_agent.name}"]["text"]
+                system_prompt = agent.rebuttal_prompt if hasattr(agent, 'rebuttal') else agent.critique_prompt
+                rebuttal, usage = llm("rebuttal", agent.name, system_prompt, other_opening, target=other_agent.name)
+                return {"phase": "rebuttal", "agent": agent.name, "target": other_agent.name, "text": rebuttal, "token_usage": usage}
+            return run
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("closing", max_parallel)) as executor:
-            closing_results = list(executor.map(get_closing, opening_statements))
-        agent_closings = {name: closing for name, closing, _ in closing_results}
-        transcript.extend([log for _, _, log in closing_results])
+        # --- Closing Statement Phase ---
+        # Each agent receives their worldview, opening, and all rebuttals against them, and generates a closing statement.
+        def get_closing(agent):
+            def run(results):
+                opening = results[f"opening:{agent.name}"]["text"]
+                # Compose worldview string (from agent definition)
+                worldview = getattr(agent, "worldview", None)
+                if worldview is None and hasattr(agent, "archetype"):
+                    worldview = f"Archetype: {agent.archetype}"
+                closing_prompt = (
+                    "You are to provide a closing response to the debate. "
+                    "Consider your worldview, your opening statement, and the rebuttals you received. "
+                    "Summarize your final position and address the main challenges raised against you.\n\n"
+                    f"Worldview: {worldview}\n"
+                    f"Opening Statement: {opening}\n"
+                    f"Rebuttals Against You: {'; '.join(rebuttals_against(results, agent.name))}"
+                )
+                # Use the agent's critique_prompt for closing, or fallback to analysis_prompt
+                prompt_to_use = getattr(agent, "closing_prompt", None) or getattr(agent, "critique_prompt", None) or getattr(agent, "analysis_prompt", None)
+                closing, usage = llm("closing", agent.name, prompt_to_use, closing_prompt)
+                return {"phase": "closing", "agent": agent.name, "text": closing, "token_usage": usage}
+            return run
 
-        # --- Summarization Phase (parallelized) ---
+        # --- Summarization Phase ---
         project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         summarizer_definitions_dir = os.path.join(project_root, "summarizer_definitions")
         summarizer_name, summarizer_prompt = load_summarizer_from_directory(summarizer_definitions_dir)
-        from .llm_utils import call_openai
-        def get_summary(agent_opening):
-            from .llm_utils import call_openai
-            agent, opening = agent_opening
-            agent_rebuttals = rebuttals[agent.name]
-            rebuttals_against = []
-            for other_agent, rebuttal_list in rebuttals.items():
-                for r in rebuttal_list:
-                    if r["target"] == agent.name:
-                        rebuttals_against.append({"from": other_agent, "text": r["text"]})
-            summarization_input = (
-                f"Opening Statement: {opening}\n"
-                f"Rebuttals made: {'; '.join([r['text'] for r in agent_rebuttals])}\n"
-                f"Rebuttals received: {'; '.join([r['text'] for r in rebuttals_against])}"
-                f"\nClosing Statement: {agent_closings.get(agent.name, '')}"
-            )
-            result = call_openai(summarizer_prompt, summarization_input, return_usage=True)
-            summary = result['response']
-            usage = result.get('usage', {})
-            token_usage["summary"].append(usage)
-            print(f"{agent.name} Summary: {summary}")
+
+        def get_summary(agent):
+            def run(results):
+                summarization_input = (
+                    f"Opening Statement: {results[f'opening:{agent.name}']['text']}\n"
+                    f"Rebuttals made: {'; '.join(rebuttals_made(results, agent.name))}\n"
+                    f"Rebuttals received: {'; '.join(rebuttals_against(results, agent.name))}"
+                    f"\nClosing Statement: {results[f'closing:{agent.name}']['text']}"
+                )
+                summary, usage = llm("summary", agent.name, summarizer_prompt, summarization_input)
+                return {"phase": "summary", "agent": agent.name, "text": summary, "token_usage": usage}
+            return run
+
+        def ordered_transcript(results):
+            entries = [results[f"opening:{name}"] for name in names]
+            entries += [results[f"rebuttal:{name}->{other}"] for name in names for other in names if other != name]
+            entries += [results[f"closing:{name}"] for name in names]
+            entries += [results[f"summary:{name}"] for name in names]
+            return entries
+
+        # --- Judging Phase ---
+        # Judges receive ONLY agent_summaries (not full transcript or debate data) for evaluation
+        def get_judge_result(judge):
+            def run(results):
+                agent_summaries = {name: results[f"summary:{name}"]["text"] for name in names}
+                started = time.time()
+                judge_result = judge.judge(agent_summaries, ordered_transcript(results), return_usage=True)
+                usage = judge_result.get('usage', {})
+                calls.record("judge", judge.name, started, usage)
+                return {"phase": "judge", "judge": judge.name, "result": judge_result['result'], "token_usage": usage}
+            return run
+
+        tasks = []
+        for agent in self.agents:
+            tasks.append(DebateTask(f"opening:{agent.name}", "opening", get_opening(agent)))
+        for agent in self.agents:
+            for other_agent in self.agents:
+                if agent != other_agent:
+                    tasks.append(DebateTask(f"rebuttal:{agent.name}->{other_agent.name}", "rebuttal",
+                                            get_rebuttal(agent, other_agent), [f"opening:{other_agent.name}"]))
+        for agent in self.agents:
+            against = [f"rebuttal:{other}->{agent.name}" for other in names if other != agent.name]
+            made = [f"rebuttal:{agent.name}->{other}" for other in names if other != agent.name]
+            tasks.append(DebateTask(f"closing:{agent.name}", "closing", get_closing(agent),
+                                    [f"opening:{agent.name}"] + against))
+            tasks.append(DebateTask(f"summary:{agent.name}", "summary", get_summary(agent),
+                                    [f"opening:{agent.name}", f"closing:{agent.name}"] + against + made))
+        for judge in self.judges:
+            tasks.append(DebateTask(f"judge:{judge.name}", "judging", get_judge_result(judge),
+                                    [f"summary:{name}" for name in names]))
+
+        # Stream each output as soon as it completes
+        def on_result(task, entry):
+            usage = entry.get("token_usage")
+            if entry["phase"] == "opening":
+                agent = agents_by_name[entry["agent"]]
+                print(f"{agent.name} ({agent.archetype}) [Opening]: {entry['text']}")
+            elif entry["phase"] == "rebuttal":
+                print(f"{entry['agent']} rebuts {entry['target']}: {entry['text']}")
+            elif entry["phase"] == "closing":
+                print(f"{entry['agent']} Closing: {entry['text']}")
+            elif entry["phase"] == "summary":
+                print(f"{entry['agent']} Summary: {entry['text']}")
+            else:
+                print(f"{entry['judge']} Judge Result:")
             if usage:
                 print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return agent.name, summary, {"phase": "summary", "agent": agent.name, "text": summary, "token_usage": usage}
+            if on_event is not None:
+                on_event(entry)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("summary", max_parallel)) as executor:
-            summary_results = list(executor.map(get_summary, opening_statements))
-        agent_summaries = {name: summary for name, summary, _ in summary_results}
-        transcript.extend([log for _, _, log in summary_results])
+        results = scheduler.run(tasks, on_result=on_result)
+
+        transcript = ordered_transcript(results)
+        opening_statements = [(agent, results[f"opening:{agent.name}"]["text"]) for agent in self.agents]
+        rebuttals = {
+            name: [{"target": other, "text": results[f"rebuttal:{name}->{other}"]["text"]} for other in names if other != name]
+            for name in names
+        }
+        agent_summaries = {name: results[f"summary:{name}"]["text"] for name in names}
 
         # Output all agent summaries to the console before judging
         print("\n=== Agent Summaries ===")
         for name, summary in agent_summaries.items():
             print(f"Summary for {name}:\n{summary}\n")
 
-        # --- Judging Phase ---
-        # Judges receive ONLY agent_summaries (not full transcript or debate data) for evaluation
         # --- Ranked-Choice Judging Phase ---
         judge_ranks = []
         judge_rationales = []
-        from collections import defaultdict
         score_board = defaultdict(int)
         agent_names = list(agent_summaries.keys())
-
-        def get_judge_result(judge):
-            judge_result = judge.judge(agent_summaries, transcript, return_usage=True)
-            result = judge_result['result']
-            usage = judge_result.get('usage', {})
-            token_usage["judge"].append(usage)
-            print(f"{judge.name} Judge Result:")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return judge.name, result, usage
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("judging", max_parallel)) as executor:
-            judge_results = list(executor.map(get_judge_result, self.judges)) # Judging phase parallelism
+        judge_results = [
+            (judge.name, results[f"judge:{judge.name}"]["result"], results[f"judge:{judge.name}"]["token_usage"])
+            for judge in self.judges
+        ]
 
         for judge_name, result, usage in judge_results:
             # Parse and display each rank
@@ -271,18 +293,14 @@ class OrchestratorAgent:
         transcript.append({"phase": "judging-result", "winner": winner, "scores": dict(score_board), "is_tie": is_tie, "judge_rationales": judge_rationales})
 
         # --- Output total token usage summary ---
-        def sum_tokens(usage_list, key):
-            return sum(u.get(key, 0) for u in usage_list if u)
         print("\n=== Token Usage Summary ===")
         total_prompt = total_completion = total_total = 0
-        for phase in ["opening", "rebuttal", "summary", "judge"]:
-            phase_prompt = sum_tokens(token_usage[phase], "prompt_tokens")
-            phase_completion = sum_tokens(token_usage[phase], "completion_tokens")
-            phase_total = sum_tokens(token_usage[phase], "total_tokens")
-            total_prompt += phase_prompt
-            total_completion += phase_completion
-            total_total += phase_total
-            print(f"{phase.title()}: prompt={phase_prompt}, completion={phase_completion}, total={phase_total}")
+        for phase, totals in calls.by_phase().items():
+            total_prompt += totals["prompt_tokens"]
+            total_completion += totals["completion_tokens"]
+            total_total += totals["total_tokens"]
+            print(f"{phase.title()}: calls={totals['calls']}, latency={totals['latency']:.2f}s, "
+                  f"prompt={totals['prompt_tokens']}, completion={totals['completion_tokens']}, total={totals['total_tokens']}")
         print(f"TOTAL: prompt={total_prompt}, completion={total_completion}, total={total_total}\n")
 
         # --- Final Debate Win Summary ---
@@ -312,10 +330,7 @@ class OrchestratorAgent:
             f"Judge Rationales:\n" + '\n'.join([f"{j['judge']} ({j['rank']}): {j['agent']} - {j['rationale']} (+{j['points']} pts)" for j in judge_rationales]) + "\n\n"
             f"Winner: {winner if winner else 'Tie'}\n"
         )
-        from .llm_utils import call_openai
-        final_summary_result = call_openai(final_summarizer_prompt, final_summary_input, return_usage=True)
-        final_summary = final_summary_result["response"]
-        final_summary_usage = final_summary_result.get("usage", {})
+        final_summary, final_summary_usage = llm("final-summary", "FinalDebateSummary", final_summarizer_prompt, final_summary_input)
         print(final_summary)
         if final_summary_usage:
             print(f"  [Tokens: prompt={final_summary_usage.get('prompt_tokens', 0)}, completion={final_summary_usage.get('completion_tokens', 0)}, total={final_summary_usage.get('total_tokens', 0)}]")
@@ -334,8 +349,13 @@ class OrchestratorAgent:
             "winner": winner,
             "is_tie": is_tie,
             "transcript": transcript,
-            "final_summary": final_summary
+            "final_summary": final_summary,
+            "token_usage": calls.by_phase(),
+            "llm_calls": calls.to_list()
         }
+        if not persist:
+            return log_entry
+
         log_path = os.path.join(os.path.dirname(__file__), "../../debate_history.jsonl")
         with open(log_path, "a") as f:
             # Persistent log step: write debate log entry
@@ -360,6 +380,7 @@ class OrchestratorAgent:
             metrics_calc.calculate_metrics_for_debate(debate_id)
         except Exception as e:
             print(f"[Warning] Could not calculate metrics for debate: {e}")
+        return log_entry
 
     def _agent_self_summary(self, agent, opening, agent_rebuttals, all_rebuttals):
         """
@@ -14,6 +14,12 @@ LLM_CONFIG = {
     "model_name": os.getenv("OPENAI_MODEL_NAME", "gpt-3.5-turbo"),
     "temperature": float(os.getenv("OPENAI_TEMPERATURE", 0.7)),
     "max_tokens": int(os.getenv("OPENAI_MAX_TOKENS", 512)),
+    "max_retries": int(os.getenv("LLM_MAX_RETRIES", 4)),
+    "timeout": float(os.getenv("LLM_TIMEOUT", 120)),
+    "cache_enabled": os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+    "cache_path": os.getenv("LLM_CACHE_PATH") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "memory", "llm_cache.sqlite3"
+    ),
 }
 
 def get_llm_config():
@@ -0,0 +1,234 @@
+"""
+Debate execution scheduler.
+
+Runs the LLM calls of a debate as a dependency graph on a shared, rate-limited
+worker pool: each call starts as soon as the calls it depends on have finished,
+and results are handed back in completion order so they can be streamed.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class LLMCallRecord:
+    """Latency and token usage of a single LLM call."""
+    phase: str
+    agent: str
+    target: Optional[str] = None
+    started_at: float = 0.0
+    latency: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+class LLMCallLog:
+    """Thread-safe collection of LLM call records for one debate."""
+    def __init__(self):
+        self._records: List[LLMCallRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, phase, agent, started_at, usage=None, target=None) -> LLMCallRecord:
+        """
+        Record a finished call.
+        Args:
+            phase (str): Debate phase of the call
+            agent (str): Agent or judge that made the call
+            started_at (float): time.time() when the call started
+            usage (dict): Token usage as returned by call_openai
+            target (str): Agent the call responded to, for rebuttals
+        Returns:
+            LLMCallRecord: The stored record
+        """
+        usage = usage or {}
+        entry = LLMCallRecord(
+            phase=phase,
+            agent=agent,
+            target=target,
+            started_at=started_at,
+            latency=time.time() - started_at,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            total_tokens=usage.get("total_tokens", 0),
+        )
+        with self._lock:
+            self._records.append(entry)
+        return entry
+
+    @property
+    def records(self) -> List[LLMCallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def by_phase(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate call count, latency and token usage per phase.
+        Returns:
+            dict: {phase: {"calls", "latency", "prompt_tokens", "completion_tokens", "total_tokens"}}
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for entry in self.records:
+            phase = totals.setdefault(entry.phase, {"calls": 0, "latency": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0})
+            phase["calls"] += 1
+            phase["latency"] += entry.latency
+            phase["prompt_tokens"] += entry.prompt_tokens
+            phase["completion_tokens"] += entry.completion_tokens
+            phase["total_tokens"] += entry.total_tokens
+        return totals
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [asdict(entry) for entry in self.records]
+
+
+class RateLimiter:
+    """Token bucket limiting how many calls may start per second."""
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate (float): Calls per second; 0 disables limiting
+            burst (int): Calls that may start back to back (default: one second's worth)
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call may start."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+_limiter: Optional[RateLimiter] = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_pool(max_workers: int = 1):
+    """
+    Return the shared LLM worker pool and rate limiter.
+
+    The pool is created on first use with LLM_POOL_WORKERS threads (default 16,
+    or max_workers if larger) and shared by every debate in the process. The
+    rate comes from LLM_REQUESTS_PER_SECOND (unset or 0: unlimited).
+    Args:
+        max_workers (int): Workers wanted by the first caller
+    Returns:
+        tuple: (ThreadPoolExecutor, RateLimiter)
+    """
+    global _pool, _limiter
+    with _pool_lock:
+        if _pool is None:
+            size = max(max_workers, int(os.environ.get("LLM_POOL_WORKERS", 16)))
+            _pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="debate-llm")
+        if _limiter is None:
+            _limiter = RateLimiter(float(os.environ.get("LLM_REQUESTS_PER_SECOND", 0) or 0))
+        return _pool, _limiter
+
+
+@dataclass
+class DebateTask:
+    """A node of the debate graph: one LLM call and the nodes it waits for."""
+    key: str
+    phase: str
+    run: Callable[[Dict[str, Any]], Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+class DebateScheduler:
+    """
+    Executes DebateTasks once their dependencies have completed.
+
+    Each task receives the live results of finished tasks (by key) and must
+    only read the entries of its own dependencies. At most
+    `phase_limits[phase]` tasks of a phase run at once, and every task waits
+    on the shared rate limiter before starting.
+    """
+    def __init__(self, max_workers: int, phase_limits: Optional[Dict[str, int]] = None):
+        self.pool, self.limiter = get_llm_pool(max_workers)
+        self.max_workers = max_workers
+        self.phase_limits = phase_limits or {}
+
+    def _limited(self, task: DebateTask, results: Dict[str, Any]):
+        self.limiter.acquire()
+        return task.run(results)
+
+    def run(self, tasks: Iterable[DebateTask], on_result: Optional[Callable[[DebateTask, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Run a task graph to completion.
+        Args:
+            tasks: Tasks to run; dependencies must refer to keys in the same graph
+            on_result: Called in the calling thread with (task, result) as each task finishes
+        Returns:
+            dict: {task key: result}
+        Raises:
+            ValueError: If the graph has unknown dependencies or a cycle
+        """
+        tasks = {task.key: task for task in tasks}
+        waiting = {key: set(task.depends_on) for key, task in tasks.items()}
+        for key, deps in waiting.items():
+            unknown = deps - tasks.keys()
+            if unknown:
+                raise ValueError(f"Task {key} depends on unknown tasks: {sorted(unknown)}")
+        dependents: Dict[str, List[str]] = {key: [] for key in tasks}
+        for key, deps in waiting.items():
+            for dep in deps:
+                dependents[dep].append(key)
+
+        ready = [key for key, deps in waiting.items() if not deps]
+        results: Dict[str, Any] = {}
+        running = {}
+        running_per_phase: Dict[str, int] = {}
+
+        try:
+            while ready or running:
+                deferred = []
+                for key in ready:
+                    task = tasks[key]
+                    limit = self.phase_limits.get(task.phase) or self.max_workers
+                    if len(running) >= self.max_workers or running_per_phase.get(task.phase, 0) >= limit:
+                        deferred.append(key)
+                        continue
+                    future = self.pool.submit(self._limited, task, results)
+                    running[future] = key
+                    running_per_phase[task.phase] = running_per_phase.get(task.phase, 0) + 1
+                ready = deferred
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    task = tasks[key]
+                    running_per_phase[task.phase] -= 1
+                    results[key] = future.result()
+                    if on_result is not None:
+                        on_result(task, results[key])
+                    for dependent in dependents[key]:
+                        waiting[dependent].discard(key)
+                        if not waiting[dependent]:
+                            ready.append(dependent)
+        finally:
+            for future in running:
+                future.cancel()
+
+        unfinished = [key for key in tasks if key not in results]
+        if unfinished:
+            raise ValueError(f"Debate graph has a dependency cycle between: {sorted(unfinished)}")
+        return results
@@ -0,0 +1,156 @@
+"""
+Argument Features Module
+
+This module extracts the per-argument features the debate metrics are derived
+from (length, structure, traditions, philosopher and concept mentions,
+agreement markers) once per argument text, and caches them
+on disk keyed by the text's hash so re-analysing an archive only processes
+arguments it has not seen before.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+# Bump when the extracted features change so stale cache entries are ignored
+FEATURE_VERSION = 1
+
+TRADITION_KEYWORDS = [
+    "utilitarian", "deontolog", "virtue ethics", "existential", "pragmati",
+    "empiric", "rational", "phenomenolog", "analytic", "continental",
+    "eastern", "buddhis", "taois", "confucian", "hindu"
+]
+
+PHILOSOPHERS = [
+    "aristotle", "plato", "kant", "nietzsche", "hume", "marx", "sartre",
+    "wittgenstein", "descartes", "hegel", "locke", "rousseau", "kierkegaard",
+    "confucius", "buddha", "laozi", "spinoza", "aquinas", "heidegger"
+]
+
+CONCEPTS = [
+    "ethics", "metaphysics", "epistemology", "ontology", "phenomenology",
+    "existentialism", "empiricism", "rationalism", "utilitarianism",
+    "deontology", "categorical imperative", "virtue", "moral", "epistemic",
+    "truth", "knowledge", "justice", "freedom", "consciousness", "meaning"
+]
+
+STRUCTURE_MARKERS = ["\n-", "\n1.", "\nFirst,"]
+
+
+@dataclass
+class ArgumentFeatures:
+    """Features of one agent's argument that the debate metrics are computed from."""
+    length: int = 0
+    structure: int = 0
+    traditions: List[str] = field(default_factory=list)
+    philosopher_mentions: int = 0
+    concept_mentions: int = 0
+    has_not: bool = False
+    has_agree: bool = False
+    has_disagree: bool = False
+    has_contrary: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ArgumentFeatures":
+        return cls(**data)
+
+
+def extract_features(text: str) -> ArgumentFeatures:
+    """Extract the metric features of an argument text.
+
+    Args:
+        text: Argument text
+
+    Returns:
+        The argument's features
+    """
+    lowered = text.lower()
+    return ArgumentFeatures(
+        length=len(text),
+        structure=sum(text.count(marker) for marker in STRUCTURE_MARKERS),
+        traditions=[keyword for keyword in TRADITION_KEYWORDS if keyword in lowered],
+        philosopher_mentions=sum(lowered.count(name) for name in PHILOSOPHERS),
+        concept_mentions=sum(lowered.count(concept) for concept in CONCEPTS),
+        has_not="not" in lowered,
+        has_agree="agree" in lowered,
+        has_disagree="disagree" in lowered,
+        has_contrary="contrary" in lowered,
+    )
+
+
+class FeatureCache:
+    """On-disk cache of argument features stored in SQLite, keyed by text hash."""
+
+    def __init__(self, path: str):
+        """Open (creating if needed) the feature cache.
+
+        Args:
+            path: Path of the SQLite file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS features (key TEXT PRIMARY KEY, features TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        return hashlib.sha256(f"{FEATURE_VERSION}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, ArgumentFeatures]:
+        keys = list(set(keys))
+        found: Dict[str, ArgumentFeatures] = {}
+        with self._lock:
+            # Stay below SQLite's default limit on bound parameters
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, features FROM features WHERE key IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, features in rows:
+                    found[key] = ArgumentFeatures.from_dict(json.loads(features))
+        return found
+
+    def put_many(self, items: Dict[str, ArgumentFeatures]) -> None:
+        if not items:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO features (key, features) VALUES (?, ?)",
+                [(key, json.dumps(features.to_dict())) for key, features in items.items()],
+            )
+            self._conn.execute("COMMIT")
+
+
+def extract_features_batch(texts: List[str], cache: Optional[FeatureCache] = None) -> List[ArgumentFeatures]:
+    """Extract the features of all arguments of a debate at once.
+
+    Cached features are looked up in one query and only new texts are analysed.
+
+    Args:
+        texts: Argument texts
+        cache: Optional feature cache
+
+    Returns:
+        Features in the order of the texts
+    """
+    if cache is None:
+        return [extract_features(text) for text in texts]
+    keys = [FeatureCache.make_key(text) for text in texts]
+    known = cache.get_many(keys)
+    missing = {key: extract_features(text) for key, text in zip(keys, texts) if key not in known}
+    cache.put_many(missing)
+    known.update(missing)
+    return [known[key] for key in keys]
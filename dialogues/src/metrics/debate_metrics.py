@@ -8,13 +8,48 @@ This module provides metrics calculation for philosophical debates, measuring:
 - User satisfaction (relevance and helpfulness)
 """
 
+import contextlib
+import io
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import Counter
 from typing import Dict, List, Any, Optional, Union, Tuple
 import math
 
+from src.metrics.argument_features import ArgumentFeatures, FeatureCache, extract_features_batch
+from src.utils.debate_archive import DebateArchive
+
+
+def debate_arguments(debate: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """The (agent name, argument text) pairs of a debate.
+    
+    Supports the explorer format ("agents" with "analysis"), the memory format
+    ("responses") and orchestrator debate logs ("opening_statements").
+    
+    Args:
+        debate: Full debate data
+        
+    Returns:
+        List of (agent name, argument text) pairs
+    """
+    if debate.get("agents") and isinstance(debate["agents"][0], dict):
+        return [(a.get("name", ""), a.get("analysis", "")) for a in debate["agents"]]
+    if debate.get("responses"):
+        return [(r.get("agent", "Unknown"), r.get("response", "")) for r in debate["responses"]]
+    return [(s.get("agent", "Unknown"), s.get("text", "")) for s in debate.get("opening_statements", [])]
+
+
+def print_metrics_summary(metrics: Dict[str, Any]) -> None:
+    """Print the headline metrics of a debate."""
+    scores = metrics["metrics"]
+    print(f"Metrics for debate '{metrics.get('topic', 'Unknown')}': ")
+    print(f"  Coherence: {scores['coherence']:.2f}")
+    print(f"  Diversity: {scores['diversity']:.2f}")
+    print(f"  Depth: {scores['depth']:.2f}")
+    print(f"  Overall Quality: {scores['overall_quality']:.2f}")
+
 
 class DebateMetricsCalculator:
     """Calculator for various metrics related to philosophical debates."""
@@ -33,6 +68,34 @@ class DebateMetricsCalculator:
         # Create metrics directory if it doesn't exist
         self.metrics_dir = self.memory_dir / "metrics"
         os.makedirs(self.metrics_dir, exist_ok=True)
+        
+        # Indexed view of the memory files, opened on first query
+        self._archive: Optional[DebateArchive] = None
+        # On-disk argument feature cache and agent memory, opened / loaded on first use
+        self._feature_cache: Optional[FeatureCache] = None
+        self._agent_memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    
+    @property
+    def archive(self) -> DebateArchive:
+        """Debate archive for this memory directory, synced with the JSON files when first opened.
+        
+        Metrics saved through this calculator are indexed as they are written;
+        call refresh_archive() to pick up files changed by other processes.
+        """
+        if self._archive is None:
+            self.refresh_archive()
+        return self._archive
+    
+    def refresh_archive(self) -> Dict[str, int]:
+        """Bring the archive up to date with the JSON files.
+        
+        Returns:
+            Counts of files ingested and removed
+        """
+        if self._archive is None:
+            self._archive = DebateArchive(str(self.memory_dir))
+        # Only files changed since the last sync are parsed
+        return self._archive.sync()
     
     def calculate_metrics_for_debate(self, debate_id: str) -> Dict[str, Any]:
         """Calculate all metrics for a specific debate.
@@ -50,8 +113,33 @@ class DebateMetricsCalculator:
         with open(debate_file, "r") as f:
             debate = json.load(f)
         
+        metrics = self.score_debate(debate_id, debate)
+        
+        # Save metrics to file
+        self.save_metrics(debate_id, metrics)
+        
+        # Print a summary of metrics for the console output
+        print_metrics_summary(metrics)
+        
+        return metrics
+    
+    def score_debate(self, debate_id: str, debate: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute the metrics of a debate without saving them.
+        
+        The features of every argument are extracted once, in a batch, and all
+        metrics are derived from them.
+        
+        Args:
+            debate_id: ID of the debate
+            debate: Full debate data
+            
+        Returns:
+            Dictionary of metrics for the debate
+        """
+        arguments = debate_arguments(debate)
+        
         # Ensure we have responses to analyze
-        if "responses" not in debate or not debate["responses"]:
+        if not arguments:
             print(f"Warning: No responses found in debate {debate_id}")
             # Use placeholder values
             coherence_score = 0.7  # Default base coherence
@@ -59,25 +147,18 @@ class DebateMetricsCalculator:
             depth_score = 0.0
             consistency_scores = {}
         else:
-            # Calculate all metrics from responses
-            coherence_score = self.calculate_coherence(debate)
-            diversity_score = self.calculate_perspective_diversity(debate)
-            depth_score = self.calculate_philosophical_depth(debate)
-            consistency_scores = self.calculate_philosophical_consistency(debate)
-        
-        # Use proper debate topic and date fields
-        topic = debate.get("topic", "Unknown")
-        date = debate.get("date", "Unknown")
-        
-        # Extract agent names for reporting
-        agents = [response.get("agent", "Unknown") for response in debate.get("responses", [])]
-        
-        # Compile metrics
-        metrics = {
+            # Calculate all metrics from the argument features
+            features = self._argument_features(arguments)
+            coherence_score = self._coherence(features)
+            diversity_score = self._diversity(arguments, features)
+            depth_score = self._depth(features)
+            consistency_scores = self._consistency(debate.get("topic", ""), arguments, features)
+        
+        return {
             "debate_id": debate_id,
-            "topic": topic,
-            "date": date,
-            "agents": agents,
+            "topic": debate.get("topic", "Unknown"),
+            "date": debate.get("date", "Unknown"),
+            "agents": [name for name, _ in arguments],
             "metrics": {
                 "coherence": coherence_score,
                 "diversity": diversity_score,
@@ -86,18 +167,12 @@ class DebateMetricsCalculator:
                 "overall_quality": (coherence_score + diversity_score + depth_score) / 3
             }
         }
-        
-        # Save metrics to file
-        self.save_metrics(debate_id, metrics)
-        
-        # Print a summary of metrics for the console output
-        print(f"Metrics for debate '{topic}': ")
-        print(f"  Coherence: {coherence_score:.2f}")
-        print(f"  Diversity: {diversity_score:.2f}")
-        print(f"  Depth: {depth_score:.2f}")
-        print(f"  Overall Quality: {(coherence_score + diversity_score + depth_score) / 3:.2f}")
-        
-        return metrics
+    
+    def _argument_features(self, arguments: List[Tuple[str, str]]) -> List[ArgumentFeatures]:
+        """Features of each argument, served from the on-disk feature cache where possible."""
+        if self._feature_cache is None:
+            self._feature_cache = FeatureCache(str(self.memory_dir / "argument_features.sqlite3"))
+        return extract_features_batch([text for _, text in arguments], self._feature_cache)
     
     def calculate_coherence(self, debate: Dict[str, Any]) -> float:
         """Calculate coherence score based on logical consistency and clarity.
@@ -111,20 +186,19 @@ class DebateMetricsCalculator:
         Returns:
             Coherence score from 0.0 to 1.0
         """
+        return self._coherence(self._argument_features(debate_arguments(debate)))
+    
+    def _coherence(self, features: List[ArgumentFeatures]) -> float:
         # Placeholder implementation - would need NLP in production
         # For demonstration, we'll use a random but consistent score based on debate properties
         base_coherence = 0.7  # Starting with decent coherence
         
         # Longer critiques may indicate more thorough reasoning
-        agent_analyses = [agent.get("analysis", "") for agent in debate.get("agents", [])]
-        avg_analysis_length = sum(len(analysis) for analysis in agent_analyses) / max(len(agent_analyses), 1)
+        avg_analysis_length = sum(f.length for f in features) / max(len(features), 1)
         length_factor = min(avg_analysis_length / 500, 1.0) * 0.2  # Length bonus up to 0.2
         
         # More structured analyses (with sections, points) may indicate better coherence
-        structure_indicators = sum(
-            analysis.count("\n-") + analysis.count("\n1.") + analysis.count("\nFirst,") 
-            for analysis in agent_analyses
-        )
+        structure_indicators = sum(f.structure for f in features)
         structure_factor = min(structure_indicators / 10, 1.0) * 0.1  # Structure bonus up to 0.1
         
         return min(base_coherence + length_factor + structure_factor, 1.0)
@@ -138,37 +212,25 @@ class DebateMetricsCalculator:
         Returns:
             Diversity score from 0.0 to 1.0
         """
-        agents = debate.get("agents", [])
-        if not agents:
+        arguments = debate_arguments(debate)
+        return self._diversity(arguments, self._argument_features(arguments))
+    
+    def _diversity(self, arguments: List[Tuple[str, str]], features: List[ArgumentFeatures]) -> float:
+        if not arguments:
             return 0.0
         
         # Count distinct philosophical traditions referenced
         traditions = set()
-        for agent in agents:
-            analysis = agent.get("analysis", "").lower()
-            # Check for mentions of major philosophical traditions
-            traditions_keywords = [
-                "utilitarian", "deontolog", "virtue ethics", "existential", "pragmati", 
-                "empiric", "rational", "phenomenolog", "analytic", "continental",
-                "eastern", "buddhis", "taois", "confucian", "hindu"
-            ]
-            
-            for keyword in traditions_keywords:
-                if keyword in analysis:
-                    traditions.add(keyword)
+        for f in features:
+            traditions.update(f.traditions)
         
         # Calculate diversity based on number of traditions referenced
         # More traditions = higher diversity score
         diversity_score = min(len(traditions) / 8, 1.0)  # Max out at 8 traditions
         
-        # Check if there are opposing viewpoints
-        has_disagreement = False
-        for agent in agents:
-            for other_agent in agents:
-                if agent != other_agent:
-                    if "disagree" in agent.get("analysis", "").lower() or "contrary" in agent.get("analysis", "").lower():
-                        has_disagreement = True
-                        break
+        # Check if there are opposing viewpoints: an argument that disagrees
+        # with another one in the same debate
+        has_disagreement = len(set(arguments)) > 1 and any(f.has_disagree or f.has_contrary for f in features)
         
         if has_disagreement:
             diversity_score = min(diversity_score + 0.2, 1.0)  # Bonus for explicit disagreement
@@ -184,32 +246,12 @@ class DebateMetricsCalculator:
         Returns:
             Depth score from 0.0 to 1.0
         """
-        # Count references to philosophers, concepts, and arguments
-        philosophers = [
-            "aristotle", "plato", "kant", "nietzsche", "hume", "marx", "sartre", 
-            "wittgenstein", "descartes", "hegel", "locke", "rousseau", "kierkegaard",
-            "confucius", "buddha", "laozi", "spinoza", "aquinas", "heidegger"
-        ]
-        
-        concepts = [
-            "ethics", "metaphysics", "epistemology", "ontology", "phenomenology",
-            "existentialism", "empiricism", "rationalism", "utilitarianism",
-            "deontology", "categorical imperative", "virtue", "moral", "epistemic",
-            "truth", "knowledge", "justice", "freedom", "consciousness", "meaning"
-        ]
-        
-        # Count mentions in all agent analyses
-        philosopher_mentions = 0
-        concept_mentions = 0
-        
-        for agent in debate.get("agents", []):
-            analysis = agent.get("analysis", "").lower()
-            
-            for philosopher in philosophers:
-                philosopher_mentions += analysis.count(philosopher)
-                
-            for concept in concepts:
-                concept_mentions += analysis.count(concept)
+        return self._depth(self._argument_features(debate_arguments(debate)))
+    
+    def _depth(self, features: List[ArgumentFeatures]) -> float:
+        # Count references to philosophers, concepts, and arguments in all agent analyses
+        philosopher_mentions = sum(f.philosopher_mentions for f in features)
+        concept_mentions = sum(f.concept_mentions for f in features)
         
         # Calculate depth score based on mentions
         # Sophisticated philosophical discussions should reference both thinkers and concepts
@@ -227,40 +269,33 @@ class DebateMetricsCalculator:
         Returns:
             Dictionary mapping agent names to consistency scores
         """
+        arguments = debate_arguments(debate)
+        return self._consistency(debate.get("topic", ""), arguments, self._argument_features(arguments))
+    
+    def _consistency(self, current_topic: str, arguments: List[Tuple[str, str]], features: List[ArgumentFeatures]) -> Dict[str, float]:
         consistency_scores = {}
         
-        for agent in debate.get("agents", []):
-            agent_name = agent.get("name")
+        for (agent_name, _), current in zip(arguments, features):
             if not agent_name:
                 continue
-                
-            # Get agent memory file
-            agent_file = self.agents_dir / f"{agent_name}.json"
-            if not agent_file.exists():
+            
+            # Get agent's positions on topics
+            positions = self._agent_positions(agent_name)
+            if positions is None:
                 consistency_scores[agent_name] = 1.0  # No previous positions, so technically consistent
                 continue
-                
-            # Load agent memory
-            with open(agent_file, "r") as f:
-                agent_memory = json.load(f)
-                
-            # Get agent's positions on topics
-            positions = agent_memory.get("positions", {})
-            current_topic = debate.get("topic", "")
             
             # Default consistency score
             consistency_score = 1.0
             
             # Check if agent has previous positions on this topic or related topics
-            related_topics = self._find_related_topics(current_topic, positions.keys())
+            related_topics = self._find_related_topics(current_topic or "", positions.keys())
             if not related_topics:
                 consistency_scores[agent_name] = consistency_score  # No previous positions on related topics
                 continue
-                
+            
             # Compare current position with previous positions on related topics
-            current_analysis = agent.get("analysis", "").lower()
             previous_positions = []
-            
             for topic in related_topics:
                 for position in positions.get(topic, []):
                     previous_positions.append(position.get("position", "").lower())
@@ -270,11 +305,11 @@ class DebateMetricsCalculator:
                 contradictions = 0
                 for prev_pos in previous_positions:
                     # Check for opposite statements (simplistic)
-                    if "not" in prev_pos and "not" not in current_analysis:
+                    if "not" in prev_pos and not current.has_not:
                         contradictions += 1
-                    if "disagree" in prev_pos and "agree" in current_analysis:
+                    if "disagree" in prev_pos and current.has_agree:
                         contradictions += 1
-                    if "agree" in prev_pos and "disagree" in current_analysis:
+                    if "agree" in prev_pos and current.has_disagree:
                         contradictions += 1
                 
                 # Reduce consistency score for each contradiction found
@@ -284,6 +319,23 @@ class DebateMetricsCalculator:
             
         return consistency_scores
     
+    def _agent_positions(self, agent_name: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """An agent's recorded positions, or None if it has no memory file.
+        
+        Agent memory files are loaded once per calculator and reloaded only when they change.
+        """
+        agent_file = self.agents_dir / f"{agent_name}.json"
+        try:
+            mtime = agent_file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        cached = self._agent_memory.get(agent_name)
+        if cached is None or cached[0] != mtime:
+            with open(agent_file, "r") as f:
+                cached = (mtime, json.load(f).get("positions", {}))
+            self._agent_memory[agent_name] = cached
+        return cached[1]
+    
     def _find_related_topics(self, current_topic: str, previous_topics: List[str]) -> List[str]:
         """Find topics related to the current debate topic.
         
@@ -315,6 +367,8 @@ class DebateMetricsCalculator:
         metrics_file = self.metrics_dir / f"{debate_id}.json"
         with open(metrics_file, "w") as f:
             json.dump(metrics, f, indent=2)
+        if self._archive is not None:
+            self._archive.ingest_file(str(metrics_file))
     
     def get_metrics_over_time(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get metrics over time to track debate quality trends.
@@ -322,32 +376,7 @@ class DebateMetricsCalculator:
         Returns:
             Dictionary mapping metric names to lists of values over time
         """
-        if not self.metrics_dir.exists():
-            return {}
-            
-        metrics_over_time = {
-            "coherence": [],
-            "diversity": [],
-            "depth": [],
-            "overall_quality": []
-        }
-        
-        for metrics_file in sorted(self.metrics_dir.glob("*.json"), key=lambda x: x.stat().st_mtime):
-            with open(metrics_file, "r") as f:
-                debate_metrics = json.load(f)
-                
-            date = debate_metrics.get("date", "Unknown")
-            metrics = debate_metrics.get("metrics", {})
-            
-            for metric_name in metrics_over_time.keys():
-                if metric_name in metrics:
-                    metrics_over_time[metric_name].append({
-                        "date": date,
-                        "topic": debate_metrics.get("topic", "Unknown"),
-                        "value": metrics[metric_name]
-                    })
-                    
-        return metrics_over_time
+        return self.archive.metrics_over_time()
     
     def get_agent_performance_metrics(self) -> Dict[str, Dict[str, Any]]:
         """Get performance metrics for each agent based on consistency and depth.
@@ -355,44 +384,46 @@ class DebateMetricsCalculator:
         Returns:
             Dictionary mapping agent names to performance metrics
         """
-        agent_metrics = {}
-        
-        # Collect metrics from all debates
-        if not self.metrics_dir.exists():
-            return {}
-            
-        for metrics_file in self.metrics_dir.glob("*.json"):
-            with open(metrics_file, "r") as f:
-                debate_metrics = json.load(f)
-                
-            consistency_scores = debate_metrics.get("metrics", {}).get("consistency", {})
-            
-            for agent_name, consistency in consistency_scores.items():
-                if agent_name not in agent_metrics:
-                    agent_metrics[agent_name] = {
-                        "consistency_scores": [],
-                        "debate_count": 0
-                    }
-                
-                agent_metrics[agent_name]["consistency_scores"].append(consistency)
-                agent_metrics[agent_name]["debate_count"] += 1
-        
-        # Calculate average metrics for each agent
-        for agent_name in agent_metrics.keys():
-            consistency_scores = agent_metrics[agent_name]["consistency_scores"]
-            if consistency_scores:
-                agent_metrics[agent_name]["avg_consistency"] = sum(consistency_scores) / len(consistency_scores)
-            else:
-                agent_metrics[agent_name]["avg_consistency"] = 0
-                
-        return agent_metrics
+        return self.archive.agent_consistency()
+
+
+# Per-process calculator used by archive scoring workers
+_worker_calculator: Optional[DebateMetricsCalculator] = None
+
+
+def _init_worker(memory_dir: str) -> None:
+    global _worker_calculator
+    _worker_calculator = DebateMetricsCalculator(memory_dir)
 
 
-def calculate_metrics_for_all_debates(memory_dir: str = "memory") -> None:
+def _score_debate_file(debate_id: str) -> Dict[str, Any]:
+    with open(_worker_calculator.debates_dir / f"{debate_id}.json", "r") as f:
+        debate = json.load(f)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _worker_calculator.score_debate(debate_id, debate)
+
+
+def _score_in_process(calculator: DebateMetricsCalculator, debate_id: str) -> Dict[str, Any]:
+    with open(calculator.debates_dir / f"{debate_id}.json", "r") as f:
+        return calculator.score_debate(debate_id, json.load(f))
+
+
+def _report(calculator: DebateMetricsCalculator, metrics: Dict[str, Any]) -> None:
+    print(f"Calculating metrics for debate {metrics['debate_id']}...")
+    calculator.save_metrics(metrics["debate_id"], metrics)
+    print_metrics_summary(metrics)
+    print()
+
+
+def calculate_metrics_for_all_debates(memory_dir: str = "memory", workers: Optional[int] = None) -> None:
     """Calculate metrics for all debates in the memory system.
     
+    Debates are scored in parallel worker processes; the parent process saves
+    and prints the results as they arrive.
+    
     Args:
         memory_dir: Path to the memory directory
+        workers: Number of worker processes (default: CPU count; 1 scores in-process)
     """
     calculator = DebateMetricsCalculator(memory_dir)
     debates_dir = Path(memory_dir) / "debates"
@@ -400,18 +431,19 @@ def calculate_metrics_for_all_debates(memory_dir: str = "memory") -> None:
     if not debates_dir.exists():
         print("No debates found in memory.")
         return
-        
-    for debate_file in debates_dir.glob("*.json"):
-        debate_id = debate_file.stem
-        print(f"Calculating metrics for debate {debate_id}...")
-        metrics = calculator.calculate_metrics_for_debate(debate_id)
-        
-        print(f"Metrics for debate '{metrics.get('topic', 'Unknown')}': ")
-        print(f"  Coherence: {metrics['metrics']['coherence']:.2f}")
-        print(f"  Diversity: {metrics['metrics']['diversity']:.2f}")
-        print(f"  Depth: {metrics['metrics']['depth']:.2f}")
-        print(f"  Overall Quality: {metrics['metrics']['overall_quality']:.2f}")
-        print()
+    
+    debate_ids = sorted(debate_file.stem for debate_file in debates_dir.glob("*.json"))
+    workers = min(workers or os.cpu_count() or 1, max(len(debate_ids), 1))
+    
+    if workers == 1:
+        results = (_score_in_process(calculator, debate_id) for debate_id in debate_ids)
+        for metrics in results:
+            _report(calculator, metrics)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(memory_dir,)) as pool:
+            chunksize = max(1, len(debate_ids) // (workers * 4))
+            for metrics in pool.map(_score_debate_file, debate_ids, chunksize=chunksize):
+                _report(calculator, metrics)
     
     print("Metrics calculation complete.")
 
@@ -419,7 +451,9 @@ def calculate_metrics_for_all_debates(memory_dir: str = "memory") -> None:
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 2:
+        calculate_metrics_for_all_debates(sys.argv[1], int(sys.argv[2]))
+    elif len(sys.argv) > 1:
         calculate_metrics_for_all_debates(sys.argv[1])
     else:
         calculate_metrics_for_all_debates()
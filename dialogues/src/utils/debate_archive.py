@@ -0,0 +1,449 @@
+"""
+Debate Archive Module
+
+This module keeps a SQLite index of the debate memory directory so that memory
+queries, contradiction lookups and metrics trends are answered with indexed
+queries instead of parsing every JSON file. The JSON files under memory/ remain
+the source of truth; the archive can be deleted at any time and is rebuilt by
+sync().
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS debates (
+    id TEXT PRIMARY KEY,
+    topic TEXT,
+    prompt TEXT,
+    date TEXT,
+    timestamp TEXT,
+    winner TEXT,
+    agents TEXT NOT NULL DEFAULT '[]',
+    embedding BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_debates_recent ON debates ((date IS NULL), date DESC, timestamp DESC);
+
+CREATE TABLE IF NOT EXISTS debate_agents (
+    agent TEXT NOT NULL,
+    debate_id TEXT NOT NULL,
+    PRIMARY KEY (agent, debate_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS debate_topics (
+    topic TEXT NOT NULL,
+    debate_id TEXT NOT NULL,
+    PRIMARY KEY (topic, debate_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS positions (
+    agent TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    position TEXT,
+    debate_id TEXT,
+    date TEXT,
+    PRIMARY KEY (agent, topic, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS metrics (
+    debate_id TEXT PRIMARY KEY,
+    topic TEXT,
+    date TEXT,
+    recorded_at REAL NOT NULL,
+    coherence REAL,
+    diversity REAL,
+    depth REAL,
+    overall_quality REAL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_recorded ON metrics (recorded_at);
+
+CREATE TABLE IF NOT EXISTS agent_consistency (
+    agent TEXT NOT NULL,
+    debate_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (agent, debate_id)
+) WITHOUT ROWID;
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts USING fts5(
+    debate_id UNINDEXED, topic, prompt, topics, body, tokenize='porter unicode61'
+);
+"""
+
+# Source directories under memory/ and the kind of record each holds
+SOURCE_DIRS = {"debates": "debate", "agents": "agent", "metrics": "metrics"}
+
+
+def _pack(vector: Sequence[float]) -> bytes:
+    return struct.pack(f"{len(vector)}f", *vector)
+
+
+def _unpack(blob: bytes) -> List[float]:
+    return list(struct.unpack(f"{len(blob) // 4}f", blob))
+
+
+def _debate_agents(debate: Dict[str, Any]) -> List[str]:
+    """Agent names of a debate in either the memory or the orchestrator log format."""
+    names = [r.get("agent") for r in debate.get("responses", [])]
+    names += [s.get("agent") for s in debate.get("opening_statements", [])]
+    seen = []
+    for name in names:
+        if name and name != "Unknown" and name not in seen:
+            seen.append(name)
+    return seen
+
+
+def _debate_body(debate: Dict[str, Any]) -> str:
+    """Free text of a debate for full-text search."""
+    parts = [r.get("response", "") for r in debate.get("responses", [])]
+    parts += [s.get("text", "") for s in debate.get("opening_statements", [])]
+    parts += list((debate.get("agent_summaries") or {}).values())
+    parts.append(debate.get("summary") or "")
+    parts.append(debate.get("final_summary") or "")
+    return "\n".join(p for p in parts if isinstance(p, str))
+
+
+class DebateArchive:
+    """SQLite index over the debate memory directory."""
+
+    def __init__(
+        self,
+        memory_dir: str = "memory",
+        db_path: Optional[str] = None,
+        embedder: Optional[Callable[[str], Sequence[float]]] = None
+    ):
+        """Open (creating if needed) the archive for a memory directory.
+
+        Args:
+            memory_dir: Path to the memory directory
+            db_path: Path of the SQLite file (default: memory_dir/debate_archive.sqlite3)
+            embedder: Optional function mapping text to an embedding vector for similarity search
+        """
+        self.memory_dir = Path(memory_dir)
+        self.memory_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path or str(self.memory_dir / "debate_archive.sqlite3")
+        self.embedder = embedder
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: fall back to LIKE matching
+            self.has_fts = False
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # --- ingestion ----------------------------------------------------------
+
+    def sync(self) -> Dict[str, int]:
+        """Bring the archive up to date with the JSON files.
+
+        Only files whose modification time or size changed are parsed, and
+        records of deleted files are removed.
+
+        Returns:
+            Counts of files ingested and removed
+        """
+        seen = {}
+        for dirname, kind in SOURCE_DIRS.items():
+            directory = self.memory_dir / dirname
+            if not directory.is_dir():
+                continue
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        seen[entry.path] = (kind, stat.st_mtime, stat.st_size)
+
+        with self._lock:
+            known = {row["path"]: (row["kind"], row["mtime"], row["size"])
+                     for row in self._conn.execute("SELECT path, kind, mtime, size FROM sources")}
+            changed = [path for path, info in seen.items() if known.get(path) != info]
+            removed = [path for path in known if path not in seen]
+
+            with self._transaction():
+                for path in removed:
+                    self._remove(known[path][0], Path(path).stem)
+                    self._conn.execute("DELETE FROM sources WHERE path = ?", (path,))
+                for path in changed:
+                    kind, mtime, size = seen[path]
+                    try:
+                        with open(path, "r") as f:
+                            data = json.load(f)
+                    except (OSError, ValueError) as e:
+                        print(f"Error indexing {path}: {e}")
+                        continue
+                    self._ingest(kind, Path(path).stem, data, mtime)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sources (path, kind, mtime, size) VALUES (?, ?, ?, ?)",
+                        (path, kind, mtime, size),
+                    )
+        return {"ingested": len(changed), "removed": len(removed)}
+
+    def ingest_file(self, path: str) -> None:
+        """Index (or re-index) a single debate, agent or metrics JSON file after it was written.
+
+        Args:
+            path: Path of a JSON file under memory/debates, memory/agents or memory/metrics
+
+        Raises:
+            KeyError: If the file is not in one of those directories
+        """
+        path = Path(path)
+        kind = SOURCE_DIRS[path.parent.name]
+        # Key the source the same way sync() does so the file is not parsed again
+        source = str(self.memory_dir / path.parent.name / path.name)
+        stat = path.stat()
+        with open(path, "r") as f:
+            data = json.load(f)
+        with self._lock, self._transaction():
+            self._ingest(kind, path.stem, data, stat.st_mtime)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (path, kind, mtime, size) VALUES (?, ?, ?, ?)",
+                (source, kind, stat.st_mtime, stat.st_size),
+            )
+
+    @contextmanager
+    def _transaction(self):
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _remove(self, kind: str, key: str) -> None:
+        if kind == "debate":
+            self._conn.execute("DELETE FROM debates WHERE id = ?", (key,))
+            self._conn.execute("DELETE FROM debate_agents WHERE debate_id = ?", (key,))
+            self._conn.execute("DELETE FROM debate_topics WHERE debate_id = ?", (key,))
+            if self.has_fts:
+                self._conn.execute("DELETE FROM debates_fts WHERE debate_id = ?", (key,))
+        elif kind == "agent":
+            self._conn.execute("DELETE FROM positions WHERE agent = ?", (key,))
+        elif kind == "metrics":
+            self._conn.execute("DELETE FROM metrics WHERE debate_id = ?", (key,))
+            self._conn.execute("DELETE FROM agent_consistency WHERE debate_id = ?", (key,))
+
+    def _ingest(self, kind: str, key: str, data: Dict[str, Any], mtime: float) -> None:
+        self._remove(kind, key)
+        if kind == "debate":
+            self._ingest_debate(key, data)
+        elif kind == "agent":
+            for topic, positions in (data.get("positions") or {}).items():
+                self._conn.executemany(
+                    "INSERT INTO positions (agent, topic, seq, position, debate_id, date) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(key, topic, seq, p.get("position"), p.get("debate_id"), p.get("date"))
+                     for seq, p in enumerate(positions)],
+                )
+        elif kind == "metrics":
+            metrics = data.get("metrics", {})
+            self._conn.execute(
+                "INSERT INTO metrics (debate_id, topic, date, recorded_at, coherence, diversity, depth, overall_quality) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, data.get("topic"), data.get("date"), mtime, metrics.get("coherence"),
+                 metrics.get("diversity"), metrics.get("depth"), metrics.get("overall_quality")),
+            )
+            self._conn.executemany(
+                "INSERT INTO agent_consistency (agent, debate_id, score) VALUES (?, ?, ?)",
+                [(agent, key, score) for agent, score in (metrics.get("consistency") or {}).items()],
+            )
+
+    def _ingest_debate(self, debate_id: str, debate: Dict[str, Any]) -> None:
+        agents = _debate_agents(debate)
+        topics = [t for t in debate.get("topics", []) if isinstance(t, str)]
+        topic = debate.get("topic")
+        prompt = debate.get("prompt", "")
+        embedding = None
+        if self.embedder is not None:
+            embedding = _pack(self.embedder(f"{topic or ''}\n{prompt}"))
+
+        self._conn.execute(
+            "INSERT INTO debates (id, topic, prompt, date, timestamp, winner, agents, embedding) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (debate_id, topic, prompt, debate.get("date"), debate.get("timestamp"), debate.get("winner"),
+             json.dumps(agents), embedding),
+        )
+        self._conn.executemany("INSERT OR IGNORE INTO debate_agents (agent, debate_id) VALUES (?, ?)",
+                               [(agent, debate_id) for agent in agents])
+        self._conn.executemany("INSERT OR IGNORE INTO debate_topics (topic, debate_id) VALUES (?, ?)",
+                               [(t.lower(), debate_id) for t in topics])
+        if self.has_fts:
+            self._conn.execute(
+                "INSERT INTO debates_fts (debate_id, topic, prompt, topics, body) VALUES (?, ?, ?, ?, ?)",
+                (debate_id, topic or "", prompt, " ".join(topics), _debate_body(debate)),
+            )
+
+    # --- queries ------------------------------------------------------------
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "topic": row["topic"] or "Unknown",
+            "date": row["date"] or "Unknown",
+            "agents": json.loads(row["agents"]),
+        }
+
+    def list_debates(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most recent debates: dated debates newest first, then undated ones by timestamp."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, topic, date, agents FROM debates ORDER BY (date IS NULL), date DESC, timestamp DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def debates_for_agent(self, agent: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Debates an agent took part in, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT d.id, d.topic, d.date, d.agents FROM debate_agents a JOIN debates d ON d.id = a.debate_id "
+                "WHERE a.agent = ? ORDER BY (d.date IS NULL), d.date DESC, d.timestamp DESC LIMIT ?",
+                (agent, limit),
+            ).fetchall()
+        return [self._summary(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over debate topics, prompts, topic keywords and text.
+
+        Args:
+            query: Search terms; each term also matches as a prefix
+            limit: Maximum number of debates to return
+
+        Returns:
+            Debate summaries with a relevance score, most relevant first. Falls
+            back to substring matching on topic and prompt when full-text search
+            finds nothing.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return []
+        with self._lock:
+            rows = []
+            if self.has_fts:
+                match = " AND ".join(f'"{term}"*' for term in terms)
+                rows = self._conn.execute(
+                    "SELECT d.id, d.topic, d.date, d.agents, -bm25(debates_fts, 0, 2.0, 1.0, 1.0, 0.2) AS relevance "
+                    "FROM debates_fts JOIN debates d ON d.id = debates_fts.debate_id "
+                    "WHERE debates_fts MATCH ? ORDER BY relevance DESC LIMIT ?",
+                    (match, limit),
+                ).fetchall()
+            if not rows:
+                # Substring match on topic and prompt, for SQLite without FTS5 and
+                # for queries that only occur inside words ("examined" in "unexamined")
+                like = f"%{query.lower()}%"
+                rows = self._conn.execute(
+                    "SELECT id, topic, date, agents, "
+                    "(2 * (lower(topic) LIKE ?) + (lower(prompt) LIKE ?)) AS relevance "
+                    "FROM debates WHERE lower(topic) LIKE ? OR lower(prompt) LIKE ? ORDER BY relevance DESC LIMIT ?",
+                    (like, like, like, like, limit),
+                ).fetchall()
+        return [dict(self._summary(row), relevance=row["relevance"]) for row in rows]
+
+    def find_similar(self, text: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Debates whose topic embedding is closest to a text (requires an embedder).
+
+        Args:
+            text: Text to compare against
+            limit: Maximum number of debates to return
+
+        Returns:
+            Debate summaries with a cosine similarity, most similar first
+        """
+        if self.embedder is None:
+            raise ValueError("DebateArchive.find_similar requires an embedder")
+        query = list(self.embedder(text))
+        query_norm = math.sqrt(sum(x * x for x in query)) or 1.0
+        scored = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, topic, date, agents, embedding FROM debates WHERE embedding IS NOT NULL"
+            ).fetchall()
+        for row in rows:
+            vector = _unpack(row["embedding"])
+            norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+            similarity = sum(a * b for a, b in zip(query, vector)) / (norm * query_norm)
+            scored.append(dict(self._summary(row), similarity=similarity))
+        scored.sort(key=lambda d: d["similarity"], reverse=True)
+        return scored[:limit]
+
+    def agent_positions(self, agent: str, topic: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """An agent's recorded positions, grouped by topic."""
+        sql = "SELECT topic, position, debate_id, date FROM positions WHERE agent = ?"
+        params: List[Any] = [agent]
+        if topic:
+            sql += " AND topic = ?"
+            params.append(topic)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY topic, seq", params).fetchall()
+        positions: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            positions.setdefault(row["topic"], []).append(
+                {"position": row["position"], "debate_id": row["debate_id"], "date": row["date"]}
+            )
+        return positions
+
+    def contradiction_candidates(self, agent: str) -> List[Dict[str, Any]]:
+        """Topics on which an agent has recorded more than one position."""
+        with self._lock:
+            topics = [row["topic"] for row in self._conn.execute(
+                "SELECT topic FROM positions WHERE agent = ? GROUP BY topic HAVING COUNT(*) > 1 ORDER BY topic",
+                (agent,),
+            )]
+        return [{"topic": topic, "positions": self.agent_positions(agent, topic)[topic]} for topic in topics]
+
+    def metrics_over_time(self, metric_names: Sequence[str] = ("coherence", "diversity", "depth", "overall_quality")) -> Dict[str, List[Dict[str, Any]]]:
+        """Metric values per debate in the order the metrics were recorded."""
+        columns = [name for name in metric_names if name in ("coherence", "diversity", "depth", "overall_quality")]
+        over_time: Dict[str, List[Dict[str, Any]]] = {name: [] for name in columns}
+        if not columns:
+            return over_time
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT topic, date, {', '.join(columns)} FROM metrics ORDER BY recorded_at"
+            ).fetchall()
+        for row in rows:
+            for name in columns:
+                if row[name] is not None:
+                    over_time[name].append({"date": row["date"] or "Unknown", "topic": row["topic"] or "Unknown", "value": row[name]})
+        return over_time
+
+    def agent_consistency(self) -> Dict[str, Dict[str, Any]]:
+        """Consistency scores, debate count and average consistency per agent."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT agent, score FROM agent_consistency ORDER BY agent, debate_id"
+            ).fetchall()
+        agents: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            entry = agents.setdefault(row["agent"], {"consistency_scores": [], "debate_count": 0})
+            entry["consistency_scores"].append(row["score"])
+            entry["debate_count"] += 1
+        for entry in agents.values():
+            scores = entry["consistency_scores"]
+            entry["avg_consistency"] = sum(scores) / len(scores) if scores else 0
+        return agents
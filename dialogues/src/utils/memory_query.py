@@ -16,20 +16,27 @@ from typing import List, Dict, Any, Optional, Union
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(project_root)
 
-from src.memory import MemoryManager
+from src.utils.debate_archive import DebateArchive
 
 
 class MemoryQueryTool:
-    """Tool to query the memory system for historical debates and agent positions."""
+    """Tool to query the memory system for historical debates and agent positions.
+
+    Queries are answered from the debate archive, an SQLite index of the
+    memory directory that is brought up to date with the JSON files once
+    when the tool is created.
+    """
     
-    def __init__(self, memory_dir: str = "memory"):
+    def __init__(self, memory_dir: str = "memory", archive: Optional[DebateArchive] = None):
         """Initialize the query tool with the memory directory.
         
         Args:
             memory_dir: Path to the memory directory
+            archive: Optional debate archive to query (default: one in memory_dir)
         """
         self.memory_dir = Path(memory_dir)
-        self.memory_manager = MemoryManager(str(self.memory_dir))
+        self.archive = archive or DebateArchive(str(self.memory_dir))
+        self.archive.sync()
     
     def list_debates(self, limit: int = 10) -> List[Dict[str, Any]]:
         """List all debates stored in the memory system.
@@ -38,53 +45,9 @@ class MemoryQueryTool:
             limit: Maximum number of debates to return
             
         Returns:
-            List of debate summaries
+            List of debate summaries, newest first
         """
-        debates_dir = self.memory_dir / "debates"
-        
-        if not debates_dir.exists():
-            return []
-        
-        debates = []
-        for debate_file in debates_dir.glob("*.json"):
-            with open(debate_file, "r") as f:
-                debate_data = json.load(f)
-                
-                # Extract agent names from responses if available
-                agents = []
-                for response in debate_data.get("responses", []):
-                    agent_name = response.get("agent", "Unknown")
-                    if agent_name != "Unknown":
-                        agents.append(agent_name)
-                
-                # Build debate summary
-                debate_summary = {
-                    "id": debate_file.stem,
-                    "topic": debate_data.get("topic", "Unknown"),
-                    "date": debate_data.get("date", "Unknown"),
-                    "agents": agents
-                }
-                
-                # Add timestamp for sorting if date is missing
-                if "timestamp" in debate_data and debate_summary["date"] == "Unknown":
-                    debate_summary["_timestamp"] = debate_data["timestamp"]
-                
-                debates.append(debate_summary)
-                
-        # Sort by date (newest first) and limit
-        # First try to sort by timestamp if date is unknown
-        debates_with_unknown = [d for d in debates if d.get("date") == "Unknown"]
-        if debates_with_unknown:
-            debates_with_unknown.sort(key=lambda x: x.get("_timestamp", ""), reverse=True)
-            
-        # Then sort the debates with known dates
-        debates_with_dates = [d for d in debates if d.get("date") != "Unknown"]
-        debates_with_dates.sort(key=lambda x: x.get("date", ""), reverse=True)
-        
-        # Combine the sorted lists
-        sorted_debates = debates_with_dates + debates_with_unknown
-        
-        return sorted_debates[:limit]
+        return self.archive.list_debates(limit)
     
     def search_debates_by_topic(self, topic: str) -> List[Dict[str, Any]]:
         """Search for debates related to a specific topic.
@@ -93,64 +56,9 @@ class MemoryQueryTool:
             topic: Topic to search for
             
         Returns:
-            List of related debates
+            List of related debates, most relevant first
         """
-        # Search in debate titles/topics first
-        debates_dir = self.memory_dir / "debates"
-        related_debates = []
-        
-        if not debates_dir.exists():
-            return []
-        
-        # Simple keyword matching for topic searching
-        topic_lower = topic.lower()
-        
-        for debate_file in debates_dir.glob("*.json"):
-            try:
-                with open(debate_file, "r") as f:
-                    debate_data = json.load(f)
-                    
-                    # Calculate relevance score based on keyword matches
-                    relevance = 0
-                    main_topic = debate_data.get("topic", "").lower()
-                    prompt = debate_data.get("prompt", "").lower()
-                    
-                    # Check if topic is in the main topic
-                    if topic_lower in main_topic:
-                        relevance += 2  # Higher score for topic match
-                    
-                    # Check if topic is in the prompt
-                    if topic_lower in prompt:
-                        relevance += 1
-                    
-                    # Check if topic is in any of the topic keywords
-                    for keyword in debate_data.get("topics", []):
-                        if topic_lower in keyword.lower():
-                            relevance += 1
-                            break
-                    
-                    # If relevant, add to results
-                    if relevance > 0:
-                        # Extract agent names
-                        agents = []
-                        for response in debate_data.get("responses", []):
-                            agent_name = response.get("agent", "Unknown")
-                            if agent_name != "Unknown":
-                                agents.append(agent_name)
-                            
-                        related_debates.append({
-                            "id": debate_file.stem,
-                            "topic": debate_data.get("topic", "Unknown"),
-                            "date": debate_data.get("date", "Unknown"),
-                            "relevance": relevance,
-                            "agents": agents
-                        })
-            except Exception as e:
-                print(f"Error searching debate {debate_file}: {e}")
-        
-        # Sort by relevance (highest first)
-        related_debates.sort(key=lambda x: x.get("relevance", 0), reverse=True)
-        return related_debates
+        return self.archive.search(topic)
     
     def get_agent_positions(self, agent_name: str, topic: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """Get an agent's positions on topics.
@@ -162,26 +70,7 @@ class MemoryQueryTool:
         Returns:
             Dictionary of topics and agent positions
         """
-        agent_file = self.memory_dir / "agents" / f"{agent_name}.json"
-        if not agent_file.exists():
-            return {}
-            
-        with open(agent_file, "r") as f:
-            agent_memory = json.load(f)
-        
-        agent_positions = {}
-        
-        if topic:
-            # Get positions on a specific topic
-            if "positions" in agent_memory and topic in agent_memory["positions"]:
-                agent_positions[topic] = agent_memory["positions"][topic]
-        else:
-            # Get all positions for the agent
-            if "positions" in agent_memory:
-                for topic_name, positions in agent_memory["positions"].items():
-                    agent_positions[topic_name] = positions
-        
-        return agent_positions
+        return self.archive.agent_positions(agent_name, topic)
     
     def get_debate_details(self, debate_id: str) -> Dict[str, Any]:
         """Get full details of a specific debate.
@@ -227,30 +116,10 @@ class MemoryQueryTool:
         Returns:
             List of potential contradictory positions
         """
-        # Load the agent memory file directly
-        agent_file = self.memory_dir / "agents" / f"{agent_name}.json"
-        if not agent_file.exists():
-            return []
-            
-        with open(agent_file, "r") as f:
-            agent_memory = json.load(f)
-        
         # This is a placeholder for more sophisticated contradiction analysis
         # A real implementation would use NLP techniques to identify semantic contradictions
-        contradictions = []
-        
-        if "positions" not in agent_memory:
-            return []
-        
         # For now, just return topics where the agent has multiple positions
-        for topic, positions in agent_memory["positions"].items():
-            if len(positions) > 1:
-                contradictions.append({
-                    "topic": topic,
-                    "positions": positions
-                })
-        
-        return contradictions
+        return self.archive.contradiction_candidates(agent_name)
 
 
 def main():
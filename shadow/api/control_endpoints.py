@@ -11,6 +11,8 @@ from typing import Dict, List, Optional, Any
 import logging
 from datetime import datetime
 
+from orchestrator.worker_pool import REQUEST_POOL, run_in_worker
+
 # Configure logging
 logger = logging.getLogger("shadow.api.control")
 
@@ -101,31 +103,20 @@ async def override_agent_selection(request: AgentOverrideRequest):
     if not shadow_agent:
         raise HTTPException(status_code=503, detail="Shadow agent not initialized")
     
+    if request.force_single and request.agents:
+        agents = [request.agents[0]]
+    else:
+        agents = request.agents
+    
     try:
-        # Store the override settings in the shadow agent
-        original_classifier = shadow_agent.classifier.classify_task
-        
-        # Create a custom classifier for this request
-        def override_classifier(user_input: str) -> List[str]:
-            if request.force_all:
-                return request.agents
-            elif request.force_single and request.agents:
-                return [request.agents[0]]
-            else:
-                return request.agents
-        
-        # Temporarily override the classifier
-        shadow_agent.classifier.classify_task = override_classifier
-        
-        # Process the request
-        response = shadow_agent.process_request(request.query)
-        
-        # Restore original classifier
-        shadow_agent.classifier.classify_task = original_classifier
+        # Route to the selected agents for this call only; the shared
+        # classifier is left untouched for concurrent requests
+        response = await run_in_worker(shadow_agent.process_request, request.query,
+                                       target_agents=agents, pool=REQUEST_POOL)
         
         return {
             "response": response,
-            "agents_used": request.agents,
+            "agents_used": agents,
             "override_applied": True,
             "session_id": request.session_id
         }
@@ -135,6 +126,24 @@ async def override_agent_selection(request: AgentOverrideRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/requests/{request_id}/cancel")
+async def cancel_request(request_id: str):
+    """
+    Cancel a running collaborative request.
+    
+    The request_id is the one sent with the request to /api/shadow.
+    Subtasks already running finish in the background, but no further
+    subtasks are started and the request returns a cancellation notice.
+    """
+    if not shadow_agent:
+        raise HTTPException(status_code=503, detail="Shadow agent not initialized")
+    
+    if not shadow_agent.cancel_request(request_id):
+        raise HTTPException(status_code=404, detail=f"No running request {request_id}")
+    
+    return {"request_id": request_id, "cancelled": True}
+
+
 @router.get("/memory/query")
 async def query_memory(
     query_type: str = Query(description="Type: documents, history, search, entities"),
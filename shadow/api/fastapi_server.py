@@ -10,10 +10,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
+import asyncio
 import sys
 import os
 import logging
 import time
+import uuid
 from typing import Dict, List, Optional
 from pathlib import Path
 
@@ -27,6 +29,7 @@ from agents.engineer.agent import EngineerAgent
 from agents.librarian.agent import LibrarianAgent
 from agents.priest.agent import PriestAgent
 from orchestrator.memory_integration import OrchestratorMemory
+from orchestrator.worker_pool import REQUEST_POOL, run_in_worker, shutdown_worker_pools
 from memory.memory_manager import MemoryManager
 from memory.vector_memory import InMemoryVectorStore
 from memory.document_store import InMemoryDocumentStore
@@ -51,6 +54,7 @@ class ShadowRequest(BaseModel):
     """Request model for the Shadow API."""
     query: str
     session_id: Optional[str] = None
+    request_id: Optional[str] = None  # for /api/control/requests/{request_id}/cancel
     metadata: Optional[Dict] = None
 
 class ShadowResponse(BaseModel):
@@ -80,7 +84,8 @@ def init_shadow_system():
     logger.info("Initializing Shadow AI system...")
     
     # Initialize memory system
-    vector_store = InMemoryVectorStore()
+    # Vectors persist across restarts when a store directory is configured
+    vector_store = InMemoryVectorStore(persist_dir=os.environ.get("SHADOW_VECTOR_STORE_DIR"))
     document_store = InMemoryDocumentStore()
     relational_store = InMemoryRelationalStore()
     
@@ -164,6 +169,15 @@ async def startup_event():
     logger.info("Shadow AI system endpoints initialized with control, session, and streaming support")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Persist the vector store so the next start is warm and stop worker threads"""
+    vector_store = memory_manager.vector_store if memory_manager else None
+    if isinstance(vector_store, InMemoryVectorStore) and vector_store.persist_dir:
+        vector_store.save()
+    shutdown_worker_pools(wait=False)
+
+
 @app.get("/")
 async def serve_react_app():
     """Serve the React frontend at root."""
@@ -193,12 +207,20 @@ async def process_request(request: ShadowRequest):
         ShadowResponse with the system's response
     """
     start_time = time.time()
+    request_id = request.request_id or uuid.uuid4().hex
     
     try:
         logger.info(f"Processing request: {request.query[:100]}...")
         
-        # Process the request through the Shadow system
-        response = shadow_agent.process_request(request.query)
+        # Process the request through the Shadow system in a worker thread so
+        # slow agents do not hold up other requests
+        try:
+            response = await run_in_worker(shadow_agent.process_request, request.query,
+                                           request_id=request_id, pool=REQUEST_POOL)
+        except asyncio.CancelledError:
+            # The client went away; stop the work still running for it
+            shadow_agent.cancel_request(request_id)
+            raise
         
         # Calculate processing time
         processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
@@ -221,7 +243,7 @@ async def process_request(request: ShadowRequest):
             session_id=request.session_id or f"session_{int(time.time())}",
             agents_used=agents_used,
             processing_time=round(processing_time, 2),
-            metadata={"request_length": len(request.query)}
+            metadata={"request_length": len(request.query), "request_id": request_id}
         )
         
     except Exception as e:
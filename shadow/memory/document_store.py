@@ -9,11 +9,15 @@ import logging
 import uuid
 import json
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Union, Tuple
 from pathlib import Path
 
 from memory.memory_base import MemoryItem, MemorySystem, SearchableMemorySystem
+from memory.text_index import BM25Index
 
 # Configure logging
 logger = logging.getLogger("shadow.memory.document")
@@ -70,18 +74,36 @@ class DocumentItem(MemoryItem):
         return result
 
 
+def _index_text(title: str, content: str) -> str:
+    """Text indexed for a document; the title is repeated to weight it above the body."""
+    return f"{title} {title} {content}"
+
+
 class InMemoryDocumentStore(SearchableMemorySystem):
     """
     In-memory implementation of a document store.
     
     This provides a simple document storage system using in-memory dictionaries,
-    suitable for development and testing.
+    with a BM25 full-text index for search.
     """
     
-    def __init__(self):
-        """Initialize the in-memory document store."""
+    def __init__(self, segment_size: int = 1000, max_segments: int = 8):
+        """
+        Initialize the in-memory document store.
+        
+        Args:
+            segment_size: Documents per sealed index segment
+            max_segments: Index segments kept before merging
+        """
         super().__init__("InMemoryDocument")
         self.documents: Dict[str, DocumentItem] = {}
+        self.index = self._create_index(segment_size, max_segments)
+    
+    def _create_index(self, segment_size: int, max_segments: int) -> BM25Index:
+        return BM25Index(segment_size=segment_size, max_segments=max_segments)
+    
+    def _index_document(self, doc: DocumentItem) -> Tuple[int, int]:
+        return self.index.add(doc.item_id, _index_text(doc.title, doc.content))
     
     def store(self, item: Union[DocumentItem, MemoryItem]) -> str:
         """
@@ -103,8 +125,9 @@ class InMemoryDocumentStore(SearchableMemorySystem):
         if item.item_id is None:
             item.item_id = str(uuid.uuid4())
         
-        # Store the document
+        # Store and index the document
         self.documents[item.item_id] = item
+        self._index_document(item)
         logger.info(f"Stored document item with ID {item.item_id} and title '{item.title}'")
         return item.item_id
     
@@ -132,6 +155,7 @@ class InMemoryDocumentStore(SearchableMemorySystem):
         """
         if item_id in self.documents:
             del self.documents[item_id]
+            self.index.remove(item_id)
             logger.info(f"Deleted document item with ID {item_id}")
             return True
         
@@ -146,38 +170,37 @@ class InMemoryDocumentStore(SearchableMemorySystem):
             True if the documents were cleared, False otherwise
         """
         self.documents.clear()
+        self.index.clear()
         logger.info("Cleared all document items")
         return True
     
+    def count(self) -> int:
+        """
+        Get the number of stored documents.
+        
+        Returns:
+            Number of document items
+        """
+        return len(self.documents)
+    
     def search(self, query: str, limit: int = 5) -> List[DocumentItem]:
         """
         Search for document items matching a query.
         
-        Simple keyword-based search implementation.
+        Documents are ranked with BM25 over their title and content tokens.
         
         Args:
             query: The search query
             limit: Maximum number of items to return
             
         Returns:
-            List of document items matching the query
+            List of document items matching the query, best match first
         """
         results = []
-        query_lower = query.lower()
-        
-        for doc_id, doc in self.documents.items():
-            # Search in content
-            if query_lower in doc.content.lower():
-                results.append(doc)
-                if len(results) >= limit:
-                    break
-            
-            # Search in title
-            elif query_lower in doc.title.lower():
+        for doc_id, _score in self.index.search(query, limit):
+            doc = self.documents.get(doc_id)
+            if doc is not None:
                 results.append(doc)
-                if len(results) >= limit:
-                    break
-        
         return results
     
     def get_all_documents(self) -> List[DocumentItem]:
@@ -202,80 +225,215 @@ class InMemoryDocumentStore(SearchableMemorySystem):
         return [doc for doc in self.documents.values() if doc.doc_type == doc_type]
 
 
+class _DocumentFiles(MutableMapping):
+    """
+    Mapping of document IDs to documents whose content is read from disk on access.
+    
+    Entries (title, type, metadata and index bookkeeping) are kept in memory;
+    the most recently used documents are cached.
+    """
+    
+    def __init__(self, storage_dir: Path, cache_size: int):
+        self.storage_dir = storage_dir
+        self.cache_size = cache_size
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._cache: "OrderedDict[str, DocumentItem]" = OrderedDict()
+    
+    def path(self, doc_id: str) -> Path:
+        return self.storage_dir / f"{doc_id}.txt"
+    
+    def __getitem__(self, doc_id: str) -> DocumentItem:
+        doc = self._cache.get(doc_id)
+        if doc is not None:
+            self._cache.move_to_end(doc_id)
+            return doc
+        
+        entry = self.entries[doc_id]
+        try:
+            with open(self.path(doc_id), 'r') as f:
+                content = f.read()
+        except OSError as e:
+            logger.warning(f"Missing content for document {doc_id}: {str(e)}")
+            raise KeyError(doc_id)
+        
+        doc = DocumentItem(content, entry.get("title", "Untitled Document"), entry.get("doc_type", "text"),
+                           dict(entry.get("metadata", {})), doc_id)
+        doc.created_at = entry.get("created_at", doc.created_at)
+        self._remember(doc_id, doc)
+        return doc
+    
+    def _remember(self, doc_id: str, doc: DocumentItem) -> None:
+        self._cache[doc_id] = doc
+        self._cache.move_to_end(doc_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def __setitem__(self, doc_id: str, doc: DocumentItem) -> None:
+        self.entries[doc_id] = {
+            "title": doc.title,
+            "doc_type": doc.doc_type,
+            "metadata": doc.metadata,
+            "created_at": doc.created_at
+        }
+        self._remember(doc_id, doc)
+    
+    def __delitem__(self, doc_id: str) -> None:
+        del self.entries[doc_id]
+        self._cache.pop(doc_id, None)
+    
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self.entries
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.entries))
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def values(self) -> List[DocumentItem]:
+        docs = []
+        for doc_id in self:
+            try:
+                docs.append(self[doc_id])
+            except KeyError:
+                continue
+        return docs
+    
+    def clear(self) -> None:
+        self.entries.clear()
+        self._cache.clear()
+
+
 class FileSystemDocumentStore(InMemoryDocumentStore):
     """
     File system-based implementation of a document store.
     
-    This provides persistent storage of documents on the file system, with in-memory 
-    indexing for fast access.
+    This provides persistent storage of documents on the file system. Document
+    content is read lazily; changes to the document index are appended to
+    index.log and folded into the index.json snapshot periodically, and the
+    full-text index is persisted as segment files under segments/.
     """
     
-    def __init__(self, storage_dir: str = "document_store"):
+    def __init__(
+        self,
+        storage_dir: str = "document_store",
+        segment_size: int = 1000,
+        max_segments: int = 8,
+        cache_size: int = 1024,
+        compact_after: int = 1000
+    ):
         """
         Initialize the file system document store.
         
         Args:
             storage_dir: Directory for document storage
+            segment_size: Documents per sealed index segment
+            max_segments: Index segments kept before merging
+            cache_size: Number of documents kept in memory after being read
+            compact_after: Minimum number of log records before the log is folded into the snapshot
         """
-        super().__init__()
         self.storage_dir = Path(storage_dir)
-        self.name = "FileSystemDocument"
+        self.compact_after = compact_after
+        self._log_records = 0
+        self._lock = threading.RLock()
         
         # Create storage directory if it doesn't exist
         if not self.storage_dir.exists():
             self.storage_dir.mkdir(parents=True, exist_ok=True)
         
+        super().__init__(segment_size, max_segments)
+        self.name = "FileSystemDocument"
+        self.documents = _DocumentFiles(self.storage_dir, cache_size)
+        
         # Load existing documents
         self._load_documents()
     
+    @property
+    def _index_path(self) -> Path:
+        return self.storage_dir / "index.json"
+    
+    @property
+    def _log_path(self) -> Path:
+        return self.storage_dir / "index.log"
+    
+    def _create_index(self, segment_size: int, max_segments: int) -> BM25Index:
+        return BM25Index(
+            directory=str(self.storage_dir / "segments"),
+            reindex=self._reindex,
+            segment_size=segment_size,
+            max_segments=max_segments
+        )
+    
+    def _reindex(self, doc_id: str) -> None:
+        """Re-index a document whose postings were not persisted in a segment."""
+        doc = self.documents.get(doc_id)
+        if doc is not None:
+            self._index_document(doc)
+            self._append_log({"op": "put", "id": doc_id, **self.documents.entries[doc_id]})
+    
+    def _index_document(self, doc: DocumentItem) -> Tuple[int, int]:
+        docno, length = super()._index_document(doc)
+        entry = self.documents.entries[doc.item_id]
+        entry["docno"] = docno
+        entry["length"] = length
+        return docno, length
+    
     def _load_documents(self):
-        """Load documents from the file system."""
-        if not self.storage_dir.exists():
-            return
-        
-        # Load document index
-        index_path = self.storage_dir / "index.json"
-        if index_path.exists():
-            try:
-                with open(index_path, 'r') as f:
-                    index_data = json.load(f)
-                
-                # Load each document
-                for doc_id, doc_info in index_data.items():
-                    doc_path = self.storage_dir / f"{doc_id}.txt"
-                    if doc_path.exists():
-                        with open(doc_path, 'r') as f:
-                            content = f.read()
-                        
-                        # Create document item
-                        title = doc_info.get("title", "Untitled Document")
-                        doc_type = doc_info.get("doc_type", "text")
-                        metadata = doc_info.get("metadata", {})
-                        
-                        # Add document to in-memory store
-                        doc = DocumentItem(content, title, doc_type, metadata, doc_id)
-                        self.documents[doc_id] = doc
-                
-                logger.info(f"Loaded {len(self.documents)} documents from file system")
+        """Load the document index from the snapshot and replay the change log."""
+        entries = self.documents.entries
+        try:
+            if self._index_path.exists():
+                with open(self._index_path, 'r') as f:
+                    entries.update(json.load(f))
             
-            except Exception as e:
-                logger.error(f"Error loading documents from file system: {str(e)}")
+            if self._log_path.exists():
+                with open(self._log_path, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            # A torn final line from an interrupted write
+                            logger.warning("Skipping unreadable document index log record")
+                            continue
+                        doc_id = record.pop("id")
+                        if record.pop("op") == "del":
+                            entries.pop(doc_id, None)
+                        else:
+                            entries[doc_id] = record
+                        self._log_records += 1
+            
+            for doc_id, entry in entries.items():
+                self.index.register(doc_id, entry.get("docno"), entry.get("length"))
+            
+            logger.info(f"Loaded {len(entries)} documents from file system")
+        
+        except Exception as e:
+            logger.error(f"Error loading documents from file system: {str(e)}")
+    
+    def _append_log(self, record: Dict[str, Any]) -> None:
+        """Append a change to the index log, folding the log into the snapshot when it grows."""
+        with open(self._log_path, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+        self._log_records += 1
+        if self._log_records >= max(self.compact_after, len(self.documents)):
+            self._save_index()
     
     def _save_index(self):
-        """Save document index to file system."""
-        index_data = {}
-        for doc_id, doc in self.documents.items():
-            index_data[doc_id] = {
-                "title": doc.title,
-                "doc_type": doc.doc_type,
-                "metadata": doc.metadata,
-                "created_at": doc.created_at
-            }
+        """Write the document index snapshot and truncate the change log."""
+        tmp_path = self._index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.documents.entries, f)
+        os.replace(tmp_path, self._index_path)
         
-        # Save index
-        index_path = self.storage_dir / "index.json"
-        with open(index_path, 'w') as f:
-            json.dump(index_data, f, indent=2)
+        if self._log_path.exists():
+            os.remove(self._log_path)
+        self._log_records = 0
+    
+    def flush(self):
+        """Persist the full-text index buffer and the document index snapshot."""
+        with self._lock:
+            self.index.flush()
+            self._save_index()
     
     def store(self, item: Union[DocumentItem, MemoryItem]) -> str:
         """
@@ -287,24 +445,24 @@ class FileSystemDocumentStore(InMemoryDocumentStore):
         Returns:
             ID of the stored document
         """
-        # Use parent class to add to in-memory store first
-        doc_id = super().store(item)
-        doc = self.documents[doc_id]
-        
-        try:
-            # Save document content
-            doc_path = self.storage_dir / f"{doc_id}.txt"
-            with open(doc_path, 'w') as f:
-                f.write(doc.content)
+        with self._lock:
+            # Use parent class to add to the index first
+            doc_id = super().store(item)
+            doc = self.documents[doc_id]
             
-            # Update index
-            self._save_index()
-            logger.info(f"Stored document '{doc.title}' to file system with ID {doc_id}")
-        
-        except Exception as e:
-            logger.error(f"Error storing document to file system: {str(e)}")
-        
-        return doc_id
+            try:
+                # Save document content
+                with open(self.documents.path(doc_id), 'w') as f:
+                    f.write(doc.content)
+                
+                # Record the change
+                self._append_log({"op": "put", "id": doc_id, **self.documents.entries[doc_id]})
+                logger.info(f"Stored document '{doc.title}' to file system with ID {doc_id}")
+            
+            except Exception as e:
+                logger.error(f"Error storing document to file system: {str(e)}")
+            
+            return doc_id
     
     def delete(self, item_id: str) -> bool:
         """
@@ -316,27 +474,29 @@ class FileSystemDocumentStore(InMemoryDocumentStore):
         Returns:
             True if the item was deleted, False otherwise
         """
-        # Check if document exists
-        if item_id not in self.documents:
-            return False
-        
-        try:
-            # Delete document file
-            doc_path = self.storage_dir / f"{item_id}.txt"
-            if doc_path.exists():
-                os.remove(doc_path)
+        with self._lock:
+            # Check if document exists
+            if item_id not in self.documents:
+                return False
             
-            # Remove from in-memory store
-            del self.documents[item_id]
+            try:
+                # Delete document file
+                doc_path = self.documents.path(item_id)
+                if doc_path.exists():
+                    os.remove(doc_path)
+                
+                # Remove from the store and index
+                del self.documents[item_id]
+                self.index.remove(item_id)
+                
+                # Record the change
+                self._append_log({"op": "del", "id": item_id})
+                logger.info(f"Deleted document with ID {item_id} from file system")
+                return True
             
-            # Update index
-            self._save_index()
-            logger.info(f"Deleted document with ID {item_id} from file system")
-            return True
-        
-        except Exception as e:
-            logger.error(f"Error deleting document from file system: {str(e)}")
-            return False
+            except Exception as e:
+                logger.error(f"Error deleting document from file system: {str(e)}")
+                return False
     
     def clear(self) -> bool:
         """
@@ -345,24 +505,54 @@ class FileSystemDocumentStore(InMemoryDocumentStore):
         Returns:
             True if the documents were cleared, False otherwise
         """
-        try:
-            # Delete all document files
-            for doc_id in list(self.documents.keys()):
-                doc_path = self.storage_dir / f"{doc_id}.txt"
-                if doc_path.exists():
-                    os.remove(doc_path)
-            
-            # Clear in-memory store
-            self.documents.clear()
+        with self._lock:
+            try:
+                # Delete all document files
+                for doc_id in list(self.documents):
+                    doc_path = self.documents.path(doc_id)
+                    if doc_path.exists():
+                        os.remove(doc_path)
+                
+                # Clear the store and index
+                self.documents.clear()
+                self.index.clear()
+                
+                # Clear index snapshot and log
+                for path in (self._index_path, self._log_path):
+                    if path.exists():
+                        os.remove(path)
+                self._log_records = 0
+                
+                logger.info("Cleared all documents from file system")
+                return True
             
-            # Clear index
-            index_path = self.storage_dir / "index.json"
-            if index_path.exists():
-                os.remove(index_path)
+            except Exception as e:
+                logger.error(f"Error clearing documents from file system: {str(e)}")
+                return False
+    
+    def search(self, query: str, limit: int = 5) -> List[DocumentItem]:
+        """
+        Search for document items matching a query.
+        
+        Args:
+            query: The search query
+            limit: Maximum number of items to return
             
-            logger.info("Cleared all documents from file system")
-            return True
+        Returns:
+            List of document items matching the query, best match first
+        """
+        with self._lock:
+            return super().search(query, limit)
+    
+    def get_documents_by_type(self, doc_type: str) -> List[DocumentItem]:
+        """
+        Get documents by type, reading content only for matching documents.
         
-        except Exception as e:
-            logger.error(f"Error clearing documents from file system: {str(e)}")
-            return False
+        Args:
+            doc_type: The document type to filter by
+            
+        Returns:
+            List of document items of the specified type
+        """
+        matches = [doc_id for doc_id, entry in self.documents.entries.items() if entry.get("doc_type", "text") == doc_type]
+        return [doc for doc in (self.documents.get(doc_id) for doc_id in matches) if doc is not None]
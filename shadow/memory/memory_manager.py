@@ -295,11 +295,30 @@ class MemoryManager:
         
         # Get relevant entities by performing a simple keyword match on entity names
         # In a more sophisticated implementation, we would use the embedding to find related entities
-        from memory.relational_store import SQLiteRelationalStore
         if isinstance(self.relational_store, SQLiteRelationalStore):
-            # For SQLite store, we need to query differently
-            # This is simplified - in reality you'd want a more sophisticated query
-            pass
+            # Name matching and the one-hop neighbourhood are each a single query
+            matches = self.relational_store.find_entities_in_text(query, limit)
+            neighbours: Dict[str, List[str]] = {}
+            if matches:
+                names = {
+                    entity.item_id: entity.metadata.get("name", "")
+                    for entity, _ in self.relational_store.traverse([m.item_id for m in matches], max_depth=1)
+                }
+                for entity in matches:
+                    neighbours[entity.item_id] = [
+                        names[target_id]
+                        for target_ids in entity.relationships.values()
+                        for target_id in target_ids
+                        if names.get(target_id)
+                    ]
+            for entity in matches:
+                context["relevant_entities"].append({
+                    "name": entity.metadata.get("name", "").lower(),
+                    "type": entity.entity_type,
+                    "description": entity.content,
+                    "properties": entity.properties,
+                    "related": neighbours.get(entity.item_id, [])
+                })
         else:
             # For in-memory store, we can search directly
             if isinstance(self.relational_store, InMemoryRelationalStore):
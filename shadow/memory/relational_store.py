@@ -9,6 +9,8 @@ import logging
 import uuid
 import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Union, Tuple
 from pathlib import Path
@@ -257,80 +259,176 @@ class SQLiteRelationalStore(MemorySystem):
     """
     SQLite implementation of a relational data store.
     
-    This provides persistent storage of relational data using SQLite,
-    suitable for more robust applications.
+    Entities keep their properties in a JSON column queried with JSON1
+    (with expression indexes created per property on first lookup), and
+    relationships live in an edge table that recursive CTEs walk in a
+    single query. Each thread reuses one WAL-mode connection, so
+    statements stay in sqlite3's prepared statement cache.
     """
     
+    SCHEMA_VERSION = 2
+    
+    PRAGMAS = (
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA foreign_keys = ON",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA busy_timeout = 5000",
+    )
+    
+    # Entity columns plus relationships aggregated as [[relation_type, target_id], ...]
+    SELECT_ENTITY = """
+        SELECT e.id, e.entity_type, e.content, e.metadata, e.properties,
+               (SELECT json_group_array(json_array(r.relation_type, r.target_id))
+                FROM relationships r WHERE r.source_id = e.id) AS relationships
+        FROM entities e
+    """
+    UPSERT_ENTITY = (
+        "INSERT INTO entities (id, entity_type, content, metadata, properties) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (id) DO UPDATE SET entity_type = excluded.entity_type, content = excluded.content, "
+        "metadata = excluded.metadata, properties = excluded.properties"
+    )
+    DELETE_RELATIONSHIPS = "DELETE FROM relationships WHERE source_id = ?"
+    INSERT_RELATIONSHIP = (
+        "INSERT OR IGNORE INTO relationships (source_id, relation_type, target_id) VALUES (?, ?, ?)"
+    )
+    
     def __init__(self, db_path: str = "shadow_memory.db"):
         """
         Initialize the SQLite relational store.
         
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file (":memory:" shares one connection)
         """
         super().__init__("SQLiteRelational")
         self.db_path = db_path
+        self._local = threading.local()
+        self._shared: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._indexed_properties: set = set()
         
         # Initialize database
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=self.db_path != ":memory:",
+            cached_statements=256,
+            isolation_level=None  # transactions are managed explicitly
+        )
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's connection (shared for in-memory databases)."""
+        if self.db_path == ":memory:":
+            if self._shared is None:
+                self._shared = self._connect()
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Run statements in one write transaction."""
+        with self._lock:
+            conn = self.connection
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+    
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        conn = self._shared if self.db_path == ":memory:" else getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._shared = None
+            self._local.conn = None
+    
     def _init_database(self):
-        """Initialize the database tables."""
+        """Initialize the database tables, migrating the version 1 layout."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Create entities table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS entities (
-                id TEXT PRIMARY KEY,
-                entity_type TEXT NOT NULL,
-                content TEXT NOT NULL,
-                metadata TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            ''')
-            
-            # Create properties table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS properties (
-                entity_id TEXT NOT NULL,
-                property_name TEXT NOT NULL,
-                property_value TEXT,
-                PRIMARY KEY (entity_id, property_name),
-                FOREIGN KEY (entity_id) REFERENCES entities(id) ON DELETE CASCADE
-            )
-            ''')
-            
-            # Create relationships table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS relationships (
-                source_id TEXT NOT NULL,
-                relation_type TEXT NOT NULL,
-                target_id TEXT NOT NULL,
-                PRIMARY KEY (source_id, relation_type, target_id),
-                FOREIGN KEY (source_id) REFERENCES entities(id) ON DELETE CASCADE,
-                FOREIGN KEY (target_id) REFERENCES entities(id) ON DELETE CASCADE
-            )
-            ''')
+            conn = self.connection
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            
+            with self._transaction() as conn:
+                conn.execute("""
+                CREATE TABLE IF NOT EXISTS entities (
+                    id TEXT PRIMARY KEY,
+                    entity_type TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT,
+                    properties TEXT NOT NULL DEFAULT '{}',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+                
+                if "entities" in tables and version < 2:
+                    # Version 1 kept one row per property in a side table
+                    columns = {row[1] for row in conn.execute("PRAGMA table_info(entities)")}
+                    if "properties" not in columns:
+                        conn.execute("ALTER TABLE entities ADD COLUMN properties TEXT NOT NULL DEFAULT '{}'")
+                    if "properties" in tables:
+                        conn.execute("""
+                        UPDATE entities SET properties = (
+                            SELECT json_group_object(p.property_name, json(p.property_value))
+                            FROM properties p WHERE p.entity_id = entities.id
+                        )
+                        WHERE id IN (SELECT entity_id FROM properties)
+                        """)
+                        conn.execute("DROP TABLE properties")
+                
+                if "relationships" in tables and version < 2:
+                    # Edges may point at entities stored later, so only the source is a foreign key
+                    conn.execute("ALTER TABLE relationships RENAME TO relationships_v1")
+                
+                conn.execute("""
+                CREATE TABLE IF NOT EXISTS relationships (
+                    source_id TEXT NOT NULL,
+                    relation_type TEXT NOT NULL,
+                    target_id TEXT NOT NULL,
+                    PRIMARY KEY (source_id, relation_type, target_id),
+                    FOREIGN KEY (source_id) REFERENCES entities(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
+                """)
+                if "relationships" in tables and version < 2:
+                    conn.execute("""
+                    INSERT OR IGNORE INTO relationships (source_id, relation_type, target_id)
+                    SELECT source_id, relation_type, target_id FROM relationships_v1
+                    WHERE source_id IN (SELECT id FROM entities)
+                    """)
+                    conn.execute("DROP TABLE relationships_v1")
+                
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_type ON entities (entity_type)")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_relationships_target "
+                    "ON relationships (target_id, relation_type)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_relationships_type "
+                    "ON relationships (relation_type, target_id)"
+                )
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
             
-            conn.commit()
-            conn.close()
             logger.info("Initialized SQLite database for relational store")
         
         except Exception as e:
             logger.error(f"Error initializing SQLite database: {str(e)}")
     
-    def store(self, item: Union[RelationalItem, MemoryItem]) -> str:
-        """
-        Store a relational item in the database.
-        
-        Args:
-            item: The relational item to store
-            
-        Returns:
-            ID of the stored item
-        """
+    @staticmethod
+    def _to_relational(item: Union[RelationalItem, MemoryItem]) -> RelationalItem:
         # Convert to RelationalItem if necessary
         if not isinstance(item, RelationalItem):
             entity_type = item.metadata.get("entity_type", "generic")
@@ -343,53 +441,83 @@ class SQLiteRelationalStore(MemorySystem):
         # Generate an ID if one isn't provided
         if item.item_id is None:
             item.item_id = str(uuid.uuid4())
+        return item
+    
+    @staticmethod
+    def _from_row(row: Tuple) -> RelationalItem:
+        entity_id, entity_type, content, metadata_json, properties_json, relationships_json = row[:6]
+        relationships: Dict[str, List[str]] = {}
+        for relation_type, target_id in json.loads(relationships_json or "[]"):
+            relationships.setdefault(relation_type, []).append(target_id)
+        return RelationalItem(
+            content=content,
+            entity_type=entity_type,
+            properties=json.loads(properties_json) if properties_json else {},
+            relationships=relationships,
+            metadata=json.loads(metadata_json) if metadata_json else {},
+            item_id=entity_id
+        )
+    
+    def _select(self, where: str = "", params: Tuple = ()) -> List[RelationalItem]:
+        rows = self.connection.execute(f"{self.SELECT_ENTITY} {where}", params).fetchall()
+        return [self._from_row(row) for row in rows]
+    
+    def store(self, item: Union[RelationalItem, MemoryItem]) -> str:
+        """
+        Store a relational item in the database.
         
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Store entity
-            cursor.execute(
-                "INSERT OR REPLACE INTO entities (id, entity_type, content, metadata) VALUES (?, ?, ?, ?)",
-                (
-                    item.item_id,
-                    item.entity_type,
-                    item.content,
-                    json.dumps(item.metadata)
-                )
-            )
-            
-            # Store properties
-            for prop_name, prop_value in item.properties.items():
-                cursor.execute(
-                    "INSERT OR REPLACE INTO properties (entity_id, property_name, property_value) VALUES (?, ?, ?)",
-                    (
-                        item.item_id,
-                        prop_name,
-                        json.dumps(prop_value)
-                    )
-                )
-            
-            # Store relationships
-            for relation_type, target_ids in item.relationships.items():
-                for target_id in target_ids:
-                    cursor.execute(
-                        "INSERT OR REPLACE INTO relationships (source_id, relation_type, target_id) VALUES (?, ?, ?)",
-                        (
-                            item.item_id,
-                            relation_type,
-                            target_id
-                        )
-                    )
+        Args:
+            item: The relational item to store
             
-            conn.commit()
-            conn.close()
+        Returns:
+            ID of the stored item
+        """
+        item = self._to_relational(item)
+        try:
+            self.store_batch([item])
             logger.info(f"Stored relational entity with ID {item.item_id} in SQLite database")
-            return item.item_id
-        
         except Exception as e:
             logger.error(f"Error storing relational entity in SQLite database: {str(e)}")
-            return item.item_id
+        return item.item_id
+    
+    def store_batch(self, items: List[Union[RelationalItem, MemoryItem]]) -> List[str]:
+        """
+        Store many relational items in one transaction.
+        
+        Args:
+            items: The items to store
+            
+        Returns:
+            IDs of the stored items
+        """
+        items = [self._to_relational(item) for item in items]
+        with self._transaction() as conn:
+            conn.executemany(self.UPSERT_ENTITY, [
+                (item.item_id, item.entity_type, item.content, json.dumps(item.metadata), json.dumps(item.properties))
+                for item in items
+            ])
+            conn.executemany(self.DELETE_RELATIONSHIPS, [(item.item_id,) for item in items])
+            conn.executemany(self.INSERT_RELATIONSHIP, [
+                (item.item_id, relation_type, target_id)
+                for item in items
+                for relation_type, target_ids in item.relationships.items()
+                for target_id in target_ids
+            ])
+        return [item.item_id for item in items]
+    
+    def add_relationships(self, edges: List[Tuple[str, str, str]]) -> int:
+        """
+        Add (source_id, relation_type, target_id) edges in one transaction.
+        
+        Args:
+            edges: Relationships to add
+            
+        Returns:
+            Number of edges submitted
+        """
+        with self._transaction() as conn:
+            conn.executemany(self.INSERT_RELATIONSHIP, edges)
+        return len(edges)
     
     def retrieve(self, item_id: str) -> Optional[RelationalItem]:
         """
@@ -402,62 +530,27 @@ class SQLiteRelationalStore(MemorySystem):
             The retrieved item or None if not found
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get entity
-            cursor.execute(
-                "SELECT id, entity_type, content, metadata FROM entities WHERE id = ?",
-                (item_id,)
-            )
-            entity_row = cursor.fetchone()
-            
-            if not entity_row:
-                conn.close()
-                return None
-            
-            # Parse entity data
-            entity_id, entity_type, content, metadata_json = entity_row
-            metadata = json.loads(metadata_json) if metadata_json else {}
-            
-            # Get properties
-            properties = {}
-            cursor.execute(
-                "SELECT property_name, property_value FROM properties WHERE entity_id = ?",
-                (item_id,)
-            )
-            for prop_row in cursor.fetchall():
-                prop_name, prop_value_json = prop_row
-                properties[prop_name] = json.loads(prop_value_json) if prop_value_json else None
-            
-            # Get relationships
-            relationships = {}
-            cursor.execute(
-                "SELECT relation_type, target_id FROM relationships WHERE source_id = ?",
-                (item_id,)
-            )
-            for rel_row in cursor.fetchall():
-                relation_type, target_id = rel_row
-                if relation_type not in relationships:
-                    relationships[relation_type] = []
-                relationships[relation_type].append(target_id)
-            
-            conn.close()
-            
-            # Create and return entity
-            return RelationalItem(
-                content=content,
-                entity_type=entity_type,
-                properties=properties,
-                relationships=relationships,
-                metadata=metadata,
-                item_id=entity_id
-            )
+            items = self._select("WHERE e.id = ?", (item_id,))
+            return items[0] if items else None
         
         except Exception as e:
             logger.error(f"Error retrieving relational entity from SQLite database: {str(e)}")
             return None
     
+    def retrieve_many(self, item_ids: List[str]) -> List[RelationalItem]:
+        """
+        Retrieve several relational items in one query.
+        
+        Args:
+            item_ids: IDs of the items to retrieve
+            
+        Returns:
+            The items found, in no particular order
+        """
+        if not item_ids:
+            return []
+        return self._select("WHERE e.id IN (SELECT value FROM json_each(?))", (json.dumps(list(item_ids)),))
+    
     def delete(self, item_id: str) -> bool:
         """
         Delete a relational item from the database.
@@ -469,20 +562,14 @@ class SQLiteRelationalStore(MemorySystem):
             True if the item was deleted, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                # Cascade removes outgoing edges; incoming edges are removed explicitly
+                deleted = conn.execute("DELETE FROM entities WHERE id = ?", (item_id,)).rowcount
+                if deleted:
+                    conn.execute("DELETE FROM relationships WHERE target_id = ?", (item_id,))
             
-            # Check if entity exists
-            cursor.execute("SELECT id FROM entities WHERE id = ?", (item_id,))
-            if not cursor.fetchone():
-                conn.close()
+            if not deleted:
                 return False
-            
-            # Delete entity (cascade will delete properties and relationships)
-            cursor.execute("DELETE FROM entities WHERE id = ?", (item_id,))
-            
-            conn.commit()
-            conn.close()
             logger.info(f"Deleted relational entity with ID {item_id} from SQLite database")
             return True
         
@@ -498,16 +585,11 @@ class SQLiteRelationalStore(MemorySystem):
             True if the items were cleared, False otherwise
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Clear all tables
-            cursor.execute("DELETE FROM relationships")
-            cursor.execute("DELETE FROM properties")
-            cursor.execute("DELETE FROM entities")
+            with self._transaction() as conn:
+                # Clear all tables
+                conn.execute("DELETE FROM relationships")
+                conn.execute("DELETE FROM entities")
             
-            conn.commit()
-            conn.close()
             logger.info("Cleared all relational entities from SQLite database")
             return True
         
@@ -526,28 +608,40 @@ class SQLiteRelationalStore(MemorySystem):
             List of entities of the specified type
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get entities by type
-            cursor.execute(
-                "SELECT id FROM entities WHERE entity_type = ?",
-                (entity_type,)
-            )
-            entity_ids = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            
-            # Retrieve each entity
-            return [self.retrieve(entity_id) for entity_id in entity_ids if entity_id]
+            return self._select("WHERE e.entity_type = ?", (entity_type,))
         
         except Exception as e:
             logger.error(f"Error querying entities by type from SQLite database: {str(e)}")
             return []
     
+    @staticmethod
+    def _property_path(property_name: str) -> str:
+        return '$."' + property_name.replace('"', '""') + '"'
+    
+    def ensure_property_index(self, property_name: str) -> None:
+        """
+        Create an expression index for lookups on one property.
+        
+        Args:
+            property_name: Name of the property to index
+        """
+        if property_name in self._indexed_properties:
+            return
+        path = self._property_path(property_name).replace("'", "''")
+        index_name = "idx_entities_prop_" + "".join(c if c.isalnum() else "_" for c in property_name)
+        with self._transaction() as conn:
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS \"{index_name}\" "
+                f"ON entities (json_extract(properties, '{path}'))"
+            )
+        self._indexed_properties.add(property_name)
+    
     def query_by_property(self, property_name: str, property_value: Any) -> List[RelationalItem]:
         """
         Query entities by property from the database.
         
+        The property gets an expression index on its first lookup.
+        
         Args:
             property_name: Name of the property to match
             property_value: Value of the property to match
@@ -556,19 +650,17 @@ class SQLiteRelationalStore(MemorySystem):
             List of entities with the specified property value
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get entities by property
-            cursor.execute(
-                "SELECT entity_id FROM properties WHERE property_name = ? AND property_value = ?",
-                (property_name, json.dumps(property_value))
+            self.ensure_property_index(property_name)
+            path = self._property_path(property_name).replace("'", "''")
+            if isinstance(property_value, (dict, list)):
+                # json_extract returns containers as minified JSON text
+                value = json.dumps(property_value, separators=(",", ":"))
+            else:
+                value = property_value
+            return self._select(
+                f"WHERE json_extract(e.properties, '{path}') = ?",
+                (value,)
             )
-            entity_ids = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            
-            # Retrieve each entity
-            return [self.retrieve(entity_id) for entity_id in entity_ids if entity_id]
         
         except Exception as e:
             logger.error(f"Error querying entities by property from SQLite database: {str(e)}")
@@ -586,27 +678,104 @@ class SQLiteRelationalStore(MemorySystem):
             List of entities with the specified relationship
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get entities by relationship
             if target_id:
-                cursor.execute(
-                    "SELECT source_id FROM relationships WHERE relation_type = ? AND target_id = ?",
+                return self._select(
+                    "WHERE e.id IN (SELECT source_id FROM relationships WHERE relation_type = ? AND target_id = ?)",
                     (relation_type, target_id)
                 )
-            else:
-                cursor.execute(
-                    "SELECT source_id FROM relationships WHERE relation_type = ?",
-                    (relation_type,)
-                )
+            return self._select(
+                "WHERE e.id IN (SELECT source_id FROM relationships WHERE relation_type = ?)",
+                (relation_type,)
+            )
+        
+        except Exception as e:
+            logger.error(f"Error querying entities by relationship from SQLite database: {str(e)}")
+            return []
+    
+    def traverse(
+        self,
+        start_ids: Union[str, List[str]],
+        max_depth: int = 2,
+        relation_types: Optional[List[str]] = None,
+        include_start: bool = False
+    ) -> List[Tuple[RelationalItem, int]]:
+        """
+        Walk outgoing relationships from one or more entities.
+        
+        The whole walk is one recursive CTE; each reachable entity is returned
+        once with its shortest distance from the start set.
+        
+        Args:
+            start_ids: Entity ID or IDs to start from
+            max_depth: Maximum number of hops
+            relation_types: Optional relationship types to follow
+            include_start: Include the start entities at depth 0
             
-            entity_ids = [row[0] for row in cursor.fetchall()]
-            conn.close()
+        Returns:
+            List of (entity, depth) tuples ordered by depth
+        """
+        if isinstance(start_ids, str):
+            start_ids = [start_ids]
+        if not start_ids:
+            return []
+        
+        type_filter = ""
+        params: List[Any] = [json.dumps(list(start_ids)), max_depth]
+        if relation_types:
+            type_filter = "AND r.relation_type IN (SELECT value FROM json_each(?))"
+            params.append(json.dumps(list(relation_types)))
+        
+        query = f"""
+            WITH RECURSIVE walk(id, depth) AS (
+                SELECT value, 0 FROM json_each(?)
+                UNION
+                SELECT r.target_id, w.depth + 1
+                FROM walk w JOIN relationships r ON r.source_id = w.id
+                WHERE w.depth < ? {type_filter}
+            ),
+            reached AS (SELECT id, MIN(depth) AS depth FROM walk GROUP BY id)
+            SELECT e.id, e.entity_type, e.content, e.metadata, e.properties,
+                   (SELECT json_group_array(json_array(r.relation_type, r.target_id))
+                    FROM relationships r WHERE r.source_id = e.id) AS relationships,
+                   reached.depth
+            FROM reached JOIN entities e ON e.id = reached.id
+            {"" if include_start else "WHERE reached.depth > 0"}
+            ORDER BY reached.depth
+        """
+        try:
+            rows = self.connection.execute(query, params).fetchall()
+            return [(self._from_row(row), row[6]) for row in rows]
+        
+        except Exception as e:
+            logger.error(f"Error traversing relationships in SQLite database: {str(e)}")
+            return []
+    
+    def find_entities_in_text(self, text: str, limit: int = 10) -> List[RelationalItem]:
+        """
+        Find entities whose name appears in the text or contains one of its words.
+        
+        Args:
+            text: Text to match entity names against
+            limit: Maximum number of entities to return
             
-            # Retrieve each entity
-            return [self.retrieve(entity_id) for entity_id in entity_ids if entity_id]
+        Returns:
+            Matching entities
+        """
+        text = text.lower()
+        words = json.dumps(text.split())
+        try:
+            return self._select(
+                """
+                WHERE json_extract(e.metadata, '$.name') IS NOT NULL
+                  AND json_extract(e.metadata, '$.name') != ''
+                  AND (instr(?, lower(json_extract(e.metadata, '$.name'))) > 0
+                       OR EXISTS (SELECT 1 FROM json_each(?) w
+                                  WHERE instr(lower(json_extract(e.metadata, '$.name')), w.value) > 0))
+                LIMIT ?
+                """,
+                (text, words, limit)
+            )
         
         except Exception as e:
-            logger.error(f"Error querying entities by relationship from SQLite database: {str(e)}")
+            logger.error(f"Error searching entity names in SQLite database: {str(e)}")
             return []
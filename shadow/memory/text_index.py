@@ -0,0 +1,358 @@
+"""
+Full-text Index Implementation for the Shadow platform.
+
+This module provides a tokenized inverted index with BM25 ranking, built
+from append-only segments that are periodically merged, with optional
+on-disk persistence that is only read when the index is first searched.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger("shadow.memory.text_index")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class IndexSegment:
+    """
+    Immutable block of postings: term -> {docno: term frequency}.
+    """
+
+    def __init__(self, name: Optional[str] = None, postings: Dict[str, Dict[int, int]] = None):
+        """
+        Initialize an index segment.
+
+        Args:
+            name: File name of the segment once written
+            postings: Initial postings
+        """
+        self.name = name or f"seg_{uuid.uuid4().hex[:12]}"
+        self.postings: Dict[str, Dict[int, int]] = postings or {}
+        self.doc_count = 0
+
+    def add(self, docno: int, terms: Counter) -> None:
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[docno] = tf
+        self.doc_count += 1
+
+    def to_json(self) -> Dict:
+        return {
+            "doc_count": self.doc_count,
+            "postings": {term: [[docno, tf] for docno, tf in docs.items()] for term, docs in self.postings.items()},
+        }
+
+    @classmethod
+    def from_json(cls, name: str, data: Dict) -> "IndexSegment":
+        segment = cls(name, {term: {docno: tf for docno, tf in docs} for term, docs in data["postings"].items()})
+        segment.doc_count = data["doc_count"]
+        return segment
+
+
+class BM25Index:
+    """
+    Inverted index with BM25 ranking.
+
+    New documents go into an in-memory buffer that is sealed into an
+    immutable segment every `segment_size` documents; once there are more
+    than `max_segments` segments the smallest are merged, dropping postings
+    of deleted documents. Every add gets a fresh document number, so deletes
+    and updates never touch existing segments. Search cost depends on the
+    posting lists of the query terms, not on the size of the corpus.
+
+    With a directory, sealed segments are written as files and listed in a
+    manifest. They are loaded on the first search; documents added after
+    the last seal are re-indexed at that point through the `reindex`
+    callback, which is expected to `add` them again.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        reindex: Optional[Callable[[str], None]] = None,
+        segment_size: int = 1000,
+        max_segments: int = 8,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Initialize a BM25 index.
+
+        Args:
+            directory: Optional directory for segment files
+            reindex: Re-adds a document ID whose postings were not persisted
+            segment_size: Documents per sealed segment
+            max_segments: Segments kept before merging
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.directory = Path(directory) if directory else None
+        self.reindex = reindex
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.k1 = k1
+        self.b = b
+
+        self._segments: List[IndexSegment] = []
+        self._buffer = IndexSegment()
+        self._doc_ids: Dict[int, str] = {}
+        self._docnos: Dict[str, int] = {}
+        self._lengths: Dict[int, Optional[int]] = {}
+        self._total_length = 0
+        self._next_docno = 0
+        self._next_pending = -1
+        self._sealed_upto = -1
+        self._loaded = self.directory is None
+        self._lock = threading.RLock()
+
+        if self.directory is not None:
+            manifest = self._read_manifest()
+            self._sealed_upto = manifest.get("sealed_upto", -1)
+            self._next_docno = self._sealed_upto + 1
+            self._segment_names = manifest.get("segments", [])
+
+    def __len__(self) -> int:
+        return len(self._docnos)
+
+    @property
+    def next_docno(self) -> int:
+        return self._next_docno
+
+    # --- document bookkeeping ----------------------------------------------
+
+    def register(self, doc_id: str, docno: Optional[int], length: Optional[int]) -> None:
+        """
+        Register a document already covered by persisted state.
+
+        Documents without a number or beyond the last sealed segment are
+        re-indexed when the index is loaded.
+
+        Args:
+            doc_id: Document ID
+            docno: Document number recorded when it was indexed
+            length: Token count recorded when it was indexed
+        """
+        with self._lock:
+            if docno is None or docno > self._sealed_upto:
+                # Not in any segment: park under a placeholder number until load
+                docno, length = self._next_pending, None
+                self._next_pending -= 1
+            self._doc_ids[docno] = doc_id
+            self._docnos[doc_id] = docno
+            self._lengths[docno] = length
+            self._total_length += length or 0
+
+    def add(self, doc_id: str, text: str) -> Tuple[int, int]:
+        """
+        Index a document, replacing any earlier version.
+
+        Args:
+            doc_id: Document ID
+            text: Text to index
+
+        Returns:
+            Tuple of (document number, token count)
+        """
+        with self._lock:
+            self.remove(doc_id)
+            terms = Counter(tokenize(text))
+            length = sum(terms.values())
+            docno = self._next_docno
+            self._next_docno += 1
+
+            self._buffer.add(docno, terms)
+            self._doc_ids[docno] = doc_id
+            self._docnos[doc_id] = docno
+            self._lengths[docno] = length
+            self._total_length += length
+
+            if self._buffer.doc_count >= self.segment_size:
+                self._seal()
+            return docno, length
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Remove a document; its postings are dropped at the next merge.
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            True if the document was indexed
+        """
+        with self._lock:
+            docno = self._docnos.pop(doc_id, None)
+            if docno is None:
+                return False
+            del self._doc_ids[docno]
+            self._total_length -= self._lengths.pop(docno) or 0
+            return True
+
+    def clear(self) -> None:
+        """Remove all documents and segment files."""
+        with self._lock:
+            if self.directory is not None and self.directory.exists():
+                for path in self.directory.glob("*.json"):
+                    path.unlink()
+            self._segments = []
+            self._segment_names = []
+            self._buffer = IndexSegment()
+            self._doc_ids.clear()
+            self._docnos.clear()
+            self._lengths.clear()
+            self._total_length = 0
+            self._sealed_upto = -1
+            self._loaded = True
+
+    # --- segments -----------------------------------------------------------
+
+    def _read_manifest(self) -> Dict:
+        path = self.directory / "manifest.json"
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_json(self, name: str, data: Dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    def _write_manifest(self) -> None:
+        self._write_json("manifest.json", {
+            "segments": [segment.name for segment in self._segments],
+            "sealed_upto": self._sealed_upto,
+        })
+
+    def _seal(self) -> None:
+        """Turn the buffer into an immutable segment, merging if there are too many."""
+        if not self._buffer.doc_count:
+            return
+        self._ensure_loaded()
+        segment = self._buffer
+        self._buffer = IndexSegment()
+        self._segments.append(segment)
+        self._sealed_upto = self._next_docno - 1
+
+        if self.directory is not None:
+            self._write_json(f"{segment.name}.json", segment.to_json())
+        if len(self._segments) > self.max_segments:
+            self._merge()
+        elif self.directory is not None:
+            self._write_manifest()
+
+    def _merge(self) -> None:
+        """Merge the smallest segments into one, dropping deleted documents."""
+        count = len(self._segments) - self.max_segments + 1
+        victims = sorted(self._segments, key=lambda segment: segment.doc_count)[:max(2, count)]
+        merged = IndexSegment()
+        live = self._doc_ids
+        docs = set()
+        for segment in victims:
+            for term, postings in segment.postings.items():
+                for docno, tf in postings.items():
+                    if docno in live:
+                        merged.postings.setdefault(term, {})[docno] = tf
+                        docs.add(docno)
+        merged.doc_count = len(docs)
+
+        names = {segment.name for segment in victims}
+        self._segments = [segment for segment in self._segments if segment.name not in names] + [merged]
+        if self.directory is not None:
+            self._write_json(f"{merged.name}.json", merged.to_json())
+            self._write_manifest()
+            for name in names:
+                path = self.directory / f"{name}.json"
+                if path.exists():
+                    path.unlink()
+        logger.info(f"Merged {len(victims)} index segments into one with {merged.doc_count} documents")
+
+    def flush(self) -> None:
+        """Seal the buffer so every document is covered by a persisted segment."""
+        with self._lock:
+            self._seal()
+
+    def _ensure_loaded(self) -> None:
+        """Load segment files and re-index documents added after the last seal."""
+        if self._loaded:
+            return
+        self._loaded = True
+        for name in self._segment_names:
+            path = self.directory / f"{name}.json"
+            if path.exists():
+                with open(path) as f:
+                    self._segments.append(IndexSegment.from_json(name, json.load(f)))
+
+        pending = [self._doc_ids[docno] for docno, length in self._lengths.items() if length is None]
+        for doc_id in pending:
+            if self.reindex is not None:
+                self.reindex(doc_id)
+            if self._lengths.get(self._docnos.get(doc_id)) is None:
+                self.remove(doc_id)
+        logger.info(f"Loaded {len(self._segments)} index segments, re-indexed {len(pending)} documents")
+
+    # --- search -------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a query with BM25.
+
+        Args:
+            query: The search query
+            limit: Maximum number of results
+
+        Returns:
+            List of (document ID, score) tuples, best first
+        """
+        with self._lock:
+            self._ensure_loaded()
+            terms = set(tokenize(query))
+            total_docs = len(self._docnos)
+            if not terms or not total_docs:
+                return []
+            average_length = self._total_length / total_docs or 1.0
+            segments = self._segments + [self._buffer]
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = [
+                    (docno, tf)
+                    for segment in segments
+                    for docno, tf in segment.postings.get(term, {}).items()
+                    if docno in self._doc_ids
+                ]
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for docno, tf in postings:
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[docno] / average_length)
+                    scores[docno] = scores.get(docno, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+            best = heapq.nlargest(limit, scores.items(), key=lambda pair: pair[1])
+            return [(self._doc_ids[docno], score) for docno, score in best]
@@ -5,13 +5,21 @@ This module provides a vector-based memory system for semantic search functional
 with both in-memory implementation and extensibility for external vector databases.
 """
 
+import json
 import logging
+import threading
+import time
 import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Union, Tuple
 import numpy as np
 import os
 
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -32,16 +40,118 @@ class InMemoryVectorStore(VectorMemorySystem):
     """
     In-memory implementation of a vector-based memory system.
     
-    This provides a simple vector store using numpy for vector operations,
-    suitable for development and testing. For production use, this should
-    be replaced with a proper vector database.
+    Embeddings live in one contiguous float32 matrix with L2-normalized rows,
+    so a search is a single matrix product followed by an argpartition
+    top-k. Large collections can additionally use an HNSW graph (when
+    hnswlib is installed), metadata filters are answered from cached
+    boolean bitmaps, and with a persist directory the matrix is saved to
+    disk and memory-mapped back on startup.
     """
     
-    def __init__(self):
-        """Initialize the in-memory vector store."""
+    def __init__(
+        self,
+        persist_dir: Optional[str] = None,
+        dimension: Optional[int] = None,
+        hnsw_threshold: int = 50_000,
+        block_size: int = 65_536
+    ):
+        """
+        Initialize the in-memory vector store.
+        
+        Args:
+            persist_dir: Optional directory to load from and save to
+            dimension: Embedding dimension (inferred from the first vector if omitted)
+            hnsw_threshold: Collection size from which an HNSW graph is used
+            block_size: Rows scored per matrix product in brute-force search
+        """
         super().__init__("InMemoryVector")
+        self.persist_dir = persist_dir
+        self.dimension = dimension
+        self.hnsw_threshold = hnsw_threshold
+        self.block_size = block_size
+        
         self.items: Dict[str, MemoryItem] = {}
-        self.vectors: Dict[str, np.ndarray] = {}
+        self._matrix = np.zeros((0, dimension or 0), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._count = 0
+        self._deleted = 0
+        self._bitmaps: Dict[Tuple[str, Any], np.ndarray] = {}
+        self._hnsw = None
+        self._hnsw_builder: Optional[threading.Thread] = None
+        self._generation = 0  # bumped whenever row numbers are invalidated
+        self._lock = threading.RLock()
+        
+        if persist_dir and os.path.exists(os.path.join(persist_dir, "vectors.npy")):
+            self.load(persist_dir)
+    
+    def __len__(self) -> int:
+        return self._count - self._deleted
+    
+    # --- matrix maintenance -------------------------------------------------
+    
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+        matrix[:self._count] = self._matrix[:self._count]
+        self._matrix = matrix
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        self._alive = alive
+        for key, bitmap in self._bitmaps.items():
+            grown = np.zeros(new_capacity, dtype=bool)
+            grown[:bitmap.shape[0]] = bitmap
+            self._bitmaps[key] = grown
+        if self._hnsw is not None:
+            self._hnsw.resize_index(new_capacity)
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    @staticmethod
+    def _filter_values(value: Any) -> List[Any]:
+        """Hashable values an item contributes to a metadata bitmap."""
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        return [v for v in values if isinstance(v, (str, int, float, bool)) or v is None]
+    
+    def _index_metadata(self, row: int, item: MemoryItem, present: bool) -> None:
+        for (key, value), bitmap in self._bitmaps.items():
+            if key in item.metadata and value in self._filter_values(item.metadata[key]):
+                bitmap[row] = present
+    
+    def _put(self, item: MemoryItem, vector: np.ndarray) -> None:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if self.dimension is None:
+            self.dimension = vector.shape[0]
+            self._matrix = np.zeros((0, self.dimension), dtype=np.float32)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(f"Embedding dimension {vector.shape[0]} does not match store dimension {self.dimension}")
+        
+        row = self._rows.get(item.item_id)
+        if row is None:
+            row = self._count
+            self._ensure_capacity(row + 1)
+            self._row_ids.append(item.item_id)
+            self._rows[item.item_id] = row
+            self._count += 1
+        else:
+            self._index_metadata(row, self.items[item.item_id], False)
+        
+        self._matrix[row] = self._normalize(vector)
+        self._alive[row] = True
+        self.items[item.item_id] = item
+        self._index_metadata(row, item, True)
+        if self._hnsw is not None:
+            self._hnsw.add_items(self._matrix[row:row + 1], np.array([row]))
+    
+    # --- MemorySystem interface ---------------------------------------------
     
     def store(self, item: MemoryItem) -> str:
         """
@@ -59,15 +169,15 @@ class InMemoryVectorStore(VectorMemorySystem):
         if item.item_id is None:
             item.item_id = str(uuid.uuid4())
         
-        # Store the item
-        self.items[item.item_id] = item
-        
-        # In a real implementation, we would compute the embedding here
-        # For now, we'll just store a random vector if vectors doesn't exist
-        if item.item_id not in self.vectors:
-            # Generate a random embedding (this is just a placeholder)
-            # In production, this would use a real embedding model
-            self.vectors[item.item_id] = np.random.randn(384)  # Common embedding dimension
+        with self._lock:
+            if item.item_id in self._rows:
+                self._index_metadata(self._rows[item.item_id], self.items[item.item_id], False)
+                self.items[item.item_id] = item
+                self._index_metadata(self._rows[item.item_id], item, True)
+            else:
+                # In production this would use a real embedding model; a random
+                # placeholder keeps the item searchable until then
+                self._put(item, np.random.randn(self.dimension or 384))
         
         logger.info(f"Stored memory item with ID {item.item_id}")
         return item.item_id
@@ -87,13 +197,36 @@ class InMemoryVectorStore(VectorMemorySystem):
         if item.item_id is None:
             item.item_id = str(uuid.uuid4())
         
-        # Store the item and its embedding
-        self.items[item.item_id] = item
-        self.vectors[item.item_id] = np.array(embedding, dtype=np.float32)
+        with self._lock:
+            self._put(item, embedding)
         
         logger.info(f"Stored memory item with ID {item.item_id} and pre-computed embedding")
         return item.item_id
     
+    def store_batch(self, items: List[MemoryItem], embeddings: Union[List[List[float]], np.ndarray]) -> List[str]:
+        """
+        Store many memory items with pre-computed embeddings.
+        
+        Args:
+            items: The memory items to store
+            embeddings: One embedding per item
+            
+        Returns:
+            IDs of the stored items
+        """
+        if len(items) != len(embeddings):
+            raise ValueError("Number of items and embeddings must match")
+        
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        with self._lock:
+            for item, vector in zip(items, vectors):
+                if item.item_id is None:
+                    item.item_id = str(uuid.uuid4())
+                self._put(item, vector)
+        
+        logger.info(f"Stored {len(items)} memory items with pre-computed embeddings")
+        return [item.item_id for item in items]
+    
     def retrieve(self, item_id: str) -> Optional[MemoryItem]:
         """
         Retrieve a memory item by ID.
@@ -116,12 +249,17 @@ class InMemoryVectorStore(VectorMemorySystem):
         Returns:
             True if the item was deleted, False otherwise
         """
-        if item_id in self.items:
-            del self.items[item_id]
-            if item_id in self.vectors:
-                del self.vectors[item_id]
-            logger.info(f"Deleted memory item with ID {item_id}")
-            return True
+        with self._lock:
+            if item_id in self.items:
+                row = self._rows.pop(item_id)
+                self._index_metadata(row, self.items.pop(item_id), False)
+                self._alive[row] = False
+                self._row_ids[row] = None
+                self._deleted += 1
+                if self._hnsw is not None:
+                    self._hnsw.mark_deleted(row)
+                logger.info(f"Deleted memory item with ID {item_id}")
+                return True
         
         logger.warning(f"Attempted to delete non-existent memory item with ID {item_id}")
         return False
@@ -133,8 +271,17 @@ class InMemoryVectorStore(VectorMemorySystem):
         Returns:
             True if the memory was cleared, False otherwise
         """
-        self.items.clear()
-        self.vectors.clear()
+        with self._lock:
+            self.items.clear()
+            self._matrix = np.zeros((0, self.dimension or 0), dtype=np.float32)
+            self._alive = np.zeros(0, dtype=bool)
+            self._row_ids = []
+            self._rows = {}
+            self._count = 0
+            self._deleted = 0
+            self._bitmaps = {}
+            self._hnsw = None
+            self._generation += 1
         logger.info("Cleared all memory items")
         return True
     
@@ -165,38 +312,292 @@ class InMemoryVectorStore(VectorMemorySystem):
         
         return results
     
-    def search_by_vector(self, query_vector: List[float], limit: int = 5) -> List[Tuple[MemoryItem, float]]:
+    # --- vector search ------------------------------------------------------
+    
+    def _bitmap(self, key: str, value: Any) -> np.ndarray:
+        """Rows whose metadata matches key == value, built on first use."""
+        bitmap = self._bitmaps.get((key, value))
+        if bitmap is None:
+            bitmap = np.zeros(self._matrix.shape[0], dtype=bool)
+            for item_id, row in self._rows.items():
+                metadata = self.items[item_id].metadata
+                if key in metadata and value in self._filter_values(metadata[key]):
+                    bitmap[row] = True
+            self._bitmaps[(key, value)] = bitmap
+        return bitmap
+    
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Combine metadata filters into a row mask.
+        
+        Keys are ANDed; a list value matches any of its elements.
+        """
+        if not filters:
+            return None
+        mask = self._alive[:self._count].copy()
+        for key, wanted in filters.items():
+            options = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            allowed = np.zeros(self._count, dtype=bool)
+            for value in options:
+                allowed |= self._bitmap(key, value)[:self._count]
+            mask &= allowed
+        return mask
+    
+    def _maybe_build_hnsw(self) -> None:
+        """Start building the HNSW graph in the background once the store is large enough."""
+        if self._hnsw is not None or self._hnsw_builder is not None:
+            return
+        if hnswlib is None or len(self) < self.hnsw_threshold:
+            return
+        self._hnsw_builder = threading.Thread(target=self._build_hnsw, name="hnsw-build", daemon=True)
+        self._hnsw_builder.start()
+    
+    def _build_hnsw(self) -> None:
+        """
+        Build the graph from a snapshot without holding the lock.
+        
+        Searches keep using the exact scan meanwhile. Rows written after the
+        snapshot are added, and rows deleted since are marked, before the
+        graph is swapped in.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            generation = self._generation
+            snapshot = self._count
+            matrix = self._matrix
+            rows = np.nonzero(self._alive[:snapshot])[0]
+        try:
+            index = hnswlib.Index(space="ip", dim=self.dimension)
+            index.init_index(max_elements=max(matrix.shape[0], snapshot), ef_construction=200, M=16)
+            index.add_items(matrix[rows], rows)
+            
+            with self._lock:
+                if generation != self._generation:
+                    return
+                if self._matrix.shape[0] > index.get_max_elements():
+                    index.resize_index(self._matrix.shape[0])
+                if self._count > snapshot:
+                    index.add_items(self._matrix[snapshot:self._count], np.arange(snapshot, self._count))
+                for row in rows[~self._alive[rows]]:
+                    index.mark_deleted(int(row))
+                for row in np.nonzero(~self._alive[snapshot:self._count])[0] + snapshot:
+                    index.mark_deleted(int(row))
+                self._hnsw = index
+            logger.info(f"Built HNSW graph over {len(rows)} vectors in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            logger.error(f"Failed to build HNSW graph: {e}")
+        finally:
+            self._hnsw_builder = None
+    
+    def _brute_force(self, queries: np.ndarray, limit: int, mask: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k over the matrix, scored block by block."""
+        if mask is None and self._deleted:
+            mask = self._alive[:self._count]
+        candidates = np.nonzero(mask)[0] if mask is not None else None
+        total = self._count if candidates is None else candidates.shape[0]
+        k = min(limit, total)
+        best_rows = np.empty((queries.shape[0], 0), dtype=np.int64)
+        best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+        if k == 0:
+            return best_rows, best_scores
+        
+        for start in range(0, total, self.block_size):
+            if candidates is None:
+                rows = np.arange(start, min(start + self.block_size, total))
+                block = self._matrix[start:start + rows.shape[0]]
+            else:
+                rows = candidates[start:start + self.block_size]
+                block = self._matrix[rows]
+            scores = queries @ block.T
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+                block_rows = rows[top]
+            else:
+                block_rows = np.broadcast_to(rows, scores.shape)
+            best_rows = np.concatenate([best_rows, block_rows], axis=1)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+        
+        order = np.argsort(-best_scores, axis=1)
+        return np.take_along_axis(best_rows, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+    
+    def search_by_vectors(
+        self,
+        query_vectors: Union[List[List[float]], np.ndarray],
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Tuple[MemoryItem, float]]]:
+        """
+        Search for several query vectors at once.
+        
+        Unfiltered searches over large collections use the HNSW graph when
+        available; everything else, including filtered searches, is an exact
+        scan restricted to the rows the filter bitmaps allow.
+        
+        Args:
+            query_vectors: Query vectors, one per row
+            limit: Maximum number of items to return per query
+            filters: Optional metadata equality filters
+            
+        Returns:
+            For each query, tuples of memory items and cosine similarity scores
+        """
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        with self._lock:
+            if not len(self) or limit <= 0:
+                return [[] for _ in range(queries.shape[0])]
+            if queries.shape[1] != self.dimension:
+                raise ValueError(f"Query dimension {queries.shape[1]} does not match store dimension {self.dimension}")
+            queries = self._normalize(queries)
+            mask = self._filter_mask(filters)
+            
+            self._maybe_build_hnsw()
+            if self._hnsw is not None and mask is None:
+                k = min(limit, len(self))
+                self._hnsw.set_ef(max(64, 2 * k))
+                rows, distances = self._hnsw.knn_query(queries, k=k)
+                scores = 1.0 - distances
+            else:
+                rows, scores = self._brute_force(queries, limit, mask)
+            
+            return [
+                [(self.items[self._row_ids[row]], float(score)) for row, score in zip(row_list, score_list)]
+                for row_list, score_list in zip(rows, scores)
+            ]
+    
+    def search_by_vector(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[MemoryItem, float]]:
         """
         Search for memory items by vector similarity.
         
         Args:
             query_vector: The query vector
             limit: Maximum number of items to return
+            filters: Optional metadata equality filters
             
         Returns:
             List of tuples containing memory items and similarity scores
         """
-        query_vector_np = np.array(query_vector, dtype=np.float32)
+        return self.search_by_vectors([query_vector], limit, filters)[0]
+    
+    # --- persistence --------------------------------------------------------
+    
+    def save(self, persist_dir: Optional[str] = None) -> str:
+        """
+        Save vectors, items and the HNSW graph to a directory.
+        
+        Deleted rows are kept as tombstones (so a saved HNSW graph stays
+        valid) until they make up a fifth of the matrix, then compacted away.
+        Files are written next to their targets and renamed into place, so a
+        crash never leaves a torn store.
+        
+        Args:
+            persist_dir: Target directory (defaults to the configured one)
+            
+        Returns:
+            The directory written
+        """
+        persist_dir = persist_dir or self.persist_dir
+        if not persist_dir:
+            raise ValueError("No persist directory configured")
+        os.makedirs(persist_dir, exist_ok=True)
         
-        # Calculate cosine similarity for all vectors
-        similarities = []
-        for item_id, vector in self.vectors.items():
-            # Compute cosine similarity
-            similarity = np.dot(query_vector_np, vector) / (
-                np.linalg.norm(query_vector_np) * np.linalg.norm(vector)
-            )
-            similarities.append((item_id, similarity))
+        with self._lock:
+            if self._deleted * 5 > self._count:
+                self._compact()
+            
+            def replace(name: str, write) -> None:
+                target = os.path.join(persist_dir, name)
+                tmp = target + ".tmp"
+                write(tmp)
+                os.replace(tmp, target)
+            
+            def write_vectors(path: str) -> None:
+                with open(path, "wb") as f:
+                    np.save(f, self._matrix[:self._count])
+            
+            def write_items(path: str) -> None:
+                with open(path, "w") as f:
+                    json.dump({
+                        "dimension": self.dimension,
+                        "items": [
+                            self.items[item_id].to_dict() if item_id is not None else None
+                            for item_id in self._row_ids
+                        ],
+                    }, f)
+            
+            replace("vectors.npy", write_vectors)
+            replace("items.json", write_items)
+            hnsw_path = os.path.join(persist_dir, "hnsw.bin")
+            if self._hnsw is not None:
+                replace("hnsw.bin", self._hnsw.save_index)
+            elif os.path.exists(hnsw_path):
+                # Row numbers may have changed; the graph is rebuilt after load
+                os.remove(hnsw_path)
         
-        # Sort by similarity (highest first)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        logger.info(f"Saved {len(self)} vectors to {persist_dir}")
+        return persist_dir
+    
+    def load(self, persist_dir: str) -> None:
+        """
+        Load a saved store, memory-mapping the vector matrix.
         
-        # Return the top matching items
-        results = []
-        for item_id, similarity in similarities[:limit]:
-            if item_id in self.items:
-                results.append((self.items[item_id], similarity))
+        The matrix is mapped copy-on-write, so pages are read lazily from the
+        OS page cache and the store is searchable immediately; it is copied
+        into private memory only once it has to grow.
         
-        return results
+        Args:
+            persist_dir: Directory written by save()
+        """
+        with open(os.path.join(persist_dir, "items.json")) as f:
+            saved = json.load(f)
+        matrix = np.load(os.path.join(persist_dir, "vectors.npy"), mmap_mode="c")
+        
+        with self._lock:
+            self.clear()
+            self.dimension = saved["dimension"]
+            self._matrix = matrix if matrix.shape[0] else np.zeros((0, self.dimension or 0), dtype=np.float32)
+            self._count = len(saved["items"])
+            self._alive = np.array([data is not None for data in saved["items"]], dtype=bool)
+            self._deleted = int(self._count - self._alive.sum())
+            for row, data in enumerate(saved["items"]):
+                if data is None:
+                    self._row_ids.append(None)
+                    continue
+                item = MemoryItem(data["content"], data["metadata"], data["id"])
+                item.created_at = data["created_at"]
+                self.items[item.item_id] = item
+                self._rows[item.item_id] = row
+                self._row_ids.append(item.item_id)
+            
+            hnsw_path = os.path.join(persist_dir, "hnsw.bin")
+            if hnswlib is not None and os.path.exists(hnsw_path):
+                self._hnsw = hnswlib.Index(space="ip", dim=self.dimension)
+                self._hnsw.load_index(hnsw_path, max_elements=self._matrix.shape[0])
+
+        
+        logger.info(f"Loaded {self._count} vectors from {persist_dir}")
+    
+    def _compact(self) -> None:
+        """Drop deleted rows; row numbers change, so the HNSW graph is rebuilt lazily."""
+        keep = np.nonzero(self._alive[:self._count])[0]
+        self._matrix = np.ascontiguousarray(self._matrix[keep])
+        self._alive = np.ones(keep.shape[0], dtype=bool)
+        self._row_ids = [self._row_ids[row] for row in keep]
+        self._rows = {item_id: row for row, item_id in enumerate(self._row_ids)}
+        self._count = keep.shape[0]
+        self._deleted = 0
+        self._bitmaps = {}
+        self._hnsw = None
+        self._generation += 1
     
 
 class EmbeddingService:
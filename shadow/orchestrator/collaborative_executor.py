@@ -8,13 +8,16 @@ dependency management, and intelligent response synthesis.
 
 import logging
 import asyncio
+import heapq
+import itertools
+import os
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .task_decomposer import TaskDecomposition, SubTask, TaskPriority
+from .worker_pool import AGENT_POOL, run_in_worker
 
 logger = logging.getLogger("shadow.orchestrator.executor")
 
@@ -26,6 +29,11 @@ class ExecutionStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     BLOCKED = "blocked"
+    TIMED_OUT = "timed_out"
+    CANCELLED = "cancelled"
+
+
+PRIORITY_RANK = {TaskPriority.HIGH: 2, TaskPriority.MEDIUM: 1, TaskPriority.LOW: 0}
 
 
 @dataclass
@@ -57,19 +65,52 @@ class CollaborativeExecutor:
     This executor manages complex task workflows, enabling agents to
     share context, build on each other's work, and produce synthesized
     responses that leverage the full capabilities of the system.
+    
+    Agents are synchronous, so subtasks run in the shared agent worker pool
+    and the event loop stays free while they wait on their LLM calls.
     """
     
-    def __init__(self, agents: Dict[str, Any]):
+    def __init__(self, agents: Dict[str, Any], max_parallel_tasks: int = 3,
+                 subtask_timeout: Optional[float] = None):
         """
         Initialize the collaborative executor.
         
         Args:
             agents: Dictionary of available agents {name: agent_instance}
+            max_parallel_tasks: Maximum subtasks running at once per execution
+            subtask_timeout: Seconds before a subtask is abandoned (defaults to SHADOW_SUBTASK_TIMEOUT)
         """
         self.agents = agents
         self.execution_history: List[ExecutionResult] = []
         self.agent_context = AgentContext()
-        self.max_parallel_tasks = 3
+        self.max_parallel_tasks = max_parallel_tasks
+        self.subtask_timeout = subtask_timeout if subtask_timeout is not None else float(
+            os.environ.get("SHADOW_SUBTASK_TIMEOUT", "120"))
+        self._running: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def cancel(self) -> int:
+        """
+        Cancel all running executions.
+        
+        Safe to call from any thread. Subtasks already running in a worker
+        thread finish in the background, but their results are discarded and
+        no further subtasks are started.
+        
+        Returns:
+            Number of executions cancelled
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return 0
+        running = [task for task in list(self._running) if not task.done()]
+        try:
+            for task in running:
+                loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            # The execution finished and its loop closed in the meantime
+            return 0
+        return len(running)
         
     async def execute_decomposition(self, decomposition: TaskDecomposition, 
                                   memory_context: Optional[Dict] = None) -> str:
@@ -90,17 +131,24 @@ class CollaborativeExecutor:
         self.execution_history = []
         
         # Execute based on strategy
-        if decomposition.execution_strategy == "direct":
-            results = await self._execute_direct(decomposition.subtasks, memory_context)
-        elif decomposition.execution_strategy == "sequential":
-            results = await self._execute_sequential(decomposition.subtasks, memory_context)
-        elif decomposition.execution_strategy == "parallel":
-            results = await self._execute_parallel(decomposition.subtasks, memory_context)
-        elif decomposition.execution_strategy == "dependency_based":
-            results = await self._execute_dependency_based(decomposition.subtasks, memory_context)
-        else:
-            # Fallback to parallel execution
-            results = await self._execute_parallel(decomposition.subtasks, memory_context)
+        strategies = {
+            "direct": self._execute_direct,
+            "sequential": self._execute_sequential,
+            "parallel": self._execute_parallel,
+            "dependency_based": self._execute_dependency_based,
+        }
+        # Fallback to parallel execution
+        strategy = strategies.get(decomposition.execution_strategy, self._execute_parallel)
+        
+        # Run as a task so cancel() can stop it
+        self._loop = asyncio.get_running_loop()
+        execution = asyncio.ensure_future(strategy(decomposition.subtasks, memory_context))
+        self._running.add(execution)
+        try:
+            results = await execution
+        finally:
+            self._running.discard(execution)
+        self.execution_history.extend(results)
         
         # Synthesize final response
         final_response = self._synthesize_responses(results, decomposition)
@@ -115,7 +163,8 @@ class CollaborativeExecutor:
             return []
             
         subtask = subtasks[0]
-        result = await self._execute_subtask(subtask, memory_context)
+        enhanced_context = self._build_enhanced_context(subtask, [], memory_context)
+        result = await self._execute_subtask(subtask, enhanced_context)
         return [result]
 
     async def _execute_sequential(self, subtasks: List[SubTask], 
@@ -171,80 +220,125 @@ class CollaborativeExecutor:
 
     async def _execute_dependency_based(self, subtasks: List[SubTask], 
                                       memory_context: Optional[Dict] = None) -> List[ExecutionResult]:
-        """Execute subtasks based on their dependencies using topological sorting."""
-        results = []
-        remaining_tasks = subtasks.copy()
+        """
+        Execute a dependency DAG of subtasks.
         
-        while remaining_tasks:
-            # Find tasks that can be executed now
-            ready_tasks = [task for task in remaining_tasks 
-                          if self._dependencies_met(task, results)]
-            
-            if not ready_tasks:
-                logger.error("Circular dependency or missing dependency detected")
-                break
-            
-            # Execute ready tasks (in parallel if possible)
-            if len(ready_tasks) <= self.max_parallel_tasks:
-                # Execute all ready tasks in parallel
-                parallel_results = await self._execute_tasks_parallel(ready_tasks, memory_context)
-                results.extend(parallel_results)
-                
-                for result in parallel_results:
-                    self._update_agent_context(result)
-            else:
-                # Execute high priority tasks first
-                priority_tasks = sorted(ready_tasks, 
-                                      key=lambda t: (t.priority.value, t.estimated_complexity), 
-                                      reverse=True)
-                
-                for task in priority_tasks[:self.max_parallel_tasks]:
+        A subtask starts as soon as its dependencies have completed and a slot
+        is free. Ready subtasks on the longest remaining chain (weighted by
+        estimated complexity) start first, since they bound the total time.
+        Subtasks whose dependencies failed are reported as blocked.
+        """
+        by_id = {task.id: task for task in subtasks}
+        dependents: Dict[str, List[str]] = {task.id: [] for task in subtasks}
+        waiting: Dict[str, int] = {}
+        for task in subtasks:
+            deps = [dep for dep in task.dependencies if dep in by_id]
+            if len(deps) != len(task.dependencies):
+                logger.warning(f"Subtask {task.id} depends on unknown subtasks, ignoring them")
+            waiting[task.id] = len(deps)
+            for dep in deps:
+                dependents[dep].append(task.id)
+        
+        path_length = self._critical_path_lengths(subtasks, dependents)
+        ready: List[Tuple[float, int, int, str]] = []
+        order = itertools.count()
+        
+        def make_ready(task_id: str) -> None:
+            task = by_id[task_id]
+            heapq.heappush(ready, (-path_length[task_id], -PRIORITY_RANK.get(task.priority, 0), next(order), task_id))
+        
+        for task_id, count in waiting.items():
+            if count == 0:
+                make_ready(task_id)
+        
+        results: List[ExecutionResult] = []
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_parallel_tasks:
+                    task = by_id[heapq.heappop(ready)[3]]
                     enhanced_context = self._build_enhanced_context(task, results, memory_context)
-                    result = await self._execute_subtask(task, enhanced_context)
+                    running[asyncio.ensure_future(self._execute_subtask(task, enhanced_context))] = task.id
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    running.pop(finished)
+                    result = finished.result()
                     results.append(result)
                     self._update_agent_context(result)
-            
-            # Remove completed tasks
-            completed_ids = [result.subtask_id for result in results 
-                           if result.subtask_id in [task.id for task in ready_tasks]]
-            remaining_tasks = [task for task in remaining_tasks 
-                             if task.id not in completed_ids]
-        
+                    
+                    if result.status == ExecutionStatus.COMPLETED:
+                        for dependent in dependents[result.subtask_id]:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0:
+                                make_ready(dependent)
+                    else:
+                        results.extend(self._block_dependents(result.subtask_id, by_id, dependents, waiting))
+        finally:
+            for pending in running:
+                pending.cancel()
+        
+        unfinished = [task_id for task_id, count in waiting.items() if count > 0]
+        if unfinished:
+            logger.error(f"Circular dependency detected between subtasks {unfinished}")
         return results
 
+    @staticmethod
+    def _critical_path_lengths(subtasks: List[SubTask], dependents: Dict[str, List[str]]) -> Dict[str, float]:
+        """Length of the longest chain of subtasks starting at each subtask."""
+        weights = {task.id: max(task.estimated_complexity, 0.01) for task in subtasks}
+        lengths: Dict[str, float] = {}
+        
+        def visit(task_id: str, path: Set[str]) -> float:
+            if task_id in lengths:
+                return lengths[task_id]
+            if task_id in path:
+                # Cycles are reported by the scheduler; stop descending here
+                return 0.0
+            path.add(task_id)
+            longest = max((visit(child, path) for child in dependents[task_id]), default=0.0)
+            path.discard(task_id)
+            lengths[task_id] = weights[task_id] + longest
+            return lengths[task_id]
+        
+        for task in subtasks:
+            visit(task.id, set())
+        return lengths
+
+    def _block_dependents(self, failed_id: str, by_id: Dict[str, SubTask],
+                          dependents: Dict[str, List[str]], waiting: Dict[str, int]) -> List[ExecutionResult]:
+        """Mark every subtask downstream of a failed one as blocked."""
+        blocked = []
+        stack = list(dependents[failed_id])
+        while stack:
+            task_id = stack.pop()
+            if waiting.get(task_id, 0) <= 0:
+                continue
+            waiting[task_id] = 0
+            task = by_id[task_id]
+            blocked.append(ExecutionResult(
+                subtask_id=task_id,
+                status=ExecutionStatus.BLOCKED,
+                response="",
+                agent_name=task.target_agents[0] if task.target_agents else "unknown",
+                execution_time=0.0,
+                dependencies_met=False,
+                error_message=f"Dependency {failed_id} did not complete"
+            ))
+            stack.extend(dependents[task_id])
+        return blocked
+
     async def _execute_tasks_parallel(self, tasks: List[SubTask], 
                                     memory_context: Optional[Dict] = None) -> List[ExecutionResult]:
-        """Execute multiple tasks in parallel."""
-        tasks_with_context = []
-        for task in tasks:
-            enhanced_context = self._build_enhanced_context(task, [], memory_context)
-            tasks_with_context.append((task, enhanced_context))
-        
-        # Use ThreadPoolExecutor for parallel execution
-        with ThreadPoolExecutor(max_workers=min(len(tasks), self.max_parallel_tasks)) as executor:
-            future_to_task = {
-                executor.submit(self._execute_subtask_sync, task, context): task 
-                for task, context in tasks_with_context
-            }
-            
-            results = []
-            for future in as_completed(future_to_task):
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    task = future_to_task[future]
-                    logger.error(f"Error executing task {task.id}: {str(e)}")
-                    results.append(ExecutionResult(
-                        subtask_id=task.id,
-                        status=ExecutionStatus.FAILED,
-                        response=f"Error: {str(e)}",
-                        agent_name=task.target_agents[0] if task.target_agents else "unknown",
-                        execution_time=0.0,
-                        error_message=str(e)
-                    ))
+        """Execute multiple tasks in parallel, at most max_parallel_tasks at a time."""
+        slots = asyncio.Semaphore(self.max_parallel_tasks)
         
-        return results
+        async def run(task: SubTask) -> ExecutionResult:
+            async with slots:
+                enhanced_context = self._build_enhanced_context(task, [], memory_context)
+                return await self._execute_subtask(task, enhanced_context)
+        
+        return list(await asyncio.gather(*(run(task) for task in tasks)))
 
     def _execute_subtask_sync(self, subtask: SubTask, context: Dict) -> ExecutionResult:
         """Synchronous wrapper for subtask execution."""
@@ -296,8 +390,28 @@ class CollaborativeExecutor:
             )
 
     async def _execute_subtask(self, subtask: SubTask, context: Dict) -> ExecutionResult:
-        """Execute a single subtask with full context."""
-        return self._execute_subtask_sync(subtask, context)
+        """
+        Execute a single subtask with full context in the agent worker pool.
+        
+        A subtask that exceeds the timeout is reported as timed out; its
+        worker thread cannot be interrupted and finishes in the background.
+        """
+        start_time = time.time()
+        try:
+            return await asyncio.wait_for(
+                run_in_worker(self._execute_subtask_sync, subtask, context, pool=AGENT_POOL),
+                timeout=self.subtask_timeout or None
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Subtask {subtask.id} timed out after {self.subtask_timeout:g}s")
+            return ExecutionResult(
+                subtask_id=subtask.id,
+                status=ExecutionStatus.TIMED_OUT,
+                response="Error: the agent did not respond in time",
+                agent_name=subtask.target_agents[0] if subtask.target_agents else "unknown",
+                execution_time=time.time() - start_time,
+                error_message=f"Timed out after {self.subtask_timeout:g}s"
+            )
 
     def _dependencies_met(self, subtask: SubTask, completed_results: List[ExecutionResult]) -> bool:
         """Check if all dependencies for a subtask have been completed."""
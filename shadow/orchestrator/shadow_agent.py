@@ -8,13 +8,14 @@ multi-agent collaboration capabilities.
 
 import logging
 import asyncio
+import threading
 from typing import Dict, List, Optional, Any
 
 from .classifier import default_classifier
 from .aggregator import default_aggregator
 from .memory_integration import OrchestratorMemory, default_orchestrator_memory
 from .task_decomposer import default_task_decomposer, TaskType
-from .collaborative_executor import create_collaborative_executor
+from .collaborative_executor import CollaborativeExecutor, ExecutionStatus, create_collaborative_executor
 
 
 class ShadowAgent:
@@ -49,6 +50,8 @@ class ShadowAgent:
         self.enable_collaboration = enable_collaboration
         self.task_decomposer = default_task_decomposer
         self.collaborative_executor = create_collaborative_executor(self.agents)
+        self._active_executors: Dict[str, CollaborativeExecutor] = {}
+        self._executors_lock = threading.Lock()
         
         # Performance tracking
         self.execution_stats = {
@@ -74,7 +77,9 @@ class ShadowAgent:
         self.collaborative_executor.agents[name] = agent
         self.logger.info(f"Registered agent: {name}")
     
-    def process_request(self, user_input: str, use_collaboration: Optional[bool] = None) -> str:
+    def process_request(self, user_input: str, use_collaboration: Optional[bool] = None,
+                        target_agents: Optional[List[str]] = None,
+                        request_id: Optional[str] = None) -> str:
         """
         Process a user request through the Shadow system with optional
         advanced collaboration capabilities.
@@ -82,6 +87,10 @@ class ShadowAgent:
         Args:
             user_input: The user's request text
             use_collaboration: Override collaboration setting for this request
+            target_agents: Agents to route to instead of classifying the request
+                (implies basic routing)
+            request_id: Identifier under which a collaborative execution can be
+                cancelled with cancel_request
             
         Returns:
             The system's response
@@ -100,6 +109,7 @@ class ShadowAgent:
 
         # Determine if we should use advanced collaboration
         should_collaborate = (
+            target_agents is None and
             (use_collaboration if use_collaboration is not None else self.enable_collaboration) and
             len(self.agents) > 1
         )
@@ -109,9 +119,9 @@ class ShadowAgent:
 
         try:
             if should_collaborate:
-                response, agents_used = self._process_with_collaboration(user_input, context)
+                response, agents_used = self._process_with_collaboration(user_input, context, request_id)
             else:
-                response, agents_used = self._process_with_basic_routing(user_input, context)
+                response, agents_used = self._process_with_basic_routing(user_input, context, target_agents)
                 
         except Exception as e:
             self.logger.error(f"Error processing request: {str(e)}")
@@ -133,13 +143,29 @@ class ShadowAgent:
             
         return response
 
-    def _process_with_collaboration(self, user_input: str, context: Dict) -> tuple[str, List[str]]:
+    def cancel_request(self, request_id: str) -> bool:
+        """
+        Cancel a running collaborative execution.
+        
+        Args:
+            request_id: The request_id passed to process_request
+            
+        Returns:
+            True if a running execution was found and cancelled
+        """
+        with self._executors_lock:
+            executor = self._active_executors.get(request_id)
+        return executor is not None and executor.cancel() > 0
+
+    def _process_with_collaboration(self, user_input: str, context: Dict,
+                                    request_id: Optional[str] = None) -> tuple[str, List[str]]:
         """
         Process request using advanced collaboration capabilities.
         
         Args:
             user_input: The user's request
             context: Memory context
+            request_id: Identifier for cancel_request
             
         Returns:
             Tuple of (response, agents_used)
@@ -150,25 +176,59 @@ class ShadowAgent:
         decomposition = self.task_decomposer.decompose_task(user_input, context)
         self.logger.info(f"Task decomposed: {decomposition.task_type.value} with {len(decomposition.subtasks)} subtasks")
         
-        # For now, skip collaborative execution to avoid async event loop issues
-        # Fall back to basic routing which works reliably
-        self.logger.info("Using basic routing for stable operation")
-        return self._process_with_basic_routing(user_input, context)
+        # The executor needs its own event loop; when called from inside a running
+        # loop (instead of a worker thread) fall back to basic routing
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            self.logger.info("Called from an event loop, using basic routing")
+            return self._process_with_basic_routing(user_input, context)
+
+        # Executors keep per-execution state, so concurrent requests each get one
+        executor = CollaborativeExecutor(
+            self.agents,
+            max_parallel_tasks=self.collaborative_executor.max_parallel_tasks,
+            subtask_timeout=self.collaborative_executor.subtask_timeout
+        )
+        if request_id:
+            with self._executors_lock:
+                self._active_executors[request_id] = executor
+        try:
+            response = asyncio.run(executor.execute_decomposition(decomposition, context))
+        except asyncio.CancelledError:
+            self.logger.info(f"Request {request_id} was cancelled")
+            return "The request was cancelled.", []
+        finally:
+            if request_id:
+                with self._executors_lock:
+                    self._active_executors.pop(request_id, None)
+        agents_used = sorted({
+            result.agent_name for result in executor.execution_history
+            if result.status == ExecutionStatus.COMPLETED
+        })
+        return response, agents_used
 
-    def _process_with_basic_routing(self, user_input: str, context: Dict) -> tuple[str, List[str]]:
+    def _process_with_basic_routing(self, user_input: str, context: Dict,
+                                    target_agents: Optional[List[str]] = None) -> tuple[str, List[str]]:
         """
         Process request using basic agent routing (original behavior).
         
         Args:
             user_input: The user's request
             context: Memory context
+            target_agents: Agents to use instead of classifying the request
             
         Returns:
             Tuple of (response, agents_used)
         """
-        # Classify the user input
-        target_agents = self.classifier.classify_task(user_input)
-        self.logger.info(f"Classified request to agents: {target_agents}")
+        if target_agents is None:
+            # Classify the user input
+            target_agents = self.classifier.classify_task(user_input)
+            self.logger.info(f"Classified request to agents: {target_agents}")
+        else:
+            self.logger.info(f"Routing request to selected agents: {target_agents}")
 
         # Collect responses from target agents
         agent_responses = {}
@@ -0,0 +1,84 @@
+"""
+Shared worker pools for the Shadow AI system.
+
+Agents and the orchestrator are synchronous and spend most of their time
+waiting on LLM calls. This module keeps long-lived, sized thread pools so
+that async code can offload that work without blocking the event loop or
+creating a new pool per call.
+
+Requests and agent subtasks use separate pools: a request running in the
+"requests" pool waits on subtasks in the "agents" pool, so sharing one pool
+could fill it with waiting requests and deadlock.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("shadow.orchestrator.workers")
+
+REQUEST_POOL = "requests"
+AGENT_POOL = "agents"
+
+_pools: Dict[str, ThreadPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _default_workers() -> int:
+    return int(os.environ.get("SHADOW_WORKER_THREADS", min(32, (os.cpu_count() or 1) + 4)))
+
+
+def get_worker_pool(name: str = AGENT_POOL, max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """
+    Get (creating on first use) the shared thread pool with the given name.
+
+    Args:
+        name: Pool name
+        max_workers: Pool size when the pool is created (defaults to SHADOW_WORKER_THREADS)
+
+    Returns:
+        The shared thread pool
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            size = max_workers or _default_workers()
+            pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"shadow-{name}")
+            _pools[name] = pool
+            logger.info(f"Started '{name}' worker pool with {size} threads")
+        return pool
+
+
+async def run_in_worker(func: Callable[..., Any], *args, pool: str = AGENT_POOL, **kwargs) -> Any:
+    """
+    Run a synchronous callable in a shared worker pool and await its result.
+
+    Args:
+        func: The callable to run
+        *args: Positional arguments for the callable
+        pool: Name of the pool to run in
+        **kwargs: Keyword arguments for the callable
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_worker_pool(pool), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_worker_pools(wait: bool = True) -> None:
+    """
+    Shut down all shared pools; queued work that has not started is cancelled.
+
+    Args:
+        wait: Whether to wait for running work to finish
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,139 @@
+"""
+Tests for the document stores and their BM25 index.
+
+These tests cover ranking, segment sealing and merging, and the
+persistence of the file system document store across restarts.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from memory.document_store import DocumentItem, FileSystemDocumentStore, InMemoryDocumentStore
+from memory.text_index import BM25Index
+
+
+def ids(results):
+    return [doc.item_id for doc in results]
+
+
+class TestBM25Index:
+    """Test cases for BM25Index."""
+
+    def test_rare_terms_rank_higher(self):
+        index = BM25Index()
+        index.add("common", "the cat sat on the mat")
+        index.add("rare", "the aardvark sat on the mat")
+        index.add("other", "the dog sat on the rug")
+
+        results = index.search("aardvark mat")
+
+        assert [doc_id for doc_id, _ in results] == ["rare", "common"]
+        assert results[0][1] > results[1][1]
+
+    def test_update_and_remove(self):
+        index = BM25Index()
+        index.add("a", "apples and pears")
+        index.add("a", "plums only")
+        index.add("b", "apples again")
+
+        assert [doc_id for doc_id, _ in index.search("apples")] == ["b"]
+        assert index.remove("b") is True
+        assert index.remove("b") is False
+        assert index.search("apples") == []
+        assert len(index) == 1
+
+    def test_segments_merge_without_losing_documents(self):
+        index = BM25Index(segment_size=2, max_segments=2)
+        for i in range(10):
+            index.add(f"doc{i}", f"shared word{i}")
+        index.remove("doc3")
+
+        index.flush()
+
+        assert len(index._segments) <= 2
+        assert sorted(doc_id for doc_id, _ in index.search("shared", limit=20)) == sorted(
+            f"doc{i}" for i in range(10) if i != 3
+        )
+        assert [doc_id for doc_id, _ in index.search("word7")] == ["doc7"]
+
+
+class TestInMemoryDocumentStore:
+    """Test cases for InMemoryDocumentStore."""
+
+    def test_round_trip_search_and_delete(self):
+        store = InMemoryDocumentStore()
+        store.store(DocumentItem("Notes on vector search", "Embeddings", "reference", item_id="d1"))
+        store.store(DocumentItem("Shopping list: milk, eggs", "Groceries", item_id="d2"))
+
+        assert store.retrieve("d1").title == "Embeddings"
+        assert ids(store.search("embeddings")) == ["d1"]
+        assert ids(store.get_documents_by_type("reference")) == ["d1"]
+        assert store.delete("d1") is True
+        assert store.search("embeddings") == []
+        assert store.count() == 1
+
+
+class TestFileSystemDocumentStore:
+    """Test cases for FileSystemDocumentStore."""
+
+    @pytest.fixture
+    def storage_dir(self, tmp_path):
+        return str(tmp_path / "documents")
+
+    def fill(self, store):
+        store.store(DocumentItem("The quick brown fox", "Fox", item_id="fox"))
+        store.store(DocumentItem("A lazy sleeping dog", "Dog", "story", item_id="dog"))
+        store.store(DocumentItem("Foxes and dogs together", "Both", item_id="both"))
+
+    @pytest.mark.parametrize("flush", [True, False])
+    def test_documents_survive_restart(self, storage_dir, flush):
+        store = FileSystemDocumentStore(storage_dir, segment_size=2)
+        self.fill(store)
+        store.delete("dog")
+        if flush:
+            store.flush()
+
+        reopened = FileSystemDocumentStore(storage_dir, segment_size=2)
+
+        assert reopened.count() == 2
+        assert reopened.retrieve("fox").content == "The quick brown fox"
+        assert reopened.retrieve("dog") is None
+        assert ids(reopened.search("fox")) == ["fox"]
+        assert ids(reopened.search("foxes")) == ["both"]
+        assert reopened.search("lazy") == []
+
+    def test_update_replaces_content(self, storage_dir):
+        store = FileSystemDocumentStore(storage_dir)
+        self.fill(store)
+        store.store(DocumentItem("Now about cats", "Fox", item_id="fox"))
+
+        reopened = FileSystemDocumentStore(storage_dir)
+
+        assert reopened.retrieve("fox").content == "Now about cats"
+        assert ids(reopened.search("cats")) == ["fox"]
+        assert reopened.search("quick") == []
+
+    def test_torn_log_record_is_skipped(self, storage_dir):
+        store = FileSystemDocumentStore(storage_dir)
+        self.fill(store)
+        with open(Path(storage_dir) / "index.log", "a") as f:
+            f.write('{"op": "put", "id": "half')
+
+        reopened = FileSystemDocumentStore(storage_dir)
+
+        assert reopened.count() == 3
+        assert ids(reopened.get_documents_by_type("story")) == ["dog"]
+
+    def test_clear(self, storage_dir):
+        store = FileSystemDocumentStore(storage_dir)
+        self.fill(store)
+        store.flush()
+
+        assert store.clear() is True
+        assert FileSystemDocumentStore(storage_dir).count() == 0
@@ -0,0 +1,146 @@
+"""
+Tests for the SQLite relational store.
+
+These tests cover entity round-trips, property and relationship queries,
+graph traversal, deletion and migration of the version 1 schema.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from memory.memory_base import MemoryItem
+from memory.relational_store import RelationalItem, SQLiteRelationalStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteRelationalStore(str(tmp_path / "relational.db"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def graph(store):
+    """ada -> knows -> grace -> knows -> alan, ada -> works_at -> lab."""
+    store.store_batch([
+        RelationalItem("Ada", "person", {"age": 36, "skills": ["math"]},
+                       {"knows": ["grace"], "works_at": ["lab"]}, {"name": "Ada"}, "ada"),
+        RelationalItem("Grace", "person", {"age": 85}, {"knows": ["alan"]}, {"name": "Grace"}, "grace"),
+        RelationalItem("Alan", "person", {"age": 41}, {}, {"name": "Alan"}, "alan"),
+        RelationalItem("Lab", "place", {"city": "London"}, {}, {"name": "Analytical Lab"}, "lab"),
+    ])
+    return store
+
+
+def ids(items):
+    return sorted(item.item_id for item in items)
+
+
+def test_round_trip(graph):
+    ada = graph.retrieve("ada")
+
+    assert ada.content == "Ada"
+    assert ada.entity_type == "person"
+    assert ada.properties == {"age": 36, "skills": ["math"]}
+    assert ada.relationships == {"knows": ["grace"], "works_at": ["lab"]}
+    assert ada.metadata["name"] == "Ada"
+    assert graph.retrieve("missing") is None
+    assert ids(graph.retrieve_many(["ada", "lab", "missing"])) == ["ada", "lab"]
+
+
+def test_plain_memory_items_become_entities(store):
+    item_id = store.store(MemoryItem("A note", {"entity_type": "note"}))
+
+    assert store.retrieve(item_id).entity_type == "note"
+
+
+def test_restore_replaces_relationships(graph):
+    graph.store(RelationalItem("Ada", "person", {"age": 37}, {"knows": ["alan"]}, {}, "ada"))
+
+    ada = graph.retrieve("ada")
+    assert ada.properties == {"age": 37}
+    assert ada.relationships == {"knows": ["alan"]}
+
+
+def test_queries(graph):
+    assert ids(graph.query_by_type("person")) == ["ada", "alan", "grace"]
+    assert ids(graph.query_by_property("age", 85)) == ["grace"]
+    assert ids(graph.query_by_property("city", "London")) == ["lab"]
+    assert ids(graph.query_by_property("skills", ["math"])) == ["ada"]
+    assert ids(graph.query_by_relationship("knows")) == ["ada", "grace"]
+    assert ids(graph.query_by_relationship("knows", "alan")) == ["grace"]
+    assert ids(graph.find_entities_in_text("Who runs the analytical lab?")) == ["lab"]
+
+
+def test_traverse_returns_shortest_depth(graph):
+    graph.add_relationships([("ada", "knows", "alan")])
+
+    reached = {item.item_id: depth for item, depth in graph.traverse("ada", max_depth=2)}
+    known = {item.item_id: depth for item, depth in graph.traverse("ada", max_depth=3, relation_types=["knows"])}
+
+    assert reached == {"grace": 1, "lab": 1, "alan": 1}
+    assert known == {"grace": 1, "alan": 1}
+    assert [depth for _, depth in graph.traverse("grace", include_start=True)] == [0, 1]
+
+
+def test_delete_removes_edges_both_ways(graph):
+    assert graph.delete("grace") is True
+    assert graph.delete("grace") is False
+
+    assert graph.retrieve("grace") is None
+    assert graph.retrieve("ada").relationships == {"works_at": ["lab"]}
+    assert ids(graph.query_by_relationship("knows")) == []
+
+
+def test_threads_use_their_own_connections(graph):
+    found = []
+    worker = threading.Thread(target=lambda: found.append(graph.retrieve("alan")))
+    worker.start()
+    worker.join()
+
+    assert found[0].content == "Alan"
+
+
+def test_in_memory_database():
+    store = SQLiteRelationalStore(":memory:")
+    store.store(RelationalItem("Ada", "person", {"age": 36}, {}, {}, "ada"))
+
+    assert ids(store.query_by_property("age", 36)) == ["ada"]
+    assert store.clear() is True
+    assert store.query_by_type("person") == []
+
+
+def test_migrates_version_1_schema(tmp_path):
+    path = str(tmp_path / "v1.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE entities (id TEXT PRIMARY KEY, entity_type TEXT NOT NULL, content TEXT NOT NULL,
+                               metadata TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE properties (entity_id TEXT NOT NULL, property_name TEXT NOT NULL, property_value TEXT,
+                                 PRIMARY KEY (entity_id, property_name));
+        CREATE TABLE relationships (source_id TEXT NOT NULL, relation_type TEXT NOT NULL, target_id TEXT NOT NULL,
+                                    PRIMARY KEY (source_id, relation_type, target_id));
+    """)
+    conn.execute("INSERT INTO entities (id, entity_type, content, metadata) VALUES ('ada', 'person', 'Ada', '{}')")
+    conn.execute("INSERT INTO properties VALUES ('ada', 'age', ?)", (json.dumps(36),))
+    conn.execute("INSERT INTO properties VALUES ('ada', 'city', ?)", (json.dumps("London"),))
+    conn.execute("INSERT INTO relationships VALUES ('ada', 'knows', 'grace')")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteRelationalStore(path)
+
+    ada = store.retrieve("ada")
+    assert ada.properties == {"age": 36, "city": "London"}
+    assert ada.relationships == {"knows": ["grace"]}
+    assert ids(store.query_by_property("city", "London")) == ["ada"]
+    store.close()
@@ -0,0 +1,120 @@
+"""
+Tests for the in-memory vector store.
+
+These tests cover storing and retrieving items, exact and HNSW search,
+metadata filters, deletion and persistence of the vector matrix.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from memory.memory_base import MemoryItem
+from memory.vector_memory import InMemoryVectorStore, hnswlib
+
+
+def unit(index, dimension=8):
+    """Basis vector, so each item is its own nearest neighbour."""
+    vector = np.zeros(dimension, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+@pytest.fixture
+def store():
+    store = InMemoryVectorStore(dimension=8)
+    items = [
+        MemoryItem(f"note {i}", {"topic": "work" if i % 2 else "home", "tags": ["a", f"t{i}"]}, f"item-{i}")
+        for i in range(6)
+    ]
+    store.store_batch(items, [unit(i) for i in range(6)])
+    return store
+
+
+def test_round_trip(store):
+    item = store.retrieve("item-3")
+
+    assert item.content == "note 3"
+    assert item.metadata["topic"] == "work"
+    assert len(store) == 6
+
+
+def test_search_ranks_by_cosine_similarity(store):
+    query = unit(2) * 3 + unit(4)
+
+    results = store.search_by_vector(query.tolist(), limit=2)
+
+    assert [item.item_id for item, _ in results] == ["item-2", "item-4"]
+    assert results[0][1] == pytest.approx(3 / np.sqrt(10))
+
+
+def test_filters_restrict_candidates(store):
+    results = store.search_by_vector(unit(2).tolist(), limit=6, filters={"topic": "work"})
+
+    assert {item.item_id for item, _ in results} == {"item-1", "item-3", "item-5"}
+    assert [item.item_id for item, _ in store.search_by_vector(unit(0).tolist(), filters={"tags": "t4"})] == ["item-4"]
+
+
+def test_restore_updates_filters(store):
+    store.store_with_embedding(MemoryItem("note 1", {"topic": "home"}, "item-1"), unit(1))
+
+    results = store.search_by_vector(unit(1).tolist(), limit=6, filters={"topic": "work"})
+
+    assert {item.item_id for item, _ in results} == {"item-3", "item-5"}
+
+
+def test_deleted_items_are_not_found(store):
+    assert store.delete("item-2") is True
+    assert store.delete("item-2") is False
+
+    results = store.search_by_vector(unit(2).tolist(), limit=6)
+
+    assert store.retrieve("item-2") is None
+    assert "item-2" not in {item.item_id for item, _ in results}
+    assert len(results) == 5
+
+
+def test_dimension_mismatch_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.store_with_embedding(MemoryItem("wrong"), [1.0, 0.0])
+
+
+def test_save_and_load(store, tmp_path):
+    store.delete("item-0")
+    store.delete("item-5")
+    store.save(str(tmp_path))
+
+    loaded = InMemoryVectorStore(persist_dir=str(tmp_path))
+
+    assert len(loaded) == 4
+    assert loaded.retrieve("item-3").content == "note 3"
+    assert [item.item_id for item, _ in loaded.search_by_vector(unit(3).tolist(), limit=1)] == ["item-3"]
+    loaded.store_with_embedding(MemoryItem("note 7", {}, "item-7"), unit(7))
+    assert [item.item_id for item, _ in loaded.search_by_vector(unit(7).tolist(), limit=1)] == ["item-7"]
+
+
+@pytest.mark.skipif(hnswlib is None, reason="hnswlib not installed")
+def test_hnsw_search_matches_exact_scan():
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((300, 16)).astype(np.float32)
+    store = InMemoryVectorStore(dimension=16, hnsw_threshold=100)
+    store.store_batch([MemoryItem(f"v{i}", {}, f"v{i}") for i in range(300)], vectors)
+    exact = [item.item_id for item, _ in store.search_by_vector(vectors[42].tolist(), limit=1)]
+
+    # The first large search starts the background build
+    builder = store._hnsw_builder
+    if builder is not None:
+        builder.join()
+    store.delete("v42")
+    results = store.search_by_vector(vectors[42].tolist(), limit=5)
+
+    assert exact == ["v42"]
+    assert store._hnsw is not None
+    assert "v42" not in {item.item_id for item, _ in results}
+    assert len(results) == 5
@@ -0,0 +1,177 @@
+"""
+Tests for the shared worker pools and collaborative execution.
+
+These tests cover dispatch of agent work to the shared pools, the
+dependency scheduler, subtask timeouts and cancellation of a running
+request.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add parent directory to path to allow imports
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from orchestrator.collaborative_executor import CollaborativeExecutor, ExecutionStatus
+from orchestrator.shadow_agent import ShadowAgent
+from orchestrator.task_decomposer import SubTask, TaskDecomposition, TaskPriority, TaskType
+from orchestrator.worker_pool import (
+    AGENT_POOL,
+    REQUEST_POOL,
+    get_worker_pool,
+    run_in_worker,
+    shutdown_worker_pools,
+)
+
+
+class RecordingAgent:
+    """Agent that records the threads it runs on and how many calls overlap."""
+
+    def __init__(self, name, delay=0.0, release=None):
+        self.name = name
+        self.delay = delay
+        self.release = release
+        self.started = threading.Event()
+        self.threads = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, user_input, conversation_history=None, memory_context=None):
+        with self._lock:
+            self.threads.append(threading.current_thread().name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.started.set()
+        try:
+            if self.release is not None:
+                self.release.wait(5)
+            time.sleep(self.delay)
+            return f"{self.name}: {user_input.splitlines()[-1]}"
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def subtask(task_id, agent, dependencies=(), complexity=0.5):
+    return SubTask(task_id, f"task {task_id}", [agent], TaskPriority.MEDIUM, list(dependencies), {}, complexity)
+
+
+def decomposition(subtasks, strategy):
+    return TaskDecomposition("query", TaskType.COMPLEX, subtasks, strategy, 1.0, "light")
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    yield
+    shutdown_worker_pools()
+
+
+class TestWorkerPool:
+    """Test cases for the shared worker pools."""
+
+    def test_pools_are_shared_per_name(self):
+        assert get_worker_pool(AGENT_POOL) is get_worker_pool(AGENT_POOL)
+        assert get_worker_pool(AGENT_POOL) is not get_worker_pool(REQUEST_POOL)
+
+    def test_run_in_worker_dispatches_to_named_pool(self):
+        async def main():
+            return await asyncio.gather(
+                run_in_worker(lambda: threading.current_thread().name),
+                run_in_worker(lambda x, y=0: x + y, 2, y=3, pool=REQUEST_POOL),
+            )
+
+        thread_name, total = asyncio.run(main())
+
+        assert thread_name.startswith(f"shadow-{AGENT_POOL}")
+        assert total == 5
+
+    def test_subtasks_run_off_the_event_loop(self):
+        agent = RecordingAgent("researcher", delay=0.05)
+        executor = CollaborativeExecutor({"researcher": agent}, max_parallel_tasks=2)
+        plan = decomposition([subtask(str(i), "researcher") for i in range(4)], "parallel")
+
+        response = asyncio.run(executor.execute_decomposition(plan))
+
+        assert len(agent.threads) == 4
+        assert all(name.startswith(f"shadow-{AGENT_POOL}") for name in agent.threads)
+        assert agent.max_active == 2
+        assert "researcher" in response.lower()
+
+
+class TestCollaborativeExecutor:
+    """Test cases for CollaborativeExecutor scheduling."""
+
+    def test_dependencies_run_in_order_and_failures_block(self):
+        agent = RecordingAgent("writer")
+        executor = CollaborativeExecutor({"writer": agent}, max_parallel_tasks=3)
+        plan = decomposition([
+            subtask("outline", "writer"),
+            subtask("draft", "writer", ["outline"]),
+            subtask("broken", "missing"),
+            subtask("review", "writer", ["draft", "broken"]),
+        ], "dependency_based")
+
+        asyncio.run(executor.execute_decomposition(plan))
+
+        statuses = {result.subtask_id: result.status for result in executor.execution_history}
+        assert statuses == {
+            "outline": ExecutionStatus.COMPLETED,
+            "draft": ExecutionStatus.COMPLETED,
+            "broken": ExecutionStatus.FAILED,
+            "review": ExecutionStatus.BLOCKED,
+        }
+        order = [result.subtask_id for result in executor.execution_history if result.status == ExecutionStatus.COMPLETED]
+        assert order == ["outline", "draft"]
+
+    def test_slow_subtask_times_out(self):
+        release = threading.Event()
+        executor = CollaborativeExecutor({"slow": RecordingAgent("slow", release=release)}, subtask_timeout=0.05)
+
+        try:
+            asyncio.run(executor.execute_decomposition(decomposition([subtask("1", "slow")], "direct")))
+        finally:
+            release.set()
+
+        assert executor.execution_history[0].status == ExecutionStatus.TIMED_OUT
+
+
+class TestCancellation:
+    """Test cases for cancelling a collaborative request."""
+
+    def test_cancel_request_stops_execution(self):
+        release = threading.Event()
+        agents = {"analyst": RecordingAgent("analyst", release=release), "critic": RecordingAgent("critic")}
+        shadow = ShadowAgent(agents=agents, memory=MagicMock())
+        shadow.task_decomposer = MagicMock()
+        shadow.task_decomposer.decompose_task.return_value = decomposition(
+            [subtask("1", "analyst"), subtask("2", "critic", ["1"])], "sequential"
+        )
+
+        responses = []
+        request = threading.Thread(
+            target=lambda: responses.append(shadow.process_request("Compare", request_id="r1"))
+        )
+        request.start()
+        try:
+            assert agents["analyst"].started.wait(5)
+            assert shadow.cancel_request("r1") is True
+            request.join(5)
+        finally:
+            release.set()
+
+        assert responses == ["The request was cancelled."]
+        assert agents["critic"].threads == []
+        assert shadow.cancel_request("r1") is False
+
+    def test_unknown_request_is_not_cancelled(self):
+        shadow = ShadowAgent(agents={}, memory=MagicMock())
+
+        assert shadow.cancel_request("nope") is False